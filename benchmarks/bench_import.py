@@ -0,0 +1,41 @@
+"""Benchmarks of the import time of the client, which every script using it pays."""
+
+import os
+import subprocess
+import sys
+from typing import List
+
+from benchmarks.harness import Report
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+STATEMENTS = {
+    "import.usrp_client": "import usrp_client",
+    "import.usrp_client.System": "from usrp_client import System",
+}
+
+
+def importDurations(statement: str, repeat: int) -> List[float]:
+    """Cumulative import time of `statement` in seconds, measured by
+    `python -X importtime` in `repeat` fresh interpreters."""
+    durations = []
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                                capture_output=True, text=True, env=env, cwd=REPO_DIR,
+                                check=True)
+        total = 0
+        for line in result.stderr.splitlines():
+            # top-level imports are not indented
+            if line.startswith("import time:") and "|" in line:
+                _, cumulative, module = line.split("|")
+                if cumulative.strip().isdigit() and not module.startswith("  "):
+                    total += int(cumulative)
+        durations.append(1e-6 * total)
+    return durations
+
+
+def run(report: Report) -> None:
+    for name, statement in STATEMENTS.items():
+        if report.nameFilter in name:
+            report.add(name, importDurations(statement, report.repeat))
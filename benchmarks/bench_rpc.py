@@ -0,0 +1,68 @@
+"""Benchmarks of RPC round trips between `UsrpClient` and `UsrpServer` via localhost.
+
+The server runs in a greenlet of this process and forwards to a mocked USRP, hence the
+results contain the overhead of the transport and the (de)serialization only.
+"""
+
+import contextlib
+import socket
+from typing import Iterator
+from unittest.mock import Mock
+
+import gevent
+import zerorpc
+
+from benchmarks.bench_serialization import randomSignal
+from benchmarks.harness import Report
+from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+from uhd_wrapper.usrp_pybinding import Usrp
+from uhd_wrapper.utils.config import RxStreamingConfig, TxStreamingConfig
+from usrp_client.rpc_client import UsrpClient
+
+NUM_SAMPLES = 100000
+
+
+def mockUsrp(numSamples: int) -> Mock:
+    usrp = Mock(spec=Usrp)
+    usrp.getMasterClockRate.return_value = 245.76e6
+    usrp.getCapabilities.return_value = {}
+    usrp.getMaxTxSamples.return_value = 1 << 28
+    usrp.resetStreamingConfigs.return_value = None
+    usrp.setTxConfig.return_value = None
+    usrp.setRxConfig.return_value = None
+    usrp.collect.return_value = [randomSignal(1, numSamples).signals]
+    return usrp
+
+
+@contextlib.contextmanager
+def localServer(usrp: Mock) -> Iterator[int]:
+    """Serve a `UsrpServer` of `usrp` on a free port of localhost."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = zerorpc.Server(UsrpServer(usrp))
+    server.bind(f"tcp://127.0.0.1:{port}")
+    task = gevent.spawn(server.run)
+    try:
+        yield port
+    finally:
+        server.close()
+        task.kill()
+
+
+def run(report: Report) -> None:
+    with localServer(mockUsrp(NUM_SAMPLES)) as port:
+        for transport in ["zerorpc", "sharedMemory"]:
+            client = UsrpClient.create("127.0.0.1", port)
+            client.sharedMemoryTransport = transport == "sharedMemory"
+            client.validateStreamingConfigs = False
+            txConfig = TxStreamingConfig(sendTimeOffset=0.1,
+                                         samples=randomSignal(1, NUM_SAMPLES))
+            size = f"[1x{NUM_SAMPLES // 1000}k]"
+            report.measure(f"rpc.{transport}.configureTx{size}",
+                           lambda: client.configureTx(txConfig))
+            report.measure(f"rpc.{transport}.collect{size}", client.collect)
+
+        rxConfig = RxStreamingConfig(receiveTimeOffset=0.1, numSamples=NUM_SAMPLES)
+        report.measure("rpc.getMasterClockRate", client.getMasterClockRate)
+        report.measure("rpc.configureRx", lambda: client.configureRx(rxConfig))
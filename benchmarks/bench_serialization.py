@@ -0,0 +1,64 @@
+"""Benchmarks of the (de)serialization of samples and configs and of the clipping
+checks, which run for every signal sent to or received from a USRP."""
+
+import numpy as np
+
+from benchmarks.harness import Report
+from uhd_wrapper.utils.config import (
+    MimoSignal,
+    RfConfig,
+    RxStreamingConfig,
+    rxContainsClippedValue,
+    txContainsClippedValue,
+)
+from uhd_wrapper.utils.serialization import (
+    deserializeComplexArray,
+    serializeComplexArray,
+)
+
+NUM_SAMPLES = [1000, 100000]
+NUM_STREAMS = 4
+
+
+def randomSignal(numStreams: int, numSamples: int) -> MimoSignal:
+    rng = np.random.default_rng(0)
+    return MimoSignal(signals=[
+        (0.5 * (rng.standard_normal(numSamples) + 1j * rng.standard_normal(numSamples)))
+        .astype(np.complex64) for _ in range(numStreams)
+    ])
+
+
+def run(report: Report) -> None:
+    for numSamples in NUM_SAMPLES:
+        size = f"[{numSamples // 1000}k]"
+        samples = randomSignal(1, numSamples).signals[0]
+        serialized = serializeComplexArray(samples)
+        out = np.empty(numSamples, dtype=np.complex64)
+        report.measure(f"serialization.serializeComplexArray{size}",
+                       lambda: serializeComplexArray(samples))
+        report.measure(f"serialization.deserializeComplexArray{size}",
+                       lambda: deserializeComplexArray(serialized))
+        report.measure(f"serialization.deserializeComplexArray.out{size}",
+                       lambda: deserializeComplexArray(serialized, out=out))
+
+        signal = randomSignal(NUM_STREAMS, numSamples)
+        serializedSignal = signal.serialize()
+        size = f"[{NUM_STREAMS}x{numSamples // 1000}k]"
+        report.measure(f"mimoSignal.serialize{size}", signal.serialize)
+        report.measure(f"mimoSignal.deserialize{size}",
+                       lambda: MimoSignal.deserialize(serializedSignal))
+        report.measure(f"clipping.txContainsClippedValue{size}",
+                       lambda: txContainsClippedValue(signal))
+        report.measure(f"clipping.rxContainsClippedValue{size}",
+                       lambda: rxContainsClippedValue(signal))
+
+    rfConfig = RfConfig(txAntennaMapping=[0, 1], rxAntennaMapping=[1, 0])
+    serializedRfConfig = rfConfig.serialize()
+    packedRfConfig = rfConfig.pack()
+    report.measure("rfConfig.serialize", rfConfig.serialize)
+    report.measure("rfConfig.deserialize", lambda: RfConfig.deserialize(serializedRfConfig))
+    report.measure("rfConfig.pack", rfConfig.pack)
+    report.measure("rfConfig.unpack", lambda: RfConfig.unpack(packedRfConfig))
+
+    rxConfig = RxStreamingConfig(receiveTimeOffset=1.0, numSamples=10000)
+    report.measure("rxStreamingConfig.pack", rxConfig.pack)
@@ -0,0 +1,138 @@
+"""This module contains the measurement and the JSON report of the benchmarks.
+
+Each benchmark is a function called repeatedly. Its duration per call is measured in
+`repeat` samples, each consisting of as many calls as needed to take at least
+`minSampleSec` seconds, cf. `timeit.Timer.autorange`.
+"""
+
+import datetime
+import json
+import platform
+import statistics
+import sys
+import timeit
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Callable, Dict, List, Optional
+
+REPORT_FORMAT_VERSION = 1
+
+
+class Report:
+    """Results of a benchmark run and the environment they were measured in."""
+
+    def __init__(self, repeat: int = 5, minSampleSec: float = 0.2,
+                 nameFilter: str = "") -> None:
+        """
+        Args:
+            repeat (int): Number of samples of each benchmark.
+            minSampleSec (float): Minimum duration of each sample in seconds.
+            nameFilter (str): Only benchmarks whose name contains this string are run.
+        """
+        self.repeat = repeat
+        self.minSampleSec = minSampleSec
+        self.nameFilter = nameFilter
+        self.results: Dict[str, Dict[str, float]] = dict()
+
+    def measure(self, name: str, function: Callable[[], Any],
+                **extra: float) -> Optional[Dict[str, float]]:
+        """Measure the duration of a call of `function`.
+
+        Args:
+            name (str): Name of the benchmark, e.g. `serialization.serialize[100k]`.
+            function (Callable[[], Any]): Benchmarked code.
+            **extra (float): Further values stored in the result, e.g. `bytes`.
+
+        Returns:
+            Dict[str, float]: `mean`, `min` and `stdev` of the duration per call in
+            seconds, the number of `calls` per sample and `extra`. None if the benchmark
+            is excluded by the filter.
+        """
+        if self.nameFilter not in name:
+            return None
+        timer = timeit.Timer(function)
+        number = _callsPerSample(timer, self.minSampleSec)
+        durations = [d / number for d in timer.repeat(self.repeat, number)]
+        return self.add(name, durations, number, **extra)
+
+    def add(self, name: str, durations: List[float], callsPerSample: int = 1,
+            **extra: float) -> Dict[str, float]:
+        """Store durations measured elsewhere, e.g. by the C++ benchmarks."""
+        result = {
+            "mean": statistics.mean(durations),
+            "min": min(durations),
+            "stdev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+            "calls": float(callsPerSample),
+        }
+        result.update(extra)
+        self.record(name, result)
+        return result
+
+    def record(self, name: str, result: Dict[str, float]) -> None:
+        self.results[name] = result
+        print(f"{name:60s} {1e6 * result['mean']:12.2f} us "
+              f"(+- {1e6 * result['stdev']:.2f} us)")
+
+    def toJson(self) -> Dict[str, Any]:
+        return {
+            "formatVersion": REPORT_FORMAT_VERSION,
+            "version": _packageVersion(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "results": self.results,
+        }
+
+    def write(self, fileName: str) -> None:
+        with open(fileName, "w") as f:
+            json.dump(self.toJson(), f, indent=2)
+
+
+def addCatchXmlResults(report: Report, xml: str, prefix: str = "cpp.") -> None:
+    """Add the results of the Catch2 benchmarks given as output of the XML reporter,
+    i.e. `benchmarks -r xml`."""
+    root = ElementTree.fromstring(xml)
+    for testCase in root.iter("TestCase"):
+        for benchmark in testCase.iter("BenchmarkResults"):
+            mean = benchmark.find("mean")
+            stdev = benchmark.find("standardDeviation")
+            if mean is None or stdev is None:
+                raise RuntimeError(f"Benchmark {benchmark.get('name')} failed.")
+            # Catch2 reports nanoseconds, the lower bound of the mean is used as minimum
+            report.record(f"{prefix}{testCase.get('name')}.{benchmark.get('name')}", {
+                "mean": 1e-9 * float(mean.attrib["value"]),
+                "min": 1e-9 * float(mean.attrib["lowerBound"]),
+                "stdev": 1e-9 * float(stdev.attrib["value"]),
+                "calls": float(benchmark.attrib["iterations"]),
+            })
+
+
+def compareReports(baseline: Dict[str, Any], current: Dict[str, Any],
+                   threshold: float = 0.1) -> List[str]:
+    """Benchmarks whose mean duration changed by more than `threshold` relative to
+    `baseline`, formatted as lines of text. Both are reports as written by `Report`."""
+    lines = []
+    for name, result in sorted(current["results"].items()):
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["mean"]
+        ratio = result["mean"] / before if before > 0 else float("inf")
+        if abs(ratio - 1.0) > threshold:
+            change = "slower" if ratio > 1.0 else "faster"
+            lines.append(f"{name}: {ratio:.2f}x ({change}, {1e6 * before:.2f} us -> "
+                         f"{1e6 * result['mean']:.2f} us)")
+    return lines
+
+
+def _callsPerSample(timer: timeit.Timer, minSampleSec: float) -> int:
+    number = 1
+    while True:
+        if timer.timeit(number) >= minSampleSec:
+            return number
+        number *= 2 if number < 1000 else 10
+
+
+def _packageVersion() -> str:
+    import usrp_client
+
+    return str(usrp_client.__version__)
@@ -0,0 +1,69 @@
+"""Runs the benchmarks without hardware and writes their results as JSON.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --cpp uhd_wrapper/build/tests/cpp/benchmarks/benchmarks
+    python -m benchmarks.run_benchmarks --compare baseline.json --filter rpc.
+
+Compare reports of different versions by `--compare`, which lists the benchmarks
+whose mean duration changed by more than `--threshold`.
+"""
+
+import argparse
+import json
+import subprocess
+
+from benchmarks import bench_import, bench_rpc, bench_serialization
+from benchmarks.harness import Report, addCatchXmlResults, compareReports
+
+SUITES = {
+    "serialization": bench_serialization.run,
+    "rpc": bench_rpc.run,
+    "import": bench_import.run,
+}
+
+
+def parseArgs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the benchmarks")
+    parser.add_argument("--output", type=str, default="benchmark_results.json",
+                        help="JSON file the results are written to")
+    parser.add_argument("--suites", type=str, nargs="+", choices=list(SUITES),
+                        default=list(SUITES), help="Python benchmark suites to run")
+    parser.add_argument("--filter", type=str, default="",
+                        help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of samples of each benchmark")
+    parser.add_argument("--min-sample-sec", type=float, default=0.2,
+                        help="Minimum duration of each sample")
+    parser.add_argument("--cpp", type=str, default="",
+                        help="Path of the C++ benchmark executable to run as well")
+    parser.add_argument("--compare", type=str, default="",
+                        help="Report of a previous run to compare the results to")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative change of the mean reported by --compare")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parseArgs()
+    report = Report(args.repeat, args.min_sample_sec, args.filter)
+    for suite in args.suites:
+        SUITES[suite](report)
+    if args.cpp != "":
+        command = [args.cpp, "-r", "xml", "--benchmark-samples", str(10 * args.repeat)]
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        addCatchXmlResults(report, result.stdout)
+    report.write(args.output)
+
+    if args.compare != "":
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        changes = compareReports(baseline, report.toJson(), args.threshold)
+        print(f"\n{len(changes)} benchmarks changed compared to {baseline['version']}:")
+        for line in changes:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import unittest
+
+from benchmarks.harness import Report, addCatchXmlResults, compareReports
+
+CATCH_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Catch name="benchmarks">
+  <Group name="benchmarks">
+    <TestCase name="StreamMapper" tags="[benchmark]">
+      <BenchmarkResults name="map streams" samples="10" iterations="700">
+        <mean value="50" lowerBound="45" upperBound="55" ci="0.95"/>
+        <standardDeviation value="4" lowerBound="1" upperBound="8" ci="0.95"/>
+      </BenchmarkResults>
+    </TestCase>
+  </Group>
+</Catch>
+"""
+
+
+class TestReport(unittest.TestCase):
+    def test_measureStoresDurationPerCall(self) -> None:
+        report = Report(repeat=3, minSampleSec=0.001)
+        result = report.measure("noop", lambda: None, bytes=8.0)
+        assert result is not None
+        self.assertGreater(result["calls"], 1)
+        self.assertLessEqual(result["min"], result["mean"])
+        self.assertEqual(result["bytes"], 8.0)
+        self.assertIn("noop", report.toJson()["results"])
+
+    def test_filterSkipsBenchmarks(self) -> None:
+        report = Report(nameFilter="rpc.")
+        self.assertIsNone(report.measure("serialization", lambda: None))
+        self.assertEqual(report.results, {})
+
+    def test_catchResultsAreConvertedToSeconds(self) -> None:
+        report = Report()
+        addCatchXmlResults(report, CATCH_XML)
+        result = report.results["cpp.StreamMapper.map streams"]
+        self.assertAlmostEqual(result["mean"], 50e-9)
+        self.assertAlmostEqual(result["min"], 45e-9)
+        self.assertAlmostEqual(result["stdev"], 4e-9)
+
+    def test_compareListsChangedBenchmarks(self) -> None:
+        baseline = {"results": {"a": {"mean": 1.0}, "b": {"mean": 1.0}}}
+        current = {"results": {"a": {"mean": 1.05}, "b": {"mean": 2.0}, "c": {"mean": 1.0}}}
+        changes = compareReports(baseline, current, threshold=0.1)
+        self.assertEqual(len(changes), 1)
+        self.assertTrue(changes[0].startswith("b: 2.00x (slower"))
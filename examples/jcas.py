@@ -85,24 +85,23 @@ def main() -> None:
         noRxSamples=60e3,
     )
 
-    for _ in range(10):
-        # we send the streaming configs to the USRPs
-        system.configureTx(usrpName="usrp1", txStreamingConfig=txStreamingConfig1)
-        system.configureRx(usrpName="usrp1", rxStreamingConfig=rxStreamingConfig1)
-
-        system.configureRx(usrpName="usrp2", rxStreamingConfig=rxStreamingConfig2)
-
-        # this command resets the internal USRP clocks to t=0
-        # (cf. documentation of createStreamingConfigs) and synchronizes the USRPs.
-        # samples are buffered
-        system.execute()
-        samples = system.collect()
-        # samples are collected from all USRPs.
-
-        printDelays(samples, txSignal)
-        if args.plot:
-            plotP2pSiso(samples)
-            break
+    # we send the streaming configs to the USRPs
+    system.configureTx(usrpName="usrp1", txStreamingConfig=txStreamingConfig1)
+    system.configureRx(usrpName="usrp1", rxStreamingConfig=rxStreamingConfig1)
+
+    system.configureRx(usrpName="usrp2", rxStreamingConfig=rxStreamingConfig2)
+
+    # the configs stay on the USRPs, such that they are transferred only once
+    with system.prepare() as plan:
+        for _ in range(10):
+            # synchronizes the USRPs (cf. documentation of createStreamingConfigs),
+            # executes the configs and collects the samples from all USRPs.
+            samples = plan.run()
+
+            printDelays(samples, txSignal)
+            if args.plot:
+                plotP2pSiso(samples)
+                break
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 # This example runs a single OFDM frame without CP and wtih no channel
 # estimation/equalization. It shows the unequalized constellation at the RX
 # side, along with the channel phase and amplitude. Parameters to adjust: Fs,
-# Fc, delay, N, Non, ip
+# Fc, N, Non, ip
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -41,9 +41,6 @@ ip = "192.168.199.134"  # IP of the USRP to attach to
 Fc = 3.7e9   # Carrier frequenc
 Fs = 2*245.76e6   # Sampling rate
 
-delay = 363        # Delay of RX towards TX in samples. Get e.g. by running
-# python -m usrp_client.sanity --ips 192.168.199.134  --single  --sync --fs 491.52e6 --fc 3.7e9
-
 padding = 1000  # How many zeros to append to the beginning of the frame to let RF ramp up
 
 N = 2048  # Number of subcarriers
@@ -65,11 +62,15 @@ txSig = txSig / max(abs(txSig))
 
 
 system = createSystem(fc=Fc, fs=Fs, txGain=30, rxGain=30, ipUsrp1=ip)
+
+# The delay of RX towards TX is measured once per RF setting and cached on disk.
+# Receptions aligned to the TX start only capture the samples of the frame.
+system.calibrateLatency("usrp1", "usrp1")
 system.configureTx(usrpName="usrp1",
                    txStreamingConfig=TxStreamingConfig(samples=MimoSignal(signals=[txSig]),
                                                        sendTimeOffset=0.0))
 system.configureRx(usrpName="usrp1", rxStreamingConfig=RxStreamingConfig(
-    numSamples=len(txSig), receiveTimeOffset=0.0))
+    numSamples=padding+N, receiveTimeOffset=0.0), alignToTx="usrp1")
 
 system.execute()
 samples = system.collect()
@@ -77,7 +78,7 @@ samples = system.collect()
 
 rxSig = samples["usrp1"][0].signals[0]
 
-rxSym = rxSig[padding+delay:padding+delay+N]
+rxSym = rxSig[padding:padding+N]
 demod = np.fft.fftshift(np.fft.fft(rxSym))
 
 
@@ -52,7 +52,7 @@ else:
             "Natural Language :: English",
             "Topic :: Scientific/Engineering",
         ],
-        packages=find_packages(exclude=["examples"]),
+        packages=find_packages(exclude=["examples", "benchmarks"]),
         python_requires=">=3.9",
         install_requires=[
             "zerorpc~=0.6.3",
@@ -1,8 +1,23 @@
 import argparse
+import logging
 
 from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+import gevent
 import zerorpc
+from uhd_wrapper.rpc_server.job_queue import LeaseManager, LeaseMiddleware
 from uhd_wrapper.rpc_server.reconfigurable_usrp import RestartingUsrp
+from uhd_wrapper.rpc_server.startup import StartupMethods, startInBackground
+from uhd_wrapper.usrp_pybinding import LogLevel, setLogCorrelationId, setLogLevel
+from uhd_wrapper.utils.data_plane import DataPlaneServer
+from uhd_wrapper.utils.log_context import (
+    LOG_FORMAT,
+    LOG_LEVELS,
+    CorrelationIdFilter,
+    LogCorrelationMiddleware,
+    pythonLogLevel,
+)
+from uhd_wrapper.utils.readiness import ServerReadiness
+from uhd_wrapper.utils.tracing import TracingMiddleware
 
 
 def parseArgs() -> argparse.Namespace:
@@ -11,11 +26,24 @@ def parseArgs() -> argparse.Namespace:
                         help="Determine the IP of the USRP to connect to")
     parser.add_argument("--rpc-port", type=int, default=5555,
                         help="Port where the RPC server listens to")
+    parser.add_argument("--data-port", type=int, default=None,
+                        help="Port of the data plane used for sample transfers. "
+                             "Defaults to the RPC port + 1, set 0 to disable it.")
     parser.add_argument("--usrp-type", type=str, default="x410",
                         help="Type of USRP to be expected")
     parser.add_argument("--master-clock-rate", type=float, default=0,
                         help="Master Clock Rate to configure. "
                              "Leave empty or set 0 to leave unchanged.")
+    parser.add_argument("--device-args", type=str, default="",
+                        help="Additional UHD device arguments, e.g. clock_source=external")
+    parser.add_argument("--bind-early", action="store_true",
+                        help="Bind the RPC port before the USRP is created. Until the "
+                             "USRP is ready, only getReadiness is answered.")
+    parser.add_argument("--restart-trials", type=int, default=5,
+                        help="Number of attempts to create the USRP, 5 seconds apart.")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="info",
+                        help="Log level of the server and the USRP. Can be changed at "
+                             "runtime by the RPC setLogLevel.")
 
     return parser.parse_args()
 
@@ -25,14 +53,56 @@ args = parseArgs()
 IP_USRP = args.uhd_ip
 PORT = args.rpc_port
 TYPE = args.usrp_type
+DATA_PORT = PORT + 1 if args.data_port is None else args.data_port
+readiness = ServerReadiness()
+leases = LeaseManager()
+
+logging.basicConfig(level=pythonLogLevel(args.log_level), format=LOG_FORMAT)
+for handler in logging.getLogger().handlers:
+    handler.addFilter(CorrelationIdFilter())
+setLogLevel(LogLevel.__members__[args.log_level])
+logger = logging.getLogger("start_usrp_server")
+
+
+def openDevice(masterClockRate: float, deviceArgs: str) -> RestartingUsrp:
+    return RestartingUsrp.create(IP_USRP,
+                                 desiredDeviceType=TYPE,
+                                 masterClockRate=masterClockRate,
+                                 restartTrials=args.restart_trials,
+                                 deviceArgs=deviceArgs)
+
+
+def createUsrp() -> RestartingUsrp:
+    return openDevice(args.master_clock_rate, args.device_args)
+
+
+def createServer(usrp: RestartingUsrp) -> UsrpServer:
+    dataPlane = None
+    if DATA_PORT != 0:
+        with readiness.phase("startDataPlane"):
+            dataPlane = DataPlaneServer(DATA_PORT)
+            dataPlane.start()
+    with readiness.phase("createServer"):
+        return UsrpServer(usrp, dataPlane, readiness, openDevice, leases)
 
-usrp = RestartingUsrp.create(IP_USRP,
-                             desiredDeviceType=TYPE,
-                             masterClockRate=args.master_clock_rate)
 
 # start server
-rpcServer = zerorpc.Server(UsrpServer(usrp))
-rpcServer.bind(f"tcp://*:{PORT}")
-rpcServer.run()
+zerorpc.Context.get_instance().register_middleware(TracingMiddleware())
+zerorpc.Context.get_instance().register_middleware(LeaseMiddleware(leases))
+zerorpc.Context.get_instance().register_middleware(
+    LogCorrelationMiddleware(setLogCorrelationId))
+if args.bind_early:
+    methods = StartupMethods(readiness)
+    rpcServer = zerorpc.Server(methods)
+    rpcServer.bind(f"tcp://*:{PORT}")
+    gevent.spawn(startInBackground, methods, readiness, createUsrp, createServer)
+else:
+    with readiness.phase("createUsrp"):
+        usrp = createUsrp()
+    rpcServer = zerorpc.Server(createServer(usrp))
+    with readiness.phase("bind"):
+        rpcServer.bind(f"tcp://*:{PORT}")
+    readiness.ready()
 
-print(f"Created USRP server on IP {IP_USRP}, listening on port {PORT}")
+logger.info("Created USRP server on IP %s, listening on port %d", IP_USRP, PORT)
+rpcServer.run()
@@ -1,3 +1,4 @@
+from typing import Any
 
 
 def _get_version() -> str:
@@ -11,4 +12,9 @@ def _get_version() -> str:
         return versionFromPackage("usrp-uhd-server")
 
 
-__version__ = _get_version()
+def __getattr__(name: str) -> Any:
+    # the version is determined on first access, since it spawns a git process
+    if name == "__version__":
+        globals()[name] = _get_version()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
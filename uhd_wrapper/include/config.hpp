@@ -1,9 +1,11 @@
 #pragma once
 #include <complex>
+#include <optional>
 #include <vector>
 
 namespace bi {
 const int SAMPLES_PER_BUFFER = 2000;
+const size_t WORD_SIZE = 8;  // samples are stored in words of 8 samples
 typedef std::complex<float> sample;
 typedef std::vector<sample> samples_vec;
 typedef std::vector<samples_vec> MimoSignal;
@@ -38,11 +40,17 @@ struct TxStreamingConfig {
     TxStreamingConfig() {}
     TxStreamingConfig(const MimoSignal& _samples,
                       const double _sendTimeOffset,
-                      const int _repetitions)
-        : samples(_samples), sendTimeOffset(_sendTimeOffset), numRepetitions(_repetitions) {}
+                      const int _repetitions,
+                      const std::optional<double> _carrierFrequency = std::nullopt,
+                      const std::optional<double> _gain = std::nullopt)
+        : samples(_samples), sendTimeOffset(_sendTimeOffset), numRepetitions(_repetitions),
+          carrierFrequency(_carrierFrequency), gain(_gain) {}
     MimoSignal samples;
     double sendTimeOffset;
     int numRepetitions;
+    // If set, the carrier frequency / gain is changed right before this config starts
+    std::optional<double> carrierFrequency;
+    std::optional<double> gain;
 
     void alignToWordSize();
 };
@@ -53,23 +61,39 @@ struct RxStreamingConfig {
                       const double _receiveTimeOffset,
                       const std::string& _antennaPort = "",
                       const unsigned int _numRepetitions = 1,
-                      const unsigned int _repetitionPeriod = 0)
+                      const unsigned int _repetitionPeriod = 0,
+                      const std::optional<double> _carrierFrequency = std::nullopt,
+                      const std::optional<double> _gain = std::nullopt)
         : numSamples(_noSamples),
           receiveTimeOffset(_receiveTimeOffset),
           numRepetitions(_numRepetitions),
           repetitionPeriod(_repetitionPeriod),
-          antennaPort(_antennaPort) {}
+          antennaPort(_antennaPort),
+          carrierFrequency(_carrierFrequency),
+          gain(_gain) {}
     unsigned int numSamples;
     double receiveTimeOffset;
     unsigned int numRepetitions = 1;
     unsigned int repetitionPeriod = 0;
     std::string antennaPort;
+    // If set, the carrier frequency / gain is changed right before this config starts
+    std::optional<double> carrierFrequency;
+    std::optional<double> gain;
 
     size_t wordAlignedNoSamples() const;
     size_t totalWordAlignedSamples() const;
     size_t totalSamples() const;
 };
 
+struct SignalStatistics {
+    // maximum magnitude of the real and imaginary parts over all streams
+    double peak = 0.0;
+    // root mean square of the stream with the highest power
+    double rms = 0.0;
+};
+
+SignalStatistics calcSignalStatistics(const MimoSignal& signal);
+
 size_t nextMultipleOfWordSize(size_t count);
 void extendToWordSize(MimoSignal& samples);
 void shortenSignal(MimoSignal& samples, size_t length);
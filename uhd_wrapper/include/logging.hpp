@@ -0,0 +1,72 @@
+#pragma once
+
+#include <functional>
+#include <sstream>
+#include <string>
+
+namespace bi {
+
+enum class LogLevel { trace = 0, debug = 1, info = 2, warning = 3, error = 4, off = 5 };
+
+// Messages below the level are dropped before their arguments are evaluated.
+// Defaults to info and can be changed at runtime.
+void setLogLevel(LogLevel level);
+LogLevel getLogLevel();
+bool isLogEnabled(LogLevel level);
+
+// ID of the request processed by the calling thread. It prefixes the messages
+// logged by this thread, an empty ID disables the prefix.
+void setLogCorrelationId(const std::string& id);
+const std::string& getLogCorrelationId();
+
+// Sets the correlation ID of the calling thread and restores the previous one
+// when leaving the scope. Threads started for a request use it to log with the
+// ID of the request, which they capture from the thread that starts them.
+class LogCorrelationScope {
+   public:
+    explicit LogCorrelationScope(const std::string& id) : previous_(getLogCorrelationId()) {
+        setLogCorrelationId(id);
+    }
+    ~LogCorrelationScope() { setLogCorrelationId(previous_); }
+    LogCorrelationScope(const LogCorrelationScope&) = delete;
+    LogCorrelationScope& operator=(const LogCorrelationScope&) = delete;
+
+   private:
+    std::string previous_;
+};
+
+typedef std::function<void(LogLevel, const std::string& component, const std::string& message)>
+    LogSink;
+
+// Replaces the sink the messages are written to. An empty sink restores the
+// default, i.e. the logger of UHD.
+void setLogSink(LogSink sink);
+
+void logMessage(LogLevel level, const std::string& component, const std::string& message);
+
+// Collects a message by operator<< and logs it when the line ends, cf. BI_LOG.
+class LogLine {
+   public:
+    LogLine(LogLevel level, const char* component) : level_(level), component_(component) {}
+    ~LogLine() { logMessage(level_, component_, stream_.str()); }
+
+    template <typename T>
+    LogLine& operator<<(const T& value) {
+        stream_ << value;
+        return *this;
+    }
+
+   private:
+    LogLevel level_;
+    const char* component_;
+    std::ostringstream stream_;
+};
+
+}  // namespace bi
+
+// Usage: BI_LOG(debug) << "fullness " << replay->get_record_fullness(0);
+// Nothing right of BI_LOG is evaluated if the level is disabled.
+#define BI_LOG(level)                                  \
+    if (!bi::isLogEnabled(bi::LogLevel::level)) {      \
+    } else                                             \
+        bi::LogLine(bi::LogLevel::level, "uhd_wrapper")
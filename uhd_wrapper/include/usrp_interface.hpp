@@ -1,4 +1,5 @@
 #pragma once
+#include <map>
 #include <memory>
 
 #include "config.hpp"
@@ -15,17 +16,25 @@ class UsrpInterface {
     virtual void setTimeToZeroNextPps() = 0;
 
     virtual void execute(const double baseTime) = 0;
-    virtual std::vector<MimoSignal> collect() = 0;
+    virtual const std::vector<MimoSignal>& collect() = 0;
+    virtual std::vector<SignalStatistics> collectStatistics() = 0;
     virtual void resetStreamingConfigs() = 0;
+    virtual void armStreamingConfigs() = 0;
 
     virtual uint64_t getCurrentSystemTime() = 0;
     virtual double getCurrentFpgaTime() = 0;
+    virtual double getTimeLastPps() = 0;
     virtual double getMasterClockRate() const = 0;
     virtual std::vector<double> getSupportedSampleRates() const = 0;
     virtual RfConfig getRfConfig() const = 0;
     virtual std::string getDeviceType() const = 0;
     virtual size_t getNumAntennas() const = 0;
+    virtual size_t getMaxTxSamples() const = 0;
+    virtual std::map<std::string, double> getPerformanceCounters() const = 0;
+    virtual std::map<std::string, double> getCapabilities() const = 0;
 };
 
-std::unique_ptr<UsrpInterface> createUsrp(const std::string& ip, double masterClockRate=0.0);
+// deviceArgs are additional UHD device arguments, e.g. "clock_source=external"
+std::unique_ptr<UsrpInterface> createUsrp(const std::string& ip, double masterClockRate=0.0,
+                                          const std::string& deviceArgs="");
 }  // namespace bi
@@ -1,3 +1,5 @@
+#include <cmath>
+#include <complex>
 #include <iostream>
 #include <algorithm>
 #include <iterator>
@@ -31,6 +33,8 @@ bool operator==(const RxStreamingConfig& a, const RxStreamingConfig& b) {
     equal &= a.antennaPort == b.antennaPort;
     equal &= a.numRepetitions == b.numRepetitions;
     equal &= a.repetitionPeriod == b.repetitionPeriod;
+    equal &= a.carrierFrequency == b.carrierFrequency;
+    equal &= a.gain == b.gain;
     return equal;
 }
 
@@ -38,6 +42,8 @@ bool operator==(const TxStreamingConfig& a, const TxStreamingConfig& b) {
     bool equal = true;
     equal &= a.samples == b.samples;
     equal &= a.sendTimeOffset == b.sendTimeOffset;
+    equal &= a.carrierFrequency == b.carrierFrequency;
+    equal &= a.gain == b.gain;
     return equal;
 }
 size_t calcNoPackages(const size_t noSamples, const size_t spb) {
@@ -51,8 +57,22 @@ size_t calcNoSamplesLastBuffer(const size_t noSamples, const size_t spb) {
     return noSamplesLastBuffer;
 }
 
+SignalStatistics calcSignalStatistics(const MimoSignal& signal) {
+    SignalStatistics stats;
+    for (const auto& stream : signal) {
+        if (stream.empty()) continue;
+        double power = 0.0;
+        for (const auto& s : stream) {
+            stats.peak = std::max({stats.peak, std::abs(static_cast<double>(s.real())),
+                                   std::abs(static_cast<double>(s.imag()))});
+            power += std::norm(std::complex<double>(s));
+        }
+        stats.rms = std::max(stats.rms, std::sqrt(power / stream.size()));
+    }
+    return stats;
+}
+
 size_t nextMultipleOfWordSize(size_t count) {
-    const size_t WORD_SIZE = 8;
     size_t rem = count % WORD_SIZE;
 
     if (rem == 0)
@@ -201,7 +221,12 @@ std::ostream& operator<<(std::ostream& os, const RfConfig& conf) {
 
 std::ostream& operator<<(std::ostream& os, const RxStreamingConfig& conf) {
     os << "RxConfig (" << conf.receiveTimeOffset << "@" << conf.antennaPort << ") ";
-    os << conf.numSamples << " " << conf.numRepetitions << " " << conf.repetitionPeriod << std::endl;
+    os << conf.numSamples << " " << conf.numRepetitions << " " << conf.repetitionPeriod;
+    if (conf.carrierFrequency)
+        os << " fc=" << *conf.carrierFrequency;
+    if (conf.gain)
+        os << " gain=" << *conf.gain;
+    os << std::endl;
 
     return os;
 }
@@ -3,15 +3,17 @@
 #include <chrono>
 #include <uhd/utils/graph_utils.hpp>
 
+#include "logging.hpp"
 #include "usrp_exception.hpp"
 
 namespace bi {
 
 void _showRfNoCConnections(uhd::rfnoc::rfnoc_graph::sptr graph) {
-    auto edges = graph->enumerate_active_connections();
-    std::cout << "Connections in graph: " << std::endl;
-    for (auto& edge : edges)
-        std::cout << edge.src_blockid << ":" << edge.src_port << " --> " << edge.dst_blockid << ":" << edge.dst_port << std::endl;
+    if (!isLogEnabled(LogLevel::debug))
+        return;
+    BI_LOG(debug) << "Connections in graph:";
+    for (auto& edge : graph->enumerate_active_connections())
+        BI_LOG(debug) << edge.src_blockid << ":" << edge.src_port << " --> " << edge.dst_blockid << ":" << edge.dst_port;
 }
 
 std::ostream& operator<<(std::ostream& os, const uhd::rfnoc::graph_edge_t& edge) {
@@ -119,8 +121,10 @@ void RfNocFullDuplexGraph::upload(const MimoSignal& txSignal) {
                             std::to_string(lastEventCode));
     }
 
-    for(size_t c = 0; c < numTxStreams_; c++) {
-        std::cout << "Upload Replay Fullness channel " << c << " " << replayCtrl_->get_record_fullness(c) << std::endl;
+    // Reading the registers takes a round trip to the device, hence only when logged
+    if (isLogEnabled(LogLevel::debug)) {
+        for(size_t c = 0; c < numTxStreams_; c++)
+            BI_LOG(debug) << "Upload Replay Fullness channel " << c << " " << replayCtrl_->get_record_fullness(c);
     }
 }
 void RfNocFullDuplexGraph::connectForStreaming(size_t numTxStreams, size_t numRxStreams) {
@@ -185,10 +189,10 @@ void RfNocFullDuplexGraph::transmit(double streamTime, size_t numTxSamples, doub
         throw UsrpException("Error occured at data replaying with event code: "
                         + std::to_string(lastEventCode));
 
-    std::lock_guard<std::recursive_mutex> lock(fpgaAccessMutex_);
-    // TOOD! Factor out into separate function or class
-    for(size_t c = 0; c < numTxStreams_; c++) {
-        std::cout << "Streaming Replay play pos channel " << c << " " << replayCtrl_->get_play_position(c) << std::endl;
+    if (isLogEnabled(LogLevel::debug)) {
+        std::lock_guard<std::recursive_mutex> lock(fpgaAccessMutex_);
+        for(size_t c = 0; c < numTxStreams_; c++)
+            BI_LOG(debug) << "Streaming Replay play pos channel " << c << " " << replayCtrl_->get_play_position(c);
     }
 }
 
@@ -228,9 +232,10 @@ void RfNocFullDuplexGraph::receive(double streamTime, size_t numRxSamples, doubl
             throw UsrpException("Error at recording: " + asyncMd.strerror());
     }
 
-    std::lock_guard<std::recursive_mutex> lock(fpgaAccessMutex_);
-    for(size_t c = 0; c < numRxStreams_; c++) {
-        std::cout << "Streaming Replay Fullness channel " << c << " " << replayCtrl_->get_record_fullness(c) << std::endl;
+    if (isLogEnabled(LogLevel::debug)) {
+        std::lock_guard<std::recursive_mutex> lock(fpgaAccessMutex_);
+        for(size_t c = 0; c < numRxStreams_; c++)
+            BI_LOG(debug) << "Streaming Replay Fullness channel " << c << " " << replayCtrl_->get_record_fullness(c);
     }
 }
 
@@ -260,11 +265,18 @@ uhd::rx_streamer::sptr RfNocFullDuplexGraph::connectForDownload(size_t numRxStre
 
 MimoSignal RfNocFullDuplexGraph::download(size_t numRxSamples) {
     MimoSignal result;
+    download(numRxSamples, result);
+    return result;
+}
+
+void RfNocFullDuplexGraph::download(size_t numRxSamples, MimoSignal& result) {
+    // Resizing keeps the capacity of the existing buffers, such that repeated
+    // downloads of the same size do not allocate memory.
     result.resize(numRxStreams_);
     for(size_t c = 0; c < numRxStreams_; c++)
         result[c].resize(numRxSamples);
     if (numRxSamples == 0)
-        return result;
+        return;
 
     uhd::stream_cmd_t streamCmd(uhd::stream_cmd_t::STREAM_MODE_NUM_SAMPS_AND_DONE);
     streamCmd.num_samps = numRxSamples;
@@ -291,8 +303,6 @@ MimoSignal RfNocFullDuplexGraph::download(size_t numRxSamples) {
     }
     if (!mdRx.end_of_burst)
         throw UsrpException("I did not receive an end_of_burst.");
-
-    return result;
 }
 
 void RfNocFullDuplexGraph::disconnectAll() {
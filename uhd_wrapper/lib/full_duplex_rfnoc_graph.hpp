@@ -28,6 +28,7 @@ public:
     uhd::rfnoc::replay_block_control::sptr getReplayControl();
 
     using RfNocBlocks::getNumAntennas;
+    using RfNocBlocks::getRadioChannelPair;
 
     void setSyncSource(const std::string& type);
 
@@ -40,6 +41,7 @@ public:
 
     uhd::rx_streamer::sptr connectForDownload(size_t numRxStreams);
     MimoSignal download(size_t numRxSamples);
+    void download(size_t numRxSamples, MimoSignal& result);
 
 private:
     void disconnectAll();
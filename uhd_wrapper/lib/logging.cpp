@@ -0,0 +1,79 @@
+#include "logging.hpp"
+
+#include <atomic>
+#include <mutex>
+#include <uhd/utils/log.hpp>
+
+namespace bi {
+
+static std::atomic<LogLevel> logLevel_{LogLevel::info};
+static thread_local std::string correlationId_;
+static std::mutex sinkMutex_;
+static LogSink sink_;
+
+static void logToUhd(LogLevel level, const std::string& component,
+                     const std::string& message) {
+    switch (level) {
+        case LogLevel::trace:
+            UHD_LOG_TRACE(component, message);
+            break;
+        case LogLevel::debug:
+            UHD_LOG_DEBUG(component, message);
+            break;
+        case LogLevel::info:
+            UHD_LOG_INFO(component, message);
+            break;
+        case LogLevel::warning:
+            UHD_LOG_WARNING(component, message);
+            break;
+        case LogLevel::error:
+            UHD_LOG_ERROR(component, message);
+            break;
+        case LogLevel::off:
+            break;
+    }
+}
+
+static uhd::log::severity_level toUhdLevel(LogLevel level) {
+    switch (level) {
+        case LogLevel::trace: return uhd::log::trace;
+        case LogLevel::debug: return uhd::log::debug;
+        case LogLevel::info: return uhd::log::info;
+        case LogLevel::warning: return uhd::log::warning;
+        case LogLevel::error: return uhd::log::error;
+        default: return uhd::log::off;
+    }
+}
+
+void setLogLevel(LogLevel level) {
+    logLevel_ = level;
+    // UHD filters the messages again, including its own ones
+    uhd::log::set_log_level(toUhdLevel(level));
+}
+
+LogLevel getLogLevel() { return logLevel_; }
+
+bool isLogEnabled(LogLevel level) {
+    return level != LogLevel::off && level >= logLevel_.load(std::memory_order_relaxed);
+}
+
+void setLogCorrelationId(const std::string& id) { correlationId_ = id; }
+
+const std::string& getLogCorrelationId() { return correlationId_; }
+
+void setLogSink(LogSink sink) {
+    std::lock_guard<std::mutex> lock(sinkMutex_);
+    sink_ = sink;
+}
+
+void logMessage(LogLevel level, const std::string& component, const std::string& message) {
+    const std::string line =
+        correlationId_.empty() ? message : "[" + correlationId_ + "] " + message;
+    std::lock_guard<std::mutex> lock(sinkMutex_);
+    if (sink_)
+        sink_(level, component, line);
+    else
+        logToUhd(level, component, line);
+}
+
+}  // namespace bi
@@ -1,6 +1,8 @@
 #include <chrono>
 #include <numeric>
 
+#include "config.hpp"
+#include "logging.hpp"
 #include "replay_config.hpp"
 #include "usrp_exception.hpp"
 
@@ -19,6 +21,11 @@ void BlockOffsetTracker::reset() {
     currentReplay_ = -1;
 }
 
+void BlockOffsetTracker::restartReplay() {
+    currentRepetition_ = -1;
+    currentReplay_ = -1;
+}
+
 void BlockOffsetTracker::setStreamCount(size_t streamCount) {
    numStreams_ = streamCount;
 }
@@ -108,13 +115,22 @@ ReplayBlockConfig::ReplayBlockConfig(std::shared_ptr<ReplayBlockInterface> repla
     : replayBlock_(replayCtrl), MEM_SIZE(replayCtrl->get_mem_size()),
       txBlocks_(getTxBufferSize(), SAMPLE_SIZE),
       rxBlocks_(getRxBufferSize(), SAMPLE_SIZE) {
-    std::cout << "Initialized Replay block with " << MEM_SIZE << " bytes memory." << std::endl;
+    BI_LOG(info) << "Initialized Replay block with " << MEM_SIZE << " bytes memory.";
 }
 
 size_t ReplayBlockConfig::getTxBufferSize() const {
     return MEM_SIZE / 4;
 }
 
+size_t ReplayBlockConfig::getMaxTxSamples(size_t numStreams) const {
+    if (numStreams == 0)
+        throw UsrpException("Cannot calculate TX size without knowing number of streams");
+    // The signal is aligned to the word size before being uploaded and the
+    // stored samples of all streams must not fill the TX buffer completely.
+    const size_t maxSamples = (getTxBufferSize() / SAMPLE_SIZE - 1) / numStreams;
+    return maxSamples - maxSamples % WORD_SIZE;
+}
+
 size_t ReplayBlockConfig::getRxBufferSize() const {
     return MEM_SIZE / 4 * 3;
 }
@@ -136,6 +152,11 @@ void ReplayBlockConfig::reset() {
     rxBlocks_.reset();
 }
 
+void ReplayBlockConfig::restartTransmit() {
+    txBlocks_.restartReplay();
+    rxBlocks_.reset();
+}
+
 void ReplayBlockConfig::configUpload(size_t numSamples) {
     txBlocks_.recordNewBlock(numSamples);
     const size_t numBytes = numSamples * SAMPLE_SIZE;
@@ -186,7 +207,7 @@ void ReplayBlockConfig::clearRecordingBuffer() {
         if (!needClear)
             break;
 
-        std::cout << "Trying to clear the buffer" << std::endl;
+        BI_LOG(debug) << "Trying to clear the buffer";
         for(int c = 0; c < numPorts; c++)
             replayBlock_->record_restart(c);
     }
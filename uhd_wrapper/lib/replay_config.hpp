@@ -62,6 +62,8 @@ public:
     BlockOffsetTracker(size_t memSize, size_t sampleSize);
     void setStreamCount(size_t streamCount);
     void reset();
+    // Replay the recorded blocks again from the first one.
+    void restartReplay();
 
     void recordNewBlock(size_t numSamples, size_t numRepetitions=1, size_t repetitionPeriod=0);
     size_t recordOffset(size_t streamIdx) const;
@@ -107,14 +109,18 @@ public:
 
     void setStreamCount(size_t numTx, size_t numRx);
     void reset();
+    // Keep the uploaded TX samples and transmit them again from the first block.
+    void restartTransmit();
     void configUpload(size_t numSamples);
     void configTransmit(size_t numSamples);
     void configReceive(size_t numSamples, size_t numRepetition = 1, size_t repetitionPeriod = 0);
     void configDownload(size_t numSamples);
 
     size_t getTxBufferSize() const;
+    size_t getMaxTxSamples(size_t numStreams) const;
     size_t getRxBufferOffset() const;
     size_t getRxBufferSize() const;
+    size_t getSampleSize() const { return SAMPLE_SIZE; }
 
 private:
     void clearRecordingBuffer();
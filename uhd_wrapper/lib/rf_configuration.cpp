@@ -1,3 +1,5 @@
+#include <chrono>
+
 #include "rf_configuration.hpp"
 #include "usrp_exception.hpp"
 
@@ -13,22 +15,38 @@ RFConfiguration::RFConfiguration(const RfNocBlockConfig& blockNames,
 
 void RFConfiguration::setRfConfig(const RfConfig &conf) {
     assertValidRfConfig(conf);
+    const auto start = std::chrono::steady_clock::now();
 
     numTxStreams_ = conf.noTxStreams;
     numRxStreams_ = conf.noRxStreams;
 
+    size_t numApplied = 0;
     for (int idxRxStream = 0; idxRxStream < numRxStreams_; idxRxStream++)
-        setRfConfigForRxAntenna(conf,
-                                streamMapper_.mapRxStreamToAntenna(idxRxStream));
-    setRxSampleRate(conf.rxSamplingRate);
+        numApplied += setRfConfigForRxAntenna(
+            conf, streamMapper_.mapRxStreamToAntenna(idxRxStream));
+    numApplied += setRxSampleRate(conf.rxSamplingRate);
 
     for (int idxTxStream = 0; idxTxStream < numTxStreams_; idxTxStream++)
-        setRfConfigForTxAntenna(conf,
-                                streamMapper_.mapTxStreamToAntenna(idxTxStream));
-    setTxSampleRate(conf.txSamplingRate);
+        numApplied += setRfConfigForTxAntenna(
+            conf, streamMapper_.mapTxStreamToAntenna(idxTxStream));
+    numApplied += setTxSampleRate(conf.txSamplingRate);
+
+    const size_t numSettings = 4 * (numRxStreams_ + numTxStreams_);
+    counters_.calls++;
+    counters_.settingsApplied += numApplied;
+    counters_.settingsSkipped += numSettings - numApplied;
+
+    // If nothing was pushed to the device, the config read from the graph is the same
+    // as before.
+    if (numApplied == 0 && rfConfig_ == conf)
+        counters_.readbacksSkipped++;
+    else
+        rfConfig_ = readFromGraph();
+    counters_.applyTime += std::chrono::duration<double>(
+        std::chrono::steady_clock::now() - start).count();
 
-    rfConfig_ = readFromGraph();
     if (rfConfig_ != conf) {
+        invalidateCaches();
         std::ostringstream confStream;
         confStream << "Actual Rf Config:" << std::endl
                    << rfConfig_ << std::endl
@@ -39,54 +57,117 @@ void RFConfiguration::setRfConfig(const RfConfig &conf) {
     }
 }
 
-void RFConfiguration::setRfConfigForRxAntenna(const RfConfig &conf,
-                                              const size_t rxAntennaIdx) {
+size_t RFConfiguration::setRfConfigForRxAntenna(const RfConfig &conf,
+                                                const size_t rxAntennaIdx) {
+    const AntennaRfSettings settings{conf.rxCarrierFrequency, conf.rxGain,
+                                     conf.rxAnalogFilterBw};
+    const AntennaRfChanges changes = rxSettingsCache_.diff(rxAntennaIdx, settings);
+    if (changes.count() == 0)
+        return 0;
+
+    // Drop the cached settings in case applying them fails in between
+    rxSettingsCache_.invalidate(rxAntennaIdx);
     auto [radio, channel] = getRadioChannelPair(rxAntennaIdx);
-    radio->set_rx_frequency(conf.rxCarrierFrequency, channel);
-    radio->set_rx_gain(conf.rxGain, channel);
-    radio->set_rx_bandwidth(conf.rxAnalogFilterBw, channel);
+    if (changes.carrierFrequency)
+        radio->set_rx_frequency(conf.rxCarrierFrequency, channel);
+    if (changes.gain)
+        radio->set_rx_gain(conf.rxGain, channel);
+    if (changes.analogFilterBw)
+        radio->set_rx_bandwidth(conf.rxAnalogFilterBw, channel);
+    rxSettingsCache_.update(rxAntennaIdx, settings);
+    return changes.count();
 }
 
-void RFConfiguration::setRxSampleRate(double rate) {
+size_t RFConfiguration::setRxSampleRate(double rate, bool force) {
     if (numRxStreams_ == 0)
         throw UsrpException("Cannot set sample rate without knowning number of antennas");
     assertSamplingRate(rate, masterClockRate_, supportsDecimation());
 
     if (!supportsDecimation())
-        return;
+        return 0;
 
+    size_t numApplied = 0;
     for(int stream = 0; stream < numRxStreams_; stream++) {
-      auto [ddc, channel] = getDDCChannelPair(streamMapper_.mapRxStreamToAntenna(stream));
+      const size_t antenna = streamMapper_.mapRxStreamToAntenna(stream);
+      if (!force && !rxRateCache_.differs(antenna, rate))
+          continue;
+      auto [ddc, channel] = getDDCChannelPair(antenna);
       ddc->set_output_rate(rate, channel);
+      rxRateCache_.update(antenna, rate);
+      numApplied++;
     }
+    return numApplied;
 }
 
 
-void RFConfiguration::setRfConfigForTxAntenna(const RfConfig &conf,
-                                              const size_t txAntennaIdx) {
+size_t RFConfiguration::setRfConfigForTxAntenna(const RfConfig &conf,
+                                                const size_t txAntennaIdx) {
+    const AntennaRfSettings settings{conf.txCarrierFrequency, conf.txGain,
+                                     conf.txAnalogFilterBw};
+    const AntennaRfChanges changes = txSettingsCache_.diff(txAntennaIdx, settings);
+    if (changes.count() == 0)
+        return 0;
+
+    txSettingsCache_.invalidate(txAntennaIdx);
     auto [radio, channel] = getRadioChannelPair(txAntennaIdx);
-    radio->set_tx_frequency(conf.txCarrierFrequency, channel);
-    radio->set_tx_gain(conf.txGain, channel);
-    radio->set_tx_bandwidth(conf.txAnalogFilterBw, channel);
+    if (changes.carrierFrequency)
+        radio->set_tx_frequency(conf.txCarrierFrequency, channel);
+    if (changes.gain)
+        radio->set_tx_gain(conf.txGain, channel);
+    if (changes.analogFilterBw)
+        radio->set_tx_bandwidth(conf.txAnalogFilterBw, channel);
+    txSettingsCache_.update(txAntennaIdx, settings);
+    return changes.count();
 }
 
-void RFConfiguration::setTxSampleRate(double rate) {
+size_t RFConfiguration::setTxSampleRate(double rate, bool force) {
     if (numTxStreams_ == 0)
         throw UsrpException("Cannot set sample rate without knowning number of antennas");
     assertSamplingRate(rate, masterClockRate_, supportsDecimation());
 
     if (!supportsDecimation())
-        return;
+        return 0;
 
+    size_t numApplied = 0;
     for(int stream = 0; stream < numTxStreams_; stream++) {
-      auto [duc, channel] = getDUCChannelPair(streamMapper_.mapTxStreamToAntenna(stream));
+      const size_t antenna = streamMapper_.mapTxStreamToAntenna(stream);
+      if (!force && !txRateCache_.differs(antenna, rate))
+          continue;
+      auto [duc, channel] = getDUCChannelPair(antenna);
       duc->set_input_rate(rate, channel);
+      txRateCache_.update(antenna, rate);
+      numApplied++;
     }
+    return numApplied;
 }
 
 void RFConfiguration::renewSampleRateSettings() {
-    setRxSampleRate(rfConfig_.rxSamplingRate);
-    setTxSampleRate(rfConfig_.txSamplingRate);
+    // Reconnecting the graph might reset the rates, hence they are always applied
+    setRxSampleRate(rfConfig_.rxSamplingRate, true);
+    setTxSampleRate(rfConfig_.txSamplingRate, true);
+}
+
+void RFConfiguration::invalidateCaches() {
+    rxSettingsCache_.clear();
+    txSettingsCache_.clear();
+    rxRateCache_.clear();
+    txRateCache_.clear();
+}
+
+void RFConfiguration::reapplyRfConfig() {
+    invalidateCaches();
+    const RfConfig conf = rfConfig_;
+    setRfConfig(conf);
+}
+
+std::map<std::string, double> RFConfiguration::getPerformanceCounters() const {
+    return {
+        {"rfConfig.calls", static_cast<double>(counters_.calls)},
+        {"rfConfig.settingsApplied", static_cast<double>(counters_.settingsApplied)},
+        {"rfConfig.settingsSkipped", static_cast<double>(counters_.settingsSkipped)},
+        {"rfConfig.readbacksSkipped", static_cast<double>(counters_.readbacksSkipped)},
+        {"rfConfig.applyTime", counters_.applyTime},
+    };
 }
 
 int RFConfiguration::getNumTxStreams() const {
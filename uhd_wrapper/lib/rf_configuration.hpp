@@ -8,7 +8,10 @@
 #include <uhd/rfnoc_graph.hpp>
 #include <uhd/rfnoc/mb_controller.hpp>
 
+#include <map>
+
 #include "config.hpp"
+#include "rf_settings_cache.hpp"
 #include "rfnoc_blocks.hpp"
 #include "stream_mapper.hpp"
 
@@ -25,6 +28,9 @@ public:
     void setRfConfig(const RfConfig& config);
 
     void renewSampleRateSettings();
+    void invalidateCaches();
+    // Applies all settings of the last RF config again, e.g. after timed RF changes.
+    void reapplyRfConfig();
 
     int getNumTxStreams() const;
     int getNumRxStreams() const;
@@ -35,14 +41,15 @@ public:
     std::vector<double> getSupportedSampleRates() const;
     double getTxSignalDuration(size_t numSamples) const;
     double getRxSignalDuration(size_t numSamples) const;
+    std::map<std::string, double> getPerformanceCounters() const;
 
 private:
-    void setRfConfigForRxAntenna(const RfConfig& conf,
-                                 const size_t rxAntennaIdx);
-    void setRfConfigForTxAntenna(const RfConfig& conf,
-                                 const size_t txAntennaIdx);
-    void setRxSampleRate(double rate);
-    void setTxSampleRate(double rate);
+    size_t setRfConfigForRxAntenna(const RfConfig& conf,
+                                   const size_t rxAntennaIdx);
+    size_t setRfConfigForTxAntenna(const RfConfig& conf,
+                                   const size_t txAntennaIdx);
+    size_t setRxSampleRate(double rate, bool force = false);
+    size_t setTxSampleRate(double rate, bool force = false);
 
     double readRxSampleRate() const;
     double readTxSampleRate() const;
@@ -53,6 +60,17 @@ private:
     int numTxStreams_ = 0;
     int numRxStreams_ = 0;
 
+    RfSettingsCache rxSettingsCache_, txSettingsCache_;
+    SampleRateCache rxRateCache_, txRateCache_;
+
+    struct Counters {
+        size_t calls = 0;
+        size_t settingsApplied = 0;
+        size_t settingsSkipped = 0;
+        size_t readbacksSkipped = 0;
+        double applyTime = 0.0;
+    } counters_;
+
     typedef std::tuple<uhd::rfnoc::ddc_block_control::sptr, int> DDCChannelPair;
     DDCChannelPair getDDCChannelPair(int antenna) const;
 
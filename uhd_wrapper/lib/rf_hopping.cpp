@@ -0,0 +1,34 @@
+#include "rf_hopping.hpp"
+
+namespace bi {
+
+void RfHopScheduler::scheduleTx(const std::vector<RadioChannel>& channels,
+                                const double commandTime,
+                                const std::optional<double>& carrierFrequency,
+                                const std::optional<double>& gain) {
+    std::lock_guard<std::mutex> lock(mtx_);
+    for (const auto& [radio, channel] : channels) {
+        radio->set_command_time(commandTime, channel);
+        if (carrierFrequency)
+            radio->set_tx_frequency(*carrierFrequency, channel);
+        if (gain)
+            radio->set_tx_gain(*gain, channel);
+        radio->clear_command_time(channel);
+    }
+}
+
+void RfHopScheduler::scheduleRx(const std::vector<RadioChannel>& channels,
+                                const double commandTime,
+                                const std::optional<double>& carrierFrequency,
+                                const std::optional<double>& gain) {
+    std::lock_guard<std::mutex> lock(mtx_);
+    for (const auto& [radio, channel] : channels) {
+        radio->set_command_time(commandTime, channel);
+        if (carrierFrequency)
+            radio->set_rx_frequency(*carrierFrequency, channel);
+        if (gain)
+            radio->set_rx_gain(*gain, channel);
+        radio->clear_command_time(channel);
+    }
+}
+}
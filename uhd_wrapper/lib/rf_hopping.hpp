@@ -0,0 +1,73 @@
+#pragma once
+#include <memory>
+#include <mutex>
+#include <optional>
+#include <tuple>
+#include <vector>
+
+#include <uhd/rfnoc/radio_control.hpp>
+
+namespace bi {
+class RadioInterface {
+public:
+    virtual ~RadioInterface() {}
+    virtual void set_command_time(const double time, const size_t chan) = 0;
+    virtual void clear_command_time(const size_t chan) = 0;
+
+    virtual void set_tx_frequency(const double freq, const size_t chan) = 0;
+    virtual void set_tx_gain(const double gain, const size_t chan) = 0;
+    virtual void set_rx_frequency(const double freq, const size_t chan) = 0;
+    virtual void set_rx_gain(const double gain, const size_t chan) = 0;
+};
+
+class RadioWrapper : public RadioInterface {
+public:
+    RadioWrapper(uhd::rfnoc::radio_control::sptr radioCtrl)
+        : radioCtrl_(radioCtrl) {}
+
+    void set_command_time(const double time, const size_t chan) {
+        radioCtrl_->set_command_time(uhd::time_spec_t(time), chan);
+    }
+
+    void clear_command_time(const size_t chan) {
+        radioCtrl_->clear_command_time(chan);
+    }
+
+    void set_tx_frequency(const double freq, const size_t chan) {
+        radioCtrl_->set_tx_frequency(freq, chan);
+    }
+
+    void set_tx_gain(const double gain, const size_t chan) {
+        radioCtrl_->set_tx_gain(gain, chan);
+    }
+
+    void set_rx_frequency(const double freq, const size_t chan) {
+        radioCtrl_->set_rx_frequency(freq, chan);
+    }
+
+    void set_rx_gain(const double gain, const size_t chan) {
+        radioCtrl_->set_rx_gain(gain, chan);
+    }
+
+private:
+    uhd::rfnoc::radio_control::sptr radioCtrl_;
+};
+
+// Applies changes of carrier frequency and gain as timed commands, such that they
+// take effect at a given FPGA time.
+class RfHopScheduler {
+public:
+    typedef std::tuple<std::shared_ptr<RadioInterface>, size_t> RadioChannel;
+
+    void scheduleTx(const std::vector<RadioChannel>& channels, const double commandTime,
+                    const std::optional<double>& carrierFrequency,
+                    const std::optional<double>& gain);
+    void scheduleRx(const std::vector<RadioChannel>& channels, const double commandTime,
+                    const std::optional<double>& carrierFrequency,
+                    const std::optional<double>& gain);
+
+private:
+    // TX and RX share the command time of a radio channel
+    std::mutex mtx_;
+};
+}
@@ -0,0 +1,50 @@
+#include "rf_settings_cache.hpp"
+
+namespace bi {
+
+size_t AntennaRfChanges::count() const {
+    return carrierFrequency + gain + analogFilterBw;
+}
+
+AntennaRfChanges RfSettingsCache::diff(size_t antenna,
+                                       const AntennaRfSettings& settings) const {
+    auto it = settings_.find(antenna);
+    if (it == settings_.end())
+        return {true, true, true};
+
+    const AntennaRfSettings& applied = it->second;
+    AntennaRfChanges changes;
+    changes.carrierFrequency = applied.carrierFrequency != settings.carrierFrequency;
+    // Retuning the LO may change the gain and filter settings of the frontend, hence
+    // they are applied again after each retune.
+    changes.gain = changes.carrierFrequency || applied.gain != settings.gain;
+    changes.analogFilterBw = changes.carrierFrequency ||
+                             applied.analogFilterBw != settings.analogFilterBw;
+    return changes;
+}
+
+void RfSettingsCache::update(size_t antenna, const AntennaRfSettings& settings) {
+    settings_[antenna] = settings;
+}
+
+void RfSettingsCache::invalidate(size_t antenna) {
+    settings_.erase(antenna);
+}
+
+void RfSettingsCache::clear() {
+    settings_.clear();
+}
+
+bool SampleRateCache::differs(size_t antenna, double rate) const {
+    auto it = rates_.find(antenna);
+    return it == rates_.end() || it->second != rate;
+}
+
+void SampleRateCache::update(size_t antenna, double rate) {
+    rates_[antenna] = rate;
+}
+
+void SampleRateCache::clear() {
+    rates_.clear();
+}
+}
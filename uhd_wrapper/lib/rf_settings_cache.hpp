@@ -0,0 +1,45 @@
+#pragma once
+
+#include <cstddef>
+#include <map>
+
+namespace bi {
+
+struct AntennaRfSettings {
+    double carrierFrequency = 0.0;
+    double gain = 0.0;
+    double analogFilterBw = 0.0;
+};
+
+struct AntennaRfChanges {
+    bool carrierFrequency = false;
+    bool gain = false;
+    bool analogFilterBw = false;
+
+    size_t count() const;
+};
+
+// Keeps the RF settings which have been applied to each antenna, such that only
+// settings that differ need to be pushed to the device.
+class RfSettingsCache {
+public:
+    AntennaRfChanges diff(size_t antenna, const AntennaRfSettings& settings) const;
+    void update(size_t antenna, const AntennaRfSettings& settings);
+    void invalidate(size_t antenna);
+    void clear();
+
+private:
+    std::map<size_t, AntennaRfSettings> settings_;
+};
+
+// Same as RfSettingsCache, but for the sample rate of the DDC/DUC of each antenna.
+class SampleRateCache {
+public:
+    bool differs(size_t antenna, double rate) const;
+    void update(size_t antenna, double rate);
+    void clear();
+
+private:
+    std::map<size_t, double> rates_;
+};
+}
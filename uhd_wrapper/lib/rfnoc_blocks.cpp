@@ -1,5 +1,6 @@
 #include "rfnoc_blocks.hpp"
 #include <uhd/exception.hpp>
+#include "logging.hpp"
 #include "usrp_exception.hpp"
 
 namespace bi {
@@ -35,7 +36,7 @@ void RfNocBlocks::obtainBlocks() {
         ducControl2_ = graph_->get_block<duc_block_control>(block_id_t(blockNames_.ducIds[1]));
     }
     catch(uhd::lookup_error& err) {
-        std::cout << "No DDC/DUC found. Disabling decimation" << std::endl;
+        BI_LOG(info) << "No DDC/DUC found. Disabling decimation";
     }
 }
 
@@ -49,7 +50,7 @@ bool RfNocBlocks::supportsDecimation() const {
 
 size_t RfNocBlocks::getNumAntennas() const {
     if (graph_->get_mb_controller()->get_mboard_name() == "x440") {
-        UHD_LOG_WARNING("Wrapper", "FPGA Image contains multiple replay blocks. Only 1 antenna possible");
+        BI_LOG(warning) << "FPGA Image contains multiple replay blocks. Only 1 antenna possible";
         return 1;
     }
     return radioCtrl1_->get_num_input_ports() + radioCtrl2_->get_num_input_ports();
@@ -62,7 +63,6 @@ RfNocBlocks::RadioChannelPair RfNocBlocks::getRadioChannelPair(int antenna) {
     else if (antenna < 2 * numAntennasPerRadio)
         return {radioCtrl2_, antenna - numAntennasPerRadio};
     else {
-        std::cout << "Requested Antenna Index not available " << antenna << std::endl;
         throw UsrpException("Requested Antenna Index not available");
     }
 }
@@ -1,4 +1,5 @@
 #include "stream_mapper.hpp"
+#include "logging.hpp"
 #include "usrp_exception.hpp"
 
 const int NUM_ANTENNAS = 4;
@@ -75,14 +76,14 @@ StreamMapper::StreamMapper(const RfNocBlockConfig& blockNames,
     : RfNocBlocks(blockNames, graph) {
 
     defaultRxPort_ = calculateDefaultRxPort();
-    UHD_LOGGER_INFO("uhd_wrapper")  << "Default RX Port: " << defaultRxPort_ << std::endl;
+    BI_LOG(info) << "Default RX Port: " << defaultRxPort_;
 }
 
 void StreamMapper::configureRxAntenna(const RxStreamingConfig &rxConfig) {
     std::string antennaPort = defaultRxPort_;
     if (rxConfig.antennaPort != "")
         antennaPort = rxConfig.antennaPort;
-    UHD_LOGGER_INFO("uhd_wrapper") << "Configuring RX Port " << antennaPort;
+    BI_LOG(debug) << "Configuring RX Port " << antennaPort;
     for(size_t stream = 0; stream < getNumRxStreams(); stream++) {
         auto [radio, channel] = getRadioChannelPair(mapRxStreamToAntenna(stream));
         radio->set_rx_antenna(antennaPort, channel);
@@ -93,9 +94,11 @@ std::string StreamMapper::calculateDefaultRxPort() {
     auto [radio, channel] = getRadioChannelPair(0);
     std::vector<std::string> antennas = radio->get_rx_antennas(channel);
 
-    std::string log = "Avaiable antenna ports: ";
-    for(const auto& a: antennas) log += a + " ";
-    UHD_LOG_DEBUG("uhd_wrapper", log);
+    if (isLogEnabled(LogLevel::debug)) {
+        std::string log = "Avaiable antenna ports: ";
+        for(const auto& a: antennas) log += a + " ";
+        BI_LOG(debug) << log;
+    }
 
     for(const auto& a: antennas) {
         if (a.rfind("RX", 0) == 0)  // startswith
@@ -1,3 +1,4 @@
+#include <algorithm>
 #include <chrono>
 #include <cmath>
 #include <cstring>
@@ -6,6 +7,7 @@
 #include <uhd/rfnoc/mb_controller.hpp>
 
 #include "config.hpp"
+#include "logging.hpp"
 #include "usrp.hpp"
 #include "usrp_exception.hpp"
 
@@ -17,15 +19,24 @@ using uhd::rfnoc::block_id_t;
 using uhd::rfnoc::rfnoc_graph;
 using uhd::rfnoc::noc_block_base;
 
+static double secondsSince(std::chrono::steady_clock::time_point start) {
+    return std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+}
+
 
-Usrp::Usrp(const std::string& ip, double masterClockRate)  {
+Usrp::Usrp(const std::string& ip, double masterClockRate, const std::string& deviceArgs) {
     ip_ = ip;
     std::string clockStr = "";
     if (masterClockRate > 0)
         clockStr = "master_clock_rate=" + std::to_string(masterClockRate) + ",";
-    std::cout << "MCR: " << clockStr << masterClockRate << std::endl;
+    BI_LOG(info) << "MCR: " << clockStr << masterClockRate;
+    std::string extraArgs = deviceArgs.empty() ? "" : deviceArgs + ",";
+
+    auto start = std::chrono::steady_clock::now();
+    graph_ = rfnoc_graph::make(clockStr + extraArgs + "addr="+ip);
+    startupTimings_["startup.makeGraph"] = secondsSince(start);
 
-    graph_ = rfnoc_graph::make(clockStr + "addr="+ip);
+    start = std::chrono::steady_clock::now();
     RfNocBlockConfig blockNames = RfNocBlockConfig::defaultNames();
 
     streamMapper_ = std::make_shared<StreamMapper>(blockNames, graph_);
@@ -33,14 +44,23 @@ Usrp::Usrp(const std::string& ip, double masterClockRate)  {
     rfConfig_ = std::make_shared<RFConfiguration>(blockNames, graph_, *streamMapper_);
 
     createRfNocBlocks();
+    startupTimings_["startup.createBlocks"] = secondsSince(start);
+}
 
+void Usrp::preinitializeRadios() const {
     // Need to perform one cycle of connections such that the radios are preinitialized
-    // in order to be able to set a reasonable RF config and sample rate for the DDC/DUC
-    const int numAnts = fdGraph_->getNumAntennas();
-    streamMapper_->applyDefaultMapping(numAnts);
-    fdGraph_->connectForUpload(numAnts);
-    fdGraph_->connectForStreaming(numAnts, numAnts);
-    fdGraph_->connectForDownload(numAnts);
+    // in order to be able to set a reasonable RF config and sample rate for the DDC/DUC.
+    // It is deferred to the first public call using the radios, which keeps the startup
+    // short. Hence, each of these calls must call it first.
+    std::call_once(radiosPreinitialized_, [this]() {
+        const auto start = std::chrono::steady_clock::now();
+        const int numAnts = fdGraph_->getNumAntennas();
+        streamMapper_->applyDefaultMapping(numAnts);
+        fdGraph_->connectForUpload(numAnts);
+        fdGraph_->connectForStreaming(numAnts, numAnts);
+        fdGraph_->connectForDownload(numAnts);
+        startupTimings_["startup.preinitializeRadios"] = secondsSince(start);
+    });
 }
 
 Usrp::~Usrp() {
@@ -82,16 +102,30 @@ void Usrp::performStreaming(double baseTime) {
     // side, we apply the sample rate again.
     rfConfig_->renewSampleRateSettings();
     int rxDecimFactor = rfConfig_->getRxDecimationRatio();
-    std::cout << "RX dec factor: " << rxDecimFactor << std::endl;
+    BI_LOG(debug) << "RX dec factor: " << rxDecimFactor;
 
     if (baseTime < 0)
         baseTime = getCurrentFpgaTime() + 0.05;
 
-    auto txFunc = [this,baseTime]() {
+    // The RF changes of the configs leave the radio in a state different from the
+    // applied RF config, hence it needs to be applied completely next time.
+    const auto txHopChannels = getTxHopChannels();
+    const auto rxHopChannels = getRxHopChannels();
+    if (hasRfHops())
+        rfConfig_->invalidateCaches();
+
+    // the streaming threads log with the ID of the request that executes
+    const std::string correlationId = getLogCorrelationId();
+
+    auto txFunc = [this,baseTime,txHopChannels,correlationId]() {
+        LogCorrelationScope correlationScope(correlationId);
         transmitThreadException_ = nullptr;
         try {
             for(const auto& config : txStreamingConfigs_) {
                 double streamTime = config.sendTimeOffset + baseTime;
+                if (config.carrierFrequency || config.gain)
+                    hopScheduler_.scheduleTx(txHopChannels, streamTime - HOP_LEAD_TIME_S_,
+                                             config.carrierFrequency, config.gain);
                 size_t numTxSamples = config.samples[0].size();
                 // Configure the replay block for replay of the entire Tx samples
                 replayConfig_->configTransmit(numTxSamples);
@@ -107,11 +141,15 @@ void Usrp::performStreaming(double baseTime) {
         }
     };
 
-    auto rxFunc = [this,baseTime,rxDecimFactor]() {
+    auto rxFunc = [this,baseTime,rxDecimFactor,rxHopChannels,correlationId]() {
+        LogCorrelationScope correlationScope(correlationId);
         receiveThreadException_ = nullptr;
         try {
             for(const auto& config: rxStreamingConfigs_) {
                 double streamTime = config.receiveTimeOffset + baseTime;
+                if (config.carrierFrequency || config.gain)
+                    hopScheduler_.scheduleRx(rxHopChannels, streamTime - HOP_LEAD_TIME_S_,
+                                             config.carrierFrequency, config.gain);
                 replayConfig_->configReceive(config.wordAlignedNoSamples(),
                                              config.numRepetitions,
                                              config.repetitionPeriod);
@@ -140,28 +178,65 @@ void Usrp::performStreaming(double baseTime) {
     receiveThread_ = std::thread(rxFunc);
 }
 
+bool Usrp::hasRfHops() const {
+    const auto changesRf = [](const auto& c) { return c.carrierFrequency || c.gain; };
+    return std::any_of(txStreamingConfigs_.begin(), txStreamingConfigs_.end(), changesRf) ||
+           std::any_of(rxStreamingConfigs_.begin(), rxStreamingConfigs_.end(), changesRf);
+}
+
+std::vector<RfHopScheduler::RadioChannel> Usrp::getTxHopChannels() {
+    std::vector<RfHopScheduler::RadioChannel> result;
+    for (int stream = 0; stream < rfConfig_->getNumTxStreams(); stream++) {
+        auto [radio, channel] = fdGraph_->getRadioChannelPair(
+            streamMapper_->mapTxStreamToAntenna(stream));
+        result.emplace_back(std::make_shared<RadioWrapper>(radio), channel);
+    }
+    return result;
+}
+
+std::vector<RfHopScheduler::RadioChannel> Usrp::getRxHopChannels() {
+    std::vector<RfHopScheduler::RadioChannel> result;
+    for (int stream = 0; stream < rfConfig_->getNumRxStreams(); stream++) {
+        auto [radio, channel] = fdGraph_->getRadioChannelPair(
+            streamMapper_->mapRxStreamToAntenna(stream));
+        result.emplace_back(std::make_shared<RadioWrapper>(radio), channel);
+    }
+    return result;
+}
+
 void Usrp::performDownload() {
-    receivedSamples_.clear();
     fdGraph_->connectForDownload(rfConfig_->getNumRxStreams());
 
+    // Keep the buffers of the previous collect alive and only resize them. This
+    // way, the memory is reused when the same configs are collected repeatedly.
+    size_t numSignals = 0;
+    for(const auto& config: rxStreamingConfigs_)
+        numSignals += config.numRepetitions;
+    receivedSamples_.resize(numSignals);
+
+    size_t signalIdx = 0;
     for(const auto& config: rxStreamingConfigs_) {
         for (size_t r = 0; r < config.numRepetitions; r++) {
+            MimoSignal& signal = receivedSamples_[signalIdx++];
             replayConfig_->configDownload(config.wordAlignedNoSamples());
-            receivedSamples_.push_back(fdGraph_->download(config.wordAlignedNoSamples()));
-            shortenSignal(receivedSamples_.back(), config.numSamples);
+            fdGraph_->download(config.wordAlignedNoSamples(), signal);
+            shortenSignal(signal, config.numSamples);
         }
     }
 }
 
 RfConfig Usrp::getRfConfig() const {
+    preinitializeRadios();
     return rfConfig_->readFromGraph();
 }
 
 double Usrp::getMasterClockRate() const {
+    preinitializeRadios();
     return rfConfig_->getMasterClockRate();
 }
 
 std::vector<double> Usrp::getSupportedSampleRates() const {
+    preinitializeRadios();
     return rfConfig_->getSupportedSampleRates();
 }
 
@@ -205,13 +280,19 @@ void Usrp::processTxStreamingConfig(const TxStreamingConfig &conf,
 }
 
 void Usrp::setRfConfig(const RfConfig &conf) {
+    preinitializeRadios();
+    if (conf.noTxStreams != rfConfig_->getNumTxStreams() ||
+        conf.noRxStreams != rfConfig_->getNumRxStreams())
+        assertNotArmed("change the number of streams");
     streamMapper_->setRfConfig(conf);
     rfConfig_->setRfConfig(conf);
     replayConfig_->setStreamCount(conf.noTxStreams, conf.noRxStreams);
 }
 
 void Usrp::setTxConfig(const TxStreamingConfig &conf) {
-    assertValidTxSignal(conf.samples, MAX_SAMPLES_TX_SIGNAL, rfConfig_->getNumTxStreams());
+    preinitializeRadios();
+    assertNotArmed("add a TX streaming config");
+    assertValidTxSignal(conf.samples, getMaxTxSamples(), rfConfig_->getNumTxStreams());
     TxStreamingConfig* prev = nullptr;
     if (txStreamingConfigs_.size())
         prev = &txStreamingConfigs_.back();
@@ -223,11 +304,13 @@ void Usrp::setTxConfig(const TxStreamingConfig &conf) {
 }
 
 void Usrp::setRxConfig(const RxStreamingConfig &conf) {
+    preinitializeRadios();
+    assertNotArmed("add an RX streaming config");
     const RxStreamingConfig* prev = nullptr;
     if (rxStreamingConfigs_.size() > 0)
         prev = &rxStreamingConfigs_.back();
     assertValidRxStreamingConfig(prev, conf, GUARD_OFFSET_S_, rfConfig_->getRxSamplingRate());
-    std::cout << "new RX config " << conf << std::endl;
+    BI_LOG(debug) << "new RX config " << conf;
     rxStreamingConfigs_.push_back(conf);
 }
 
@@ -274,13 +357,31 @@ double Usrp::getCurrentFpgaTime() {
     return graph_->get_mb_controller()->get_timekeeper(0)->get_time_now().get_real_secs();
 }
 
+double Usrp::getTimeLastPps() {
+    std::scoped_lock lock(fpgaAccessMutex_);
+    waitOnThreadToJoin(setTimeToZeroNextPpsThread_);
+
+    auto keeper = graph_->get_mb_controller()->get_timekeeper(0);
+    return keeper->get_time_last_pps().get_real_secs();
+}
+
 void Usrp::execute(const double baseTime) {
+    preinitializeRadios();
     waitOnThreadToJoin(setTimeToZeroNextPpsThread_);
     waitOnThreadToJoin(transmitThread_);
     waitOnThreadToJoin(receiveThread_);
 
-    replayConfig_->reset();
-    performUpload();
+    if (configsArmed_ && armedConfigsUploaded_) {
+        // The hops of the previous run are still in effect, hence each run starts
+        // from the RF config again.
+        if (hasRfHops())
+            rfConfig_->reapplyRfConfig();
+        replayConfig_->restartTransmit();
+    } else {
+        replayConfig_->reset();
+        performUpload();
+        armedConfigsUploaded_ = configsArmed_;
+    }
     performStreaming(baseTime);
 
     return;
@@ -296,7 +397,8 @@ void Usrp::execute(const double baseTime) {
                                      std::ref(receiveThreadException_));
 }
 
-std::vector<MimoSignal> Usrp::collect() {
+const std::vector<MimoSignal>& Usrp::collect() {
+    preinitializeRadios();
     waitOnThreadToJoin(transmitThread_);
     waitOnThreadToJoin(receiveThread_);
     if (transmitThreadException_)
@@ -305,17 +407,41 @@ std::vector<MimoSignal> Usrp::collect() {
         std::rethrow_exception(receiveThreadException_);
 
     performDownload();
-    resetStreamingConfigs();
+    if (!configsArmed_)
+        resetStreamingConfigs();
 
     return receivedSamples_;
 }
-std::unique_ptr<UsrpInterface> createUsrp(const std::string &ip, double masterClockRate) {
-    return std::make_unique<Usrp>(ip, masterClockRate);
+
+std::vector<SignalStatistics> Usrp::collectStatistics() {
+    // Evaluating the samples here avoids converting them to numpy arrays, which
+    // matters for the repeated probe captures of the gain control.
+    std::vector<SignalStatistics> stats;
+    for (const auto& signal : collect()) stats.push_back(calcSignalStatistics(signal));
+    return stats;
+}
+
+std::unique_ptr<UsrpInterface> createUsrp(const std::string &ip, double masterClockRate,
+                                          const std::string &deviceArgs) {
+    return std::make_unique<Usrp>(ip, masterClockRate, deviceArgs);
 }
 
 void Usrp::resetStreamingConfigs() {
     txStreamingConfigs_.clear();
     rxStreamingConfigs_.clear();
+    configsArmed_ = false;
+    armedConfigsUploaded_ = false;
+}
+
+void Usrp::armStreamingConfigs() {
+    configsArmed_ = true;
+    armedConfigsUploaded_ = false;
+}
+
+void Usrp::assertNotArmed(const std::string& action) const {
+    if (configsArmed_)
+        throw UsrpException("Cannot " + action + " while streaming configs are armed. "
+                            "Reset the streaming configs first.");
 }
 
 void Usrp::waitOnThreadToJoin(std::thread &t) {
@@ -330,4 +456,29 @@ size_t Usrp::getNumAntennas() const {
     return fdGraph_->getNumAntennas();
 }
 
+size_t Usrp::getMaxTxSamples() const {
+    preinitializeRadios();
+    return replayConfig_->getMaxTxSamples(std::max(rfConfig_->getNumTxStreams(), 1));
+}
+
+std::map<std::string, double> Usrp::getPerformanceCounters() const {
+    auto counters = rfConfig_->getPerformanceCounters();
+    counters.insert(startupTimings_.begin(), startupTimings_.end());
+    return counters;
+}
+
+std::map<std::string, double> Usrp::getCapabilities() const {
+    preinitializeRadios();
+    // Clients use these limits to validate streaming configs before sending them.
+    return {
+        {"txBufferSize", static_cast<double>(replayConfig_->getTxBufferSize())},
+        {"rxBufferSize", static_cast<double>(replayConfig_->getRxBufferSize())},
+        {"sampleSize", static_cast<double>(replayConfig_->getSampleSize())},
+        {"wordSize", static_cast<double>(WORD_SIZE)},
+        {"guardOffset", GUARD_OFFSET_S_},
+        {"masterClockRate", getMasterClockRate()},
+        {"numAntennas", static_cast<double>(getNumAntennas())},
+    };
+}
+
 }  // namespace bi
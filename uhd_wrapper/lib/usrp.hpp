@@ -16,13 +16,14 @@
 #include "full_duplex_rfnoc_graph.hpp"
 #include "rf_configuration.hpp"
 #include "replay_config.hpp"
+#include "rf_hopping.hpp"
 #include "stream_mapper.hpp"
 
 namespace bi {
 
 class Usrp : public UsrpInterface {
    public:
-    Usrp(const std::string& ip, double masterClockRate);
+    Usrp(const std::string& ip, double masterClockRate, const std::string& deviceArgs = "");
     ~Usrp();
 
     void setRfConfig(const RfConfig& rfConfig) override;
@@ -33,16 +34,22 @@ class Usrp : public UsrpInterface {
     void setTimeToZeroNextPps() override;
     uint64_t getCurrentSystemTime() override;
     double getCurrentFpgaTime() override;
+    double getTimeLastPps() override;
     void execute(const double baseTime) override;
-    std::vector<MimoSignal> collect() override;
+    const std::vector<MimoSignal>& collect() override;
+    std::vector<SignalStatistics> collectStatistics() override;
 
 
     double getMasterClockRate() const override;
     std::vector<double> getSupportedSampleRates() const override;
     RfConfig getRfConfig() const override;
     void resetStreamingConfigs() override;
+    void armStreamingConfigs() override;
     std::string getDeviceType() const override;
     size_t getNumAntennas() const override;
+    size_t getMaxTxSamples() const override;
+    std::map<std::string, double> getPerformanceCounters() const override;
+    std::map<std::string, double> getCapabilities() const override;
 
    private:
     // RfNoC components
@@ -51,24 +58,38 @@ class Usrp : public UsrpInterface {
     std::shared_ptr<RFConfiguration> rfConfig_;
     std::shared_ptr<ReplayBlockConfig> replayConfig_;
     std::shared_ptr<StreamMapper> streamMapper_;
-
+    RfHopScheduler hopScheduler_;
 
     void createRfNocBlocks();
+    void preinitializeRadios() const;
 
     void performUpload();
     void performStreaming(double baseTime);
     void performDownload();
 
+    // true, if any of the streaming configs changes the carrier frequency or gain
+    bool hasRfHops() const;
+    std::vector<RfHopScheduler::RadioChannel> getTxHopChannels();
+    std::vector<RfHopScheduler::RadioChannel> getRxHopChannels();
+
     // constants
     const double GUARD_OFFSET_S_ = 0.05;
-    const size_t MAX_SAMPLES_TX_SIGNAL = (size_t)200e3;
+    // RF changes of a config take effect this long before the config starts
+    const double HOP_LEAD_TIME_S_ = GUARD_OFFSET_S_ / 2;
     const size_t PACKET_SIZE = 8192;
 
     // variables
     std::string ip_;
+    // durations of the startup phases in seconds, reported as performance counters
+    mutable std::map<std::string, double> startupTimings_;
+    mutable std::once_flag radiosPreinitialized_;
     std::vector<TxStreamingConfig> txStreamingConfigs_;
     std::vector<RxStreamingConfig> rxStreamingConfigs_;
     bool ppsSetToZero_ = false;
+    // armed streaming configs are kept across executions
+    bool configsArmed_ = false;
+    // the TX samples of the armed configs are stored in the replay memory
+    bool armedConfigsUploaded_ = false;
     std::thread transmitThread_;
     std::thread receiveThread_;
     mutable std::recursive_mutex fpgaAccessMutex_;
@@ -90,6 +111,7 @@ class Usrp : public UsrpInterface {
     // remaining functions
     void setTimeToZeroNextPpsThreadFunction();
     void waitOnThreadToJoin(std::thread&);
+    void assertNotArmed(const std::string& action) const;
 };
 
 }  // namespace bi
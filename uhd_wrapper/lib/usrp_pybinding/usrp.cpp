@@ -4,6 +4,7 @@
 #include <pybind11/stl.h>
 #include <pybind11/stl_bind.h>
 
+#include "logging.hpp"
 #include "usrp_exception.hpp"
 #include "usrp_interface.hpp"
 
@@ -76,9 +77,22 @@ struct type_caster<bi::MimoSignal> {
 
 PYBIND11_MODULE(usrp_pybinding, m) {
     // factory function
-    m.def("createUsrp", &bi::createUsrp);
+    m.def("createUsrp", &bi::createUsrp, py::arg("ip"), py::arg("masterClockRate") = 0.0,
+          py::arg("deviceArgs") = "");
     m.def("assertSamplingRate", &bi::assertSamplingRate);
 
+    // logging
+    py::enum_<bi::LogLevel>(m, "LogLevel")
+        .value("trace", bi::LogLevel::trace)
+        .value("debug", bi::LogLevel::debug)
+        .value("info", bi::LogLevel::info)
+        .value("warning", bi::LogLevel::warning)
+        .value("error", bi::LogLevel::error)
+        .value("off", bi::LogLevel::off);
+    m.def("setLogLevel", &bi::setLogLevel);
+    m.def("getLogLevel", &bi::getLogLevel);
+    m.def("setLogCorrelationId", &bi::setLogCorrelationId);
+
     // wrap object
     py::class_<bi::RfConfig>(m, "RfConfig")
         .def(py::init())
@@ -107,33 +121,50 @@ PYBIND11_MODULE(usrp_pybinding, m) {
     py::class_<bi::RxStreamingConfig>(m, "RxStreamingConfig")
         .def(py::init())
         .def(py::init<const unsigned int, const double, const std::string&,
-             const unsigned int, const unsigned int>(),
+             const unsigned int, const unsigned int, const std::optional<double>,
+             const std::optional<double>>(),
              py::arg("numSamples"),
              py::arg("receiveTimeOffset"),
              py::arg("antennaPort") = "",
              py::arg("numRepetitions") = 1,
-             py::arg("repetitionPeriod") = 0)
+             py::arg("repetitionPeriod") = 0,
+             py::arg("carrierFrequency") = py::none(),
+             py::arg("gain") = py::none())
         .def_readwrite("numSamples", &bi::RxStreamingConfig::numSamples)
         .def_readwrite("antennaPort", &bi::RxStreamingConfig::antennaPort)
         .def_readwrite("numRepetitions", &bi::RxStreamingConfig::numRepetitions)
         .def_readwrite("repetitionPeriod", &bi::RxStreamingConfig::repetitionPeriod)
         .def_readwrite("receiveTimeOffset",
                        &bi::RxStreamingConfig::receiveTimeOffset)
+        .def_readwrite("carrierFrequency", &bi::RxStreamingConfig::carrierFrequency)
+        .def_readwrite("gain", &bi::RxStreamingConfig::gain)
         .def(py::self == py::self)
         ;
 
 
     py::class_<bi::TxStreamingConfig>(m, "TxStreamingConfig")
         .def(py::init())
-        .def(py::init<const bi::MimoSignal&, const double, const int>(),
-             py::arg("samples"), py::arg("sendTimeOffset"), py::arg("numRepetitions"))
+        .def(py::init<const bi::MimoSignal&, const double, const int,
+             const std::optional<double>, const std::optional<double>>(),
+             py::arg("samples"), py::arg("sendTimeOffset"), py::arg("numRepetitions"),
+             py::arg("carrierFrequency") = py::none(), py::arg("gain") = py::none())
         .def_readwrite("samples", &bi::TxStreamingConfig::samples)
         .def_readwrite("sendTimeOffset", &bi::TxStreamingConfig::sendTimeOffset)
         .def_readwrite("numRepetitions", &bi::TxStreamingConfig::numRepetitions)
+        .def_readwrite("carrierFrequency", &bi::TxStreamingConfig::carrierFrequency)
+        .def_readwrite("gain", &bi::TxStreamingConfig::gain)
         .def(py::self == py::self);
 
+    py::class_<bi::SignalStatistics>(m, "SignalStatistics")
+        .def(py::init())
+        .def_readwrite("peak", &bi::SignalStatistics::peak)
+        .def_readwrite("rms", &bi::SignalStatistics::rms);
+
     py::class_<bi::UsrpInterface>(m, "Usrp")
-        .def(py::init(&bi::createUsrp))
+        // the device is created without the GIL, such that a server can answer requests
+        // while it is starting
+        .def(py::init(&bi::createUsrp), py::call_guard<py::gil_scoped_release>(),
+             py::arg("ip"), py::arg("masterClockRate") = 0.0, py::arg("deviceArgs") = "")
         .def("setRfConfig", &bi::UsrpInterface::setRfConfig)
         .def("setRxConfig", &bi::UsrpInterface::setRxConfig)
         .def("setTxConfig", &bi::UsrpInterface::setTxConfig)
@@ -141,13 +172,20 @@ PYBIND11_MODULE(usrp_pybinding, m) {
         .def("setTimeToZeroNextPps", &bi::UsrpInterface::setTimeToZeroNextPps)
         .def("getCurrentSystemTime", &bi::UsrpInterface::getCurrentSystemTime)
         .def("getCurrentFpgaTime", &bi::UsrpInterface::getCurrentFpgaTime)
-        .def("execute", &bi::UsrpInterface::execute)
-        .def("collect", &bi::UsrpInterface::collect)
+        .def("getTimeLastPps", &bi::UsrpInterface::getTimeLastPps)
+        // streaming blocks, hence other threads, e.g. the hub of the server, may run
+        .def("execute", &bi::UsrpInterface::execute, py::call_guard<py::gil_scoped_release>())
+        .def("collect", &bi::UsrpInterface::collect, py::call_guard<py::gil_scoped_release>())
+        .def("collectStatistics", &bi::UsrpInterface::collectStatistics)
         .def("resetStreamingConfigs", &bi::UsrpInterface::resetStreamingConfigs)
+        .def("armStreamingConfigs", &bi::UsrpInterface::armStreamingConfigs)
         .def("getMasterClockRate", &bi::UsrpInterface::getMasterClockRate)
         .def("getSupportedSampleRates", &bi::UsrpInterface::getSupportedSampleRates)
         .def("getRfConfig", &bi::UsrpInterface::getRfConfig)
         .def("getNumAntennas", &bi::UsrpInterface::getNumAntennas)
+        .def("getMaxTxSamples", &bi::UsrpInterface::getMaxTxSamples)
+        .def("getPerformanceCounters", &bi::UsrpInterface::getPerformanceCounters)
+        .def("getCapabilities", &bi::UsrpInterface::getCapabilities)
         .def_property_readonly("deviceType", &bi::UsrpInterface::getDeviceType);
 
     py::register_exception<bi::UsrpException>(m, "UsrpException");
@@ -0,0 +1,181 @@
+"""This module contains the automatic gain control (AGC) running on the server.
+
+The AGC performs short probe captures and measures peak and RMS of the received
+samples on the device. The gain is searched within a bracket of gains which are known
+to be too low or too high. Unless the samples are clipped, the next gain is estimated
+from the measured peak, since the peak scales linearly with the gain in dB. Otherwise,
+the bracket is bisected. Hence, the AGC usually converges within two or three probes.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+import math
+
+from uhd_wrapper.usrp_pybinding import (
+    Usrp,
+    TxStreamingConfig,
+    RxStreamingConfig,
+    SignalStatistics,
+)
+from uhd_wrapper.utils.config import AgcConfig, AgcResult, MimoSignal, RfConfig
+
+
+CLIPPING_LEVEL = 1.0
+"""Received samples with a real or imaginary part of at least this value are
+clipped, cf. `rxContainsClippedValue`."""
+
+PROBE_DELAY_S = 0.1
+"""Delay between the FPGA time and the start of a probe capture in seconds."""
+
+
+@dataclass
+class _Probe:
+    gain: float
+    peak: float
+    rms: float
+
+    @property
+    def clipped(self) -> bool:
+        return self.peak >= CLIPPING_LEVEL
+
+
+@dataclass
+class _SearchResult:
+    best: _Probe
+    numIterations: int
+    converged: bool
+
+
+def _gainErrorDb(peak: float, targetPeak: float) -> float:
+    """Gain in dB to add such that `peak` reaches `targetPeak`. Clipped peaks only tell
+    that the gain is too high."""
+    if peak >= CLIPPING_LEVEL:
+        return -math.inf
+    if peak <= 0:
+        return math.inf
+    return 20 * math.log10(targetPeak / peak)
+
+
+def _searchGain(measure: Callable[[float], SignalStatistics], gain: float,
+                minGain: float, maxGain: float, config: AgcConfig,
+                maxIterations: int) -> _SearchResult:
+    """Search the gain for which the peak returned by `measure` reaches the target.
+
+    Args:
+        measure (Callable[[float], SignalStatistics]): Performs a probe with the gain.
+        gain (float): Initial gain.
+        minGain (float): Lowest gain to consider.
+        maxGain (float): Highest gain to consider.
+        config (AgcConfig): Target and tolerance of the search.
+        maxIterations (int): Maximum number of calls of `measure`.
+
+    Returns:
+        _SearchResult: The probe closest to the target without clipping. If all probes
+        clip, the probe with the lowest gain.
+    """
+    def quantize(g: float) -> float:
+        return round(g / config.gainStep) * config.gainStep
+
+    # the gains in [lo, hi] have not been ruled out yet
+    lo, hi = quantize(minGain), quantize(maxGain)
+    gain = min(max(quantize(gain), lo), hi)
+    probes: List[_Probe] = []
+    while len(probes) < maxIterations:
+        stats = measure(gain)
+        probe = _Probe(gain=gain, peak=stats.peak, rms=stats.rms)
+        probes.append(probe)
+
+        errorDb = _gainErrorDb(probe.peak, config.targetPeak)
+        if abs(errorDb) <= config.tolerance:
+            return _SearchResult(probe, len(probes), converged=True)
+        if errorDb > 0:
+            lo = gain + config.gainStep
+        else:
+            hi = gain - config.gainStep
+        if lo > hi:
+            break
+
+        if math.isinf(errorDb):
+            gain = quantize((lo + hi) / 2)
+        else:
+            gain = quantize(gain + errorDb)
+        gain = min(max(gain, lo), hi)
+
+    unclipped = [p for p in probes if not p.clipped]
+    if len(unclipped) > 0:
+        best = min(unclipped,
+                   key=lambda p: abs(_gainErrorDb(p.peak, config.targetPeak)))
+    else:
+        best = min(probes, key=lambda p: p.gain)
+    return _SearchResult(best, len(probes), converged=False)
+
+
+class GainControl:
+    """Runs the automatic gain control on a device."""
+
+    def __init__(self, usrp: Usrp, setRfConfig: Callable[[RfConfig], None]) -> None:
+        """
+        Args:
+            usrp (Usrp): Device the probes are captured with.
+            setRfConfig (Callable[[RfConfig], None]): Applies an RF configuration.
+        """
+        self.__usrp = usrp
+        self.__setRfConfig = setRfConfig
+
+    def run(self, rfConfig: RfConfig, config: AgcConfig,
+            txSignal: Optional[MimoSignal] = None) -> AgcResult:
+        """Search the RX gain (and optionally the TX gain) for `rfConfig`.
+
+        Pending streaming configurations are discarded. After returning, the device is
+        configured with `rfConfig` using the chosen gains.
+
+        Args:
+            rfConfig (RfConfig): RF configuration the gains are searched for. The gains
+                contained serve as initial values.
+            config (AgcConfig): Parameters of the AGC.
+            txSignal (MimoSignal, optional): Probe signal transmitted during each probe
+                capture, e.g. for a loopback or radar setup.
+
+        Returns:
+            AgcResult: Chosen gains.
+        """
+        self.__usrp.resetStreamingConfigs()
+
+        def measureRx(gain: float) -> SignalStatistics:
+            return self.__probe(replace(rfConfig, rxGain=gain), config, txSignal)
+
+        result = _searchGain(measureRx, rfConfig.rxGain, config.minRxGain,
+                             config.maxRxGain, config, config.maxIterations)
+        rfConfig = replace(rfConfig, rxGain=result.best.gain)
+
+        remainingIterations = config.maxIterations - result.numIterations
+        if (not result.converged and config.adjustTxGain and txSignal is not None
+                and remainingIterations > 0):
+            def measureTx(gain: float) -> SignalStatistics:
+                return self.__probe(replace(rfConfig, txGain=gain), config, txSignal)
+
+            txResult = _searchGain(measureTx, rfConfig.txGain, config.minTxGain,
+                                   config.maxTxGain, config, remainingIterations)
+            rfConfig = replace(rfConfig, txGain=txResult.best.gain)
+            result = _SearchResult(txResult.best,
+                                   result.numIterations + txResult.numIterations,
+                                   txResult.converged)
+
+        # the device is still configured with the gains of the last probe
+        self.__setRfConfig(rfConfig)
+        return AgcResult(rxGain=rfConfig.rxGain, txGain=rfConfig.txGain,
+                         peak=result.best.peak, rms=result.best.rms,
+                         numIterations=result.numIterations,
+                         converged=result.converged)
+
+    def __probe(self, rfConfig: RfConfig, config: AgcConfig,
+                txSignal: Optional[MimoSignal]) -> SignalStatistics:
+        self.__setRfConfig(rfConfig)
+        if txSignal is not None:
+            self.__usrp.setTxConfig(TxStreamingConfig(
+                samples=txSignal.signals, sendTimeOffset=0.0, numRepetitions=1))
+        self.__usrp.setRxConfig(RxStreamingConfig(
+            numSamples=config.numSamples, receiveTimeOffset=0.0))
+        self.__usrp.execute(self.__usrp.getCurrentFpgaTime() + PROBE_DELAY_S)
+        stats: List[SignalStatistics] = self.__usrp.collectStatistics()
+        return stats[0]
@@ -0,0 +1,294 @@
+"""This module contains the leases and the job queue that share a USRP between clients.
+
+A client holding the lease has exclusive access to the device. Requests changing its
+state are rejected with a `LeaseError` for all other clients until the lease is
+released or expires. Instead of leasing the device, clients can submit jobs, which are
+executed back to back by the server while the device is not leased. While a job is
+running, the job queue holds the lease itself.
+
+Clients of older versions send no lease token. Their requests are only rejected while
+the device is leased.
+"""
+
+import heapq
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import gevent
+import gevent.event
+
+from uhd_wrapper.utils.leases import LEASE_TOKEN_HEADER
+
+JOB_QUEUE_OWNER = "job queue"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_LEASE_FREE_METHODS = frozenset([
+    "acquireLease", "renewLease", "releaseLease",
+    "submitJob", "collectJob", "cancelJob", "setLogLevel",
+])
+
+
+def requiresLease(method: str) -> bool:
+    """True, if `method` changes the state of the device and is rejected for clients
+    without lease while the device is leased. Queries, i.e. methods starting with
+    `get`, and the methods of the leases and the job queue are always accepted."""
+    return not (method.startswith("get") or method.startswith("_")
+                or method in _LEASE_FREE_METHODS)
+
+
+class LeaseError(RuntimeError):
+    """Raised for requests changing the device while another client holds the lease."""
+
+
+@dataclass
+class Lease:
+    token: str
+    owner: str
+    expiry: float
+    """Time of the expiry as returned by the clock of the `LeaseManager`."""
+
+
+class LeaseManager:
+    """Grants exclusive access to the device to one client at a time."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.__clock = clock
+        self.__lease: Optional[Lease] = None
+
+    def current(self) -> Optional[Lease]:
+        """The lease currently held, None if the device is not leased."""
+        if self.__lease is not None and self.__lease.expiry <= self.__clock():
+            self.__lease = None
+        return self.__lease
+
+    def acquire(self, owner: str, durationSec: float) -> Lease:
+        """Lease the device to `owner` for `durationSec` seconds.
+
+        Raises:
+            LeaseError: The device is leased already.
+        """
+        lease = self.current()
+        if lease is not None:
+            raise LeaseError(f"The USRP is leased by {lease.owner} for another "
+                             f"{lease.expiry - self.__clock():.1f} s.")
+        self.__lease = Lease(uuid.uuid4().hex, owner, self.__clock() + durationSec)
+        return self.__lease
+
+    def renew(self, token: str, durationSec: float) -> Lease:
+        """Extend the lease identified by `token` to `durationSec` seconds from now."""
+        lease = self.__require(token)
+        lease.expiry = self.__clock() + durationSec
+        return lease
+
+    def release(self, token: str) -> None:
+        self.__require(token)
+        self.__lease = None
+
+    def check(self, token: Optional[str]) -> None:
+        """Raise a `LeaseError` if the device is leased by a client other than the one
+        presenting `token`."""
+        lease = self.current()
+        if lease is not None and lease.token != token:
+            raise LeaseError(f"The USRP is leased by {lease.owner} for another "
+                             f"{lease.expiry - self.__clock():.1f} s.")
+
+    def describe(self) -> Dict[str, Any]:
+        """Owner and remaining duration of the current lease, without its token.
+        Empty if the device is not leased."""
+        lease = self.current()
+        if lease is None:
+            return dict()
+        return {"owner": lease.owner, "remainingSec": lease.expiry - self.__clock()}
+
+    def __require(self, token: str) -> Lease:
+        lease = self.current()
+        if lease is None or lease.token != token:
+            raise LeaseError("The lease expired or is held by another client.")
+        return lease
+
+
+class LeaseMiddleware:
+    """zerorpc middleware rejecting requests of clients not holding the lease, cf.
+    `requiresLease`.
+
+    Register it with `zerorpc.Context.get_instance().register_middleware`.
+    """
+
+    def __init__(self, leases: LeaseManager) -> None:
+        self.__leases = leases
+
+    def server_before_exec(self, requestEvent: Any) -> None:
+        if requiresLease(requestEvent.name):
+            self.__leases.check(requestEvent.header.get(LEASE_TOKEN_HEADER))
+
+
+@dataclass
+class _Job:
+    jobId: int
+    spec: Dict[str, Any]
+    state: str = QUEUED
+    result: Any = None
+    error: str = ""
+    finished: gevent.event.Event = field(default_factory=gevent.event.Event)
+    finishedAt: float = 0.0
+
+
+class JobQueue:
+    """Runs submitted jobs one after another, ordered by priority and, for equal
+    priorities, by submission.
+
+    A worker greenlet is started with the first job. It runs the jobs while the device
+    is not leased by a client.
+    """
+
+    jobLeaseSec = 600.0
+    """Duration of the lease held by the queue while running a job."""
+
+    pollIntervalSec = 0.5
+    """Interval of checking whether the lease of a client expired."""
+
+    retentionSec = 3600.0
+    """Finished jobs that are not collected within this duration are forgotten together
+    with their results, e.g. those of clients that disappeared."""
+
+    def __init__(self, leases: LeaseManager, runJob: Callable[[Dict[str, Any]], Any],
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            leases (LeaseManager): Leases of the device.
+            runJob (Callable[[Dict[str, Any]], Any]): Runs a job on the device and
+                returns its result.
+            clock (Callable[[], float]): Time in seconds used for the utilization.
+        """
+        self.__leases = leases
+        self.__runJob = runJob
+        self.__clock = clock
+        self.__start = clock()
+        self.__queue: List[Tuple[int, int, _Job]] = []
+        self.__jobs: Dict[int, _Job] = dict()
+        self.__nextJobId = 1
+        self.__running: Optional[_Job] = None
+        self.__busySec = 0.0
+        self.__numFinished = 0
+        self.__wakeUp = gevent.event.Event()
+        self.__worker: Optional[gevent.Greenlet] = None
+
+    def submit(self, spec: Dict[str, Any], priority: int = 0) -> int:
+        """Queue a job. Jobs of higher `priority` run first. Returns the job ID."""
+        self.__forgetExpiredJobs()
+        job = _Job(self.__nextJobId, spec)
+        self.__nextJobId += 1
+        self.__jobs[job.jobId] = job
+        heapq.heappush(self.__queue, (-priority, job.jobId, job))
+        if self.__worker is None or self.__worker.dead:
+            self.__worker = gevent.spawn(self.__serve)
+        self.wakeUp()
+        return job.jobId
+
+    def wakeUp(self) -> None:
+        """Check for runnable jobs, e.g. after a lease was released."""
+        self.__wakeUp.set()
+
+    def status(self, jobId: int) -> str:
+        return self.__job(jobId).state
+
+    def cancel(self, jobId: int) -> bool:
+        """Cancel a queued job. Returns False if it is running or finished already."""
+        job = self.__job(jobId)
+        if job.state != QUEUED:
+            return False
+        job.state = CANCELLED
+        job.finishedAt = self.__clock()
+        job.finished.set()
+        return True
+
+    def collect(self, jobId: int, timeoutSec: Optional[float] = None) -> Any:
+        """Wait until the job finished and return its result. The job is forgotten
+        afterwards, or `retentionSec` after it finished if it is not collected.
+
+        Raises:
+            TimeoutError: The job did not finish within `timeoutSec` seconds.
+            RuntimeError: The job failed or was cancelled.
+        """
+        job = self.__job(jobId)
+        if not job.finished.wait(timeoutSec):
+            raise TimeoutError(f"Job {jobId} did not finish within {timeoutSec} s.")
+        del self.__jobs[jobId]
+        if job.state == FAILED:
+            raise RuntimeError(f"Job {jobId} failed: {job.error}")
+        if job.state == CANCELLED:
+            raise RuntimeError(f"Job {jobId} was cancelled.")
+        return job.result
+
+    def statistics(self) -> Dict[str, float]:
+        """Queue depth, ID of the running job (0 if none), number of finished jobs and
+        utilization, i.e. the fraction of time the device executed jobs since the queue
+        was created."""
+        elapsed = self.__clock() - self.__start
+        return {
+            "depth": float(sum(1 for _, _, j in self.__queue if j.state == QUEUED)),
+            "runningJob": float(0 if self.__running is None else self.__running.jobId),
+            "finishedJobs": float(self.__numFinished),
+            "busySec": self.__busySec,
+            "utilization": self.__busySec / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def runNext(self) -> bool:
+        """Run the next queued job, unless the device is leased by a client. Returns
+        True if a job was run."""
+        self.__forgetExpiredJobs()
+        while len(self.__queue) > 0 and self.__queue[0][2].state != QUEUED:
+            heapq.heappop(self.__queue)
+        if len(self.__queue) == 0 or self.__leases.current() is not None:
+            return False
+
+        lease = self.__leases.acquire(JOB_QUEUE_OWNER, self.jobLeaseSec)
+        job = heapq.heappop(self.__queue)[2]
+        job.state = RUNNING
+        self.__running = job
+        start = self.__clock()
+        try:
+            try:
+                job.result = self.__runJob(job.spec)
+                job.state = DONE
+            except Exception as e:
+                job.state = FAILED
+                job.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.__busySec += self.__clock() - start
+            self.__numFinished += 1
+            self.__running = None
+            job.finishedAt = self.__clock()
+            job.finished.set()
+            # the lease expires if the job takes longer than `jobLeaseSec`
+            current = self.__leases.current()
+            if current is not None and current.token == lease.token:
+                self.__leases.release(lease.token)
+        return True
+
+    def __forgetExpiredJobs(self) -> None:
+        now = self.__clock()
+        expired = [jobId for jobId, job in self.__jobs.items()
+                   if job.finished.is_set() and now - job.finishedAt > self.retentionSec]
+        for jobId in expired:
+            del self.__jobs[jobId]
+
+    def __serve(self) -> None:
+        while True:
+            if not self.runNext():
+                self.__wakeUp.clear()
+                self.__wakeUp.wait(self.pollIntervalSec)
+            else:
+                gevent.sleep(0)
+
+    def __job(self, jobId: int) -> _Job:
+        if jobId not in self.__jobs:
+            raise ValueError(f"Unknown job {jobId}.")
+        return self.__jobs[jobId]
@@ -1,20 +1,24 @@
+import logging
 import time
 
 import uhd_wrapper.usrp_pybinding as pybinding
 
+logger = logging.getLogger(__name__)
+
 
 class RestartingUsrp(pybinding.Usrp):
     @staticmethod
     def create(ip: str, masterClockRate: float = 0,
-               desiredDeviceType: str = "x410") -> 'RestartingUsrp':
-        RestartTrials = 5
+               desiredDeviceType: str = "x410", restartTrials: int = 5,
+               deviceArgs: str = "") -> 'RestartingUsrp':
         SleepTime = 5
 
-        for _ in range(RestartTrials):
+        for _ in range(restartTrials):
             try:
-                result = RestartingUsrp(ip, masterClockRate)
+                result = RestartingUsrp(ip, masterClockRate, deviceArgs)
             except RuntimeError:
-                print(f"Creating of USRP failed... Retrying after {SleepTime} seconds.")
+                logger.warning("Creating of USRP failed... Retrying after %d seconds.",
+                               SleepTime)
                 time.sleep(SleepTime)
                 continue
 
@@ -1,36 +1,132 @@
-from dataclasses import fields
-from typing import List
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, cast
 import json
+import logging
+import threading
+
+import gevent
+import gevent.event
 
 from uhd_wrapper.utils.serialization import (
     SerializedComplexArray,
+    SerializedSparseComplexArray,
+    deserializeComplexArray,
+)
+from uhd_wrapper.utils.compression import (
+    SerializedCompressedSignal,
+    SignalCompressor,
+    availableCodecs,
+)
+from uhd_wrapper.utils.data_plane import DataPlaneServer
+from uhd_wrapper.utils.readiness import READY, ServerNotReadyError, ServerReadiness
+from uhd_wrapper.utils.shared_memory import (
+    SharedMemoryDescriptor,
+    hostId,
+    readSharedMemory,
+    writeSharedMemory,
 )
 from uhd_wrapper.usrp_pybinding import (
+    LogLevel,
     Usrp,
     TxStreamingConfig,
     RxStreamingConfig,
+    getLogLevel as getNativeLogLevel,
+    setLogLevel as setNativeLogLevel,
 )
 from uhd_wrapper.usrp_pybinding import RfConfig as RfConfigBinding
-from uhd_wrapper.utils.config import RfConfig, MimoSignal
+from uhd_wrapper.utils.config import (
+    AgcConfig,
+    RfConfig,
+    MimoSignal,
+    PackedConfig,
+    RF_CONFIG_SCHEMA,
+    RX_STREAMING_CONFIG_SCHEMA,
+)
+from uhd_wrapper.rpc_server.gain_control import GainControl
+from uhd_wrapper.rpc_server.job_queue import JobQueue, LeaseManager
+from uhd_wrapper.utils.log_context import pythonLogLevel
+
+logger = logging.getLogger(__name__)
 
 
 def RfConfigFromBinding(rfConfigBinding: RfConfigBinding) -> RfConfig:
-    c = RfConfig()
-    for field in fields(RfConfig):
-        setattr(c, field.name, getattr(rfConfigBinding, field.name))
-    return c
+    return RfConfig.unpack(RF_CONFIG_SCHEMA.pack(rfConfigBinding))
 
 
 def RfConfigToBinding(rfConfig: RfConfig) -> RfConfigBinding:
+    return RfConfigBindingFromPacked(RF_CONFIG_SCHEMA.pack(rfConfig))
+
+
+def RfConfigBindingFromPacked(packed: Sequence[Any]) -> RfConfigBinding:
     cBinding = RfConfigBinding()
-    for field in fields(RfConfig):
-        setattr(cBinding, field.name, getattr(rfConfig, field.name))
+    for name, value in RF_CONFIG_SCHEMA.unpack(packed).items():
+        setattr(cBinding, name, value)
     return cBinding
 
 
+def RxStreamingConfigBindingFromPacked(packed: Sequence[Any]) -> RxStreamingConfig:
+    return RxStreamingConfig(**RX_STREAMING_CONFIG_SCHEMA.unpack(packed))
+
+
+@dataclass
+class _ChunkedTxUpload:
+    sendTimeOffset: float
+    numRepetitions: int
+    signal: MimoSignal
+    carrierFrequency: Optional[float] = None
+    gain: Optional[float] = None
+    numReceivedSamples: int = 0
+
+
+@dataclass
+class _RepeatedExecution:
+    result: gevent.event.AsyncResult
+    cancelled: threading.Event
+
+
+JOB_START_DELAY_S = 0.1
+"""Delay between submitting the streaming configs of a job and its base time."""
+
+
+class _ClosedDevice:
+    """Replaces the device while it is reopened, cf. `UsrpServer.reopenDevice`."""
+
+    def __init__(self, reason: str) -> None:
+        self.__reason = reason
+
+    def __getattr__(self, name: str) -> Any:
+        raise ServerNotReadyError(self.__reason)
+
+
 class UsrpServer:
-    def __init__(self, usrp: Usrp) -> None:
-        self.__usrp = usrp
+    def __init__(self, usrp: Usrp, dataPlane: Optional[DataPlaneServer] = None,
+                 readiness: Optional[ServerReadiness] = None,
+                 openDevice: Optional[Callable[[float, str], Usrp]] = None,
+                 leases: Optional[LeaseManager] = None) -> None:
+        """
+        Args:
+            usrp (Usrp): Device the requests are forwarded to.
+            dataPlane (DataPlaneServer, optional): Data plane for sample transfers.
+            readiness (ServerReadiness, optional): Startup of the server. Defaults to a
+                server that is ready.
+            openDevice (Callable[[float, str], Usrp], optional): Creates the device for
+                a master clock rate and additional device arguments. Required by
+                `reopenDevice`.
+            leases (LeaseManager, optional): Leases of the device. They are enforced by
+                registering a `LeaseMiddleware` for them.
+        """
+        self.__dataPlane = dataPlane
+        if readiness is None:
+            readiness = ServerReadiness()
+            readiness.ready()
+        self.__readiness = readiness
+        self.__openDevice = openDevice
+        self.__leases = LeaseManager() if leases is None else leases
+        self.__jobQueue = JobQueue(self.__leases, self.__runJob)
+        self.__compressor = SignalCompressor()
+        self.__chunkedTxUpload: Optional[_ChunkedTxUpload] = None
+        self.__repeatedExecution: Optional[_RepeatedExecution] = None
+        self.__attachDevice(usrp)
 
         # Forward all calls from this object to __usrp. However,
         # do not forward calls which are explicitely implemented
@@ -38,10 +134,74 @@ class UsrpServer:
         # serialization.
         methods = [method for method in dir(usrp)
                    if callable(getattr(usrp, method))]
-        for m in methods:
-            if not hasattr(self, m):
-                print("Setting up automatic call forwarding to", m)
-                setattr(self, m, getattr(self.__usrp, m))
+        forwarded = [m for m in methods if not hasattr(self, m)]
+        for m in forwarded:
+            setattr(self, m, self.__forward(m))
+        logger.debug("Set up automatic call forwarding to %s", ", ".join(forwarded))
+
+    def __forward(self, name: str) -> Callable[..., Any]:
+        # The device is looked up on each call, since it is replaced by reopenDevice.
+        def forwarded(*args: Any) -> Any:
+            return getattr(self.__usrp, name)(*args)
+        forwarded.__name__ = name
+        return forwarded
+
+    def __attachDevice(self, usrp: Usrp) -> None:
+        self.__usrp = usrp
+        self.__gainControl = GainControl(
+            usrp, lambda c: self.__usrp.setRfConfig(RfConfigToBinding(c)))
+
+    def reopenDevice(self, masterClockRate: float = 0.0,
+                     deviceArgs: str = "") -> Dict[str, Any]:
+        """Close the device and open it again, e.g. with another master clock rate.
+
+        The RPC server and the connections of the clients are kept. The RF config and
+        the streaming configs are lost and the device needs to be synchronized again.
+        Requests received while the device is reopened fail with a
+        `ServerNotReadyError`.
+
+        Args:
+            masterClockRate (float): Master clock rate to configure. 0 leaves it at the
+                default of the device.
+            deviceArgs (str): Additional UHD device arguments, e.g.
+                `clock_source=external`.
+
+        Returns:
+            Dict[str, Any]: Readiness after reopening, cf. `getReadiness`. Its phases
+            contain the durations of closing and opening the device.
+        """
+        openDevice = self.__openDevice
+        if openDevice is None:
+            raise RuntimeError("The server was started without support for reopening "
+                               "the device.")
+        self.__readiness.restart()
+        self.__chunkedTxUpload = None
+        self.__discardRepeatedExecution()
+        with self.__readiness.phase("closeDevice"):
+            # the device is destroyed with its last reference
+            self.__attachDevice(cast(Usrp, _ClosedDevice("The device is being reopened.")))
+        try:
+            with self.__readiness.phase("openDevice"):
+                # opened in a native thread, such that other requests are answered
+                usrp = gevent.get_hub().threadpool.apply(
+                    openDevice, (masterClockRate, deviceArgs))
+        except Exception as e:
+            self.__attachDevice(cast(Usrp, _ClosedDevice(
+                f"Reopening the device failed: {e}")))
+            raise
+        self.__attachDevice(usrp)
+        self.__readiness.ready()
+        return self.getReadiness()
+
+    def getReadiness(self) -> Dict[str, Any]:
+        """State of the server startup and the durations of its phases in seconds,
+        cf. `ServerReadiness.report`. The phases measured by the USRP are prefixed
+        with `startup.`."""
+        if self.__readiness.state != READY:
+            return self.__readiness.report()
+        counters = dict(self.__usrp.getPerformanceCounters())
+        return self.__readiness.report({name: value for name, value in counters.items()
+                                        if name.startswith("startup.")})
 
     def getVersion(self) -> str:
         import uhd_wrapper
@@ -49,15 +209,122 @@ class UsrpServer:
 
     def configureTx(
             self, sendTimeOffset: float, samples: List[SerializedComplexArray],
-            numRepetitions: int
+            numRepetitions: int, carrierFrequency: Optional[float] = None,
+            gain: Optional[float] = None
     ) -> None:
-        mimoSignal = MimoSignal.deserialize(samples)
-        self.__usrp.setTxConfig(
+        self.__setTxConfig(sendTimeOffset, MimoSignal.deserialize(samples), numRepetitions,
+                           carrierFrequency, gain)
+
+    def configureTxSparse(
+            self, sendTimeOffset: float, samples: List[SerializedSparseComplexArray],
+            numRepetitions: int, carrierFrequency: Optional[float] = None,
+            gain: Optional[float] = None
+    ) -> None:
+        """Same as `configureTx`, but the samples contain only the non-zero segments."""
+        self.__setTxConfig(sendTimeOffset, MimoSignal.deserializeSparse(samples),
+                           numRepetitions, carrierFrequency, gain)
+
+    def getHostId(self) -> str:
+        """Identifier of the host the server runs on. Clients on the same host
+        exchange samples via shared memory."""
+        return hostId()
+
+    def configureTxFromSharedMemory(
+            self, sendTimeOffset: float, samples: SharedMemoryDescriptor,
+            numRepetitions: int, carrierFrequency: Optional[float] = None,
+            gain: Optional[float] = None
+    ) -> None:
+        """Same as `configureTx`, but the samples are read from shared memory.
+
+        The segment remains owned by the client."""
+        self.__setTxConfig(sendTimeOffset, readSharedMemory(samples), numRepetitions,
+                           carrierFrequency, gain)
+
+    def getDataPlanePort(self) -> int:
+        """Port of the data plane used for sample transfers, 0 if there is none."""
+        return 0 if self.__dataPlane is None else self.__dataPlane.port
+
+    def configureTxFromDataPlane(self, sendTimeOffset: float, handle: str,
+                                 numRepetitions: int,
+                                 carrierFrequency: Optional[float] = None,
+                                 gain: Optional[float] = None) -> None:
+        """Same as `configureTx`, but the samples were uploaded via the data plane."""
+        self.__setTxConfig(sendTimeOffset, self.__requireDataPlane().take(handle),
+                           numRepetitions, carrierFrequency, gain)
+
+    def beginTxChunks(self, sendTimeOffset: float, numStreams: int, numSamples: int,
+                      numRepetitions: int, carrierFrequency: Optional[float] = None,
+                      gain: Optional[float] = None) -> None:
+        """Start the upload of a TX signal that is transferred in several chunks.
+
+        The signal is stored in a buffer that is allocated once for the whole signal.
+        The chunks are appended to it by `appendTxChunk` and the TX config is set by
+        `endTxChunks`.
+
+        Raises:
+            ValueError: The signal does not fit into the replay memory of the USRP.
+        """
+        maxSamples = self.__usrp.getMaxTxSamples()
+        if numSamples > maxSamples:
+            raise ValueError(f"TX signal with {numSamples} samples exceeds the maximum "
+                             f"of {maxSamples} samples.")
+        self.__chunkedTxUpload = _ChunkedTxUpload(
+            sendTimeOffset=sendTimeOffset,
+            numRepetitions=numRepetitions,
+            signal=MimoSignal.empty(numStreams, numSamples),
+            carrierFrequency=carrierFrequency,
+            gain=gain,
+        )
+
+    def appendTxChunk(self, samples: List[SerializedComplexArray]) -> None:
+        """Append the next chunk of each stream to the signal started by `beginTxChunks`.
+
+        Raises:
+            RuntimeError: No chunked upload was started.
+            ValueError: The chunk does not fit to the announced signal.
+        """
+        upload = self.__chunkedTxUpload
+        if upload is None:
+            raise RuntimeError("No chunked TX upload was started.")
+        if len(samples) != len(upload.signal.signals):
+            raise ValueError(f"Chunk contains {len(samples)} streams, but "
+                             f"{len(upload.signal.signals)} streams were announced.")
+
+        start = upload.numReceivedSamples
+        stop = start + len(samples[0][0])
+        if stop > len(upload.signal.signals[0]):
+            raise ValueError("Chunk exceeds the announced number of samples.")
+        for chunk, stream in zip(samples, upload.signal.signals):
+            deserializeComplexArray(chunk, out=stream[start:stop])
+        upload.numReceivedSamples = stop
 
+    def endTxChunks(self) -> None:
+        """Finish the chunked upload and set the TX config of the received signal.
+
+        Raises:
+            RuntimeError: No chunked upload was started or samples are missing.
+        """
+        upload = self.__chunkedTxUpload
+        if upload is None:
+            raise RuntimeError("No chunked TX upload was started.")
+        self.__chunkedTxUpload = None
+        numSamples = len(upload.signal.signals[0])
+        if upload.numReceivedSamples != numSamples:
+            raise RuntimeError(f"Only {upload.numReceivedSamples} of {numSamples} TX "
+                               "samples were received.")
+        self.__setTxConfig(upload.sendTimeOffset, upload.signal, upload.numRepetitions,
+                           upload.carrierFrequency, upload.gain)
+
+    def __setTxConfig(self, sendTimeOffset: float, mimoSignal: MimoSignal,
+                      numRepetitions: int, carrierFrequency: Optional[float],
+                      gain: Optional[float]) -> None:
+        self.__usrp.setTxConfig(
             TxStreamingConfig(
                 samples=mimoSignal.signals,
                 sendTimeOffset=sendTimeOffset,
-                numRepetitions=numRepetitions
+                numRepetitions=numRepetitions,
+                carrierFrequency=carrierFrequency,
+                gain=gain,
             )
         )
 
@@ -69,9 +336,232 @@ class UsrpServer:
             RfConfigToBinding(RfConfig.deserialize(serializedRfConfig))
         )
 
+    def configureRxPacked(self, packedRxConfig: PackedConfig) -> None:
+        """Same as `configureRx`, but the config is packed by
+        `RxStreamingConfig.pack`, which avoids encoding it as JSON."""
+        self.__usrp.setRxConfig(RxStreamingConfigBindingFromPacked(packedRxConfig))
+
+    def configureRfConfigPacked(self, packedRfConfig: PackedConfig) -> None:
+        """Same as `configureRfConfig`, but the config is packed by `RfConfig.pack`."""
+        self.__usrp.setRfConfig(RfConfigBindingFromPacked(packedRfConfig))
+
+    def execute(self, baseTime: float) -> None:
+        """Execute the streaming configs once, discarding the runs of a previous
+        `executeRepeatedly` that have not been collected."""
+        self.__discardRepeatedExecution()
+        self.__usrp.execute(baseTime)
+
+    def resetStreamingConfigs(self) -> None:
+        """Reset the streaming configs and discard the runs of `executeRepeatedly`
+        that have not been collected."""
+        self.__discardRepeatedExecution()
+        self.__usrp.resetStreamingConfigs()
+
+    def executeRepeatedly(self, baseTime: float, numRuns: int, period: float) -> None:
+        """Execute the armed streaming configs `numRuns` times.
+
+        Run `i` starts at `baseTime + i * period`. The first run is started immediately,
+        the following runs are started by the server in a native thread as soon as the
+        previous run is received, independent of when the client collects. Meanwhile,
+        other requests are answered. The next call of a collect function returns the
+        samples of all runs in order.
+
+        Args:
+            baseTime (float): Base time of the first run. Use a negative value to start
+                each run immediately.
+            numRuns (int): Number of runs.
+            period (float): Time between the starts of two runs in seconds.
+        """
+        if numRuns < 1:
+            raise ValueError("At least one run is required.")
+        self.__discardRepeatedExecution()
+        self.__usrp.execute(baseTime)
+        if numRuns > 1:
+            # the device blocks until a run is received, hence the runs are performed
+            # in a native thread that does not block the hub
+            cancelled = threading.Event()
+            self.__repeatedExecution = _RepeatedExecution(
+                gevent.get_hub().threadpool.spawn(
+                    self.__executeRuns, self.__usrp, baseTime, numRuns, period, cancelled),
+                cancelled)
+
+    @staticmethod
+    def __executeRuns(usrp: Usrp, baseTime: float, numRuns: int, period: float,
+                      cancelled: threading.Event) -> List[MimoSignal]:
+        # Each run is received before the next one is executed, since both use the
+        # same replay memory.
+        signals = [MimoSignal(signals=c) for c in usrp.collect()]
+        for run in range(1, numRuns):
+            if cancelled.is_set():
+                break
+            usrp.execute(baseTime + run * period if baseTime >= 0 else baseTime)
+            signals += [MimoSignal(signals=c) for c in usrp.collect()]
+        return signals
+
+    def __discardRepeatedExecution(self) -> None:
+        repeated, self.__repeatedExecution = self.__repeatedExecution, None
+        if repeated is not None:
+            repeated.cancelled.set()
+            # the device must not be used by the runs and the caller at the same time
+            repeated.result.wait()
+
+    def __collectSignals(self) -> List[MimoSignal]:
+        repeated, self.__repeatedExecution = self.__repeatedExecution, None
+        if repeated is not None:
+            return cast(List[MimoSignal], repeated.result.get())
+        return [MimoSignal(signals=c) for c in self.__usrp.collect()]
+
     def collect(self) -> List[List[SerializedComplexArray]]:
-        mimoSignals = [MimoSignal(signals=c) for c in self.__usrp.collect()]
-        return [s.serialize() for s in mimoSignals]
+        return [s.serialize() for s in self.__collectSignals()]
+
+    def getCompressionCodecs(self) -> List[str]:
+        """Codecs available for compressing the collected samples."""
+        return availableCodecs()
+
+    def collectCompressed(self, codecs: List[str],
+                          linkRate: float = 0) -> List[SerializedCompressedSignal]:
+        """Same as `collect`, but the samples are compressed losslessly.
+
+        Args:
+            codecs (List[str]): Codecs supported by the client.
+            linkRate (float): Link rate measured by the client in bytes per second,
+                used for selecting the codec. 0 if unknown.
+        """
+        return self.__compressor.compress(self.__collectSignals(), codecs, linkRate)
+
+    def collectToSharedMemory(self) -> List[SharedMemoryDescriptor]:
+        """Same as `collect`, but the samples are stored in shared memory.
+
+        The ownership of the segments is passed to the client, which needs to unlink
+        them after reading."""
+        return [writeSharedMemory(s) for s in self.__collectSignals()]
+
+    def collectToDataPlane(self) -> List[str]:
+        """Same as `collect`, but the samples are provided for download via the data
+        plane. Returns the handles of the received signals."""
+        dataPlane = self.__requireDataPlane()
+        return dataPlane.storeBatch(self.__collectSignals())
+
+    def __requireDataPlane(self) -> DataPlaneServer:
+        if self.__dataPlane is None:
+            raise RuntimeError("The server was started without data plane.")
+        return self.__dataPlane
+
+    def runAgc(self, serializedRfConfig: str, serializedAgcConfig: str,
+               txSignal: Optional[List[SerializedComplexArray]] = None) -> str:
+        """Search the gains of `serializedRfConfig` by automatic gain control.
+
+        Pending streaming configurations are discarded. Afterwards, the RF config is
+        applied with the chosen gains.
+
+        Args:
+            serializedRfConfig (str): RF configuration containing the initial gains.
+            serializedAgcConfig (str): Serialized `AgcConfig`.
+            txSignal (List[SerializedComplexArray], optional): Probe signal transmitted
+                during each probe capture.
+
+        Returns:
+            str: Serialized `AgcResult`.
+        """
+        probeSignal = None
+        if txSignal is not None:
+            probeSignal = MimoSignal(signals=[deserializeComplexArray(s) for s in txSignal])
+        return self.__gainControl.run(RfConfig.deserialize(serializedRfConfig),
+                                      AgcConfig.from_json(serializedAgcConfig),
+                                      probeSignal).to_json()
 
     def getRfConfig(self) -> str:
         return RfConfigFromBinding(self.__usrp.getRfConfig()).serialize()
+
+    def getRfConfigPacked(self) -> PackedConfig:
+        """Same as `getRfConfig`, but the config is packed by `RfConfig.pack`."""
+        return RF_CONFIG_SCHEMA.pack(self.__usrp.getRfConfig())
+
+    def acquireLease(self, owner: str, durationSec: float) -> Dict[str, Any]:
+        """Lease the device exclusively for `durationSec` seconds.
+
+        Requests changing the device are rejected for all clients not presenting the
+        returned token, cf. `uhd_wrapper.rpc_server.job_queue`.
+
+        Returns:
+            Dict[str, Any]: `token` of the lease, its `owner` and `remainingSec`.
+        """
+        lease = self.__leases.acquire(owner, durationSec)
+        return dict(self.__leases.describe(), token=lease.token)
+
+    def renewLease(self, token: str, durationSec: float) -> Dict[str, Any]:
+        self.__leases.renew(token, durationSec)
+        return dict(self.__leases.describe(), token=token)
+
+    def releaseLease(self, token: str) -> None:
+        self.__leases.release(token)
+        self.__jobQueue.wakeUp()
+
+    def getLease(self) -> Dict[str, Any]:
+        """Owner and remaining duration of the current lease. Empty if the device is
+        not leased."""
+        return self.__leases.describe()
+
+    def submitJob(self, job: Dict[str, Any], priority: int = 0) -> int:
+        """Queue a job, which is run while the device is not leased.
+
+        Args:
+            job (Dict[str, Any]): `rfConfig` packed by `RfConfig.pack` or None to keep
+                the current one, `tx` as list of `[sendTimeOffset, samples,
+                numRepetitions, carrierFrequency, gain]` and `rx` as list of configs
+                packed by `RxStreamingConfig.pack`.
+            priority (int): Jobs of higher priority are run first.
+
+        Returns:
+            int: ID of the job, cf. `collectJob`.
+        """
+        return self.__jobQueue.submit(job, priority)
+
+    def getJobStatus(self, jobId: int) -> str:
+        """One of `queued`, `running`, `done`, `failed` and `cancelled`."""
+        return self.__jobQueue.status(jobId)
+
+    def cancelJob(self, jobId: int) -> bool:
+        return self.__jobQueue.cancel(jobId)
+
+    def collectJob(self, jobId: int,
+                   timeoutSec: Optional[float] = None) -> List[List[SerializedComplexArray]]:
+        """Wait until the job finished and return its samples as `collect` does."""
+        return cast(List[List[SerializedComplexArray]],
+                    self.__jobQueue.collect(jobId, timeoutSec))
+
+    def getQueueStatus(self) -> Dict[str, float]:
+        """Depth and utilization of the job queue, cf. `JobQueue.statistics`."""
+        return self.__jobQueue.statistics()
+
+    def __runJob(self, job: Dict[str, Any]) -> List[List[SerializedComplexArray]]:
+        if job.get("rfConfig") is not None:
+            self.__usrp.setRfConfig(RfConfigBindingFromPacked(job["rfConfig"]))
+        self.__usrp.resetStreamingConfigs()
+        self.__discardRepeatedExecution()
+        for sendTimeOffset, samples, numRepetitions, carrierFrequency, gain in job["tx"]:
+            signal = MimoSignal(signals=[deserializeComplexArray(s) for s in samples])
+            self.__setTxConfig(sendTimeOffset, signal, numRepetitions, carrierFrequency,
+                               gain)
+        for packedRxConfig in job["rx"]:
+            self.__usrp.setRxConfig(RxStreamingConfigBindingFromPacked(packedRxConfig))
+        self.__usrp.execute(self.__usrp.getCurrentFpgaTime() + JOB_START_DELAY_S)
+        return self.collect()
+
+    def setLogLevel(self, level: str) -> None:
+        """Change the log level of the server and the USRP at runtime.
+
+        Args:
+            level (str): One of `trace`, `debug`, `info`, `warning`, `error` and `off`.
+                Register values read only for logging are skipped above `debug`.
+        """
+        logging.getLogger().setLevel(pythonLogLevel(level))
+        setNativeLogLevel(LogLevel.__members__[level])
+
+    def getLogLevel(self) -> str:
+        return str(getNativeLogLevel().name)
+
+    def getCapabilities(self) -> Dict[str, float]:
+        """Limits of the device, e.g. the size of the replay memory, that allow clients
+        to validate streaming configs before sending them."""
+        return dict(self.__usrp.getCapabilities())
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Optional
+import logging
+
+import gevent
+import zerorpc
+
+from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+from uhd_wrapper.usrp_pybinding import Usrp
+from uhd_wrapper.utils.readiness import READY, ServerNotReadyError, ServerReadiness
+
+logger = logging.getLogger(__name__)
+
+
+class StartupMethods(dict):
+    """Method table of a zerorpc server that is bound before the USRP is created.
+
+    Until `serve` is called, only `getReadiness` is answered. All other requests fail
+    with a `ServerNotReadyError` instead of a `NameError`, since clients interpret the
+    latter as a server of an older version.
+
+    Usage::
+
+        methods = StartupMethods(readiness)
+        server = zerorpc.Server(methods)
+        server.bind(...)
+        # create the UsrpServer in the background, then
+        methods.serve(usrpServer)
+        readiness.ready()
+    """
+
+    def __init__(self, readiness: ServerReadiness) -> None:
+        super().__init__(getReadiness=zerorpc.rep(readiness.report))
+        self.__readiness = readiness
+        self.__notReady = zerorpc.rep(self.__raiseNotReady)
+
+    def get(self, name: str, default: Optional[Any] = None) -> Any:
+        # zerorpc looks up the method of each request by `get`
+        functor = super().get(name)
+        if functor is not None:
+            return functor
+        if self.__readiness.state == READY:
+            return default
+        return self.__notReady
+
+    def serve(self, server: UsrpServer) -> None:
+        """Answer all requests by `server` from now on."""
+        self.update({name: zerorpc.rep(getattr(server, name))
+                     for name in dir(server)
+                     if not name.startswith("_") and callable(getattr(server, name))})
+
+    def __raiseNotReady(self, *args: Any) -> None:
+        report = self.__readiness.report()
+        message = f"The server is {report['state']}"
+        if report["error"] != "":
+            message += f": {report['error']}"
+        raise ServerNotReadyError(message)
+
+
+def startInBackground(methods: StartupMethods, readiness: ServerReadiness,
+                      openDevice: Callable[[], Usrp],
+                      createServer: Callable[[Usrp], UsrpServer]) -> None:
+    """Open the device and serve it by `methods` once it is ready.
+
+    Only `openDevice` runs in a native thread, such that requests are answered
+    meanwhile. `createServer` runs on the hub of the calling thread, since the greenlets
+    it spawns, e.g. of the data plane, are only run by that hub. A failure is reported
+    by `readiness`.
+    """
+    try:
+        with readiness.phase("createUsrp"):
+            usrp = gevent.get_hub().threadpool.apply(openDevice)
+        server = createServer(usrp)
+    except Exception as e:
+        readiness.fail(e)
+        logger.error("Starting the USRP server failed: %s", readiness.report()["error"])
+        return
+    methods.serve(server)
+    readiness.ready()
+    logger.info("USRP server is ready after %s", readiness.report()["phases"])
@@ -0,0 +1,65 @@
+#include <catch/catch.hpp>
+
+#include "config.hpp"
+#include "replay_config.hpp"
+#include "stream_mapper.hpp"
+
+class StreamMapperDummy : public bi::StreamMapperBase {
+public:
+    void configureRxAntenna(const bi::RxStreamingConfig&) override {}
+};
+
+TEST_CASE("BlockOffsetTracker", "[benchmark]") {
+    const size_t MEM_SIZE = 1ul << 31;
+    const size_t SAMPLE_SIZE = 4;
+    bi::BlockOffsetTracker tracker(MEM_SIZE, SAMPLE_SIZE);
+    tracker.setStreamCount(4);
+
+    BENCHMARK("record and replay 100 blocks") {
+        tracker.reset();
+        size_t sum = 0;
+        for (size_t b = 0; b < 100; b++) {
+            tracker.recordNewBlock(20000);
+            for (size_t s = 0; s < 4; s++)
+                sum += tracker.recordOffset(s);
+        }
+        tracker.restartReplay();
+        for (size_t b = 0; b < 100; b++) {
+            tracker.replayNextBlock(20000);
+            for (size_t s = 0; s < 4; s++)
+                sum += tracker.replayOffset(s);
+        }
+        return sum;
+    };
+}
+
+TEST_CASE("assertValidTxSignal", "[benchmark]") {
+    const size_t NUM_SAMPLES = 100000;
+    const bi::MimoSignal signal(4, bi::samples_vec(NUM_SAMPLES, bi::sample(0.5f, -0.5f)));
+
+    BENCHMARK("4 x 100k samples") {
+        bi::assertValidTxSignal(signal, 2 * NUM_SAMPLES, 4);
+        return signal.size();
+    };
+}
+
+TEST_CASE("StreamMapper", "[benchmark]") {
+    StreamMapperDummy mapper;
+    bi::RfConfig config;
+    config.noTxStreams = 4;
+    config.noRxStreams = 4;
+    config.txAntennaMapping = {3, 2, 1, 0};
+
+    BENCHMARK("setRfConfig with custom mapping") {
+        mapper.setRfConfig(config);
+        return mapper.getNumTxStreams();
+    };
+
+    mapper.setRfConfig(config);
+    BENCHMARK("map 4 TX and RX streams") {
+        uint sum = 0;
+        for (uint s = 0; s < 4; s++)
+            sum += mapper.mapTxStreamToAntenna(s) + mapper.mapRxStreamToAntenna(s);
+        return sum;
+    };
+}
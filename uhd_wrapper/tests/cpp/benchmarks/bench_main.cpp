@@ -0,0 +1,5 @@
+// Main of the benchmark executable. Run it on a quiet machine, e.g.
+//   ./benchmarks -r xml -o benchmarks.xml
+// benchmarks/run_benchmarks.py runs it and merges the results into its JSON report.
+#define CATCH_CONFIG_MAIN
+#include "catch/catch.hpp"
@@ -342,4 +342,26 @@ TEST_CASE("nextMultipleOfWordSize") {
 
     REQUIRE(nextMultipleOfWordSize(17) == 24);
 }
+
+TEST_CASE("calcSignalStatistics") {
+    SECTION("EmptySignal") {
+        SignalStatistics stats = calcSignalStatistics({});
+        REQUIRE(stats.peak == 0.0);
+        REQUIRE(stats.rms == 0.0);
+    }
+    SECTION("PeakIsLargestComponent") {
+        MimoSignal signal = {{{0.1, -0.5}, {0.2, 0.0}}, {{-0.75, 0.25}}};
+        REQUIRE(calcSignalStatistics(signal).peak == Approx(0.75));
+    }
+    SECTION("RmsOfStrongestStream") {
+        MimoSignal signal = {samples_vec(4, {0.6, 0.8}), {{0.1, 0.0}, {0.0, 0.1}}};
+        REQUIRE(calcSignalStatistics(signal).rms == Approx(1.0));
+    }
+    SECTION("EmptyStreamsAreIgnored") {
+        MimoSignal signal = {{}, {{0.5, 0.0}, {-0.5, 0.0}}};
+        SignalStatistics stats = calcSignalStatistics(signal);
+        REQUIRE(stats.peak == Approx(0.5));
+        REQUIRE(stats.rms == Approx(0.5));
+    }
+}
 }  // namespace bi
@@ -0,0 +1,72 @@
+#include <catch/catch.hpp>
+#include <thread>
+#include <vector>
+
+#include "logging.hpp"
+
+TEST_CASE("Logging") {
+    std::vector<std::string> messages;
+    bi::setLogSink([&messages](bi::LogLevel, const std::string&, const std::string& message) {
+        messages.push_back(message);
+    });
+    bi::setLogLevel(bi::LogLevel::info);
+
+    SECTION("Messages below the level are dropped") {
+        BI_LOG(debug) << "dropped";
+        BI_LOG(info) << "value " << 42;
+        REQUIRE(messages == std::vector<std::string>{"value 42"});
+    }
+
+    SECTION("Arguments of dropped messages are not evaluated") {
+        int numReads = 0;
+        auto readRegister = [&numReads]() { return ++numReads; };
+        BI_LOG(debug) << "fullness " << readRegister();
+        REQUIRE(numReads == 0);
+
+        bi::setLogLevel(bi::LogLevel::debug);
+        BI_LOG(debug) << "fullness " << readRegister();
+        REQUIRE(numReads == 1);
+        REQUIRE(messages == std::vector<std::string>{"fullness 1"});
+    }
+
+    SECTION("Level off drops all messages") {
+        bi::setLogLevel(bi::LogLevel::off);
+        BI_LOG(error) << "dropped";
+        REQUIRE(messages.empty());
+        REQUIRE_FALSE(bi::isLogEnabled(bi::LogLevel::off));
+    }
+
+    SECTION("Correlation ID prefixes the messages of its thread") {
+        bi::setLogCorrelationId("abc");
+        BI_LOG(info) << "request";
+        std::thread([]() { BI_LOG(info) << "other thread"; }).join();
+        bi::setLogCorrelationId("");
+        BI_LOG(info) << "no request";
+        REQUIRE(messages == std::vector<std::string>{"[abc] request", "other thread", "no request"});
+    }
+
+    SECTION("Spawned thread logs with the captured correlation ID") {
+        bi::setLogCorrelationId("abc");
+        const std::string correlationId = bi::getLogCorrelationId();
+        std::thread([correlationId]() {
+            bi::LogCorrelationScope scope(correlationId);
+            BI_LOG(info) << "streaming";
+        }).join();
+        bi::setLogCorrelationId("");
+        REQUIRE(messages == std::vector<std::string>{"[abc] streaming"});
+    }
+
+    SECTION("Scope restores the previous correlation ID") {
+        bi::setLogCorrelationId("abc");
+        {
+            bi::LogCorrelationScope scope("def");
+            BI_LOG(info) << "inner";
+        }
+        BI_LOG(info) << "outer";
+        bi::setLogCorrelationId("");
+        REQUIRE(messages == std::vector<std::string>{"[def] inner", "[abc] outer"});
+    }
+
+    bi::setLogSink(nullptr);
+    bi::setLogLevel(bi::LogLevel::info);
+}
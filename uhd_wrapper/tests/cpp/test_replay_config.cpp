@@ -136,6 +136,22 @@ TEST_CASE("BlockOffsetTracker") {
         tracker.replayNextBlock(25);
         REQUIRE(tracker.replayOffset(1) == 25*4);
     }
+
+    SECTION("Can restart replay") {
+        tracker.setStreamCount(1);
+        tracker.recordNewBlock(10, 2, 20);
+        tracker.recordNewBlock(15);
+        for(int i = 0; i < 3; i++) tracker.replayNextBlock(10);
+        tracker.restartReplay();
+
+        tracker.replayNextBlock(10);
+        REQUIRE(tracker.replayOffset(0) == 0);
+        tracker.replayNextBlock(10);
+        REQUIRE(tracker.replayOffset(0) == 20*4);
+        tracker.replayNextBlock(15);
+        REQUIRE(tracker.replayOffset(0) == 2*20*4);
+        REQUIRE_THROWS_AS(tracker.replayNextBlock(15), bi::UsrpException);
+    }
 }
 
 TEST_CASE("Replay Block Config") {
@@ -160,6 +176,16 @@ TEST_CASE("Replay Block Config") {
         REQUIRE(block.getRxBufferOffset() == RX_OFFSET);
     }
 
+    SECTION("Maximum TX signal length fits into TX buffer") {
+        REQUIRE(block.getMaxTxSamples(1) == 504u);
+        REQUIRE(block.getMaxTxSamples(2) == 248u);
+        REQUIRE_THROWS_AS(block.getMaxTxSamples(0), bi::UsrpException);
+
+        block.setStreamCount(2, 2);
+        ALLOW_CALL(replay, record(_, _, _));
+        block.configUpload(block.getMaxTxSamples(2));
+    }
+
     SECTION("Throws if streams count is not set or too small") {
         // cannot use require_throws_as due to https://github.com/catchorg/Catch2/issues/1292
         try {
@@ -239,6 +265,24 @@ TEST_CASE("Replay Block Config") {
         block.configDownload(16);
     }
 
+    SECTION("Restarting transmission keeps uploaded samples") {
+        block.setStreamCount(1, 1);
+        trompeloeil::sequence seq;
+
+        REQUIRE_CALL(replay, record(0u, 10*4u, 0u)).IN_SEQUENCE(seq);
+        block.configUpload(10);
+        REQUIRE_CALL(replay, config_play(0u, 10*4u, 0u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(replay, record(RX_OFFSET, 11*4u, 0u)).IN_SEQUENCE(seq);
+        block.configTransmit(10);
+        block.configReceive(11);
+
+        block.restartTransmit();
+        REQUIRE_CALL(replay, config_play(0u, 10*4u, 0u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(replay, record(RX_OFFSET, 11*4u, 0u)).IN_SEQUENCE(seq);
+        block.configTransmit(10);
+        block.configReceive(11);
+    }
+
     SECTION("Single stream, repetitions") {
         block.setStreamCount(1, 1);
         trompeloeil::sequence seq;
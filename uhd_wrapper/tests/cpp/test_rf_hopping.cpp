@@ -0,0 +1,53 @@
+#include <catch/catch.hpp>
+#include <trompeloeil/catch/trompeloeil.hpp>
+
+#include "rf_hopping.hpp"
+
+class RadioMock : public trompeloeil::mock_interface<bi::RadioInterface> {
+public:
+    IMPLEMENT_MOCK2(set_command_time);
+    IMPLEMENT_MOCK1(clear_command_time);
+
+    IMPLEMENT_MOCK2(set_tx_frequency);
+    IMPLEMENT_MOCK2(set_tx_gain);
+    IMPLEMENT_MOCK2(set_rx_frequency);
+    IMPLEMENT_MOCK2(set_rx_gain);
+};
+
+TEST_CASE("RfHopScheduler") {
+    using trompeloeil::_;
+
+    auto radio = std::make_shared<RadioMock>();
+    bi::RfHopScheduler scheduler;
+    trompeloeil::sequence seq;
+
+    SECTION("TX frequency and gain are applied at the command time") {
+        REQUIRE_CALL(*radio, set_command_time(2.5, 1u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(*radio, set_tx_frequency(3.6e9, 1u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(*radio, set_tx_gain(20.0, 1u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(*radio, clear_command_time(1u)).IN_SEQUENCE(seq);
+
+        scheduler.scheduleTx({{radio, 1}}, 2.5, 3.6e9, 20.0);
+    }
+
+    SECTION("Only the given RX settings are applied") {
+        FORBID_CALL(*radio, set_rx_frequency(_, _));
+        REQUIRE_CALL(*radio, set_command_time(1.0, 0u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(*radio, set_rx_gain(10.0, 0u)).IN_SEQUENCE(seq);
+        REQUIRE_CALL(*radio, clear_command_time(0u)).IN_SEQUENCE(seq);
+
+        scheduler.scheduleRx({{radio, 0}}, 1.0, std::nullopt, 10.0);
+    }
+
+    SECTION("Commands are issued for each channel") {
+        auto radio2 = std::make_shared<RadioMock>();
+        REQUIRE_CALL(*radio, set_command_time(4.0, 0u));
+        REQUIRE_CALL(*radio, set_rx_frequency(2.4e9, 0u));
+        REQUIRE_CALL(*radio, clear_command_time(0u));
+        REQUIRE_CALL(*radio2, set_command_time(4.0, 1u));
+        REQUIRE_CALL(*radio2, set_rx_frequency(2.4e9, 1u));
+        REQUIRE_CALL(*radio2, clear_command_time(1u));
+
+        scheduler.scheduleRx({{radio, 0}, {radio2, 1}}, 4.0, 2.4e9, std::nullopt);
+    }
+}
@@ -0,0 +1,60 @@
+#include <catch/catch.hpp>
+
+#include "rf_settings_cache.hpp"
+
+TEST_CASE("RfSettingsCache") {
+    bi::RfSettingsCache cache;
+    const bi::AntennaRfSettings settings{3.7e9, 30.0, 400e6};
+
+    SECTION("All settings are applied initially") {
+        REQUIRE(cache.diff(0, settings).count() == 3);
+    }
+
+    SECTION("Nothing is applied if settings did not change") {
+        cache.update(0, settings);
+        REQUIRE(cache.diff(0, settings).count() == 0);
+        REQUIRE(cache.diff(1, settings).count() == 3);
+    }
+
+    SECTION("Only the gain is applied if only the gain changed") {
+        cache.update(0, settings);
+        bi::AntennaRfSettings newSettings = settings;
+        newSettings.gain = 20.0;
+
+        auto changes = cache.diff(0, newSettings);
+        REQUIRE(changes.gain);
+        REQUIRE_FALSE(changes.carrierFrequency);
+        REQUIRE_FALSE(changes.analogFilterBw);
+    }
+
+    SECTION("Changing the frequency applies all settings") {
+        cache.update(0, settings);
+        bi::AntennaRfSettings newSettings = settings;
+        newSettings.carrierFrequency = 2.4e9;
+        REQUIRE(cache.diff(0, newSettings).count() == 3);
+    }
+
+    SECTION("Invalidated antennas are applied again") {
+        cache.update(0, settings);
+        cache.update(1, settings);
+        cache.invalidate(0);
+        REQUIRE(cache.diff(0, settings).count() == 3);
+        REQUIRE(cache.diff(1, settings).count() == 0);
+
+        cache.clear();
+        REQUIRE(cache.diff(1, settings).count() == 3);
+    }
+}
+
+TEST_CASE("SampleRateCache") {
+    bi::SampleRateCache cache;
+    REQUIRE(cache.differs(0, 245.76e6));
+
+    cache.update(0, 245.76e6);
+    REQUIRE_FALSE(cache.differs(0, 245.76e6));
+    REQUIRE(cache.differs(0, 122.88e6));
+    REQUIRE(cache.differs(1, 245.76e6));
+
+    cache.clear();
+    REQUIRE(cache.differs(0, 245.76e6));
+}
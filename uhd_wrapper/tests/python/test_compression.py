@@ -0,0 +1,86 @@
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+import gevent
+import numpy as np
+import numpy.testing as npt
+
+from uhd_wrapper.utils.config import MimoSignal
+from uhd_wrapper.utils.compression import (
+    CodecSelector,
+    SignalCompressor,
+    availableCodecs,
+    compressStream,
+    decompressSignal,
+    decompressStream,
+)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        samples = rng.integers(-50, 50, size=(2, 1000)) / 32767
+        self.signal = MimoSignal(
+            signals=[(s[:500] + 1j * s[500:]).astype(np.complex64)
+                     for s in samples]
+        )
+
+    def test_zlibAndNoneAreAlwaysAvailable(self) -> None:
+        self.assertIn("zlib", availableCodecs())
+        self.assertIn("none", availableCodecs())
+
+    def test_allCodecsAreLossless(self) -> None:
+        for codec in availableCodecs():
+            stream = self.signal.signals[0]
+            compressed = compressStream(stream, codec)
+            npt.assert_array_equal(decompressStream(compressed, codec, len(stream)), stream)
+
+    def test_lowAmplitudeSamplesCompressWell(self) -> None:
+        stream = self.signal.signals[0]
+        self.assertLess(len(compressStream(stream, "zlib")), 0.6 * stream.nbytes)
+
+    def test_wrongNumberOfSamplesThrows(self) -> None:
+        compressed = compressStream(self.signal.signals[0], "zlib")
+        self.assertRaises(ValueError, lambda: decompressStream(compressed, "zlib", 10))
+        self.assertRaises(ValueError, lambda: decompressStream(compressed, "unknown", 500))
+
+    def test_compressorRoundTrip(self) -> None:
+        compressed = SignalCompressor().compress([self.signal, self.signal], ["zlib"])
+        self.assertEqual([c[0] for c in compressed], ["zlib", "zlib"])
+
+        out = MimoSignal.empty(2, 500)
+        self.assertIs(decompressSignal(compressed[1], out=out), out)
+        self.assertEqual(out, self.signal)
+        self.assertEqual(decompressSignal(compressed[0]), self.signal)
+
+    def test_otherGreenletsRunWhileCompressing(self) -> None:
+        def slowCompress(data: bytes) -> bytes:
+            time.sleep(0.05)
+            return data
+
+        events: List[str] = []
+        with patch.dict("uhd_wrapper.utils.compression._CODECS",
+                        {"slow": (slowCompress, bytes)}):
+            gevent.spawn(events.append, "request")
+            SignalCompressor().compress([self.signal], ["slow"])
+        events.append("compressed")
+        self.assertEqual(events, ["request", "compressed"])
+
+
+class TestCodecSelector(unittest.TestCase):
+    def test_unmeasuredCodecsAreTriedFirst(self) -> None:
+        selector = CodecSelector()
+        self.assertEqual(selector.select(["none", "zlib"]), "zlib")
+
+    def test_unknownCodecsAreIgnored(self) -> None:
+        self.assertEqual(CodecSelector().select(["none", "unknown"]), "none")
+
+    def test_selectsCodecWithShortestExpectedTime(self) -> None:
+        selector = CodecSelector()
+        selector.update("zlib", numBytes=1000, numCompressedBytes=500, duration=1e-5)
+        self.assertEqual(selector.select(["none", "zlib"], linkRate=1e6), "zlib")
+
+        # compression takes longer than transferring the uncompressed data
+        self.assertEqual(selector.select(["none", "zlib"], linkRate=1e10), "none")
@@ -1,7 +1,15 @@
 import unittest
+from dataclasses import fields
+
+import msgpack
 
 from uhd_wrapper.utils.config import (
+    CONFIG_SCHEMA_VERSION,
+    RF_CONFIG_SCHEMA,
+    RX_STREAMING_CONFIG_SCHEMA,
     MimoSignal,
+    RfConfig,
+    RxStreamingConfig,
     rxContainsClippedValue,
     txContainsClippedValue,
 )
@@ -40,3 +48,71 @@ class TestMimoSignal(unittest.TestCase):
 
     def test_noTxSignalContainsClippedValue(self) -> None:
         self.assertFalse(txContainsClippedValue(self.mimoSignal))
+
+
+class TestMimoSignalDeserialization(unittest.TestCase):
+    def setUp(self) -> None:
+        self.signal = MimoSignal(
+            signals=[np.arange(5) + 1j * np.arange(5), -np.arange(5) + 0.5j]
+        )
+
+    def test_deserializeIntoPreallocatedBuffer(self) -> None:
+        out = MimoSignal.empty(numStreams=2, numSamples=5)
+        buffers = list(out.signals)
+
+        result = MimoSignal.deserialize(self.signal.serialize(), out=out)
+
+        self.assertIs(result, out)
+        for b, r, expected in zip(buffers, result.signals, self.signal.signals):
+            self.assertIs(r, b)
+            self.assertEqual(r.dtype, np.complex64)
+            np.testing.assert_array_almost_equal(r, expected)
+
+    def test_throwsIfStreamCountMismatches(self) -> None:
+        out = MimoSignal.empty(numStreams=1, numSamples=5)
+        self.assertRaises(ValueError,
+                          lambda: MimoSignal.deserialize(self.signal.serialize(), out=out))
+
+    def test_throwsIfSampleCountMismatches(self) -> None:
+        out = MimoSignal.empty(numStreams=2, numSamples=4)
+        self.assertRaises(ValueError,
+                          lambda: MimoSignal.deserialize(self.signal.serialize(), out=out))
+
+    def test_occupancyCountsSamplesInNonZeroSegments(self) -> None:
+        signal = MimoSignal(signals=[np.zeros(1000), np.zeros(1000)])
+        signal.signals[0][100:200] = 1.0
+        self.assertAlmostEqual(signal.occupancy(), 0.05)
+
+    def test_sparseRoundTrip(self) -> None:
+        self.signal.signals = [np.hstack([np.zeros(100), s]) for s in self.signal.signals]
+        deserialized = MimoSignal.deserializeSparse(self.signal.serializeSparse())
+        for d, expected in zip(deserialized.signals, self.signal.signals):
+            np.testing.assert_array_almost_equal(d, expected)
+
+
+class TestPackedConfigs(unittest.TestCase):
+    def test_schemasContainAllFields(self) -> None:
+        self.assertCountEqual(RF_CONFIG_SCHEMA.fieldNames,
+                              [f.name for f in fields(RfConfig)])
+        self.assertCountEqual(RX_STREAMING_CONFIG_SCHEMA.fieldNames,
+                              [f.name for f in fields(RxStreamingConfig)])
+
+    def test_rfConfigRoundTripViaMsgpack(self) -> None:
+        config = RfConfig(txGain=30.0, rxSamplingRate=245.76e6, noRxStreams=2,
+                          rxAntennaMapping=[1, 0])
+        packed = msgpack.unpackb(msgpack.packb(config.pack()))
+        self.assertEqual(packed[0], CONFIG_SCHEMA_VERSION)
+        self.assertEqual(RfConfig.unpack(packed), config)
+
+    def test_rxConfigRoundTripKeepsUnsetRfChanges(self) -> None:
+        for config in [RxStreamingConfig(receiveTimeOffset=1.5, numSamples=100,
+                                         antennaPort="RX2"),
+                       RxStreamingConfig(numSamples=100, carrierFrequency=2e9, gain=3.0)]:
+            packed = msgpack.unpackb(msgpack.packb(config.pack()))
+            self.assertEqual(RxStreamingConfig.unpack(packed), config)
+
+    def test_incompatibleSchemaIsRejected(self) -> None:
+        packed = RfConfig().pack()
+        self.assertRaises(ValueError, lambda: RfConfig.unpack([2] + packed[1:]))
+        self.assertRaises(ValueError, lambda: RfConfig.unpack(packed[:-1]))
+        self.assertRaises(ValueError, lambda: RxStreamingConfig.unpack([]))
@@ -0,0 +1,84 @@
+import unittest
+
+import gevent
+import numpy as np
+import numpy.testing as npt
+import zmq.green as zmq
+
+from uhd_wrapper.utils.config import MimoSignal
+from uhd_wrapper.utils.data_plane import DataPlaneClient, DataPlaneServer
+
+
+class TestDataPlane(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = DataPlaneServer(maxPendingBuffers=2)
+        self.server.start()
+        self.client = DataPlaneClient("localhost", self.server.port, timeout=5.0)
+        self.signal = MimoSignal(signals=[np.arange(100) + 1j, np.arange(100) * 1j])
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_uploadedSignalIsStoredOnServer(self) -> None:
+        handle = self.client.upload(self.signal)
+        self.assertEqual(self.server.take(handle), self.signal)
+
+    def test_storedSignalCanBeDownloaded(self) -> None:
+        handle = self.server.store(self.signal)
+        self.assertEqual(self.client.download(handle), self.signal)
+
+    def test_downloadIntoOutputBuffer(self) -> None:
+        out = MimoSignal.empty(2, 100)
+        result = self.client.download(self.server.store(self.signal), out=out)
+        self.assertIs(result, out)
+        npt.assert_array_equal(out.signals[0], self.signal.signals[0])
+
+    def test_signalCanOnlyBeTakenOnce(self) -> None:
+        handle = self.server.store(self.signal)
+        self.client.download(handle)
+        self.assertRaises(RuntimeError, lambda: self.client.download(handle))
+        self.assertEqual(self.client.download(self.server.store(self.signal)), self.signal)
+
+    def test_handlesCannotBeGuessed(self) -> None:
+        handles = self.server.storeBatch([self.signal] * 2)
+        self.assertNotEqual(handles[0], handles[1])
+        self.assertGreaterEqual(len(handles[0]), 32)
+        self.assertRaises(RuntimeError, lambda: self.client.download("1"))
+        self.assertEqual(self.client.download(handles[1]), self.signal)
+
+    def test_oldestPendingSignalsAreDiscarded(self) -> None:
+        handles = [self.server.store(self.signal) for _ in range(3)]
+        self.assertRaises(KeyError, lambda: self.server.take(handles[0]))
+        self.server.take(handles[2])
+
+    def test_batchExceedingLimitIsKeptCompletely(self) -> None:
+        earlier = self.server.store(self.signal)
+        handles = self.server.storeBatch([self.signal] * 5)
+        self.assertRaises(KeyError, lambda: self.server.take(earlier))
+        for handle in handles:
+            self.assertEqual(self.client.download(handle), self.signal)
+
+        # the next batch discards the earlier signals only
+        self.server.storeBatch([self.signal] * 3)
+        self.assertEqual(len(self.server.storeBatch([self.signal])), 1)
+
+
+class TestDataPlaneTimeout(unittest.TestCase):
+    def setUp(self) -> None:
+        # a server that never replies
+        self.silentServer: zmq.Socket = zmq.Context.instance().socket(zmq.ROUTER)
+        self.silentServer.setsockopt(zmq.LINGER, 0)
+        port: int = self.silentServer.bind_to_random_port("tcp://*")
+        self.client = DataPlaneClient("localhost", port, timeout=0.1)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.silentServer.close()
+
+    def test_missingReplyRaisesIOError(self) -> None:
+        signal = MimoSignal(signals=[np.ones(10)])
+        with gevent.Timeout(5.0):
+            self.assertRaises(IOError, lambda: self.client.upload(signal))
+            # the client can send again after the timeout
+            self.assertRaises(IOError, lambda: self.client.download("1"))
@@ -0,0 +1,85 @@
+from typing import List
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from uhd_wrapper.rpc_server.gain_control import GainControl
+from uhd_wrapper.usrp_pybinding import (
+    Usrp,
+    RxStreamingConfig,
+    SignalStatistics,
+)
+from uhd_wrapper.utils.config import AgcConfig, MimoSignal, RfConfig
+
+
+class TestGainControl(unittest.TestCase):
+    def setUp(self) -> None:
+        self.usrpMock = Mock(spec=Usrp)
+        self.usrpMock.getCurrentFpgaTime.return_value = 1.0
+        self.usrpMock.collectStatistics.side_effect = self.__measure
+        self.appliedConfigs: List[RfConfig] = []
+        self.gainControl = GainControl(self.usrpMock, self.appliedConfigs.append)
+
+        # peak at zero gain in dB relative to full scale
+        self.pathGainDb = -50.0
+
+    def __measure(self) -> List[SignalStatistics]:
+        c = self.appliedConfigs[-1]
+        stats = SignalStatistics()
+        stats.peak = min(10 ** ((c.rxGain + c.txGain + self.pathGainDb) / 20), 1.0)
+        stats.rms = stats.peak / 2
+        return [stats]
+
+    def test_estimatesGainFromMeasuredPeak(self) -> None:
+        result = self.gainControl.run(RfConfig(rxGain=10), AgcConfig(targetPeak=0.5))
+
+        self.assertTrue(result.converged)
+        self.assertEqual(result.rxGain, 44)
+        self.assertEqual(result.numIterations, 2)
+        self.assertAlmostEqual(result.peak, 10 ** (-6 / 20))
+        self.assertEqual(self.appliedConfigs[-1].rxGain, 44)
+
+    def test_bisectsIfClipped(self) -> None:
+        self.pathGainDb = -20.0
+        result = self.gainControl.run(RfConfig(rxGain=30), AgcConfig(targetPeak=0.5))
+
+        self.assertTrue(result.converged)
+        self.assertEqual([c.rxGain for c in self.appliedConfigs], [30, 14, 14])
+
+    def test_probesAreCapturedWithRxConfig(self) -> None:
+        self.gainControl.run(RfConfig(rxGain=44), AgcConfig(numSamples=1234))
+
+        self.usrpMock.resetStreamingConfigs.assert_called_once()
+        self.usrpMock.setRxConfig.assert_called_once_with(
+            RxStreamingConfig(numSamples=1234, receiveTimeOffset=0.0))
+        self.usrpMock.execute.assert_called_once_with(1.1)
+        self.usrpMock.setTxConfig.assert_not_called()
+
+    def test_returnsMaxGainIfTargetIsNotReachable(self) -> None:
+        self.pathGainDb = -100.0
+        result = self.gainControl.run(RfConfig(rxGain=10), AgcConfig(maxRxGain=60))
+
+        self.assertFalse(result.converged)
+        self.assertEqual(result.rxGain, 60)
+        self.assertEqual(result.numIterations, 2)
+
+    def test_adjustsTxGainIfRxGainIsExhausted(self) -> None:
+        self.pathGainDb = -100.0
+        txSignal = MimoSignal(signals=[np.ones(100, dtype=np.complex64)])
+        result = self.gainControl.run(
+            RfConfig(rxGain=10, txGain=0),
+            AgcConfig(targetPeak=0.5, maxRxGain=60, adjustTxGain=True), txSignal)
+
+        self.assertTrue(result.converged)
+        self.assertEqual(result.rxGain, 60)
+        self.assertEqual(result.txGain, 34)
+        self.assertEqual(self.usrpMock.setTxConfig.call_count, result.numIterations)
+
+    def test_stopsAfterMaxIterations(self) -> None:
+        self.pathGainDb = 10.0
+        result = self.gainControl.run(RfConfig(rxGain=30), AgcConfig(maxIterations=3))
+
+        self.assertFalse(result.converged)
+        self.assertEqual(result.numIterations, 3)
+        self.assertEqual(result.rxGain, min(c.rxGain for c in self.appliedConfigs))
@@ -0,0 +1,181 @@
+import unittest
+from typing import Any, Callable, Dict, List
+from unittest.mock import Mock
+
+from uhd_wrapper.rpc_server.job_queue import (
+    DONE,
+    JOB_QUEUE_OWNER,
+    CANCELLED,
+    JobQueue,
+    LeaseError,
+    LeaseManager,
+    LeaseMiddleware,
+    requiresLease,
+)
+from uhd_wrapper.utils.leases import LEASE_TOKEN_HEADER
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class TestLeaseManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.leases = LeaseManager(self.clock)
+
+    def test_onlyOneClientHoldsTheLease(self) -> None:
+        lease = self.leases.acquire("alice", 10.0)
+        self.assertRaises(LeaseError, lambda: self.leases.acquire("bob", 10.0))
+        self.assertEqual(self.leases.describe(), {"owner": "alice", "remainingSec": 10.0})
+
+        self.leases.check(lease.token)
+        self.assertRaises(LeaseError, lambda: self.leases.check(None))
+        self.assertRaises(LeaseError, lambda: self.leases.release("foo"))
+
+        self.leases.release(lease.token)
+        self.leases.check(None)
+        self.assertEqual(self.leases.describe(), {})
+
+    def test_leaseExpiresUnlessRenewed(self) -> None:
+        lease = self.leases.acquire("alice", 10.0)
+        self.clock.time = 9.0
+        self.leases.renew(lease.token, 10.0)
+        self.clock.time = 18.0
+        self.assertRaises(LeaseError, lambda: self.leases.check(None))
+
+        self.clock.time = 19.0
+        self.leases.check(None)
+        self.assertRaises(LeaseError, lambda: self.leases.renew(lease.token, 10.0))
+        self.leases.acquire("bob", 10.0)
+
+    def test_middlewareRejectsChangesOfOtherClients(self) -> None:
+        middleware = LeaseMiddleware(self.leases)
+        lease = self.leases.acquire("alice", 10.0)
+
+        def request(name: str, token: Any = None) -> None:
+            header = {} if token is None else {LEASE_TOKEN_HEADER: token}
+            requestEvent = Mock(header=header)
+            requestEvent.name = name
+            middleware.server_before_exec(requestEvent)
+
+        request("getCurrentFpgaTime")
+        request("submitJob")
+        request("configureTx", lease.token)
+        self.assertRaises(LeaseError, lambda: request("configureTx"))
+        self.assertRaises(LeaseError, lambda: request("execute", "foo"))
+
+    def test_queriesDoNotRequireLease(self) -> None:
+        self.assertFalse(requiresLease("getRfConfigPacked"))
+        self.assertFalse(requiresLease("collectJob"))
+        self.assertFalse(requiresLease("_zerorpc_inspect"))
+        self.assertTrue(requiresLease("configureRfConfigPacked"))
+        self.assertTrue(requiresLease("collect"))
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.leases = LeaseManager(self.clock)
+        self.executed: List[Dict[str, Any]] = []
+        self.duringJob: Callable[[], Any] = lambda: None
+        self.queue = JobQueue(self.leases, self.runJob, self.clock)
+
+    def runJob(self, job: Dict[str, Any]) -> str:
+        self.assertEqual(self.leases.describe()["owner"], JOB_QUEUE_OWNER)
+        self.executed.append(job)
+        self.clock.time += 1.0
+        self.duringJob()
+        if job["name"] == "broken":
+            raise ValueError("invalid config")
+        return str(job["name"])
+
+    def test_jobsRunByPriorityAndSubmission(self) -> None:
+        first = self.queue.submit({"name": "first"})
+        second = self.queue.submit({"name": "second"})
+        urgent = self.queue.submit({"name": "urgent"}, priority=1)
+        while self.queue.runNext():
+            pass
+        self.assertEqual([j["name"] for j in self.executed], ["urgent", "first", "second"])
+        self.assertEqual(self.queue.status(second), DONE)
+        self.assertEqual(self.queue.collect(first), "first")
+        self.assertEqual(self.queue.collect(urgent), "urgent")
+        self.assertRaises(ValueError, lambda: self.queue.status(first))
+        self.assertEqual(self.leases.describe(), {})
+
+    def test_jobsWaitWhileDeviceIsLeased(self) -> None:
+        lease = self.leases.acquire("alice", 10.0)
+        jobId = self.queue.submit({"name": "job"})
+        self.assertFalse(self.queue.runNext())
+        self.leases.release(lease.token)
+        self.assertTrue(self.queue.runNext())
+        self.assertEqual(self.queue.collect(jobId, timeoutSec=0.0), "job")
+
+    def test_jobOutlastingItsLeaseFinishes(self) -> None:
+        self.queue.jobLeaseSec = 0.5
+        jobId = self.queue.submit({"name": "job"})
+        self.assertTrue(self.queue.runNext())
+        self.assertEqual(self.queue.collect(jobId, timeoutSec=0.0), "job")
+        self.assertEqual(self.queue.statistics()["runningJob"], 0)
+        self.assertEqual(self.leases.describe(), {})
+
+    def test_leaseOfClientIsKeptAfterJobLeaseExpired(self) -> None:
+        self.queue.jobLeaseSec = 0.5
+        self.duringJob = lambda: self.leases.acquire("alice", 10.0)
+        first = self.queue.submit({"name": "first"})
+        second = self.queue.submit({"name": "second"})
+        self.assertTrue(self.queue.runNext())
+
+        self.assertEqual(self.queue.collect(first, timeoutSec=0.0), "first")
+        self.assertEqual(self.leases.describe()["owner"], "alice")
+        self.assertFalse(self.queue.runNext())
+        self.assertEqual(self.queue.status(second), "queued")
+
+    def test_failedAndCancelledJobsRaiseOnCollect(self) -> None:
+        broken = self.queue.submit({"name": "broken"})
+        cancelled = self.queue.submit({"name": "cancelled"})
+        self.assertTrue(self.queue.cancel(cancelled))
+        self.assertTrue(self.queue.runNext())
+        self.assertFalse(self.queue.runNext())
+        self.assertEqual(self.queue.status(cancelled), CANCELLED)
+
+        with self.assertRaises(RuntimeError) as context:
+            self.queue.collect(broken)
+        self.assertIn("ValueError: invalid config", str(context.exception))
+        self.assertRaises(RuntimeError, lambda: self.queue.collect(cancelled))
+
+    def test_uncollectedJobsAreForgottenAfterRetention(self) -> None:
+        self.queue.retentionSec = 10.0
+        cancelled = self.queue.submit({"name": "cancelled"})
+        self.queue.cancel(cancelled)
+        done = self.queue.submit({"name": "done"})
+        self.assertTrue(self.queue.runNext())
+
+        self.clock.time = 10.5
+        queued = self.queue.submit({"name": "queued"})
+        self.assertRaises(ValueError, lambda: self.queue.status(cancelled))
+        self.assertEqual(self.queue.status(done), DONE)
+
+        self.clock.time = 11.5
+        self.assertTrue(self.queue.runNext())
+        self.assertRaises(ValueError, lambda: self.queue.status(done))
+        self.assertEqual(self.queue.collect(queued, timeoutSec=0.0), "queued")
+
+    def test_statisticsContainUtilization(self) -> None:
+        self.queue.submit({"name": "job"})
+        self.queue.submit({"name": "job"})
+        self.queue.runNext()
+        self.clock.time = 4.0
+        statistics = self.queue.statistics()
+        self.assertEqual(statistics["depth"], 1)
+        self.assertEqual(statistics["finishedJobs"], 1)
+        self.assertEqual(statistics["runningJob"], 0)
+        self.assertAlmostEqual(statistics["utilization"], 0.25)
+
+    def test_workerRunsJobsInBackground(self) -> None:
+        jobId = self.queue.submit({"name": "job"})
+        self.assertEqual(self.queue.collect(jobId, timeoutSec=1.0), "job")
@@ -0,0 +1,84 @@
+import logging
+import unittest
+from typing import List
+from unittest.mock import Mock
+
+import gevent
+
+from uhd_wrapper.utils.log_context import (
+    CorrelationIdFilter,
+    LogCorrelationMiddleware,
+    currentCorrelationId,
+    pythonLogLevel,
+)
+from uhd_wrapper.utils.tracing import TRACE_ID_HEADER
+
+
+class TestLogCorrelationMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nativeIds: List[str] = []
+        self.middleware = LogCorrelationMiddleware(self.nativeIds.append)
+
+    def tearDown(self) -> None:
+        self.middleware.close()
+
+    def test_traceIdIsPreferred(self) -> None:
+        requestEvent = Mock(header={TRACE_ID_HEADER: "abc", "message_id": b"0001"})
+        self.middleware.server_before_exec(requestEvent)
+        self.assertEqual(currentCorrelationId(), "abc")
+
+        self.middleware.server_after_exec(requestEvent, None)
+        self.assertEqual(currentCorrelationId(), "")
+        self.assertEqual(self.nativeIds, ["abc", ""])
+
+    def test_messageIdIsUsedForUntracedRequests(self) -> None:
+        requestEvent = Mock(header={"message_id": b"0001"})
+        self.middleware.server_before_exec(requestEvent)
+        self.assertEqual(currentCorrelationId(), "0001")
+
+        self.middleware.server_inspect_exception(requestEvent, None, None, None)
+        self.assertEqual(self.nativeIds, ["0001", ""])
+
+    def test_nativeIdFollowsTheRunningRequest(self) -> None:
+        nativeIdsInRequests: List[str] = []
+
+        def request(correlationId: str) -> None:
+            self.middleware.server_before_exec(Mock(header={TRACE_ID_HEADER: correlationId}))
+            gevent.sleep(0)
+            # the other request has started and possibly finished in between
+            nativeIdsInRequests.append(self.nativeIds[-1])
+            self.middleware.server_after_exec(Mock(), None)
+
+        gevent.joinall([gevent.spawn(request, "abc"), gevent.spawn(request, "def")])
+        self.assertEqual(nativeIdsInRequests, ["abc", "def"])
+        self.assertEqual(self.nativeIds[-1], "")
+
+    def test_nativeIdIsOnlyPassedIfItChanges(self) -> None:
+        self.middleware.server_before_exec(Mock(header={TRACE_ID_HEADER: "abc"}))
+        gevent.sleep(0)
+        gevent.sleep(0)
+        self.middleware.server_after_exec(Mock(), None)
+        gevent.sleep(0)
+        self.assertEqual(self.nativeIds, ["abc", ""])
+
+    def test_closeStopsTracingGreenletSwitches(self) -> None:
+        self.middleware.close()
+        self.nativeIds.clear()
+        gevent.sleep(0)
+        self.assertEqual(self.nativeIds, [])
+
+    def test_filterAddsCorrelationIdToRecords(self) -> None:
+        self.middleware.server_before_exec(Mock(header={TRACE_ID_HEADER: "abc"}))
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None,
+                                   None)
+        self.assertTrue(CorrelationIdFilter().filter(record))
+        self.assertEqual(record.correlationId, "abc")  # type: ignore
+        self.middleware.server_after_exec(Mock(), None)
+
+
+class TestLogLevels(unittest.TestCase):
+    def test_levelsAreMappedToLoggingModule(self) -> None:
+        self.assertEqual(pythonLogLevel("trace"), logging.DEBUG)
+        self.assertEqual(pythonLogLevel("warning"), logging.WARNING)
+        self.assertGreater(pythonLogLevel("off"), logging.CRITICAL)
+        self.assertRaises(ValueError, lambda: pythonLogLevel("verbose"))
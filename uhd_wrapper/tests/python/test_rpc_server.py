@@ -1,6 +1,10 @@
+import logging
+import time
 import unittest
+from typing import List
 from unittest.mock import Mock
 
+import gevent
 import numpy as np
 import numpy.testing as npt
 
@@ -8,16 +12,30 @@ from uhd_wrapper.rpc_server.rpc_server import (
     RfConfigFromBinding,
     UsrpServer,
     RfConfigToBinding,
+    JOB_START_DELAY_S,
 )
 from uhd_wrapper.utils.serialization import (
     serializeComplexArray,
     deserializeComplexArray,
+    serializeSparseComplexArray,
+    deserializeSparseComplexArray,
+    findNonZeroSegments,
 )
 from uhd_wrapper.usrp_pybinding import (
     Usrp,
     TxStreamingConfig,
+    RxStreamingConfig,
 )
 from uhd_wrapper.utils.config import RfConfig, MimoSignal
+from uhd_wrapper.utils.config import RxStreamingConfig as RxStreamingConfigClient
+from uhd_wrapper.utils.compression import decompressSignal
+from uhd_wrapper.utils.data_plane import DataPlaneServer
+from uhd_wrapper.utils.shared_memory import (
+    hostId,
+    readSharedMemory,
+    unlinkSharedMemory,
+    writeSharedMemory,
+)
 from uhd_wrapper.tests.python.utils import fillDummyRfConfig
 
 
@@ -50,6 +68,18 @@ class TestDeserializationComplexArr(unittest.TestCase):
         deserializedArr = deserializeComplexArray((realList, imagList))
         npt.assert_array_almost_equal(deserializedArr, expectedArr)
 
+    def test_deserializeIntoOutputBuffer(self) -> None:
+        out = np.zeros(3, dtype=np.complex64)
+        result = deserializeComplexArray(([4, 5, 6], [1, 2, 3]), out=out)
+        self.assertIs(result, out)
+        npt.assert_array_almost_equal(out, np.array([4 + 1j, 5 + 2j, 6 + 3j]))
+
+    def test_outputBufferMustMatchLength(self) -> None:
+        out = np.zeros(2, dtype=np.complex64)
+        self.assertRaises(
+            ValueError, lambda: deserializeComplexArray(([4, 5, 6], [1, 2, 3]), out=out)
+        )
+
     def test_noImagSamples_mismatch_noRealSamples(self) -> None:
         imagList = [0]
         realList = [1, 2]
@@ -59,6 +89,39 @@ class TestDeserializationComplexArr(unittest.TestCase):
         )
 
 
+class TestSparseSerialization(unittest.TestCase):
+    def test_findNonZeroSegments(self) -> None:
+        data = np.zeros(100)
+        data[10:20] = 1
+        data[22] = 1
+        data[60:70] = 1
+        self.assertListEqual(findNonZeroSegments(data, minZeroRun=5), [(10, 23), (60, 70)])
+        self.assertListEqual(findNonZeroSegments(data, minZeroRun=1),
+                             [(10, 20), (22, 23), (60, 70)])
+
+    def test_findNonZeroSegments_allZeros(self) -> None:
+        self.assertListEqual(findNonZeroSegments(np.zeros(10)), [])
+
+    def test_onlyNonZeroSegmentsAreSerialized(self) -> None:
+        data = np.zeros(1000, dtype=np.complex64)
+        data[500:502] = [1 + 2j, 3 + 4j]
+        length, segments = serializeSparseComplexArray(data)
+        self.assertEqual(length, 1000)
+        self.assertListEqual(segments, [(500, [1.0, 3.0], [2.0, 4.0])])
+
+    def test_roundTrip(self) -> None:
+        data = np.zeros(1000, dtype=np.complex64)
+        data[3:50] = np.arange(47) * (1 - 1j) / 100
+        data[900:] = 0.5j
+        deserialized = deserializeSparseComplexArray(serializeSparseComplexArray(data))
+        self.assertEqual(deserialized.dtype, np.complex64)
+        npt.assert_array_equal(deserialized, data)
+
+    def test_segmentExceedingLengthThrows(self) -> None:
+        self.assertRaises(ValueError,
+                          lambda: deserializeSparseComplexArray((5, [(4, [1, 2], [0, 0])])))
+
+
 class TestSerializationRfConfig(unittest.TestCase):
     def setUp(self) -> None:
         self.conf = fillDummyRfConfig(RfConfig())
@@ -126,6 +189,60 @@ class TestUsrpServer(unittest.TestCase):
                               numRepetitions=18)
         )
 
+    def test_configureTxPassesRfChanges(self) -> None:
+        signal = MimoSignal(signals=[np.array([2, 3]) + 1j * np.array([0, 1])])
+        self.usrpServer.configureTx(1.0, signal.serialize(), 1, 3.6e9, None)
+        self.usrpMock.setTxConfig.assert_called_once_with(
+            TxStreamingConfig(sendTimeOffset=1.0, samples=signal.signals,
+                              numRepetitions=1, carrierFrequency=3.6e9)
+        )
+
+    def test_configureRxPassesRfChanges(self) -> None:
+        config = RxStreamingConfigClient(receiveTimeOffset=1.0, numSamples=100, gain=20.0)
+        self.usrpServer.configureRx(config.to_json())
+        self.usrpMock.setRxConfig.assert_called_once_with(
+            RxStreamingConfig(receiveTimeOffset=1.0, numSamples=100, gain=20.0)
+        )
+
+    def test_configureTxSparseExpandsSignal(self) -> None:
+        samples = np.zeros(100, dtype=np.complex64)
+        samples[40:45] = 0.5 + 0.25j
+        signal = MimoSignal(signals=[samples])
+        self.usrpServer.configureTxSparse(1.0, signal.serializeSparse(), 3)
+        self.usrpMock.setTxConfig.assert_called_once_with(
+            TxStreamingConfig(sendTimeOffset=1.0, samples=signal.signals,
+                              numRepetitions=3)
+        )
+
+    def test_chunkedTxUploadAssemblesSignal(self) -> None:
+        self.usrpMock.getMaxTxSamples.return_value = 1000
+        signal = MimoSignal(signals=[np.arange(10) + 1j, np.arange(10) - 1j])
+        self.usrpServer.beginTxChunks(2.0, 2, 10, 3)
+        for start in range(0, 10, 4):
+            chunk = MimoSignal(signals=[s[start:start + 4] for s in signal.signals])
+            self.usrpServer.appendTxChunk(chunk.serialize())
+        self.usrpMock.setTxConfig.assert_not_called()
+
+        self.usrpServer.endTxChunks()
+        self.usrpMock.setTxConfig.assert_called_once_with(
+            TxStreamingConfig(sendTimeOffset=2.0, samples=signal.signals,
+                              numRepetitions=3)
+        )
+
+    def test_chunkedTxUploadRejectsSignalsExceedingReplayMemory(self) -> None:
+        self.usrpMock.getMaxTxSamples.return_value = 100
+        self.assertRaises(ValueError, lambda: self.usrpServer.beginTxChunks(0.0, 1, 101, 1))
+
+    def test_chunkedTxUploadThrowsIfSamplesAreMissingOrExceeding(self) -> None:
+        self.usrpMock.getMaxTxSamples.return_value = 100
+        chunk = MimoSignal(signals=[np.ones(6)]).serialize()
+        self.usrpServer.beginTxChunks(0.0, 1, 10, 1)
+        self.usrpServer.appendTxChunk(chunk)
+        self.assertRaises(ValueError, lambda: self.usrpServer.appendTxChunk(chunk))
+        self.assertRaises(RuntimeError, lambda: self.usrpServer.endTxChunks())
+        self.assertRaises(RuntimeError, lambda: self.usrpServer.appendTxChunk(chunk))
+        self.usrpMock.setTxConfig.assert_not_called()
+
     def test_configureRfConfigCalledWithCorrectArguments(self) -> None:
         from uhd_wrapper.usrp_pybinding import RfConfig as RfConfigBinding
         from uhd_wrapper.utils.config import RfConfig
@@ -137,6 +254,63 @@ class TestUsrpServer(unittest.TestCase):
             fillDummyRfConfig(RfConfigBinding())
         )
 
+    def test_configureRfConfigPackedCalledWithCorrectArguments(self) -> None:
+        from uhd_wrapper.usrp_pybinding import RfConfig as RfConfigBinding
+
+        c = fillDummyRfConfig(RfConfig(rxAntennaMapping=[0]))
+        self.usrpServer.configureRfConfigPacked(c.pack())
+
+        expected = fillDummyRfConfig(RfConfigBinding())
+        expected.rxAntennaMapping = [0]
+        self.usrpMock.setRfConfig.assert_called_once_with(expected)
+
+    def test_configureRxPackedPassesRfChanges(self) -> None:
+        config = RxStreamingConfigClient(receiveTimeOffset=1.0, numSamples=100, gain=20.0)
+        self.usrpServer.configureRxPacked(config.pack())
+        self.usrpMock.setRxConfig.assert_called_once_with(
+            RxStreamingConfig(receiveTimeOffset=1.0, numSamples=100, gain=20.0)
+        )
+
+    def test_reopenDeviceForwardsCallsToNewDevice(self) -> None:
+        newUsrpMock = Mock(spec=Usrp)
+        newUsrpMock.getPerformanceCounters.return_value = {"startup.makeGraph": 2.0}
+        openDevice = Mock(return_value=newUsrpMock)
+        usrpServer = UsrpServer(self.usrpMock, openDevice=openDevice)
+
+        readiness = usrpServer.reopenDevice(250e6, "clock_source=external")
+        openDevice.assert_called_once_with(250e6, "clock_source=external")
+        self.assertEqual(readiness["state"], "ready")
+        self.assertEqual(set(readiness["phases"]),
+                         {"closeDevice", "openDevice", "startup.makeGraph"})
+
+        usrpServer.getMasterClockRate()  # type: ignore
+        usrpServer.configureRfConfigPacked(RfConfig().pack())
+        newUsrpMock.getMasterClockRate.assert_called_once_with()
+        newUsrpMock.setRfConfig.assert_called_once()
+        self.usrpMock.getMasterClockRate.assert_not_called()
+
+    def test_failedReopenIsReported(self) -> None:
+        from uhd_wrapper.utils.readiness import ServerNotReadyError
+
+        usrpServer = UsrpServer(self.usrpMock,
+                                openDevice=Mock(side_effect=RuntimeError("no device")))
+        self.assertRaises(RuntimeError, lambda: usrpServer.reopenDevice(250e6))
+        self.assertRaises(ServerNotReadyError,
+                          lambda: usrpServer.getMasterClockRate())  # type: ignore
+        readiness = usrpServer.getReadiness()
+        self.assertEqual(readiness["state"], "failed")
+        self.assertEqual(readiness["error"], "RuntimeError: no device")
+
+    def test_reopenRequiresDeviceFactory(self) -> None:
+        self.assertRaises(RuntimeError, lambda: self.usrpServer.reopenDevice(250e6))
+
+    def test_getRfConfigPackedRoundTrips(self) -> None:
+        from uhd_wrapper.usrp_pybinding import RfConfig as RfConfigBinding
+
+        self.usrpMock.getRfConfig.return_value = fillDummyRfConfig(RfConfigBinding())
+        self.assertEqual(RfConfig.unpack(self.usrpServer.getRfConfigPacked()),
+                         fillDummyRfConfig(RfConfig()))
+
     def test_getRfConfigReturnsSerializedVersion(self) -> None:
         from uhd_wrapper.usrp_pybinding import RfConfig as RfConfigBinding
 
@@ -165,3 +339,188 @@ class TestUsrpServer(unittest.TestCase):
         self.assertListEqual(
             [signal.serialize(), signal.serialize()], self.usrpServer.collect()
         )
+
+    def test_submittedJobIsExecutedAndCollected(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10)])
+        self.usrpMock.collect.return_value = [signal.signals]
+        self.usrpMock.getCurrentFpgaTime.return_value = 3.0
+        rxConfig = RxStreamingConfigClient(receiveTimeOffset=1.0, numSamples=10)
+
+        jobId = self.usrpServer.submitJob(
+            {"rfConfig": None, "tx": [[0.5, signal.serialize(), 1, -1.0, -1.0]],
+             "rx": [rxConfig.pack()]})
+        self.assertListEqual([signal.serialize()],
+                             self.usrpServer.collectJob(jobId, timeoutSec=1.0))
+
+        self.usrpMock.setRfConfig.assert_not_called()
+        self.usrpMock.setTxConfig.assert_called_once()
+        self.usrpMock.setRxConfig.assert_called_once()
+        self.usrpMock.execute.assert_called_once_with(3.0 + JOB_START_DELAY_S)
+        self.assertEqual(self.usrpServer.getQueueStatus()["finishedJobs"], 1)
+
+    def test_leaseIsReleasedForNextClient(self) -> None:
+        lease = self.usrpServer.acquireLease("alice", 10.0)
+        self.assertEqual(self.usrpServer.getLease()["owner"], "alice")
+        self.assertRaises(RuntimeError, lambda: self.usrpServer.acquireLease("bob", 10.0))
+        self.usrpServer.releaseLease(lease["token"])
+        self.assertEqual(self.usrpServer.acquireLease("bob", 10.0)["owner"], "bob")
+
+    def test_executeRepeatedlyCollectsAllRuns(self) -> None:
+        signals = [MimoSignal(signals=[np.arange(10) + run]) for run in range(3)]
+        self.usrpMock.collect.side_effect = [[s.signals] for s in signals]
+
+        self.usrpServer.executeRepeatedly(5.0, 3, 0.5)
+        self.assertEqual(self.usrpMock.execute.call_args_list[0].args, (5.0,))
+
+        self.assertListEqual(self.usrpServer.collect(), [s.serialize() for s in signals])
+        self.assertListEqual([c.args for c in self.usrpMock.execute.call_args_list],
+                             [(5.0,), (5.5,), (6.0,)])
+
+    def test_executeRepeatedlyRunsPeriodicallyIfCollectIsDelayed(self) -> None:
+        self.usrpMock.collect.return_value = []
+        self.usrpServer.executeRepeatedly(5.0, 3, 0.01)
+        # the client collects later than the period
+        gevent.sleep(0.05)
+        self.assertListEqual([c.args for c in self.usrpMock.execute.call_args_list],
+                             [(5.0,), (5.01,), (5.02,)])
+        self.assertEqual(self.usrpMock.collect.call_count, 3)
+
+        self.usrpServer.collect()
+        self.assertEqual(self.usrpMock.execute.call_count, 3)
+
+    def test_serverAnswersRequestsDuringRepeatedExecution(self) -> None:
+        def receiveRun() -> List:
+            time.sleep(0.1)
+            return []
+        self.usrpMock.collect.side_effect = receiveRun
+        self.usrpServer.executeRepeatedly(-1, 3, 0.0)
+        gevent.sleep(0.01)
+        self.assertLess(self.usrpMock.collect.call_count, 3)
+        self.usrpServer.collect()
+        self.assertEqual(self.usrpMock.collect.call_count, 3)
+
+    def test_failedRunIsRaisedByCollect(self) -> None:
+        self.usrpMock.collect.return_value = []
+        self.usrpMock.execute.side_effect = [None, RuntimeError("too late")]
+        self.usrpServer.executeRepeatedly(5.0, 2, 0.01)
+        self.assertRaises(RuntimeError, self.usrpServer.collect)
+
+    def test_executeRepeatedlyImmediately(self) -> None:
+        self.usrpMock.collect.return_value = []
+        self.usrpServer.executeRepeatedly(-1, 2, 0.5)
+        self.usrpServer.collect()
+        self.assertListEqual([c.args for c in self.usrpMock.execute.call_args_list],
+                             [(-1,), (-1,)])
+
+    def test_repeatedExecutionEndsWithCollect(self) -> None:
+        self.usrpMock.collect.return_value = []
+        self.usrpServer.executeRepeatedly(1.0, 2, 1.0)
+        self.usrpServer.collect()
+        self.usrpServer.collect()
+        self.assertEqual(self.usrpMock.execute.call_count, 2)
+
+    def test_resetDiscardsUncollectedRuns(self) -> None:
+        self.usrpMock.collect.return_value = [[np.ones(10)]]
+        self.usrpServer.executeRepeatedly(1.0, 2, 1.0)
+        self.usrpServer.resetStreamingConfigs()
+        self.usrpMock.resetStreamingConfigs.assert_called_once()
+
+        self.usrpServer.execute(3.0)
+        self.assertEqual(len(self.usrpServer.collect()), 1)
+        self.usrpMock.execute.assert_called_with(3.0)
+
+    def test_executeDiscardsUncollectedRuns(self) -> None:
+        self.usrpMock.collect.return_value = [[np.ones(10)]]
+        self.usrpServer.executeRepeatedly(1.0, 3, 1.0)
+        self.usrpServer.execute(5.0)
+        self.assertEqual(len(self.usrpServer.collect()), 1)
+
+    def test_setLogLevelChangesLevelOfUsrp(self) -> None:
+        rootLevel = logging.getLogger().level
+        self.usrpServer.setLogLevel("debug")
+        try:
+            self.assertEqual(self.usrpServer.getLogLevel(), "debug")
+            self.assertEqual(logging.getLogger().level, logging.DEBUG)
+        finally:
+            self.usrpServer.setLogLevel("info")
+            logging.getLogger().setLevel(rootLevel)
+        self.assertRaises(ValueError, lambda: self.usrpServer.setLogLevel("verbose"))
+
+    def test_getHostIdReturnsIdOfLocalHost(self) -> None:
+        self.assertEqual(self.usrpServer.getHostId(), hostId())
+
+    def test_configureTxFromSharedMemory(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10) + 1j])
+        descriptor = writeSharedMemory(signal)
+        try:
+            self.usrpServer.configureTxFromSharedMemory(2.0, descriptor, 3)
+        finally:
+            unlinkSharedMemory([descriptor])
+        self.usrpMock.setTxConfig.assert_called_once_with(
+            TxStreamingConfig(sendTimeOffset=2.0, samples=signal.signals,
+                              numRepetitions=3)
+        )
+
+    def test_collectToSharedMemory(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10), np.ones(10)])
+        self.usrpMock.collect.return_value = [signal.signals]
+
+        descriptors = self.usrpServer.collectToSharedMemory()
+        self.assertEqual(len(descriptors), 1)
+        self.assertEqual(readSharedMemory(descriptors[0], unlink=True), signal)
+
+    def test_collectCompressedReturnsCompressedSignals(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10), np.ones(10)])
+        self.usrpMock.collect.return_value = [signal.signals]
+        self.assertIn("zlib", self.usrpServer.getCompressionCodecs())
+
+        compressed = self.usrpServer.collectCompressed(["zlib"], 0)
+        self.assertEqual(len(compressed), 1)
+        self.assertEqual(compressed[0][0], "zlib")
+        self.assertEqual(decompressSignal(compressed[0]), signal)
+
+    def test_withoutDataPlane(self) -> None:
+        self.assertEqual(self.usrpServer.getDataPlanePort(), 0)
+        self.assertRaises(RuntimeError, lambda: self.usrpServer.collectToDataPlane())
+
+
+class TestUsrpServerWithDataPlane(unittest.TestCase):
+    def setUp(self) -> None:
+        self.usrpMock = Mock(spec=Usrp)
+        self.dataPlane = Mock(spec=DataPlaneServer)
+        self.dataPlane.port = 1234
+        self.usrpServer = UsrpServer(self.usrpMock, self.dataPlane)
+
+    def test_getDataPlanePort(self) -> None:
+        self.assertEqual(self.usrpServer.getDataPlanePort(), 1234)
+
+    def test_configureTxFromDataPlane(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10) + 1j])
+        self.dataPlane.take.return_value = signal
+        self.usrpServer.configureTxFromDataPlane(2.0, "5f", 3)
+
+        self.dataPlane.take.assert_called_once_with("5f")
+        self.usrpMock.setTxConfig.assert_called_once_with(
+            TxStreamingConfig(sendTimeOffset=2.0, samples=signal.signals,
+                              numRepetitions=3)
+        )
+
+    def test_collectToDataPlane(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10)])
+        self.usrpMock.collect.return_value = [signal.signals, signal.signals]
+        self.dataPlane.storeBatch.return_value = ["7a", "8b"]
+
+        self.assertEqual(self.usrpServer.collectToDataPlane(), ["7a", "8b"])
+        self.dataPlane.storeBatch.assert_called_once_with([signal, signal])
+
+    def test_collectToDataPlaneKeepsMoreSignalsThanPendingBuffers(self) -> None:
+        dataPlane = DataPlaneServer(maxPendingBuffers=4)
+        try:
+            usrpServer = UsrpServer(self.usrpMock, dataPlane)
+            signals = [MimoSignal(signals=[np.arange(10) + i]) for i in range(6)]
+            self.usrpMock.collect.return_value = [s.signals for s in signals]
+
+            handles = usrpServer.collectToDataPlane()
+            self.assertEqual([dataPlane.take(h) for h in handles], signals)
+        finally:
+            dataPlane.stop()
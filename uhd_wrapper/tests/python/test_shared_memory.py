@@ -0,0 +1,53 @@
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import numpy.testing as npt
+
+from uhd_wrapper.utils.config import MimoSignal
+from uhd_wrapper.utils.shared_memory import (
+    hostId,
+    readSharedMemory,
+    unlinkSharedMemory,
+    writeSharedMemory,
+)
+
+
+class TestSharedMemory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.signal = MimoSignal(signals=[np.arange(10) + 1j, np.arange(10) * 1j])
+
+    def test_hostIdIsStable(self) -> None:
+        self.assertEqual(hostId(), hostId())
+
+    def test_roundTrip(self) -> None:
+        descriptor = writeSharedMemory(self.signal)
+        self.assertEqual(descriptor[1:], (2, 10))
+
+        result = readSharedMemory(descriptor, unlink=True)
+        self.assertEqual(result, self.signal)
+
+    def test_readIntoOutputBuffer(self) -> None:
+        out = MimoSignal.empty(2, 10)
+        descriptor = writeSharedMemory(self.signal)
+        self.assertIs(readSharedMemory(descriptor, out=out, unlink=True), out)
+        npt.assert_array_equal(out.signals[1], self.signal.signals[1])
+
+    def test_segmentPersistsUntilUnlinked(self) -> None:
+        descriptor = writeSharedMemory(self.signal)
+        readSharedMemory(descriptor)
+        readSharedMemory(descriptor)
+        unlinkSharedMemory([descriptor])
+        self.assertRaises(FileNotFoundError, lambda: SharedMemory(name=descriptor[0]))
+
+    def test_mismatchingOutputBufferThrowsAndUnlinks(self) -> None:
+        descriptor = writeSharedMemory(self.signal)
+        self.assertRaises(
+            ValueError,
+            lambda: readSharedMemory(descriptor, out=MimoSignal.empty(2, 5), unlink=True)
+        )
+        self.assertRaises(FileNotFoundError, lambda: SharedMemory(name=descriptor[0]))
+
+    def test_streamsOfDifferentLengthThrow(self) -> None:
+        signal = MimoSignal(signals=[np.ones(3), np.ones(4)])
+        self.assertRaises(ValueError, lambda: writeSharedMemory(signal))
@@ -0,0 +1,115 @@
+import unittest
+from typing import List
+from unittest.mock import Mock
+
+import gevent
+import numpy as np
+
+from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+from uhd_wrapper.rpc_server.startup import StartupMethods, startInBackground
+from uhd_wrapper.usrp_pybinding import Usrp
+from uhd_wrapper.utils.config import MimoSignal
+from uhd_wrapper.utils.data_plane import DataPlaneClient, DataPlaneServer
+from uhd_wrapper.utils.readiness import (
+    FAILED,
+    INITIALIZING,
+    READY,
+    ServerNotReadyError,
+    ServerReadiness,
+)
+
+
+class TestServerReadiness(unittest.TestCase):
+    def setUp(self) -> None:
+        self.readiness = ServerReadiness()
+
+    def test_phasesAreTimed(self) -> None:
+        with self.readiness.phase("createUsrp"):
+            pass
+        report = self.readiness.report({"startup.makeGraph": 2.0})
+        self.assertEqual(report["state"], INITIALIZING)
+        self.assertEqual(set(report["phases"]), {"createUsrp", "startup.makeGraph"})
+        self.assertGreaterEqual(report["uptime"], report["phases"]["createUsrp"])
+
+        self.readiness.ready()
+        self.assertEqual(self.readiness.report()["state"], READY)
+
+    def test_failingPhaseMarksStartupAsFailed(self) -> None:
+        def fail() -> None:
+            with self.readiness.phase("createUsrp"):
+                raise RuntimeError("no device")
+
+        self.assertRaises(RuntimeError, fail)
+        report = self.readiness.report()
+        self.assertEqual(report["state"], FAILED)
+        self.assertEqual(report["error"], "RuntimeError: no device")
+        self.assertIn("createUsrp", report["phases"])
+
+
+class TestStartupMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.readiness = ServerReadiness()
+        self.methods = StartupMethods(self.readiness)
+        self.usrpMock = Mock(spec=Usrp)
+        self.usrpMock.getPerformanceCounters.return_value = {
+            "startup.makeGraph": 3.0, "rfConfig.calls": 1.0}
+
+    def test_onlyReadinessIsAnsweredWhileInitializing(self) -> None:
+        self.assertEqual(self.methods.get("getReadiness")()["state"], INITIALIZING)
+        self.assertRaises(ServerNotReadyError, lambda: self.methods.get("collect")())
+
+    def test_serverAnswersAllRequestsWhenReady(self) -> None:
+        self.methods.serve(UsrpServer(self.usrpMock, readiness=self.readiness))
+        self.readiness.ready()
+
+        self.methods.get("getMasterClockRate")()
+        self.usrpMock.getMasterClockRate.assert_called_once_with()
+        self.assertIsNone(self.methods.get("notImplemented"))
+
+        report = self.methods.get("getReadiness")()
+        self.assertEqual(report["state"], READY)
+        self.assertEqual(report["phases"], {"startup.makeGraph": 3.0})
+
+    def test_serverWithoutReadinessIsReady(self) -> None:
+        self.assertEqual(UsrpServer(self.usrpMock).getReadiness()["state"], READY)
+
+
+class TestStartInBackground(unittest.TestCase):
+    def setUp(self) -> None:
+        self.readiness = ServerReadiness()
+        self.methods = StartupMethods(self.readiness)
+        self.usrpMock = Mock(spec=Usrp)
+        self.usrpMock.getPerformanceCounters.return_value = {}
+        self.dataPlanes: List[DataPlaneServer] = []
+
+    def tearDown(self) -> None:
+        for dataPlane in self.dataPlanes:
+            dataPlane.stop()
+
+    def createServer(self, usrp: Usrp) -> UsrpServer:
+        dataPlane = DataPlaneServer()
+        dataPlane.start()
+        self.dataPlanes.append(dataPlane)
+        return UsrpServer(usrp, dataPlane, self.readiness)
+
+    def test_dataPlaneOfServerStartedInBackgroundAnswers(self) -> None:
+        gevent.spawn(startInBackground, self.methods, self.readiness,
+                     lambda: self.usrpMock, self.createServer).join(timeout=5.0)
+        self.assertEqual(self.methods.get("getReadiness")()["state"], READY)
+
+        client = DataPlaneClient("localhost", self.dataPlanes[0].port, timeout=5.0)
+        try:
+            with gevent.Timeout(5.0):
+                handle = client.upload(MimoSignal(signals=[np.ones(10)]))
+        finally:
+            client.close()
+        self.assertEqual(self.dataPlanes[0].take(handle), MimoSignal(signals=[np.ones(10)]))
+
+    def test_failureToOpenTheDeviceIsReported(self) -> None:
+        def openDevice() -> Usrp:
+            raise RuntimeError("no device")
+
+        startInBackground(self.methods, self.readiness, openDevice, self.createServer)
+        self.assertEqual(self.readiness.report()["state"], FAILED)
+        self.assertRaises(ServerNotReadyError, lambda: self.methods.get("collect")())
+        self.assertEqual(self.dataPlanes, [])
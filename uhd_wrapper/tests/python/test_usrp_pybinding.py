@@ -28,6 +28,15 @@ class TestTxStreamingConfig(unittest.TestCase):
         nt.assert_array_equal(dut.samples, signals)
         self.assertEqual(dut.numRepetitions, 16)
 
+    def test_rfChangesAreOptional(self) -> None:
+        dut = binding.TxStreamingConfig([np.array([5])], 8, 15)
+        self.assertIsNone(dut.carrierFrequency)
+        self.assertIsNone(dut.gain)
+
+        dut = binding.TxStreamingConfig([np.array([5])], 8, 15, carrierFrequency=2.4e9)
+        self.assertEqual(dut.carrierFrequency, 2.4e9)
+        self.assertNotEqual(dut, binding.TxStreamingConfig([np.array([5])], 8, 15))
+
     def test_inCppConstructedVersionMatchesLocallyConstructedVersion(self) -> None:
         signals = [np.array([8, 3]), np.array([9, 7])]
         dut = binding.TxStreamingConfig(signals, 5, 18)
@@ -71,3 +80,10 @@ class TestMimoSignal(unittest.TestCase):
         self.assertIs(type(res[0][1]), np.ndarray)
         nt.assert_array_equal(res[0][0], np.array([1, 2, 3, 4]))
         nt.assert_array_equal(res[0][1], np.array([5, 6, 7, 8]))
+
+    def test_rfChangesCanBeSet(self) -> None:
+        dut = binding.RxStreamingConfig(receiveTimeOffset=5, numSamples=42, gain=10.0)
+        self.assertEqual(dut.gain, 10.0)
+        self.assertIsNone(dut.carrierFrequency)
+        dut.carrierFrequency = 3.6e9
+        self.assertEqual(dut.carrierFrequency, 3.6e9)
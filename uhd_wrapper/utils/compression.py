@@ -0,0 +1,202 @@
+"""This module contains the lossless compression of sample payloads.
+
+The samples are stored as complex64 and byte-shuffled before compression, i.e. the
+first bytes of all values are stored first, then all second bytes, and so on. Since
+the received samples originate from 16 bit integers, the low mantissa bytes are
+mostly constant and compress well after shuffling.
+
+zlib is always available. zstd and lz4 are used if the `zstandard` and `lz4` packages
+are installed.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import time
+import zlib
+
+import gevent
+import gevent.threadpool
+import numpy as np
+
+from uhd_wrapper.utils.config import MimoSignal
+
+
+SAMPLE_DTYPE = np.complex64
+
+SerializedCompressedSignal = Tuple[str, int, List[bytes]]
+"""Tuple containing the codec as first element, the number of samples per stream as
+second element and the compressed streams as third element."""
+
+_Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+_CODECS: Dict[str, _Codec] = {
+    "none": (bytes, bytes),
+    "zlib": (lambda b: zlib.compress(b, 1), zlib.decompress),
+}
+
+try:
+    import zstandard  # type: ignore
+
+    _CODECS["zstd"] = (
+        lambda b: zstandard.ZstdCompressor(level=1).compress(b),
+        lambda b: zstandard.ZstdDecompressor().decompress(b),
+    )
+except ImportError:
+    pass
+
+try:
+    import lz4.frame  # type: ignore
+
+    _CODECS["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+
+
+def availableCodecs() -> List[str]:
+    """Names of the codecs available in this environment."""
+    return list(_CODECS.keys())
+
+
+def _shuffle(data: np.ndarray) -> bytes:
+    raw = np.ascontiguousarray(data, dtype=SAMPLE_DTYPE).view(np.uint8)
+    return raw.reshape(-1, np.dtype(SAMPLE_DTYPE).itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, numSamples: int) -> np.ndarray:
+    raw = np.frombuffer(data, dtype=np.uint8)
+    return raw.reshape(np.dtype(SAMPLE_DTYPE).itemsize, numSamples).T.copy().view(
+        SAMPLE_DTYPE).reshape(numSamples)
+
+
+def compressStream(data: np.ndarray, codec: str) -> bytes:
+    """Shuffle and compress a onedimensional array of samples with `codec`."""
+    return _CODECS[codec][0](_shuffle(data))
+
+
+def decompressStream(data: bytes, codec: str, numSamples: int) -> np.ndarray:
+    """Inverse of `compressStream`.
+
+    Raises:
+        ValueError: Unknown codec or the stream does not contain `numSamples` samples.
+    """
+    if codec not in _CODECS:
+        raise ValueError(f"Codec {codec} is not available.")
+    raw = _CODECS[codec][1](data)
+    if len(raw) != numSamples * np.dtype(SAMPLE_DTYPE).itemsize:
+        raise ValueError(f"Compressed stream does not contain {numSamples} samples.")
+    return _unshuffle(raw, numSamples)
+
+
+def decompressSignal(serialized: SerializedCompressedSignal,
+                     out: Optional[MimoSignal] = None) -> MimoSignal:
+    """Decompress a signal compressed by `SignalCompressor`.
+
+    Args:
+        serialized (SerializedCompressedSignal): Compressed signal.
+        out (MimoSignal, optional): Preallocated buffer the samples are written to in
+            place. Needs to have as many streams and samples as the signal.
+
+    Returns:
+        MimoSignal: Decompressed signal. If `out` is given, `out` is returned.
+    """
+    codec, numSamples, streams = serialized
+    signals = [decompressStream(s, codec, numSamples) for s in streams]
+    if out is None:
+        return MimoSignal(signals=signals)
+
+    if len(out.signals) != len(signals):
+        raise ValueError(f"Output buffer has {len(out.signals)} streams, "
+                         f"but {len(signals)} streams were received.")
+    for s, o in zip(signals, out.signals):
+        if o.shape != s.shape:
+            raise ValueError(f"Output buffer has shape {o.shape}, "
+                             f"but {numSamples} samples were received.")
+        o[:] = s
+    return out
+
+
+class CodecSelector:
+    """Selects the codec with the shortest expected time for compression and transfer.
+
+    For each codec, the compression ratio and compression throughput are measured and
+    averaged over the calls. Codecs without measurement are tried first.
+    """
+
+    DEFAULT_LINK_RATE = 12.5e6
+    """Link rate in bytes per second assumed if the client did not measure one."""
+
+    def __init__(self, smoothing: float = 0.5) -> None:
+        self.__smoothing = smoothing
+        self.__ratio: Dict[str, float] = {"none": 1.0}
+        self.__throughput: Dict[str, float] = {"none": float("inf")}
+
+    def select(self, codecs: List[str], linkRate: float = 0) -> str:
+        """Select one of `codecs`.
+
+        Args:
+            codecs (List[str]): Candidates.
+            linkRate (float): Measured link rate in bytes per second, 0 if unknown.
+        """
+        if linkRate <= 0:
+            linkRate = self.DEFAULT_LINK_RATE
+        candidates = [c for c in codecs if c in _CODECS]
+        for c in candidates:
+            if c not in self.__ratio:
+                return c
+
+        def expectedTimePerByte(c: str) -> float:
+            return 1 / self.__throughput[c] + self.__ratio[c] / linkRate
+        return min(candidates, key=expectedTimePerByte, default="none")
+
+    def update(self, codec: str, numBytes: int, numCompressedBytes: int,
+               duration: float) -> None:
+        """Add a measurement of compressing `numBytes` with `codec`."""
+        if numBytes == 0 or codec == "none":
+            return
+        ratio = numCompressedBytes / numBytes
+        throughput = numBytes / max(duration, 1e-9)
+        if codec not in self.__ratio:
+            self.__ratio[codec] = ratio
+            self.__throughput[codec] = throughput
+            return
+        a = self.__smoothing
+        self.__ratio[codec] = a * ratio + (1 - a) * self.__ratio[codec]
+        self.__throughput[codec] = a * throughput + (1 - a) * self.__throughput[codec]
+
+
+class SignalCompressor:
+    """Compresses signals in a pool of worker threads.
+
+    The codecs release the GIL, hence the streams are compressed in parallel. The pool
+    belongs to the hub of the creating thread, which keeps serving other greenlets while
+    a signal is compressed.
+    """
+
+    def __init__(self, numWorkers: int = 4) -> None:
+        self.__pool = gevent.threadpool.ThreadPool(numWorkers)
+        self.__selector = CodecSelector()
+
+    def compress(self, signals: List[MimoSignal], codecs: List[str],
+                 linkRate: float = 0) -> List[SerializedCompressedSignal]:
+        """Compress `signals` with one of `codecs` which is selected for this call.
+
+        Args:
+            signals (List[MimoSignal]): Signals to compress.
+            codecs (List[str]): Codecs supported by the receiver.
+            linkRate (float): Measured link rate in bytes per second, 0 if unknown.
+        """
+        codec = self.__selector.select(codecs, linkRate)
+        start = time.perf_counter()
+        streams = [[self.__pool.spawn(compressStream, s, codec) for s in signal.signals]
+                   for signal in signals]
+        gevent.wait([s for signalStreams in streams for s in signalStreams])
+        result: List[SerializedCompressedSignal] = []
+        for signal, signalStreams in zip(signals, streams):
+            numSamples = len(signal.signals[0]) if len(signal.signals) > 0 else 0
+            result.append((codec, numSamples, [s.get() for s in signalStreams]))
+        duration = time.perf_counter() - start
+
+        numBytes = sum(len(s) for signal in signals for s in signal.signals) * \
+            np.dtype(SAMPLE_DTYPE).itemsize
+        numCompressedBytes = sum(len(s) for _, _, streams in result for s in streams)
+        self.__selector.update(codec, numBytes, numCompressedBytes, duration)
+        return result
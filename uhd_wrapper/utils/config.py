@@ -1,17 +1,69 @@
 """This module contains classes and functions for configuring the USRPs"""
 
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
 from dataclasses import dataclass, field
+import operator
 from dataclasses_json import DataClassJsonMixin
 
 import numpy as np
 
 from .serialization import (
     SerializedComplexArray,
+    SerializedSparseComplexArray,
     serializeComplexArray,
     deserializeComplexArray,
+    serializeSparseComplexArray,
+    deserializeSparseComplexArray,
+    findNonZeroSegments,
 )
 
+CONFIG_SCHEMA_VERSION = 1
+"""Version of the packed representation of configs, cf. `RfConfig.pack`. It is increased
+whenever fields are added, removed or reordered."""
+
+PackedConfig = List[Any]
+"""Config packed as `[CONFIG_SCHEMA_VERSION, *values]`, which msgpack encodes natively."""
+
+
+class _ConfigSchema:
+    """Fixed order of the fields of a packed config. The fields are read by a
+    precompiled getter, hence configs and their bindings can be packed without
+    reflection."""
+
+    def __init__(self, fieldNames: Sequence[str]) -> None:
+        self.fieldNames = tuple(fieldNames)
+        self.__getter = operator.attrgetter(*self.fieldNames)
+
+    def pack(self, config: Any) -> PackedConfig:
+        """Pack the fields of `config`, which may be a dataclass or a binding."""
+        return [CONFIG_SCHEMA_VERSION, *self.__getter(config)]
+
+    def unpack(self, packed: Sequence[Any]) -> Dict[str, Any]:
+        """Map the field names to the values of `packed`.
+
+        Raises:
+            ValueError: `packed` was created by an incompatible schema.
+        """
+        if len(packed) == 0 or packed[0] != CONFIG_SCHEMA_VERSION:
+            raise ValueError(f"Unsupported config schema {packed[:1]}, "
+                             f"expected version {CONFIG_SCHEMA_VERSION}.")
+        if len(packed) != len(self.fieldNames) + 1:
+            raise ValueError(f"Packed config contains {len(packed) - 1} fields, "
+                             f"expected {len(self.fieldNames)}.")
+        return dict(zip(self.fieldNames, packed[1:]))
+
+
+RF_CONFIG_SCHEMA = _ConfigSchema([
+    "txAnalogFilterBw", "rxAnalogFilterBw", "txSamplingRate", "rxSamplingRate",
+    "txGain", "rxGain", "txCarrierFrequency", "rxCarrierFrequency",
+    "noTxStreams", "noRxStreams", "txAntennaMapping", "rxAntennaMapping",
+])
+
+RX_STREAMING_CONFIG_SCHEMA = _ConfigSchema([
+    "receiveTimeOffset", "numSamples", "numRepetitions", "repetitionPeriod",
+    "antennaPort", "carrierFrequency", "gain",
+])
+
 
 @dataclass
 class RfConfig(DataClassJsonMixin):
@@ -55,6 +107,17 @@ class RfConfig(DataClassJsonMixin):
     def deserialize(value: str) -> "RfConfig":
         return RfConfig.from_json(value)  # type: ignore
 
+    def pack(self) -> PackedConfig:
+        """Compact representation sent via RPC, cf. `RF_CONFIG_SCHEMA`."""
+        return RF_CONFIG_SCHEMA.pack(self)
+
+    @staticmethod
+    def unpack(packed: Sequence[Any]) -> "RfConfig":
+        values = RF_CONFIG_SCHEMA.unpack(packed)
+        values["txAntennaMapping"] = list(values["txAntennaMapping"])
+        values["rxAntennaMapping"] = list(values["rxAntennaMapping"])
+        return RfConfig(**values)
+
 
 @dataclass
 class RxStreamingConfig(DataClassJsonMixin):
@@ -64,6 +127,72 @@ class RxStreamingConfig(DataClassJsonMixin):
     repetitionPeriod: int = 0
     antennaPort: str = ""
 
+    carrierFrequency: Optional[float] = None
+    """
+    If set, the RX carrier frequency is changed to this value right before this config
+    starts. The change is kept for the following configs.
+    """
+
+    gain: Optional[float] = None
+    """
+    If set, the RX gain is changed to this value right before this config starts.
+    """
+
+    def pack(self) -> PackedConfig:
+        """Compact representation sent via RPC, cf. `RX_STREAMING_CONFIG_SCHEMA`."""
+        return RX_STREAMING_CONFIG_SCHEMA.pack(self)
+
+    @staticmethod
+    def unpack(packed: Sequence[Any]) -> "RxStreamingConfig":
+        return RxStreamingConfig(**RX_STREAMING_CONFIG_SCHEMA.unpack(packed))
+
+
+@dataclass
+class AgcConfig(DataClassJsonMixin):
+    """Parameters of the automatic gain control, cf. `UsrpClient.runAgc`."""
+
+    targetPeak: float = 0.5
+    """Desired peak amplitude of the received samples. Full scale corresponds to 1.0,
+    hence the default leaves a headroom of about 6 dB."""
+
+    tolerance: float = 1.0
+    """Accepted deviation of the measured peak from `targetPeak` in dB."""
+
+    numSamples: int = 10000
+    """Number of samples of each probe capture."""
+
+    maxIterations: int = 8
+    """Maximum number of probe captures."""
+
+    gainStep: float = 1.0
+    """The gains are multiples of this value, since the devices only support discrete
+    gains."""
+
+    minRxGain: float = 0.0
+    maxRxGain: float = 60.0
+
+    adjustTxGain: bool = False
+    """If the target cannot be reached within the RX gain range, the TX gain is adapted
+    as well. Only effective if a probe signal is transmitted."""
+
+    minTxGain: float = 0.0
+    maxTxGain: float = 60.0
+
+
+@dataclass
+class AgcResult(DataClassJsonMixin):
+    """Gains chosen by the automatic gain control and the statistics of the last
+    probe capture."""
+
+    rxGain: float = 0.0
+    txGain: float = 0.0
+    peak: float = 0.0
+    rms: float = 0.0
+    numIterations: int = 0
+    converged: bool = False
+    """False if the target could not be reached within the gain ranges or the number
+    of iterations. The gains closest to the target without clipping are returned."""
+
 
 @dataclass
 class MimoSignal:
@@ -75,8 +204,49 @@ class MimoSignal:
         return [serializeComplexArray(s) for s in self.signals]
 
     @staticmethod
-    def deserialize(serialized: List[SerializedComplexArray]) -> "MimoSignal":
-        return MimoSignal(signals=[deserializeComplexArray(s) for s in serialized])
+    def deserialize(serialized: List[SerializedComplexArray],
+                    out: Optional["MimoSignal"] = None) -> "MimoSignal":
+        """Deserialize into a `MimoSignal`.
+
+        If `out` is given, the samples are written in place into the preallocated
+        arrays of `out`, which is returned. This avoids allocating new arrays, when
+        the same buffers are used for many consecutive receptions.
+        """
+        if out is None:
+            return MimoSignal(signals=[deserializeComplexArray(s) for s in serialized])
+
+        if len(out.signals) != len(serialized):
+            raise ValueError(f"Output buffer contains {len(out.signals)} streams, "
+                             f"but {len(serialized)} streams were received.")
+        for s, o in zip(serialized, out.signals):
+            deserializeComplexArray(s, out=o)
+        return out
+
+    def serializeSparse(self) -> List[SerializedSparseComplexArray]:
+        """Serialize only the non-zero segments of the signals."""
+        return [serializeSparseComplexArray(s) for s in self.signals]
+
+    @staticmethod
+    def deserializeSparse(serialized: List[SerializedSparseComplexArray]) -> "MimoSignal":
+        return MimoSignal(signals=[deserializeSparseComplexArray(s) for s in serialized])
+
+    def occupancy(self) -> float:
+        """Returns the fraction of samples that would be transferred by the sparse
+        serialization, i.e. the share of samples within non-zero segments."""
+        totalSamples = sum(np.size(s) for s in self.signals)
+        if totalSamples == 0:
+            return 1.0
+        usedSamples = sum(end - start
+                          for s in self.signals
+                          for start, end in findNonZeroSegments(np.squeeze(s)))
+        return usedSamples / totalSamples
+
+    @staticmethod
+    def empty(numStreams: int, numSamples: int) -> "MimoSignal":
+        """Allocate a `MimoSignal` of `complex64` zeros that can be used as output
+        buffer for receiving samples."""
+        return MimoSignal(signals=[np.zeros(numSamples, dtype=np.complex64)
+                                   for _ in range(numStreams)])
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MimoSignal):
@@ -117,3 +287,14 @@ class TxStreamingConfig:
     not equal 1, the signal length must be aligned to the word size. Otherwise
     an error is raised.
     """
+
+    carrierFrequency: Optional[float] = None
+    """
+    If set, the TX carrier frequency is changed to this value right before this config
+    starts. The change is kept for the following configs.
+    """
+
+    gain: Optional[float] = None
+    """
+    If set, the TX gain is changed to this value right before this config starts.
+    """
@@ -0,0 +1,210 @@
+"""This module contains the data plane for transferring samples.
+
+Samples are transferred via a dedicated ZeroMQ socket per device, such that large
+transfers do not block the zerorpc control channel and are not packed by msgpack.
+Each stream of a signal is sent as a separate frame without copying. Only the handles
+of the transferred signals are exchanged via RPC.
+
+Client and server communicate in lockstep, i.e. each client has at most one transfer
+in flight. The server keeps at most `maxPendingBuffers` signals which have not been
+picked up yet and discards the oldest ones if more arrive. Signals stored together,
+e.g. those of one collect, are never discarded in favor of each other, hence a batch
+may exceed the limit until the client picked it up.
+
+The data plane does not check leases. Instead, the handles are random, hence a signal
+can only be picked up by the client that received its handle via RPC, which is guarded
+by the lease of the device.
+"""
+
+from typing import Dict, List, Optional
+import json
+import secrets
+
+import gevent
+import numpy as np
+import zmq.green as zmq
+
+from uhd_wrapper.utils.config import MimoSignal
+
+
+SAMPLE_DTYPE = np.complex64
+
+_PUT = b"PUT"
+_GET = b"GET"
+_OK = b"OK"
+_ERROR = b"ERR"
+
+
+def _signalToFrames(signal: MimoSignal) -> List:
+    numSamples = len(signal.signals[0]) if len(signal.signals) > 0 else 0
+    if any(len(s) != numSamples for s in signal.signals):
+        raise ValueError("All streams must contain the same number of samples.")
+    header = json.dumps({"numStreams": len(signal.signals), "numSamples": numSamples})
+    return [header.encode()] + [np.ascontiguousarray(s, dtype=SAMPLE_DTYPE)
+                                for s in signal.signals]
+
+
+def _framesToSignal(frames: List, out: Optional[MimoSignal] = None,
+                    copy: bool = True) -> MimoSignal:
+    header = json.loads(frames[0].bytes)
+    numStreams, numSamples = header["numStreams"], header["numSamples"]
+    if len(frames) != numStreams + 1:
+        raise ValueError(f"Expected {numStreams} streams, but received "
+                         f"{len(frames) - 1} frames.")
+
+    streams = [np.frombuffer(f.buffer, dtype=SAMPLE_DTYPE) for f in frames[1:]]
+    if any(len(s) != numSamples for s in streams):
+        raise ValueError(f"Streams do not contain {numSamples} samples.")
+    if out is None:
+        return MimoSignal(signals=[s.copy() if copy else s for s in streams])
+
+    if len(out.signals) != numStreams:
+        raise ValueError(f"Output buffer has {len(out.signals)} streams, "
+                         f"but {numStreams} streams were received.")
+    if any(o.shape != (numSamples,) for o in out.signals):
+        raise ValueError(f"Output buffer streams do not contain {numSamples} samples.")
+    for s, o in zip(streams, out.signals):
+        o[:] = s
+    return out
+
+
+class DataPlaneServer:
+    """Server side of the data plane, running in a greenlet next to the RPC server."""
+
+    def __init__(self, port: int = 0, maxPendingBuffers: int = 16) -> None:
+        """Bind the data socket.
+
+        Args:
+            port (int): Port the socket binds to. Use 0 to bind to a random port.
+            maxPendingBuffers (int): Maximum number of signals kept for pickup.
+        """
+        self.__socket: zmq.Socket = zmq.Context.instance().socket(zmq.ROUTER)
+        self.__socket.setsockopt(zmq.LINGER, 0)
+        if port == 0:
+            self.__port: int = self.__socket.bind_to_random_port("tcp://*")
+        else:
+            self.__socket.bind(f"tcp://*:{port}")
+            self.__port = port
+        self.__maxPendingBuffers = maxPendingBuffers
+        self.__buffers: Dict[str, MimoSignal] = {}
+        self.__greenlet: Optional[gevent.Greenlet] = None
+
+    @property
+    def port(self) -> int:
+        return self.__port
+
+    def start(self) -> None:
+        """Serve data requests in the background."""
+        self.__greenlet = gevent.spawn(self.serveForever)
+
+    def stop(self) -> None:
+        if self.__greenlet is not None:
+            self.__greenlet.kill()
+            self.__greenlet = None
+        self.__socket.close()
+
+    def store(self, signal: MimoSignal) -> str:
+        """Keep `signal` for pickup by a client and return its handle."""
+        return self.storeBatch([signal])[0]
+
+    def storeBatch(self, signals: List[MimoSignal]) -> List[str]:
+        """Keep `signals` for pickup by a client and return their handles.
+
+        To stay within `maxPendingBuffers`, only signals stored before are discarded,
+        the oldest first.
+        """
+        numDiscarded = len(self.__buffers) + len(signals) - self.__maxPendingBuffers
+        for handle in list(self.__buffers)[:max(numDiscarded, 0)]:
+            del self.__buffers[handle]
+
+        handles = [secrets.token_hex(16) for _ in signals]
+        self.__buffers.update(zip(handles, signals))
+        return handles
+
+    def take(self, handle: str) -> MimoSignal:
+        """Remove the signal of `handle` and return it.
+
+        Raises:
+            KeyError: No signal is stored for `handle`.
+        """
+        try:
+            return self.__buffers.pop(handle)
+        except KeyError:
+            raise KeyError(f"No signal is stored for handle {handle}.") from None
+
+    def serveForever(self) -> None:
+        while True:
+            self.serveOnce()
+
+    def serveOnce(self) -> None:
+        """Wait for a single request and reply to it."""
+        identity, empty, command, *frames = self.__socket.recv_multipart(copy=False)
+        reply: List
+        try:
+            if command.bytes == _PUT:
+                # the received frames are only read when setting the TX config
+                handle = self.store(_framesToSignal(frames, copy=False))
+                reply = [_OK, handle.encode()]
+            elif command.bytes == _GET:
+                reply = [_OK] + _signalToFrames(self.take(frames[0].bytes.decode()))
+            else:
+                raise ValueError(f"Unknown data plane command {command.bytes!r}")
+        except Exception as e:
+            reply = [_ERROR, str(e).encode()]
+        self.__socket.send_multipart([identity, empty, *reply], copy=False)
+
+
+class DataPlaneClient:
+    """Client side of the data plane of one device."""
+
+    def __init__(self, ip: str, port: int, timeout: float = 30.0) -> None:
+        """Connect to the data plane server.
+
+        Args:
+            ip (str): IP of the server.
+            port (int): Port of the data plane server.
+            timeout (float): Seconds to wait for a reply of the server.
+        """
+        self.__address = f"tcp://{ip}:{port}"
+        self.__timeoutMs = int(timeout * 1000)
+        self.__socket = self.__connect()
+
+    def __connect(self) -> zmq.Socket:
+        socket: zmq.Socket = zmq.Context.instance().socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(self.__address)
+        return socket
+
+    def close(self) -> None:
+        self.__socket.close()
+
+    def upload(self, signal: MimoSignal) -> str:
+        """Transfer `signal` to the server and return the handle it is stored under."""
+        reply = self.__request([_PUT] + _signalToFrames(signal))
+        return str(reply[0].bytes.decode())
+
+    def download(self, handle: str, out: Optional[MimoSignal] = None) -> MimoSignal:
+        """Fetch the signal stored under `handle` from the server.
+
+        Args:
+            handle (str): Handle of the signal.
+            out (MimoSignal, optional): Preallocated buffer the samples are written to
+                in place.
+        """
+        reply = self.__request([_GET, handle.encode()])
+        return _framesToSignal(reply, out=out)
+
+    def __request(self, frames: List) -> List:
+        self.__socket.send_multipart(frames, copy=False)
+        # the timeout options of the socket have no effect in zmq.green
+        poller = zmq.Poller()
+        poller.register(self.__socket, zmq.POLLIN)
+        if len(poller.poll(self.__timeoutMs)) == 0:
+            # a REQ socket cannot send again without a reply, hence reconnect
+            self.__socket.close()
+            self.__socket = self.__connect()
+            raise IOError(f"Data plane {self.__address} did not reply in time")
+        status, *reply = self.__socket.recv_multipart(copy=False)
+        if status.bytes != _OK:
+            raise RuntimeError(reply[0].bytes.decode())
+        return reply
@@ -0,0 +1,5 @@
+"""This module contains the parts of the leasing of a USRP shared by client and
+server, cf. `uhd_wrapper.rpc_server.job_queue`."""
+
+LEASE_TOKEN_HEADER = "lease_token"
+"""Header of a request containing the lease token of the client."""
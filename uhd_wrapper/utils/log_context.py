@@ -0,0 +1,117 @@
+"""This module contains the structured logging of the server.
+
+Each log record of the server carries the correlation ID of the request it belongs to,
+i.e. the trace ID of traced requests and the message ID of zerorpc otherwise. The
+`LogCorrelationMiddleware` also passes the ID to the logging of the USRP, which prefixes
+its messages with it. Since the requests are served by greenlets of the same OS thread,
+which share the ID of the USRP, the middleware passes the ID of a greenlet again
+whenever a switch to it changes the ID. Switches to the hub are ignored, as the hub
+only schedules greenlets and never calls the USRP.
+
+Levels are named as in UHD: `trace`, `debug`, `info`, `warning`, `error` and `off`.
+"""
+
+import contextvars
+import logging
+from typing import Any, Callable, Optional
+
+import greenlet
+from gevent.hub import Hub
+
+from uhd_wrapper.utils.tracing import TRACE_ID_HEADER
+
+LOG_LEVELS = ("trace", "debug", "info", "warning", "error", "off")
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(correlationId)s] %(name)s: %(message)s"
+"""Format of the server log, requires the `CorrelationIdFilter`."""
+
+_PYTHON_LOG_LEVELS = {
+    "trace": logging.DEBUG,
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "off": logging.CRITICAL + 1,
+}
+
+_correlationId: contextvars.ContextVar[str] = contextvars.ContextVar("correlationId",
+                                                                     default="")
+
+
+def pythonLogLevel(level: str) -> int:
+    """Level of the `logging` module corresponding to `level`."""
+    if level not in _PYTHON_LOG_LEVELS:
+        raise ValueError(f"Unknown log level {level}, valid are {', '.join(LOG_LEVELS)}")
+    return _PYTHON_LOG_LEVELS[level]
+
+
+def currentCorrelationId() -> str:
+    """Correlation ID of the request being executed, empty outside of requests."""
+    return _correlationId.get()
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Adds the attribute `correlationId` to each record, cf. `LOG_FORMAT`."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlationId = currentCorrelationId()
+        return True
+
+
+class LogCorrelationMiddleware:
+    """zerorpc middleware setting the correlation ID while a request is executed.
+
+    Register it with `zerorpc.Context.get_instance().register_middleware`. If the ID is
+    passed to the USRP, the middleware traces the greenlet switches until `close`.
+    """
+
+    def __init__(self,
+                 setNativeCorrelationId: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Args:
+            setNativeCorrelationId (Callable[[str], None], optional): Passes the ID to
+                the logging of the USRP, e.g. `usrp_pybinding.setLogCorrelationId`.
+        """
+        self.__setNative = setNativeCorrelationId
+        # the ID passed to the USRP last, which is only passed again if it changes
+        self.__nativeId: Optional[str] = None
+        self.__previousTrace: Optional[Callable[[str, Any], Any]] = None
+        if setNativeCorrelationId is not None:
+            self.__previousTrace = greenlet.settrace(self.__traceSwitch)
+
+    def close(self) -> None:
+        """Stop passing the correlation ID to the USRP on greenlet switches."""
+        if self.__setNative is not None and greenlet.gettrace() == self.__traceSwitch:
+            greenlet.settrace(self.__previousTrace)
+        self.__setNative = None
+
+    def server_before_exec(self, requestEvent: Any) -> None:
+        header = requestEvent.header
+        correlationId = header.get(TRACE_ID_HEADER, header.get("message_id", ""))
+        if isinstance(correlationId, bytes):
+            correlationId = correlationId.decode(errors="replace")
+        self.__set(str(correlationId))
+
+    def server_after_exec(self, requestEvent: Any, replyEvent: Optional[Any]) -> None:
+        self.__set("")
+
+    def server_inspect_exception(self, requestEvent: Any, replyEvent: Optional[Any],
+                                 taskContext: Any, excInfos: Any) -> None:
+        self.__set("")
+
+    def __traceSwitch(self, event: str, args: Any) -> None:
+        if event in ("switch", "throw") and not isinstance(args[1], Hub):
+            context = args[1].gr_context
+            self.__passToNative(context.get(_correlationId, "") if context is not None
+                                else "")
+        if self.__previousTrace is not None:
+            self.__previousTrace(event, args)
+
+    def __set(self, correlationId: str) -> None:
+        _correlationId.set(correlationId)
+        self.__passToNative(correlationId)
+
+    def __passToNative(self, correlationId: str) -> None:
+        if self.__setNative is not None and correlationId != self.__nativeId:
+            self.__setNative(correlationId)
+            self.__nativeId = correlationId
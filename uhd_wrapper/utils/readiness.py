@@ -0,0 +1,85 @@
+"""This module contains the readiness of a server that is reported to clients during
+its startup, cf. `UsrpServer.getReadiness`."""
+
+import contextlib
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+INITIALIZING = "initializing"
+READY = "ready"
+FAILED = "failed"
+
+
+class ServerNotReadyError(RuntimeError):
+    """Raised by a server that is still initializing for all requests except
+    `getReadiness`."""
+
+
+class ServerReadiness:
+    """Tracks the state of the server startup and the duration of its phases."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__start = time.monotonic()
+        self.__state = INITIALIZING
+        self.__error = ""
+        self.__phases: Dict[str, float] = dict()
+
+    @property
+    def state(self) -> str:
+        return self.__state
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the duration of the startup phase `name` covering the `with` block.
+        If the block raises, the startup is marked as failed."""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.fail(e)
+            raise
+        finally:
+            with self.__lock:
+                self.__phases[name] = time.monotonic() - start
+
+    def restart(self) -> None:
+        """Start measuring a new startup, e.g. when the device is reopened."""
+        with self.__lock:
+            self.__start = time.monotonic()
+            self.__state = INITIALIZING
+            self.__error = ""
+            self.__phases.clear()
+
+    def ready(self) -> None:
+        with self.__lock:
+            self.__state = READY
+
+    def fail(self, error: BaseException) -> None:
+        with self.__lock:
+            self.__state = FAILED
+            self.__error = f"{type(error).__name__}: {error}"
+
+    def report(self, extraPhases: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Readiness as sent to clients.
+
+        Args:
+            extraPhases (Dict[str, float], optional): Durations of further phases, e.g.
+                measured by the USRP itself.
+
+        Returns:
+            Dict[str, Any]: `state` is one of `initializing`, `ready` and `failed`.
+            `phases` contains the durations of the startup phases in seconds, `uptime`
+            the time since the startup began and `error` the reason of a failure.
+        """
+        with self.__lock:
+            phases = dict(self.__phases)
+            if extraPhases is not None:
+                phases.update(extraPhases)
+            return {
+                "state": self.__state,
+                "phases": phases,
+                "uptime": time.monotonic() - self.__start,
+                "error": self.__error,
+            }
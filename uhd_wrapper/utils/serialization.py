@@ -3,7 +3,7 @@
 Since we use zerorpc for RPC, we need to serialize non-pythonic datatypes.
 """
 
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 import numpy as np
 
 
@@ -31,21 +31,112 @@ def serializeComplexArray(data: np.ndarray) -> SerializedComplexArray:
     return (np.real(data).tolist(), np.imag(data).tolist())
 
 
-def deserializeComplexArray(data: SerializedComplexArray) -> np.ndarray:
+def deserializeComplexArray(data: SerializedComplexArray,
+                            out: Optional[np.ndarray] = None) -> np.ndarray:
     """Deserialize into a complex array.
 
     Args:
         data (SerializedComplexArray): Samples.
+        out (np.ndarray, optional): Preallocated complex array the samples are written
+            to in place. Needs to have exactly as many elements as `data` contains samples.
     Raises:
         ValueError: Number of samples must match
 
     Returns:
-        np.ndarray: One dimensional numpy array.
+        np.ndarray: One dimensional numpy array. If `out` is given, `out` is returned.
     """
     if len(data[0]) != len(data[1]):
         raise ValueError(
             """Number of imaginary samples
                             mismatches number of real samples."""
         )
-    arr = np.array(data[0]) + 1j * np.array(data[1])
+    if out is None:
+        arr = np.array(data[0]) + 1j * np.array(data[1])
+        return arr
+
+    if not np.iscomplexobj(out):
+        raise ValueError("Output buffer must be a complex array.")
+    if out.shape != (len(data[0]),):
+        raise ValueError(f"Output buffer has shape {out.shape}, "
+                         f"but {len(data[0])} samples were received.")
+    out.real[:] = data[0]
+    out.imag[:] = data[1]
+    return out
+
+
+SerializedSparseComplexArray = Tuple[int, List[Tuple[int, List, List]]]
+"""Tuple containing the total number of samples as first element and the list of
+non-zero segments as second element. Each segment is a tuple of its start index,
+its real samples as `List` and its imaginary samples as `List`."""
+
+
+def findNonZeroSegments(data: np.ndarray, minZeroRun: int = 16) -> List[Tuple[int, int]]:
+    """Find the segments of an array that contain non-zero samples.
+
+    Args:
+        data (np.ndarray): Onedimensional array of samples.
+        minZeroRun (int): Runs of zeros shorter than this are kept within a segment,
+            since encoding them is cheaper than starting a new segment.
+
+    Returns:
+        List[Tuple[int, int]]: Start (inclusive) and end (exclusive) index per segment.
+    """
+    nonZero = np.flatnonzero(data)
+    if len(nonZero) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(nonZero) > minZeroRun)
+    starts = nonZero[np.r_[0, breaks + 1]]
+    ends = nonZero[np.r_[breaks, len(nonZero) - 1]] + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def serializeSparseComplexArray(data: np.ndarray,
+                                minZeroRun: int = 16) -> SerializedSparseComplexArray:
+    """Serialize a complex array that mostly contains zeros.
+
+    Only the non-zero segments are serialized, the zero runs in between are implicitly
+    given by the segment start indices and the total length.
+
+    Args:
+        data (np.ndarray): Onedimensional array of complex samples.
+        minZeroRun (int): Minimum length of zero runs that are omitted.
+
+    Raises:
+        ValueError: Array must be one dimensional.
+
+    Returns:
+        SerializedSparseComplexArray: Serialized data.
+    """
+    data = np.squeeze(data)
+    if len(data.shape) == 2:
+        raise ValueError("Array must be one dimensional!")
+    segments = [
+        (start, np.real(data[start:end]).tolist(), np.imag(data[start:end]).tolist())
+        for start, end in findNonZeroSegments(data, minZeroRun)
+    ]
+    return (len(data), segments)
+
+
+def deserializeSparseComplexArray(data: SerializedSparseComplexArray) -> np.ndarray:
+    """Deserialize into a complex array.
+
+    Args:
+        data (SerializedSparseComplexArray): Length and non-zero segments.
+
+    Raises:
+        ValueError: Segments must lie within the array.
+
+    Returns:
+        np.ndarray: One dimensional `complex64` numpy array.
+    """
+    length, segments = data
+    arr = np.zeros(length, dtype=np.complex64)
+    for start, real, imag in segments:
+        if len(real) != len(imag):
+            raise ValueError("Number of imaginary samples mismatches number of real samples.")
+        end = start + len(real)
+        if start < 0 or end > length:
+            raise ValueError("Segment exceeds the length of the array.")
+        arr.real[start:end] = real
+        arr.imag[start:end] = imag
     return arr
@@ -0,0 +1,134 @@
+"""This module contains functions to exchange samples via shared memory.
+
+If client and server run on the same host, transferring the samples via msgpack
+over the loopback interface is unnecessarily slow. Instead, the samples are stored
+in POSIX shared memory segments and only their descriptors are sent via RPC.
+"""
+
+from typing import List, Optional, Tuple
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import socket
+
+import numpy as np
+
+from uhd_wrapper.utils.config import MimoSignal
+
+
+SharedMemoryDescriptor = Tuple[str, int, int]
+"""Tuple containing the name of the shared memory segment, the number of streams
+and the number of samples per stream."""
+
+SAMPLE_DTYPE = np.complex64
+
+
+def hostId() -> str:
+    """Identifier of the host the calling process runs on.
+
+    Client and server can exchange samples via shared memory if their host ids
+    are identical.
+    """
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            bootId = f.read().strip()
+    except OSError:
+        bootId = ""
+    return f"{socket.gethostname()}:{bootId}"
+
+
+def _untrack(shm: SharedMemory) -> None:
+    # The resource tracker unlinks all segments a process has created or attached to
+    # when it exits. Since the ownership of the segments is passed between client and
+    # server, the segment must not be unlinked by the tracker.
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+
+
+def _signalView(shm: SharedMemory, numStreams: int, numSamples: int) -> np.ndarray:
+    return np.ndarray((numStreams, numSamples), dtype=SAMPLE_DTYPE, buffer=shm.buf)
+
+
+def writeSharedMemory(signal: MimoSignal) -> SharedMemoryDescriptor:
+    """Store `signal` in a newly created shared memory segment.
+
+    The ownership of the segment is passed to the receiver of the descriptor, which
+    needs to unlink it, e.g. by calling `readSharedMemory` with `unlink=True`.
+
+    Args:
+        signal (MimoSignal): Signal to store. All streams need to have the same length.
+
+    Raises:
+        ValueError: Streams differ in length.
+
+    Returns:
+        SharedMemoryDescriptor: Descriptor of the created segment.
+    """
+    numStreams = len(signal.signals)
+    numSamples = len(signal.signals[0]) if numStreams > 0 else 0
+    if any(len(s) != numSamples for s in signal.signals):
+        raise ValueError("All streams must contain the same number of samples.")
+
+    size = max(numStreams * numSamples * np.dtype(SAMPLE_DTYPE).itemsize, 1)
+    shm = SharedMemory(create=True, size=size)
+    try:
+        view = _signalView(shm, numStreams, numSamples)
+        for stream, samples in zip(view, signal.signals):
+            stream[:] = samples
+        del view
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    _untrack(shm)
+    shm.close()
+    return (shm.name, numStreams, numSamples)
+
+
+def readSharedMemory(descriptor: SharedMemoryDescriptor, out: Optional[MimoSignal] = None,
+                     unlink: bool = False) -> MimoSignal:
+    """Copy the signal stored in a shared memory segment.
+
+    Args:
+        descriptor (SharedMemoryDescriptor): Descriptor of the segment.
+        out (MimoSignal, optional): Preallocated buffer the samples are written to in
+            place. Needs to have exactly as many streams and samples as the segment.
+        unlink (bool): Remove the segment after reading it.
+
+    Raises:
+        ValueError: `out` does not match the segment.
+
+    Returns:
+        MimoSignal: The stored signal. If `out` is given, `out` is returned.
+    """
+    name, numStreams, numSamples = descriptor
+    shm = SharedMemory(name=name)
+    try:
+        if out is not None:
+            if len(out.signals) != numStreams:
+                raise ValueError(f"Output buffer has {len(out.signals)} streams, "
+                                 f"but {numStreams} streams were received.")
+            if any(s.shape != (numSamples,) for s in out.signals):
+                raise ValueError("Output buffer streams do not contain "
+                                 f"{numSamples} samples.")
+
+        view = _signalView(shm, numStreams, numSamples)
+        if out is None:
+            out = MimoSignal(signals=[np.array(s) for s in view])
+        else:
+            for s, o in zip(view, out.signals):
+                o[:] = s
+        del view
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+        else:
+            _untrack(shm)
+    return out
+
+
+def unlinkSharedMemory(descriptors: List[SharedMemoryDescriptor]) -> None:
+    """Remove the shared memory segments of the given descriptors."""
+    for name, _, _ in descriptors:
+        shm = SharedMemory(name=name)
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,48 @@
+"""This module contains the server side of the request tracing of the client.
+
+Clients with enabled tracing add a trace ID to the header of their requests. The
+`TracingMiddleware` measures the execution of these requests on the server and returns
+the span in the header of the reply. Requests without trace ID are not measured, and
+clients of older versions ignore the additional header.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+TRACE_ID_HEADER = "trace_id"
+"""Header of a request containing the ID of the span on the client."""
+
+SERVER_SPAN_HEADER = "trace_span"
+"""Header of a reply containing the span of the request on the server."""
+
+
+class TracingMiddleware:
+    """zerorpc middleware measuring traced requests on the server.
+
+    Register it with `zerorpc.Context.get_instance().register_middleware`.
+    """
+
+    def __init__(self) -> None:
+        self.__starts: Dict[int, float] = dict()
+
+    def server_before_exec(self, requestEvent: Any) -> None:
+        if TRACE_ID_HEADER in requestEvent.header:
+            self.__starts[id(requestEvent)] = time.time()
+
+    def server_after_exec(self, requestEvent: Any, replyEvent: Optional[Any]) -> None:
+        self.__finish(requestEvent, replyEvent)
+
+    def server_inspect_exception(self, requestEvent: Any, replyEvent: Optional[Any],
+                                 taskContext: Any, excInfos: Any) -> None:
+        self.__finish(requestEvent, replyEvent)
+
+    def __finish(self, requestEvent: Any, replyEvent: Optional[Any]) -> None:
+        start = self.__starts.pop(id(requestEvent), None)
+        if start is None or replyEvent is None:
+            return
+        replyEvent.header[SERVER_SPAN_HEADER] = {
+            "id": requestEvent.header[TRACE_ID_HEADER],
+            "name": requestEvent.name,
+            "start": start,
+            "duration": time.time() - start,
+        }
@@ -1,8 +1,13 @@
 
+import functools
+
+
+@functools.lru_cache(maxsize=None)
 def versionFromFile(fileName: str, pattern: str) -> str:
     """Extract the version from a file.
 
-    Searches for pattern, extracts the version string from the first line matching the pattern
+    Searches for pattern, extracts the version string from the first line matching the pattern.
+    The result is cached, since checking for local changes spawns a git process.
 
     Args:
         fileName: file to open
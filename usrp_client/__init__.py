@@ -1,7 +1,31 @@
-
-from .rpc_client import UsrpClient
-from .system import System
-from uhd_wrapper.utils.config import MimoSignal, TxStreamingConfig, RxStreamingConfig, RfConfig
+"""Client of the USRP RPC server.
+
+The attributes of this package are imported lazily on first access, such that
+importing the package does not load the transport (zerorpc, gevent, msgpack) and numpy
+before they are needed.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .rpc_client import UsrpClient
+    from .system import System
+    from uhd_wrapper.utils.config import (
+        MimoSignal,
+        TxStreamingConfig,
+        RxStreamingConfig,
+        RfConfig,
+    )
+
+_LAZY_ATTRIBUTES = {
+    "UsrpClient": "usrp_client.rpc_client",
+    "System": "usrp_client.system",
+    "MimoSignal": "uhd_wrapper.utils.config",
+    "TxStreamingConfig": "uhd_wrapper.utils.config",
+    "RxStreamingConfig": "uhd_wrapper.utils.config",
+    "RfConfig": "uhd_wrapper.utils.config",
+}
 
 
 def _get_version() -> str:
@@ -15,7 +39,19 @@ def _get_version() -> str:
         return versionFromPackage("usrp-uhd-client")
 
 
-__version__ = _get_version()
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value: Any = _get_version()
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals().keys()) + list(_LAZY_ATTRIBUTES.keys()) + ["__version__"])
 
 
 __all__ = ["UsrpClient", "System",
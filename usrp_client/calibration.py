@@ -0,0 +1,168 @@
+"""This module contains the calibration of the TX to RX latency of links.
+
+The number of samples between the start of a transmission and the arrival of the
+signal in the receive buffer is constant for a link, as long as its RF settings do not
+change. The measured latencies are stored in a cache file per link, i.e. per pair of
+devices, sampling rate and antenna mapping. Entries become stale if the carrier
+frequency or the analog filter bandwidth of the link changed since the measurement.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+import json
+import os
+import tempfile
+import time
+
+from dataclasses_json import DataClassJsonMixin
+import numpy as np
+
+from uhd_wrapper.utils.config import RfConfig
+
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "usrp_uhd_wrapper",
+                                  "latency.json")
+
+_CACHE_VERSION = 1
+
+
+@dataclass
+class LatencyEntry(DataClassJsonMixin):
+    """Measured latency of a link."""
+
+    txDevice: str = ""
+    rxDevice: str = ""
+    txSamplingRate: float = 0.0
+    rxSamplingRate: float = 0.0
+    txAntennaMapping: List[int] = field(default_factory=list)
+    rxAntennaMapping: List[int] = field(default_factory=list)
+
+    txCarrierFrequency: float = 0.0
+    rxCarrierFrequency: float = 0.0
+    txAnalogFilterBw: float = 0.0
+    rxAnalogFilterBw: float = 0.0
+
+    delaySamples: int = 0
+    """Delay of the received signal in samples at `rxSamplingRate`."""
+
+    measuredAt: float = 0.0
+    """Time of the measurement in seconds since the epoch."""
+
+    @staticmethod
+    def create(txDevice: str, txRfConfig: RfConfig, rxDevice: str, rxRfConfig: RfConfig,
+               delaySamples: int = 0) -> "LatencyEntry":
+        return LatencyEntry(
+            txDevice=txDevice, rxDevice=rxDevice,
+            txSamplingRate=txRfConfig.txSamplingRate,
+            rxSamplingRate=rxRfConfig.rxSamplingRate,
+            txAntennaMapping=list(txRfConfig.txAntennaMapping),
+            rxAntennaMapping=list(rxRfConfig.rxAntennaMapping),
+            txCarrierFrequency=txRfConfig.txCarrierFrequency,
+            rxCarrierFrequency=rxRfConfig.rxCarrierFrequency,
+            txAnalogFilterBw=txRfConfig.txAnalogFilterBw,
+            rxAnalogFilterBw=rxRfConfig.rxAnalogFilterBw,
+            delaySamples=delaySamples, measuredAt=time.time())
+
+    @property
+    def link(self) -> str:
+        """Identifies the link, i.e. devices, sampling rates and antenna mappings."""
+        return (f"{self.txDevice}{self.txAntennaMapping}@{self.txSamplingRate}->"
+                f"{self.rxDevice}{self.rxAntennaMapping}@{self.rxSamplingRate}")
+
+    def isStale(self, current: "LatencyEntry") -> bool:
+        """Checks if the RF settings of the link changed since the measurement."""
+        return (self.txCarrierFrequency != current.txCarrierFrequency
+                or self.rxCarrierFrequency != current.rxCarrierFrequency
+                or self.txAnalogFilterBw != current.txAnalogFilterBw
+                or self.rxAnalogFilterBw != current.rxAnalogFilterBw)
+
+
+def findSignalDelay(rxSignal: np.ndarray, txSignal: np.ndarray) -> int:
+    """Find the delay of `txSignal` within `rxSignal` by cross-correlation.
+
+    Raises:
+        ValueError: `rxSignal` is shorter than `txSignal`.
+
+    Returns:
+        int: Index of the first sample of `txSignal` in `rxSignal`.
+    """
+    if len(rxSignal) < len(txSignal) or len(txSignal) == 0:
+        raise ValueError("The received signal must be at least as long as the transmitted "
+                         "signal.")
+    n = 1 << int(np.ceil(np.log2(len(rxSignal) + len(txSignal) - 1)))
+    correlation = np.fft.ifft(np.fft.fft(rxSignal, n) * np.conj(np.fft.fft(txSignal, n)))
+    return int(np.argmax(np.abs(correlation[:len(rxSignal) - len(txSignal) + 1])))
+
+
+class LatencyCalibration:
+    """Cache of the measured latencies of links, persisted in a JSON file."""
+
+    def __init__(self, cacheFile: str = DEFAULT_CACHE_FILE) -> None:
+        """
+        Args:
+            cacheFile (str): File the latencies are stored in. It is created on the first
+                measurement.
+        """
+        self.__cacheFile = cacheFile
+        self.__entries = {e.link: e for e in self.__load()}
+
+    @property
+    def cacheFile(self) -> str:
+        return self.__cacheFile
+
+    def lookup(self, txDevice: str, txRfConfig: RfConfig, rxDevice: str,
+               rxRfConfig: RfConfig) -> Optional[int]:
+        """Returns the delay in RX samples of the link, None if it is not calibrated.
+
+        A stale entry is removed from the cache.
+        """
+        current = LatencyEntry.create(txDevice, txRfConfig, rxDevice, rxRfConfig)
+        entry = self.__entries.get(current.link)
+        if entry is None:
+            return None
+        if entry.isStale(current):
+            del self.__entries[current.link]
+            self.__save()
+            return None
+        return entry.delaySamples
+
+    def store(self, txDevice: str, txRfConfig: RfConfig, rxDevice: str,
+              rxRfConfig: RfConfig, delaySamples: int) -> None:
+        """Store the measured delay of the link in RX samples."""
+        entry = LatencyEntry.create(txDevice, txRfConfig, rxDevice, rxRfConfig,
+                                    delaySamples)
+        self.__entries[entry.link] = entry
+        self.__save()
+
+    def invalidate(self, device: str) -> None:
+        """Remove all entries of links `device` is part of, e.g. after replacing cables."""
+        self.__entries = {link: e for link, e in self.__entries.items()
+                          if device not in (e.txDevice, e.rxDevice)}
+        self.__save()
+
+    def __load(self) -> List[LatencyEntry]:
+        try:
+            with open(self.__cacheFile) as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if content.get("version") != _CACHE_VERSION:
+            return []
+        return [LatencyEntry.from_dict(e) for e in content.get("entries", [])]
+
+    def __save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.__cacheFile))
+        os.makedirs(directory, exist_ok=True)
+        content = {"version": _CACHE_VERSION,
+                   "entries": [e.to_dict() for e in self.__entries.values()]}
+
+        # replace the file atomically such that concurrent readers never see a
+        # partially written cache
+        fd, tmpFile = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(content, f, indent=2)
+            os.replace(tmpFile, self.__cacheFile)
+        except BaseException:
+            os.unlink(tmpFile)
+            raise
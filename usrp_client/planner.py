@@ -0,0 +1,243 @@
+"""This module contains the client-side validation of streaming configs.
+
+The planner mirrors the checks the device performs when streaming configs are set
+(cf. `config.cpp`) and tracks the usage of the replay memory like the
+`BlockOffsetTracker`. Hence, invalid configs are rejected before their samples are
+transferred, and the duration of the burst is known before it is executed.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from uhd_wrapper.utils.config import RfConfig, RxStreamingConfig, TxStreamingConfig
+
+
+MAX_STREAMS = 4
+
+
+@dataclass
+class DeviceCapabilities:
+    """Limits of a device, as returned by `UsrpServer.getCapabilities`."""
+
+    txBufferSize: int
+    """Size of the TX part of the replay memory in bytes."""
+
+    rxBufferSize: int
+    """Size of the RX part of the replay memory in bytes."""
+
+    sampleSize: int = 4
+    wordSize: int = 8
+
+    guardOffset: float = 0.05
+    """Minimum time between two streaming configs in seconds."""
+
+    masterClockRate: float = 0.0
+    numAntennas: int = 0
+
+    @staticmethod
+    def fromDict(capabilities: Dict[str, float]) -> "DeviceCapabilities":
+        return DeviceCapabilities(
+            txBufferSize=int(capabilities["txBufferSize"]),
+            rxBufferSize=int(capabilities["rxBufferSize"]),
+            sampleSize=int(capabilities["sampleSize"]),
+            wordSize=int(capabilities["wordSize"]),
+            guardOffset=capabilities["guardOffset"],
+            masterClockRate=capabilities["masterClockRate"],
+            numAntennas=int(capabilities["numAntennas"]))
+
+    def maxTxSamples(self, numStreams: int) -> int:
+        """Maximum length of a TX signal, cf. `ReplayBlockConfig::getMaxTxSamples`."""
+        maxSamples = (self.txBufferSize // self.sampleSize - 1) // numStreams
+        return maxSamples - maxSamples % self.wordSize
+
+
+@dataclass
+class PlanSummary:
+    """Properties of the planned streaming configs of a device."""
+
+    burstDuration: float = 0.0
+    """Time from the base time until the last config finished streaming in seconds."""
+
+    txMemoryUsage: int = 0
+    """Bytes of the TX replay memory occupied by the planned configs."""
+
+    rxMemoryUsage: int = 0
+    """Bytes of the RX replay memory occupied by the planned configs."""
+
+    rxSignalLengths: List[int] = field(default_factory=list)
+    """Number of samples per stream of each signal returned by `collect`, in order.
+    Each repetition of a RX config yields a separate signal."""
+
+    numRxStreams: int = 1
+
+
+class StreamingPlanner:
+    """Validates the streaming configs of a device before they are sent to it."""
+
+    def __init__(self, capabilities: DeviceCapabilities, rfConfig: RfConfig) -> None:
+        self.__caps = capabilities
+        self.setRfConfig(rfConfig)
+        self.reset()
+
+    def setRfConfig(self, rfConfig: RfConfig) -> None:
+        """Use `rfConfig` for validating the following configs.
+
+        Raises:
+            ValueError: The number of streams is invalid.
+        """
+        for direction, numStreams in [("TX", rfConfig.noTxStreams),
+                                      ("RX", rfConfig.noRxStreams)]:
+            if not 1 <= numStreams <= MAX_STREAMS:
+                raise ValueError(f"You provided {numStreams} {direction} streams. Number "
+                                 f"of streams must be within interval [1,{MAX_STREAMS}].")
+        self.__rfConfig = rfConfig
+
+    def reset(self) -> None:
+        """Remove all planned configs, e.g. after they have been executed."""
+        self.__txConfigs: List[TxStreamingConfig] = []
+        self.__rxConfigs: List[RxStreamingConfig] = []
+        self.__txMemory = 0
+        self.__rxMemory = 0
+        self.__armed = False
+
+    def arm(self) -> None:
+        """The planned configs are armed, hence no further configs can be added."""
+        self.__armed = True
+
+    @property
+    def armed(self) -> bool:
+        return self.__armed
+
+    def addTx(self, config: TxStreamingConfig) -> None:
+        """Plan `config` after validating it.
+
+        Raises:
+            ValueError: `config` would be rejected by the device.
+        """
+        self.__txMemory = self.__validateTx(config)
+        self.__txConfigs.append(config)
+
+    def validateTx(self, config: TxStreamingConfig) -> None:
+        """Same as `addTx`, but `config` is not planned."""
+        self.__validateTx(config)
+
+    def addRx(self, config: RxStreamingConfig) -> None:
+        """Plan `config` after validating it.
+
+        Raises:
+            ValueError: `config` would be rejected by the device.
+        """
+        self.__rxMemory = self.__validateRx(config)
+        self.__rxConfigs.append(config)
+
+    def validateRx(self, config: RxStreamingConfig) -> None:
+        """Same as `addRx`, but `config` is not planned."""
+        self.__validateRx(config)
+
+    @property
+    def summary(self) -> PlanSummary:
+        txEnd = [c.sendTimeOffset + self.__txDuration(c) for c in self.__txConfigs]
+        rxEnd = [c.receiveTimeOffset + self.__rxDuration(c) for c in self.__rxConfigs]
+        return PlanSummary(burstDuration=max(txEnd + rxEnd, default=0.0),
+                           txMemoryUsage=self.__txMemory,
+                           rxMemoryUsage=self.__rxMemory,
+                           rxSignalLengths=[c.numSamples for c in self.__rxConfigs
+                                            for _ in range(c.numRepetitions)],
+                           numRxStreams=self.__rfConfig.noRxStreams)
+
+    def __alignedLength(self, numSamples: int) -> int:
+        return -(-numSamples // self.__caps.wordSize) * self.__caps.wordSize
+
+    def __txDuration(self, config: TxStreamingConfig) -> float:
+        # the device extends the signal to the word size before transmitting it
+        numSamples = self.__alignedLength(len(config.samples.signals[0]))
+        return numSamples * config.numRepetitions / self.__rfConfig.txSamplingRate
+
+    def __rxDuration(self, config: RxStreamingConfig) -> float:
+        if config.repetitionPeriod == 0:
+            numSamples = config.numSamples * config.numRepetitions
+        else:
+            numSamples = config.repetitionPeriod * config.numRepetitions
+        return numSamples / self.__rfConfig.rxSamplingRate
+
+    def __assertNotArmed(self) -> None:
+        if self.__armed:
+            raise ValueError("Cannot add a streaming config while streaming configs are "
+                             "armed. Reset the streaming configs first.")
+
+    def __validateTx(self, config: TxStreamingConfig) -> int:
+        self.__assertNotArmed()
+        signals = config.samples.signals
+        numStreams = self.__rfConfig.noTxStreams
+        if len(signals) == 0:
+            raise ValueError("No signal provided.")
+        if len(signals) != numStreams:
+            raise ValueError("The number of signals must match the number of tx streams.")
+        maxSamples = self.__caps.maxTxSamples(numStreams)
+        for s in signals:
+            if len(s) > maxSamples:
+                raise ValueError(f"Transmitted signal length must not be larger than "
+                                 f"{maxSamples}")
+            if len(s) != len(signals[0]):
+                raise ValueError("The antenna signals need to have the same length.")
+            if np.any(np.isnan(s)):
+                raise ValueError("The antenna signal contains nan values!")
+
+        if len(self.__txConfigs) > 0:
+            prev = self.__txConfigs[-1]
+            minimumOffset = prev.sendTimeOffset + self.__caps.guardOffset + \
+                self.__txDuration(prev)
+            if config.sendTimeOffset < minimumOffset:
+                raise ValueError("Invalid TX streaming config: the offset of the new config "
+                                 "is too small.")
+        if config.numRepetitions <= 0:
+            raise ValueError("Number of repetitions must be > 0")
+        if config.numRepetitions != 1 and \
+                self.__alignedLength(len(signals[0])) != len(signals[0]):
+            raise ValueError("When using repetitions, the length of the TX signal must be "
+                             "word-aligned!")
+
+        memory = self.__txMemory + \
+            self.__alignedLength(len(signals[0])) * numStreams * self.__caps.sampleSize
+        if memory >= self.__caps.txBufferSize:
+            raise ValueError("Attempting to store too many samples in buffer!")
+        return memory
+
+    def __validateRx(self, config: RxStreamingConfig) -> int:
+        self.__assertNotArmed()
+        if config.numRepetitions < 1:
+            raise ValueError("Num Repetitions needs to be at least 1!")
+        if config.repetitionPeriod != 0 and config.repetitionPeriod < config.numSamples:
+            raise ValueError("Repetition Period is smaller than record length!")
+        if config.repetitionPeriod != 0 and \
+                config.repetitionPeriod < self.__alignedLength(config.numSamples):
+            raise ValueError("RepetitionPeriod must be >= numSamples")
+        if config.numRepetitions > 1:
+            if config.repetitionPeriod > 0:
+                if self.__alignedLength(config.repetitionPeriod) != config.repetitionPeriod:
+                    raise ValueError("When using repetitions, repPeriod must be "
+                                     f"word-aligned ({self.__caps.wordSize})")
+            elif self.__alignedLength(config.numSamples) != config.numSamples:
+                raise ValueError("When using repetitions, numSamples must be word-aligned "
+                                 f"({self.__caps.wordSize})")
+            if self.__rfConfig.noRxStreams > 1:
+                raise ValueError("Multi-Stream with Repetitions not implemented!")
+
+        if len(self.__rxConfigs) > 0:
+            prev = self.__rxConfigs[-1]
+            minimumOffset = prev.receiveTimeOffset + self.__caps.guardOffset + \
+                self.__rxDuration(prev)
+            if config.receiveTimeOffset < minimumOffset:
+                raise ValueError("Invalid RX streaming config: the offset of the new config "
+                                 "is too small.")
+
+        period = config.repetitionPeriod
+        if period == 0:
+            period = self.__alignedLength(config.numSamples)
+        memory = self.__rxMemory + period * config.numRepetitions * \
+            self.__rfConfig.noRxStreams * self.__caps.sampleSize
+        if memory >= self.__caps.rxBufferSize:
+            raise ValueError("Attempting to store too many samples in buffer!")
+        return memory
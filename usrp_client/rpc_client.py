@@ -1,17 +1,168 @@
-from typing import List
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union, cast
+import functools
+import json
+import threading
+import time
+
 import numpy as np
 
 import zerorpc
 
 from uhd_wrapper.utils.config import (
+    AgcConfig,
+    AgcResult,
     RxStreamingConfig,
     TxStreamingConfig,
     RfConfig,
     MimoSignal,
 )
+from uhd_wrapper.utils.compression import availableCodecs, decompressSignal
+from uhd_wrapper.utils.data_plane import DataPlaneClient
+from uhd_wrapper.utils.leases import LEASE_TOKEN_HEADER
+from uhd_wrapper.utils.readiness import FAILED, READY
+from uhd_wrapper.utils.shared_memory import (
+    hostId,
+    readSharedMemory,
+    unlinkSharedMemory,
+    writeSharedMemory,
+)
+from usrp_client.planner import DeviceCapabilities, PlanSummary, StreamingPlanner
+from usrp_client.tracing import activeTracer, span
+
+
+_Method = TypeVar("_Method", bound=Callable[..., Any])
+
+
+def _synchronized(method: _Method) -> _Method:
+    """Holds the lock of the client while `method` is running."""
+    @functools.wraps(method)
+    def wrapper(self: "_RpcClient", *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return cast(_Method, wrapper)
+
+
+_requestContext = threading.local()
+_leaseMiddlewareRegistered = False
+
+
+class _LeaseTokenMiddleware:
+    """Adds the lease token of the calling client to its requests."""
+
+    def client_before_request(self, requestEvent: Any) -> None:
+        token = getattr(_requestContext, "leaseToken", None)
+        if token is not None:
+            requestEvent.header[LEASE_TOKEN_HEADER] = token
+
+
+def _registerLeaseMiddleware() -> None:
+    global _leaseMiddlewareRegistered
+    if not _leaseMiddlewareRegistered:
+        zerorpc.Context.get_instance().register_middleware(_LeaseTokenMiddleware())
+        _leaseMiddlewareRegistered = True
+
+
+class _ConnectionPerThread:
+    """Forwards calls to a zerorpc client of the calling thread.
+
+    zerorpc clients must not be shared between threads. Hence, each thread gets its own
+    connection, which is created on its first call.
+    """
+
+    def __init__(self, createClient: Callable[[], zerorpc.Client], device: str = "") -> None:
+        self.__createClient = createClient
+        self.__device = device
+        self.leaseToken: Optional[str] = None
+        """Token sent with each request while the client holds the lease of the
+        device."""
+        self.__local = threading.local()
+        self.__local.client = createClient()
+
+    @property
+    def device(self) -> str:
+        """Address of the server the calls are attributed to when tracing them."""
+        return self.__device
+
+    @property
+    def connection(self) -> zerorpc.Client:
+        client = getattr(self.__local, "client", None)
+        if client is None:
+            client = self.__local.client = self.__createClient()
+        return client
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.connection, name)
+        if not callable(attribute):
+            return attribute
+        if self.leaseToken is not None:
+            attribute = functools.partial(self.__leased, self.leaseToken, attribute)
+        if activeTracer() is not None:
+            attribute = functools.partial(self.__traced, name, attribute)
+        return attribute
+
+    def __traced(self, name: str, method: Callable[..., Any], *args: Any,
+                 **kwargs: Any) -> Any:
+        with span(f"rpc.{name}", device=self.__device):
+            return method(*args, **kwargs)
+
+    @staticmethod
+    def __leased(token: str, method: Callable[..., Any], *args: Any,
+                 **kwargs: Any) -> Any:
+        previousToken = getattr(_requestContext, "leaseToken", None)
+        _requestContext.leaseToken = token
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _requestContext.leaseToken = previousToken
+
+
+def _connect(ip: str, port: int, timeout: float) -> zerorpc.Client:
+    import socket
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.settimeout(1)
+
+        # throws after 1second timeout. Succeeds, if USRP can be reached.
+        s.connect((ip, port))
+        s.close()
+    except socket.timeout:
+        raise IOError(f"Usrp {ip}:{port} not reachable")
+
+    result = zerorpc.Client(heartbeat=10, timeout=timeout)
+    result.connect(f"tcp://{ip}:{port}")
+    return result
 
 
 class _RpcClient:
+    sparseTxOccupancy = 0.5
+    """TX signals whose non-zero segments cover less than this fraction of the samples
+    are transferred in sparse form, i.e. without their zero runs."""
+
+    txChunkSize = 50000
+    """TX signals longer than this number of samples are uploaded in chunks of this
+    size, such that no single RPC message contains the whole signal."""
+
+    sharedMemoryTransport = True
+    """If the server runs on the same host, samples are exchanged via shared memory
+    and only control messages are sent via RPC."""
+
+    dataPlaneTransport = True
+    """If the server provides a data plane, samples are transferred via its dedicated
+    socket and only their handles are sent via RPC."""
+
+    compressSamples = False
+    """Compress the collected samples losslessly before transferring them. Useful if
+    the USRP is connected via a slow link."""
+
+    validateStreamingConfigs = True
+    """Validate streaming configs on the client before sending them to the server,
+    such that invalid configs are rejected before their samples are transferred."""
+
+    rpcTimeoutSec = 30.0
+    """Timeout of RPC requests in seconds. Collecting samples additionally waits for
+    the planned duration of the execution."""
+
     def __init__(self, ip: str, port: int = 5555) -> None:
         """Initializes the UsrpClient.
 
@@ -21,7 +172,34 @@ class _RpcClient:
         """
         self.__ip = ip
         self.__port = port
-        self.__rpcClient = self._createClient(ip, port)
+        self.__lock = threading.RLock()
+        self.__rpcClient = _ConnectionPerThread(lambda: self._createClient(ip, port),
+                                                device=f"{ip}:{port}")
+        self.__sparseTxSupported = True
+        self.__chunkedTxSupported = True
+        self.__packedConfigsSupported = True
+        self.__serverIsLocal: Optional[bool] = None
+        self.__dataPlanePort: Optional[int] = None
+        # zmq.green sockets are bound to the hub of their thread, cf. _ConnectionPerThread
+        self.__dataPlanes = threading.local()
+        self.__compressionCodecs: Optional[List[str]] = None
+        self.__linkRate = 0.0
+        self.__lastRfConfig: Optional[RfConfig] = None
+        self.__numSkippedRfConfigs = 0
+        self.__capabilities: Optional[DeviceCapabilities] = None
+        self.__capabilitiesResolved = False
+        self.__planner: Optional[StreamingPlanner] = None
+        self.__executionDuration = 0.0
+        self.__numRuns = 1
+        self.__numPendingConfigs = 0
+        self.__armed = False
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock of the device. Calls changing the state of the client hold it, hence the
+        client can be used by multiple threads. Hold it to perform a sequence of calls,
+        e.g. configure, execute and collect, without interference of other threads."""
+        return self.__lock
 
     @property
     def ip(self) -> str:
@@ -31,38 +209,261 @@ class _RpcClient:
     def port(self) -> int:
         return self.__port
 
-    def _createClient(self, ip: str, port: int) -> zerorpc.Client:
-        import socket
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(1)
+    @property
+    @_synchronized
+    def usesSharedMemory(self) -> bool:
+        """True, if samples are exchanged with the server via shared memory."""
+        if not self.sharedMemoryTransport:
+            return False
+        if self.__serverIsLocal is None:
+            try:
+                self.__serverIsLocal = self.__rpcClient.getHostId() == hostId()
+            except zerorpc.RemoteError as e:
+                # servers of older versions do not support shared memory
+                if e.name != "NameError":
+                    raise
+                self.__serverIsLocal = False
+        return self.__serverIsLocal
+
+    def _compressionCodecs(self) -> List[str]:
+        if not self.compressSamples:
+            return []
+        if self.__compressionCodecs is None:
+            try:
+                remoteCodecs = self.__rpcClient.getCompressionCodecs()
+            except zerorpc.RemoteError as e:
+                # servers of older versions do not support compression
+                if e.name != "NameError":
+                    raise
+                remoteCodecs = []
+            self.__compressionCodecs = [c for c in availableCodecs() if c in remoteCodecs]
+        return self.__compressionCodecs
+
+    def _dataPlane(self) -> Optional[DataPlaneClient]:
+        if not self.dataPlaneTransport:
+            return None
+        if self.__dataPlanePort is None:
+            try:
+                self.__dataPlanePort = int(self.__rpcClient.getDataPlanePort())
+            except zerorpc.RemoteError as e:
+                # servers of older versions do not provide a data plane
+                if e.name != "NameError":
+                    raise
+                self.__dataPlanePort = 0
+        if self.__dataPlanePort == 0:
+            return None
+        dataPlane: Optional[DataPlaneClient] = getattr(self.__dataPlanes, "client", None)
+        if dataPlane is None:
+            dataPlane = self.__dataPlanes.client = DataPlaneClient(self.__ip,
+                                                                   self.__dataPlanePort)
+        return dataPlane
+
+    def _capabilities(self) -> Optional[DeviceCapabilities]:
+        if not self.__capabilitiesResolved:
+            self.__capabilitiesResolved = True
+            try:
+                self.__capabilities = DeviceCapabilities.fromDict(
+                    self.__rpcClient.getCapabilities())
+            except zerorpc.RemoteError as e:
+                # servers of older versions do not report their capabilities
+                if e.name != "NameError":
+                    raise
+        return self.__capabilities
 
-            # throws after 1second timeout. Succeeds, if USRP can be reached.
-            s.connect((ip, port))
-            s.close()
-        except socket.timeout:
-            raise IOError(f"Usrp {ip}:{port} not reachable")
+    @property
+    def hasPendingConfigs(self) -> bool:
+        """True, if streaming configs have been configured that have not been collected
+        yet or are armed. Otherwise, executing and collecting can be skipped."""
+        return self.__numPendingConfigs > 0
 
-        result = zerorpc.Client(heartbeat=10)
-        result.connect(f"tcp://{ip}:{port}")
-        return result
+    @property
+    @_synchronized
+    def plannedStreaming(self) -> Optional[PlanSummary]:
+        """Duration and replay memory usage of the configured streaming configs. None,
+        if the configs are not validated on the client, cf. `validateStreamingConfigs`.
+        """
+        if self.__planner is None:
+            return None
+        return self.__planner.summary
+
+    @property
+    @_synchronized
+    def pendingSignalLengths(self) -> Optional[List[int]]:
+        """Number of samples per stream of each signal returned by the next `collect`,
+        covering all runs of the last execution. None, if the configs are not validated
+        on the client, cf. `plannedStreaming`."""
+        if self.__planner is None:
+            return None
+        if not self.hasPendingConfigs:
+            return []
+        return self.__planner.summary.rxSignalLengths * self.__numRuns
+
+    def __updatePlanner(self, rfConfig: RfConfig) -> None:
+        if not self.validateStreamingConfigs:
+            self.__planner = None
+            return
+        capabilities = self._capabilities()
+        if capabilities is None:
+            return
+        if self.__planner is None:
+            self.__planner = StreamingPlanner(capabilities, rfConfig)
+        else:
+            self.__planner.setRfConfig(rfConfig)
 
+    def _createClient(self, ip: str, port: int) -> zerorpc.Client:
+        return _connect(ip, port, self.rpcTimeoutSec)
+
+    @_synchronized
     def configureRx(self, rxConfig: RxStreamingConfig) -> None:
         """Call `configureRx` on server and serialize `rxConfig`.
 
+        If the config changes the carrier frequency or gain, the next RF config is
+        sent to the server even if it did not change.
+
         Args:
             rxConfig (RxStreamingConfig): Streaming config.
-        """
-        self.__rpcClient.configureRx(rxConfig.to_json())
 
+        Raises:
+            ValueError: The config is rejected by the validation on the client, cf.
+                `validateStreamingConfigs`.
+        """
+        if self.__planner is not None:
+            self.__planner.validateRx(rxConfig)
+        if self.__hasRfChanges(rxConfig):
+            self.__lastRfConfig = None
+        self.__sendRxConfig(rxConfig)
+        self.__numPendingConfigs += 1
+        if self.__planner is not None:
+            self.__planner.addRx(rxConfig)
+
+    def __sendRxConfig(self, rxConfig: RxStreamingConfig) -> None:
+        if self.__packedConfigsSupported:
+            try:
+                self.__rpcClient.configureRxPacked(rxConfig.pack())
+                return
+            except zerorpc.RemoteError as e:
+                # servers of older versions only accept configs encoded as JSON
+                if e.name != "NameError":
+                    raise
+                self.__packedConfigsSupported = False
+
+        serialized = rxConfig.to_dict()
+        # servers of older versions do not know about RF changes
+        for key in ("carrierFrequency", "gain"):
+            if serialized[key] is None:
+                del serialized[key]
+        self.__rpcClient.configureRx(json.dumps(serialized))
+
+    def __hasRfChanges(self, config: Union[RxStreamingConfig, TxStreamingConfig]) -> bool:
+        return config.carrierFrequency is not None or config.gain is not None
+
+    def __rfChangeArgs(self, txConfig: TxStreamingConfig) -> List[Optional[float]]:
+        # The RF changes leave the device in a state different from the last RF config,
+        # hence it needs to be sent again. The arguments are only sent if required,
+        # since servers of older versions do not accept them.
+        if not self.__hasRfChanges(txConfig):
+            return []
+        self.__lastRfConfig = None
+        return [txConfig.carrierFrequency, txConfig.gain]
+
+    @_synchronized
     def configureTx(self, txConfig: TxStreamingConfig) -> None:
-        """Call `configureTx` on server and serialize `txConfig`."""
+        """Call `configureTx` on server and serialize `txConfig`.
+
+        The samples are transferred by the first applicable of these options:
+
+        1. If the server runs on the same host, they are passed via shared memory.
+        2. Signals that mostly consist of zeros are sent in sparse form, i.e. only
+           their non-zero segments are transferred.
+        3. If the server provides a data plane, they are transferred via the data
+           plane, which is not limited in size.
+        4. Long signals are uploaded in chunks of `txChunkSize` samples.
+        5. Otherwise, they are sent in a single message.
+
+        Raises:
+            ValueError: The config is rejected by the validation on the client, cf.
+                `validateStreamingConfigs`.
+        """
+        if self.__planner is not None:
+            self.__planner.validateTx(txConfig)
+        self.__uploadTx(txConfig)
+        self.__numPendingConfigs += 1
+        if self.__planner is not None:
+            self.__planner.addTx(txConfig)
+
+    def __uploadTx(self, txConfig: TxStreamingConfig) -> None:
+        rfChanges = self.__rfChangeArgs(txConfig)
+        if self.usesSharedMemory:
+            descriptor = writeSharedMemory(txConfig.samples)
+            try:
+                self.__rpcClient.configureTxFromSharedMemory(
+                    txConfig.sendTimeOffset, descriptor, txConfig.numRepetitions,
+                    *rfChanges
+                )
+            finally:
+                unlinkSharedMemory([descriptor])
+            return
+
+        if (self.__sparseTxSupported
+                and txConfig.samples.occupancy() < self.sparseTxOccupancy):
+            try:
+                with span("serializeSparse", device=self.__rpcClient.device):
+                    serialized = txConfig.samples.serializeSparse()
+                self.__rpcClient.configureTxSparse(
+                    txConfig.sendTimeOffset,
+                    serialized,
+                    txConfig.numRepetitions,
+                    *rfChanges
+                )
+                return
+            except zerorpc.RemoteError as e:
+                # servers of older versions do not know about sparse signals
+                if e.name != "NameError":
+                    raise
+                self.__sparseTxSupported = False
+
+        dataPlane = self._dataPlane()
+        if dataPlane is not None:
+            self.__rpcClient.configureTxFromDataPlane(
+                txConfig.sendTimeOffset, dataPlane.upload(txConfig.samples),
+                txConfig.numRepetitions, *rfChanges
+            )
+            return
+
+        if (self.__chunkedTxSupported
+                and len(txConfig.samples.signals[0]) > self.txChunkSize):
+            try:
+                self.__configureTxChunked(txConfig, rfChanges)
+                return
+            except zerorpc.RemoteError as e:
+                # servers of older versions do not know about chunked uploads
+                if e.name != "NameError":
+                    raise
+                self.__chunkedTxSupported = False
+
+        with span("serialize", device=self.__rpcClient.device):
+            samples = txConfig.samples.serialize()
         self.__rpcClient.configureTx(
             txConfig.sendTimeOffset,
-            txConfig.samples.serialize(),
-            txConfig.numRepetitions
+            samples,
+            txConfig.numRepetitions,
+            *rfChanges
+        )
+
+    def __configureTxChunked(self, txConfig: TxStreamingConfig,
+                             rfChanges: List[Optional[float]]) -> None:
+        signals = txConfig.samples.signals
+        numSamples = len(signals[0])
+        self.__rpcClient.beginTxChunks(
+            txConfig.sendTimeOffset, len(signals), numSamples, txConfig.numRepetitions,
+            *rfChanges
         )
+        for start in range(0, numSamples, self.txChunkSize):
+            chunk = MimoSignal(signals=[s[start:start + self.txChunkSize] for s in signals])
+            self.__rpcClient.appendTxChunk(chunk.serialize())
+        self.__rpcClient.endTxChunks()
 
+    @_synchronized
     def execute(self, baseTime: float) -> None:
         """Execute the current configuration at the receiver side.
 
@@ -72,26 +473,203 @@ class _RpcClient:
             baseTime (float): FPGA time all streaming config time offsets refer to.
         """
         self.__rpcClient.execute(baseTime)
+        self.__numRuns = 1
+        self.__executionDuration = self.__burstDuration()
 
+    @_synchronized
     def executeImmediately(self) -> None:
         """Execute the current TX and RX streaming configs immediately, without
         synchronizing the stream time with other USRPs in the setup.
 
         """
         self.__rpcClient.execute(-1)
+        self.__numRuns = 1
+        self.__executionDuration = self.__burstDuration()
 
-    def collect(self) -> List[MimoSignal]:
+    @_synchronized
+    def executeRepeatedly(self, baseTime: float, numRuns: int, period: float) -> None:
+        """Execute the armed streaming configs `numRuns` times on the server.
+
+        Run `i` starts at `baseTime + i * period`. The next call of `collect` returns the
+        samples of all runs in order. Requires armed streaming configs, cf.
+        `armStreamingConfigs`.
+
+        Args:
+            baseTime (float): Base time of the first run. Use a negative value to start
+                each run immediately.
+            numRuns (int): Number of runs.
+            period (float): Time between the starts of two runs in seconds. Needs to
+                cover the streaming and the download of the samples of one run.
+        """
+        self.__rpcClient.executeRepeatedly(baseTime, numRuns, period)
+        self.__numRuns = numRuns
+        self.__executionDuration = (numRuns - 1) * period + self.__burstDuration()
+
+    def __burstDuration(self) -> float:
+        return 0.0 if self.__planner is None else self.__planner.summary.burstDuration
+
+    def __collectTimeout(self) -> float:
+        return self.rpcTimeoutSec + self.__executionDuration
+
+    @_synchronized
+    def collect(self, out: Optional[List[MimoSignal]] = None) -> List[MimoSignal]:
         """Collect samples from RPC server and deserialize them.
 
+        If `compressSamples` is set, the samples are compressed by the server with a
+        codec supported by both sides.
+
+        Args:
+            out (List[MimoSignal], optional): Preallocated buffers, one per received
+                streaming configuration. If given, the samples are written into these
+                buffers in place and `out` is returned. Use `MimoSignal.empty` to
+                allocate them once and reuse them for consecutive collects.
+
         Returns:
             List[MimoSignal]:
                 Each list item corresponds to the samples of one streaming configuration.
         """
-        return [MimoSignal.deserialize(c) for c in self.__rpcClient.collect()]
+        result = self.__collectSamples(out)
+        self.__executionDuration = 0.0
+        # the server keeps armed configs only
+        if not self.__armed:
+            self.__resetPendingConfigs()
+        return result
 
+    def __resetPendingConfigs(self) -> None:
+        self.__numPendingConfigs = 0
+        self.__armed = False
+        if self.__planner is not None:
+            self.__planner.reset()
+
+    def __collectSamples(self, out: Optional[List[MimoSignal]]) -> List[MimoSignal]:
+        if self.usesSharedMemory:
+            return self.__collectFromSharedMemory(out)
+        codecs = self._compressionCodecs()
+        if len(codecs) > 0:
+            return self.__collectCompressed(codecs, out)
+        dataPlane = self._dataPlane()
+        if dataPlane is not None:
+            return self.__collectFromDataPlane(dataPlane, out)
+
+        serialized = self.__rpcClient.collect(timeout=self.__collectTimeout())
+        if out is not None and len(out) != len(serialized):
+            raise ValueError(f"{len(out)} output buffers were provided, but "
+                             f"{len(serialized)} signals were received.")
+        with span("deserialize", device=self.__rpcClient.device):
+            if out is None:
+                return [MimoSignal.deserialize(c) for c in serialized]
+            for c, o in zip(serialized, out):
+                MimoSignal.deserialize(c, out=o)
+        return out
+
+    def __collectCompressed(self, codecs: List[str],
+                            out: Optional[List[MimoSignal]]) -> List[MimoSignal]:
+        start = time.perf_counter()
+        compressed = self.__rpcClient.collectCompressed(
+            codecs, self.__linkRate, timeout=self.__collectTimeout())
+        duration = time.perf_counter() - start
+        numBytes = sum(len(s) for _, _, streams in compressed for s in streams)
+        if numBytes > 0 and duration > 0:
+            rate = numBytes / duration
+            self.__linkRate = rate if self.__linkRate == 0 else \
+                0.5 * rate + 0.5 * self.__linkRate
+
+        if out is not None and len(out) != len(compressed):
+            raise ValueError(f"{len(out)} output buffers were provided, but "
+                             f"{len(compressed)} signals were received.")
+        return [decompressSignal(c, out=None if out is None else out[i])
+                for i, c in enumerate(compressed)]
+
+    def __collectFromDataPlane(self, dataPlane: DataPlaneClient,
+                               out: Optional[List[MimoSignal]]) -> List[MimoSignal]:
+        handles = self.__rpcClient.collectToDataPlane(timeout=self.__collectTimeout())
+        if out is not None and len(out) != len(handles):
+            raise ValueError(f"{len(out)} output buffers were provided, but "
+                             f"{len(handles)} signals were received.")
+        return [dataPlane.download(h, out=None if out is None else out[i])
+                for i, h in enumerate(handles)]
+
+    def __collectFromSharedMemory(self, out: Optional[List[MimoSignal]]) -> List[MimoSignal]:
+        descriptors = self.__rpcClient.collectToSharedMemory(
+            timeout=self.__collectTimeout())
+        if out is not None and len(out) != len(descriptors):
+            unlinkSharedMemory(descriptors)
+            raise ValueError(f"{len(out)} output buffers were provided, but "
+                             f"{len(descriptors)} signals were received.")
+
+        result = []
+        try:
+            for i, d in enumerate(descriptors):
+                result.append(readSharedMemory(d, out=None if out is None else out[i],
+                                               unlink=True))
+        except BaseException:
+            unlinkSharedMemory(descriptors[len(result) + 1:])
+            raise
+        return result
+
+    @_synchronized
     def configureRfConfig(self, rfConfig: RfConfig) -> None:
-        """Serialize `rfConfig` and request configuration on RPC server."""
+        """Serialize `rfConfig` and request configuration on RPC server.
+
+        The request is skipped if `rfConfig` equals the last config that was sent.
+
+        Raises:
+            ValueError: The number of streams is invalid.
+        """
+        if rfConfig == self.__lastRfConfig:
+            self.__numSkippedRfConfigs += 1
+            return
+        self.__updatePlanner(rfConfig)
+        self.__lastRfConfig = None
+        if self.__packedConfigsSupported:
+            try:
+                self.__rpcClient.configureRfConfigPacked(rfConfig.pack())
+                self.__lastRfConfig = replace(rfConfig)
+                return
+            except zerorpc.RemoteError as e:
+                # servers of older versions only accept configs encoded as JSON
+                if e.name != "NameError":
+                    raise
+                self.__packedConfigsSupported = False
         self.__rpcClient.configureRfConfig(rfConfig.serialize())
+        self.__lastRfConfig = replace(rfConfig)
+
+    @_synchronized
+    def runAgc(self, rfConfig: RfConfig, agcConfig: AgcConfig = AgcConfig(),
+               txSignal: Optional[MimoSignal] = None) -> AgcResult:
+        """Search the gains of `rfConfig` by an automatic gain control on the server.
+
+        The server performs short probe captures and adapts the RX gain (and optionally
+        the TX gain) until the peak of the received samples reaches the target headroom.
+        Pending streaming configurations are discarded. Afterwards, the USRP is
+        configured with `rfConfig` using the chosen gains.
+
+        Args:
+            rfConfig (RfConfig): RF configuration containing the initial gains.
+            agcConfig (AgcConfig): Target and ranges of the search.
+            txSignal (MimoSignal, optional): Probe signal transmitted during each probe
+                capture, e.g. for a loopback or radar setup.
+
+        Returns:
+            AgcResult: Chosen gains.
+        """
+        self.__lastRfConfig = None
+        serializedTxSignal = None if txSignal is None else txSignal.serialize()
+        result = AgcResult.from_json(self.__rpcClient.runAgc(
+            rfConfig.serialize(), agcConfig.to_json(), serializedTxSignal))
+        self.__lastRfConfig = replace(rfConfig, rxGain=result.rxGain, txGain=result.txGain)
+        self.__updatePlanner(self.__lastRfConfig)
+        self.__resetPendingConfigs()
+        return result
+
+    @_synchronized
+    def getPerformanceCounters(self) -> Dict[str, float]:
+        """Queries the performance counters of the USRP, e.g. the number of RF settings
+        that were applied or skipped because they did not change. The counters of the
+        client are prefixed with `client.`."""
+        counters = dict(self.__rpcClient.getPerformanceCounters())
+        counters["client.rfConfigsSkipped"] = self.__numSkippedRfConfigs
+        return counters
 
     def setTimeToZeroNextPps(self) -> None:
         """Sets the time to zero on the next PPS edge."""
@@ -101,14 +679,34 @@ class _RpcClient:
         """Queries current FPGA time from RPC server."""
         return self.__rpcClient.getCurrentFpgaTime()
 
+    def getTimeLastPps(self) -> float:
+        """Queries the FPGA time of the last PPS edge from RPC server."""
+        return self.__rpcClient.getTimeLastPps()
+
     def getCurrentSystemTime(self) -> int:
         """Queries current system time from RPC server."""
         return self.__rpcClient.getCurrentSystemTime()
 
     def getRfConfig(self) -> RfConfig:
         """Queries RfConfig from RPC server and deserializes it."""
+        if self.__packedConfigsSupported:
+            try:
+                return RfConfig.unpack(self.__rpcClient.getRfConfigPacked())
+            except zerorpc.RemoteError as e:
+                # servers of older versions only return configs encoded as JSON
+                if e.name != "NameError":
+                    raise
+                self.__packedConfigsSupported = False
         return RfConfig.deserialize(self.__rpcClient.getRfConfig())
 
+    @_synchronized
+    def getConfiguredRfConfig(self) -> RfConfig:
+        """Returns the RfConfig last sent to the RPC server. If it is unknown, e.g. after
+        a failed configuration, the RfConfig is queried from the RPC server."""
+        if self.__lastRfConfig is None:
+            return self.getRfConfig()
+        return replace(self.__lastRfConfig)
+
     def getMasterClockRate(self) -> float:
         """Queries the master clock rate of the USRP."""
         return self.__rpcClient.getMasterClockRate()
@@ -117,9 +715,143 @@ class _RpcClient:
         """Queries the samples rates supported by the device."""
         return self.__rpcClient.getSupportedSampleRates()
 
+    @_synchronized
+    def acquireLease(self, owner: str = "", durationSec: float = 60.0) -> Dict[str, Any]:
+        """Lease the USRP exclusively, such that other clients cannot change its
+        configuration until the lease is released or expires. Renew the lease with
+        `renewLease` for longer measurements.
+
+        Args:
+            owner (str): Shown to other clients. Defaults to the host name.
+            durationSec (float): Duration of the lease in seconds.
+
+        Returns:
+            Dict[str, Any]: `owner` and `remainingSec` of the lease.
+
+        Raises:
+            zerorpc.RemoteError: The USRP is leased by another client (`LeaseError`).
+        """
+        if owner == "":
+            import socket
+            owner = socket.gethostname()
+        _registerLeaseMiddleware()
+        lease = self.__rpcClient.acquireLease(owner, durationSec)
+        self.__rpcClient.leaseToken = lease.pop("token")
+        # other clients may have changed the RF config before
+        self.__lastRfConfig = None
+        return lease
+
+    @_synchronized
+    def renewLease(self, durationSec: float = 60.0) -> Dict[str, Any]:
+        """Extend the lease to `durationSec` seconds from now."""
+        token = self.__requireLease()
+        lease = self.__rpcClient.renewLease(token, durationSec)
+        del lease["token"]
+        return lease
+
+    @_synchronized
+    def releaseLease(self) -> None:
+        token = self.__requireLease()
+        self.__rpcClient.leaseToken = None
+        self.__rpcClient.releaseLease(token)
+
+    def __requireLease(self) -> str:
+        token = self.__rpcClient.leaseToken
+        if token is None:
+            raise RuntimeError("The client does not hold a lease.")
+        return cast(str, token)
+
+    @_synchronized
+    def submitJob(self, rxConfigs: Sequence[RxStreamingConfig],
+                  txConfigs: Sequence[TxStreamingConfig] = (),
+                  rfConfig: Optional[RfConfig] = None, priority: int = 0) -> int:
+        """Queue the streaming configs as job on the server, which executes the jobs of
+        all clients back to back while the USRP is not leased.
+
+        Pending streaming configs on the USRP are replaced by each job. The execution
+        starts shortly after the job is started, the offsets of the configs are
+        relative to it.
+
+        Args:
+            rxConfigs (Sequence[RxStreamingConfig]): RX streaming configs of the job.
+            txConfigs (Sequence[TxStreamingConfig]): TX streaming configs of the job.
+            rfConfig (RfConfig, optional): RF config applied before the job. Defaults
+                to the current RF config of the USRP.
+            priority (int): Jobs of higher priority are run first.
+
+        Returns:
+            int: ID of the job, cf. `collectJob`.
+        """
+        job = {
+            "rfConfig": None if rfConfig is None else rfConfig.pack(),
+            "tx": [[c.sendTimeOffset, c.samples.serialize(), c.numRepetitions,
+                    c.carrierFrequency, c.gain] for c in txConfigs],
+            "rx": [c.pack() for c in rxConfigs],
+        }
+        if rfConfig is not None or any(self.__hasRfChanges(c) for c in txConfigs) \
+                or any(self.__hasRfChanges(c) for c in rxConfigs):
+            self.__lastRfConfig = None
+        return self.__rpcClient.submitJob(job, priority)
+
+    def collectJob(self, jobId: int, timeoutSec: float = 60.0) -> List[MimoSignal]:
+        """Wait up to `timeoutSec` seconds until the job finished and return the
+        received samples, one `MimoSignal` per RX streaming config."""
+        serialized = self.__rpcClient.collectJob(
+            jobId, timeoutSec, timeout=self.rpcTimeoutSec + timeoutSec)
+        return [MimoSignal.deserialize(c) for c in serialized]
+
+    def cancelJob(self, jobId: int) -> bool:
+        """Cancel a queued job. Returns False if it is running or finished already."""
+        return self.__rpcClient.cancelJob(jobId)
+
+    def getQueueStatus(self) -> Dict[str, float]:
+        """Depth and utilization of the job queue of the server."""
+        return self.__rpcClient.getQueueStatus()
+
+    @_synchronized
+    def reopenDevice(self, masterClockRate: float = 0.0, deviceArgs: str = "",
+                     timeoutSec: float = 120.0) -> Dict[str, Any]:
+        """Recreate the device on the server, e.g. with another master clock rate,
+        without restarting the server.
+
+        The RF config and the streaming configs are lost, hence the RF config needs to
+        be configured again and the device needs to be synchronized again.
+
+        Args:
+            masterClockRate (float): Master clock rate to configure. 0 leaves it at the
+                default of the device.
+            deviceArgs (str): Additional UHD device arguments.
+            timeoutSec (float): Timeout of the request in seconds.
+
+        Returns:
+            Dict[str, Any]: Readiness of the server after reopening, whose phases
+            contain the durations of the reinitialization in seconds.
+        """
+        self.__lastRfConfig = None
+        self.__capabilities = None
+        self.__capabilitiesResolved = False
+        self.__planner = None
+        self.__resetPendingConfigs()
+        return self.__rpcClient.reopenDevice(masterClockRate, deviceArgs,
+                                             timeout=timeoutSec)
+
+    @_synchronized
     def resetStreamingConfigs(self) -> None:
         """Tells USRP to reset streaming configs."""
         self.__rpcClient.resetStreamingConfigs()
+        self.__resetPendingConfigs()
+
+    @_synchronized
+    def armStreamingConfigs(self) -> None:
+        """Keep the current streaming configs on the USRP across executions.
+
+        The TX samples are uploaded to the device only once and every `execute` runs
+        the same configs again. No further configs can be added until
+        `resetStreamingConfigs` is called."""
+        self.__rpcClient.armStreamingConfigs()
+        self.__armed = True
+        if self.__planner is not None:
+            self.__planner.arm()
 
     def setSyncSource(self, syncSource: str) -> None:
         """Set synchronization source. See
@@ -162,6 +894,51 @@ class UsrpClient(_RpcClient):
 
         return UsrpClient(ip, port)
 
+    @staticmethod
+    def waitUntilReady(ip: str, port: int = 5555, timeout: float = 120.0,
+                       pollInterval: float = 0.5) -> Dict[str, Any]:
+        """Wait until the UsrpServer at given ip and port finished its startup.
+
+        Servers started with `--bind-early` answer `getReadiness` while the USRP is
+        being created. Until the port is bound, the server is polled every
+        `pollInterval` seconds. Servers of older versions are ready once they are
+        reachable.
+
+        Returns:
+            Dict[str, Any]: Readiness of the server, cf. `UsrpServer.getReadiness`.
+
+        Raises:
+            RuntimeError: The startup of the server failed.
+            TimeoutError: The server is not ready within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        client: Optional[zerorpc.Client] = None
+        try:
+            while True:
+                try:
+                    if client is None:
+                        client = _connect(ip, port, max(pollInterval, 1.0))
+                    readiness: Dict[str, Any] = client.getReadiness()
+                except (OSError, zerorpc.TimeoutExpired):
+                    pass
+                except zerorpc.RemoteError as e:
+                    if e.name == "NameError":
+                        return {"state": READY, "phases": {}, "uptime": 0.0, "error": ""}
+                    if e.name != "ServerNotReadyError":
+                        raise
+                else:
+                    if readiness["state"] == READY:
+                        return readiness
+                    if readiness["state"] == FAILED:
+                        raise RuntimeError(f"Usrp {ip}:{port} failed to start: "
+                                           f"{readiness['error']}")
+                if time.monotonic() + pollInterval > deadline:
+                    raise TimeoutError(f"Usrp {ip}:{port} not ready within {timeout} s")
+                time.sleep(pollInterval)
+        finally:
+            if client is not None:
+                client.close()
+
     def __init__(self, ip: str, port: int) -> None:
         """Private constructor. Should not be called. Use UsrpClient.create
         """
@@ -174,6 +951,16 @@ class UsrpClient(_RpcClient):
         self._rfConfiguredOnce = True
         return super().configureRfConfig(rfConfig)
 
+    def reopenDevice(self, masterClockRate: float = 0.0, deviceArgs: str = "",
+                     timeoutSec: float = 120.0) -> Dict[str, Any]:
+        self._rfConfiguredOnce = False
+        return super().reopenDevice(masterClockRate, deviceArgs, timeoutSec)
+
+    def runAgc(self, rfConfig: RfConfig, agcConfig: AgcConfig = AgcConfig(),
+               txSignal: Optional[MimoSignal] = None) -> AgcResult:
+        self._rfConfiguredOnce = True
+        return super().runAgc(rfConfig, agcConfig, txSignal)
+
     def execute(self, baseTime: float) -> None:
         if not self._rfConfiguredOnce:
             raise RuntimeError("RF has not been configured "
@@ -1,9 +1,11 @@
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 import sys
+import json
+import time
 import logging
 import argparse
 import numpy as np
-import matplotlib.pyplot as plt
 
 from usrp_client import (System, RfConfig, UsrpClient,
                          TxStreamingConfig, RxStreamingConfig,
@@ -11,6 +13,21 @@ from usrp_client import (System, RfConfig, UsrpClient,
 
 cmdlineArgs: argparse.Namespace
 
+MAX_PEAK_SPREAD = 5
+"""Maximum difference of the peaks of repeated receptions in samples."""
+
+FLEET_NUM_RUNS = 3
+"""Number of receptions per device and link in the fleet check."""
+
+FLEET_RUN_PERIOD_SEC = 0.5
+"""Time between the starts of two receptions, covering streaming and download."""
+
+LINK_SLOT_SEC = 0.1
+"""Offset of the reverse direction of a link within a run of the fleet check."""
+
+PROBE_LENGTH = 1000
+"""Number of samples of the probe signals of the fleet check."""
+
 
 def _connectSystem(ips: List[str]) -> Tuple[System, List[UsrpClient]]:
     print("   Connecting USRPs...")
@@ -41,21 +58,58 @@ def _defaultRfConfig() -> RfConfig:
                     )
 
 
+def _plot(rxSignal: np.ndarray) -> None:
+    # matplotlib is only needed with --plot and slow to import
+    import matplotlib.pyplot as plt
+
+    plt.plot(abs(rxSignal))
+    plt.show()
+
+
+def _findPeaks(frames: np.ndarray, txSignal: np.ndarray) -> np.ndarray:
+    """Index of the first sample of `txSignal` in each row of `frames`.
+
+    The correlation of all frames is computed at once in the frequency domain. Only
+    lags at which `txSignal` lies completely within the frame are considered.
+    """
+    frameLength = frames.shape[-1]
+    spectrum = np.fft.fft(frames, axis=-1) * np.conj(np.fft.fft(txSignal, frameLength))
+    correlation = np.abs(np.fft.ifft(spectrum, axis=-1)[..., :frameLength - len(txSignal) + 1])
+    return np.argmax(correlation, axis=-1)
+
+
+def _calculateSNRs(frames: np.ndarray, signalLength: int, peaks: np.ndarray) -> np.ndarray:
+    """SNR in dB of each row of `frames`. The noise is estimated from the 1000 samples
+    following the signal starting at `peaks`."""
+    power = np.abs(frames - np.mean(frames, axis=-1, keepdims=True)) ** 2
+    positions = np.arange(frames.shape[-1])
+    signalEnd = peaks[:, np.newaxis] + signalLength
+    signalMask = (positions >= peaks[:, np.newaxis]) & (positions < signalEnd)
+    noiseMask = (positions >= signalEnd) & (positions < signalEnd + 1000)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rxPow = np.sum(power * signalMask, axis=-1) / np.sum(signalMask, axis=-1)
+        rxNoise = np.sum(power * noiseMask, axis=-1) / np.sum(noiseMask, axis=-1)
+        return 10 * np.log10((rxPow - rxNoise) / rxNoise)
+
+
 def _findFirstSampleInFrameOfSignal(frame: np.ndarray, txSignal: np.ndarray) -> int:
-    correlation = np.abs(np.correlate(frame, txSignal))
-    return np.argsort(correlation)[-1]
+    return int(_findPeaks(frame[np.newaxis], txSignal)[0])
 
 
 def _calculateSNR(txSignal: np.ndarray, rxSignal: np.ndarray, peak: int) -> float:
-    dcOffset = np.mean(rxSignal)
-    rxSignal = rxSignal - dcOffset
-    end = peak+len(txSignal)
-    sigPart = rxSignal[peak:end]
-    noisePart = rxSignal[end:end+1000]
-    rxPow = np.mean(abs(sigPart) ** 2)
-    rxNoise = np.mean(abs(noisePart) ** 2)
+    return float(_calculateSNRs(rxSignal[np.newaxis], len(txSignal), np.array([peak]))[0])
 
-    return 10 * np.log10((rxPow-rxNoise)/rxNoise)
+
+def _evaluateReceptions(frames: np.ndarray, txSignal: np.ndarray) -> Dict[str, Any]:
+    """Latency, SNR and peak stability of repeated receptions of `txSignal`."""
+    peaks = _findPeaks(frames, txSignal)
+    snrs = _calculateSNRs(frames, len(txSignal), peaks)
+    peakSpread = int(np.max(peaks) - np.min(peaks))
+    return {"latencySamples": int(np.median(peaks)),
+            "peaks": peaks.tolist(),
+            "peakSpread": peakSpread,
+            "snrDb": [float(s) if np.isfinite(s) else None for s in snrs],
+            "ok": peakSpread <= MAX_PEAK_SPREAD}
 
 
 def checkSynchronization(ips: List[str]) -> bool:
@@ -97,29 +151,31 @@ def checkSingle(ip: str) -> bool:
     peaks = []
     snrs = []
 
-    for i in range(3):
-
-        client.configureTx(TxStreamingConfig(sendTimeOffset=0.0,
-                                             samples=MimoSignal(signals=[signal])))
-        client.configureRx(RxStreamingConfig(receiveTimeOffset=0.0,
-                                             numSamples=2*len(signal),
-                                             antennaPort=cmdlineArgs.rx_antenna))
-
-        client.executeImmediately()
-        rxSig = client.collect()
-        if cmdlineArgs.plot:
-            plt.plot(abs(rxSig[0].signals[0]))
-            plt.show()
-
-        rx = rxSig[0].signals[0]
-        peak = _findFirstSampleInFrameOfSignal(rx, signal)
-        peaks.append(peak)
-        snrs.append(_calculateSNR(signal, rx, peak))
+    client.configureTx(TxStreamingConfig(sendTimeOffset=0.0,
+                                         samples=MimoSignal(signals=[signal])))
+    client.configureRx(RxStreamingConfig(receiveTimeOffset=0.0,
+                                         numSamples=2*len(signal),
+                                         antennaPort=cmdlineArgs.rx_antenna))
+    client.armStreamingConfigs()
+
+    try:
+        for i in range(3):
+            client.executeImmediately()
+            rxSig = client.collect()
+            if cmdlineArgs.plot:
+                _plot(rxSig[0].signals[0])
+
+            rx = rxSig[0].signals[0]
+            peak = _findFirstSampleInFrameOfSignal(rx, signal)
+            peaks.append(peak)
+            snrs.append(_calculateSNR(signal, rx, peak))
+    finally:
+        client.resetStreamingConfigs()
 
     peakDiff = max(peaks) - min(peaks)
     print("   Found peaks: ", peaks)
     print("   SNRs       : ", snrs)
-    if peakDiff > 5:
+    if peakDiff > MAX_PEAK_SPREAD:
         print("   Peaks too far apart!. Check if antennas are connected")
         print("ERROR")
         return False
@@ -140,30 +196,28 @@ def checkTrx(ips: List[str]) -> bool:
     peaks = []
     snrs = []
 
-    for i in range(3):
+    system.configureTx("usrp0", TxStreamingConfig(sendTimeOffset=0.0,
+                                                  samples=MimoSignal(signals=[signal])))
+    system.configureRx("usrp1", RxStreamingConfig(receiveTimeOffset=0.0,
+                                                  numSamples=2*len(signal),
+                                                  antennaPort=cmdlineArgs.rx_antenna))
 
-        system.configureTx("usrp0", TxStreamingConfig(sendTimeOffset=0.0,
-                                                      samples=MimoSignal(signals=[signal])))
-        system.configureRx("usrp1", RxStreamingConfig(receiveTimeOffset=0.0,
-                                                      numSamples=2*len(signal),
-                                                      antennaPort=cmdlineArgs.rx_antenna))
+    with system.prepare() as plan:
+        for i in range(3):
+            rxSig = plan.run()
 
-        system.execute()
-        rxSig = system.collect()
+            if cmdlineArgs.plot:
+                _plot(rxSig["usrp1"][0].signals[0])
 
-        if cmdlineArgs.plot:
-            plt.plot(abs(rxSig["usrp1"][0].signals[0]))
-            plt.show()
-
-        rx = rxSig["usrp1"][0].signals[0]
-        peak = _findFirstSampleInFrameOfSignal(rx, signal)
-        peaks.append(peak)
-        snrs.append(_calculateSNR(signal, rx, peak))
+            rx = rxSig["usrp1"][0].signals[0]
+            peak = _findFirstSampleInFrameOfSignal(rx, signal)
+            peaks.append(peak)
+            snrs.append(_calculateSNR(signal, rx, peak))
 
     peakDiff = max(peaks) - min(peaks)
     print("   Found peaks: ", peaks)
     print("   SNRs       : ", snrs)
-    if peakDiff > 5:
+    if peakDiff > MAX_PEAK_SPREAD:
         print("   Peaks too far apart!. Check if antennas are connected")
         print("ERROR")
         return False
@@ -172,6 +226,159 @@ def checkTrx(ips: List[str]) -> bool:
         return True
 
 
+def _pairRounds(usrpNames: List[str]) -> List[List[Tuple[str, str]]]:
+    """Schedule all pairs of USRPs in rounds of disjoint pairs (round-robin tournament),
+    such that the pairs of a round can be measured at the same time."""
+    names: List[Any] = list(usrpNames)
+    if len(names) % 2 == 1:
+        names.append(None)
+    rounds = []
+    for _ in range(len(names) - 1):
+        half = len(names) // 2
+        rounds.append([(a, b) for a, b in zip(names[:half], reversed(names[half:]))
+                       if a is not None and b is not None])
+        names = [names[0], names[-1]] + names[1:-1]
+    return rounds
+
+
+def _probeSignals(usrpNames: List[str], seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Draw an independent random probe signal per USRP.
+
+    Devices transmitting at the same time use distinct probes, such that a receiver
+    locks onto the transmission it measures instead of the one of a neighbour."""
+    rng = np.random.default_rng(seed)
+    return {usrpName: rng.random(PROBE_LENGTH) - 0.5 for usrpName in usrpNames}
+
+
+def _txConfig(txSignal: np.ndarray, offset: float) -> TxStreamingConfig:
+    return TxStreamingConfig(sendTimeOffset=offset, samples=MimoSignal(signals=[txSignal]))
+
+
+def _rxConfig(txSignal: np.ndarray, offset: float) -> RxStreamingConfig:
+    return RxStreamingConfig(receiveTimeOffset=offset, numSamples=2*len(txSignal),
+                             antennaPort=cmdlineArgs.rx_antenna)
+
+
+def _checkDevice(client: UsrpClient, txSignal: np.ndarray) -> Dict[str, Any]:
+    """Check the PPS input and a transmission from a device to itself."""
+    start = time.perf_counter()
+    result: Dict[str, Any] = dict()
+    try:
+        result["ppsAgeSec"] = client.getCurrentFpgaTime() - client.getTimeLastPps()
+        client.configureTx(_txConfig(txSignal, 0.0))
+        client.configureRx(_rxConfig(txSignal, 0.0))
+        client.armStreamingConfigs()
+        try:
+            client.executeRepeatedly(-1.0, FLEET_NUM_RUNS, FLEET_RUN_PERIOD_SEC)
+            frames = np.stack([s.signals[0] for s in client.collect()])
+        finally:
+            client.resetStreamingConfigs()
+        result["loopback"] = _evaluateReceptions(frames, txSignal)
+        result["ok"] = result["loopback"]["ok"] and \
+            result["ppsAgeSec"] <= System.maxPpsAgeSec
+    except Exception as e:
+        result["ok"] = False
+        result["error"] = str(e)
+    result["durationSec"] = time.perf_counter() - start
+    return result
+
+
+def _checkLinks(system: System, pairs: List[Tuple[str, str]],
+                probes: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Measure both directions of the links of `pairs` at the same time, where each
+    transmitter sends its own probe of `probes`."""
+    start = time.perf_counter()
+    links = [(a, b, 0.0) for a, b in pairs] + [(b, a, LINK_SLOT_SEC) for a, b in pairs]
+    try:
+        for tx, rx, offset in links:
+            system.configureTx(tx, _txConfig(probes[tx], offset))
+            system.configureRx(rx, _rxConfig(probes[tx], offset))
+        with system.prepare() as plan:
+            samples = plan.run(numRuns=FLEET_NUM_RUNS, runPeriodSec=FLEET_RUN_PERIOD_SEC)
+    except Exception as e:
+        return [{"tx": tx, "rx": rx, "ok": False, "error": str(e),
+                 "durationSec": time.perf_counter() - start} for tx, rx, _ in links]
+
+    duration = time.perf_counter() - start
+    # each device receives one signal per run
+    return [{"tx": tx, "rx": rx, "durationSec": duration,
+             **_evaluateReceptions(np.stack([s.signals[0] for s in samples[rx]]),
+                                   probes[tx])}
+            for tx, rx, _ in links]
+
+
+def checkFleet(ips: List[str], reportFile: str) -> bool:
+    """Check all USRPs and all links between them and write a JSON report.
+
+    The devices are checked concurrently, each transmitting a distinct probe signal. The
+    links are measured in rounds of disjoint pairs, where each round transmits in both
+    directions of its pairs at the same time. Only devices receiving the PPS signal are
+    synchronized and used for links.
+
+    Args:
+        ips: List of IP-Adresses of the USRPs to check, where the RPC server needs to run.
+        reportFile: File to write the report to. `-` writes it to stdout.
+
+    Return:
+        True if all devices and links work. False otherwise
+    """
+    start = time.perf_counter()
+    report: Dict[str, Any] = {"devices": dict(), "links": []}
+
+    system = System(logLevel=logging.WARN)
+    clients: Dict[str, UsrpClient] = dict()
+    for nr, ip in enumerate(ips):
+        usrpName = f"usrp{nr}"
+        report["devices"][usrpName] = {"ip": ip}
+        try:
+            clients[usrpName] = system.newUsrp(usrpName=usrpName, ip=ip)
+            clients[usrpName].configureRfConfig(_defaultRfConfig())
+        except Exception as e:
+            report["devices"][usrpName].update({"ok": False, "error": str(e)})
+            clients.pop(usrpName, None)
+
+    probes = _probeSignals(list(clients.keys()))
+    with ThreadPoolExecutor(max_workers=max(len(clients), 1)) as executor:
+        results = executor.map(lambda n: _checkDevice(clients[n], probes[n]), clients.keys())
+        for usrpName, result in zip(clients.keys(), results):
+            report["devices"][usrpName].update(result)
+
+    syncStart = time.perf_counter()
+    candidates = [n for n in clients if report["devices"][n].get("ppsAgeSec", np.inf)
+                  <= System.maxPpsAgeSec]
+    sync: Dict[str, Any] = {"usrps": candidates, "synchronized": False}
+    if len(candidates) < 2:
+        sync["reason"] = "Less than two devices receive the PPS signal."
+    else:
+        try:
+            system.synchronizeUsrps(candidates)
+            status = system.checkSynchronization()
+            sync.update(synchronized=status.synchronized, reason=status.reason)
+        except Exception as e:
+            sync["reason"] = str(e)
+    sync["durationSec"] = time.perf_counter() - syncStart
+    report["synchronization"] = sync
+
+    if sync["synchronized"]:
+        for pairs in _pairRounds(candidates):
+            report["links"] += _checkLinks(system, pairs, probes)
+
+    report["durationSec"] = time.perf_counter() - start
+    report["success"] = len(ips) > 0 and \
+        all(d.get("ok", False) for d in report["devices"].values()) and \
+        (len(ips) < 2 or sync["synchronized"]) and \
+        all(link["ok"] for link in report["links"])
+
+    if reportFile == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(reportFile, "w") as f:
+            json.dump(report, f, indent=2)
+        print("SUCCESS" if report["success"] else "ERROR", f"- report written to {reportFile}")
+    return report["success"]
+
+
 def parseArgs() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run several sanity tests against USRPs",
                                      formatter_class=argparse.ArgumentDefaultsHelpFormatter)
@@ -187,6 +394,9 @@ def parseArgs() -> argparse.Namespace:
                        default=False)
     group.add_argument("--all", default=False, action='store_true',
                        help="Run all sanity tests")
+    group.add_argument("--fleet", default=False, action='store_true',
+                       help="Check all USRPs and all links between them concurrently "
+                            "and write a JSON report")
     group.add_argument("--plot", action='store_true', default=False,
                        help="Plot received signals")
 
@@ -210,6 +420,10 @@ def parseArgs() -> argparse.Namespace:
     group.add_argument("--rx-antenna", required=False, default="RX1",
                        help="RX antenna name (TX/RX, RX1, ...)", type=str)
 
+    group = parser.add_argument_group("Fleet check")
+    group.add_argument("--report", required=False, default="-", type=str,
+                       help="File to write the JSON report of --fleet to, - for stdout")
+
     return parser.parse_args()
 
 
@@ -225,6 +439,8 @@ def main() -> None:
         success = success & checkTrx(ips=args.ips)
     if args.single or args.all:
         success = success & checkSingle(ip=args.ips[0])
+    if args.fleet:
+        success = success & checkFleet(ips=args.ips, reportFile=args.report)
 
     sys.exit(0 if success else 1)
 
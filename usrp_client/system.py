@@ -1,8 +1,9 @@
 import logging
-from typing import Dict, List, Callable
+from typing import Any, Dict, Iterable, List, Callable, Optional, Set, Tuple, Union
 import time
 from collections import namedtuple
-from threading import Timer
+from dataclasses import dataclass, replace
+from threading import Event, RLock, Thread, Timer
 
 from zerorpc.exceptions import RemoteError
 import numpy as np
@@ -16,11 +17,17 @@ from uhd_wrapper.utils.config import (
     TxStreamingConfig,
 )
 from usrp_client.rpc_client import UsrpClient
+from usrp_client.calibration import DEFAULT_CACHE_FILE, LatencyCalibration, findSignalDelay
 from usrp_client.errors import MultipleRemoteUsrpErrors, RemoteUsrpError
+from usrp_client.tracing import span, traced
 
 
 LabeledUsrp = namedtuple("LabeledUsrp", "name ip port client")
 
+UsrpSelection = Union[None, str, Iterable[str]]
+"""Selects USRPs of a system: None for all USRPs, the name of a USRP or group, or
+multiple names of USRPs or groups."""
+
 
 class TimedFlag:
     """Creates a flag that is reset after a certain time denoted by `resetTimeSec`."""
@@ -29,11 +36,13 @@ class TimedFlag:
         self._resetTimeSec = resetTimeSec
         self._value = False
         self.__resetSyncFlagTimer = Timer(10.0, lambda: None)
+        self.__lock = RLock()
 
     def set(self) -> None:
         """Sets the flag and resets after the specified time."""
-        self._value = True
-        self._startTimer()
+        with self.__lock:
+            self._value = True
+            self._startTimer()
 
     def reset(self) -> None:
         """Reset flag."""
@@ -43,22 +52,255 @@ class TimedFlag:
         def setFlagToFalse() -> None:
             self._value = False
 
-        self.__resetSyncFlagTimer.cancel()
-        self.__resetSyncFlagTimer = Timer(self._resetTimeSec, setFlagToFalse)
-        self.__resetSyncFlagTimer.daemon = True
-        self.__resetSyncFlagTimer.start()
+        with self.__lock:
+            self.__resetSyncFlagTimer.cancel()
+            self.__resetSyncFlagTimer = Timer(self._resetTimeSec, setFlagToFalse)
+            self.__resetSyncFlagTimer.daemon = True
+            self.__resetSyncFlagTimer.start()
 
     def isSet(self) -> bool:
         """Returns the value of the flag."""
         return self._value
 
 
+@dataclass
+class SyncStatus:
+    """Result of a check of the synchronization, cf. `System.checkSynchronization`."""
+
+    synchronized: bool = False
+
+    reason: str = ""
+    """Why the USRPs are not synchronized. Empty, if they are."""
+
+    ppsMissing: bool = False
+    """True, if a USRP did not receive a PPS edge recently. Synchronizing the USRPs
+    again does not help in this case."""
+
+    checkedAt: float = 0.0
+    """Time of the check in seconds since the epoch."""
+
+    numResyncs: int = 0
+    """Number of synchronizations performed by the `SyncSupervisor` so far."""
+
+
+class SyncSupervisor:
+    """Verifies the synchronization of the USRPs of a system in a background thread.
+
+    The checks compare the FPGA times of the last PPS edge, which neither resets the
+    clocks nor interrupts running measurements. The USRPs are only synchronized again if
+    they drifted apart, but not while USRPs have been executed and not collected yet.
+    Successful checks renew the synchronization, hence `execute` does not need to
+    synchronize the USRPs periodically. Use `System.startSyncSupervisor` to create it.
+    """
+
+    def __init__(self, system: "System", intervalSec: float,
+                 logger: logging.Logger) -> None:
+        self.__system = system
+        self.__intervalSec = intervalSec
+        self.__logger = logger
+        self.__status = SyncStatus()
+        self.__numResyncs = 0
+        self.__stopEvent = Event()
+        self.__thread: Optional[Thread] = None
+
+    @property
+    def status(self) -> SyncStatus:
+        """Result of the last check."""
+        return self.__status
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None
+
+    def start(self) -> None:
+        """Start checking every `intervalSec` in a daemon thread."""
+        if self.__thread is not None:
+            return
+        self.__stopEvent.clear()
+        self.__thread = Thread(target=self.__run, name="SyncSupervisor", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and wait until a running check has finished."""
+        if self.__thread is None:
+            return
+        self.__stopEvent.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def __run(self) -> None:
+        while not self.__stopEvent.is_set():
+            self.check()
+            self.__stopEvent.wait(self.__intervalSec)
+
+    def check(self) -> SyncStatus:
+        """Check the synchronization once and synchronize the USRPs if they drifted
+        apart."""
+        try:
+            status = self.__system.checkSynchronization()
+            if not status.synchronized and not status.ppsMissing:
+                if self.__system._resynchronize():
+                    self.__logger.info(f"Synchronized USRPs: {status.reason}")
+                    self.__numResyncs += 1
+                    status = self.__system.checkSynchronization()
+                else:
+                    status = replace(status, reason=f"{status.reason} Synchronizing is "
+                                     "deferred until the executing USRPs are collected.")
+        except Exception as e:
+            status = SyncStatus(synchronized=False, reason=str(e), checkedAt=time.time())
+        if not status.synchronized:
+            self.__logger.warning(f"USRPs are not synchronized: {status.reason}")
+        self.__status = replace(status, numResyncs=self.__numResyncs)
+        return self.__status
+
+
+def _tensorLayout(signalLengths: Dict[str, List[int]],
+                  numStreams: Dict[str, int]) -> Tuple[np.ndarray, Tuple[int, ...]]:
+    """Number of valid samples per USRP and signal, and shape of the tensor."""
+    numSignals = max((len(lengths) for lengths in signalLengths.values()), default=0)
+    numSamples = np.zeros((len(signalLengths), numSignals), dtype=int)
+    for i, lengths in enumerate(signalLengths.values()):
+        numSamples[i, :len(lengths)] = lengths
+    shape = (len(signalLengths), numSignals, max(numStreams.values(), default=0),
+             int(numSamples.max(initial=0)))
+    return numSamples, shape
+
+
+@dataclass
+class SampleTensor:
+    """Samples of several USRPs stored in a single array, cf. `System.collectArray`."""
+
+    samples: np.ndarray
+    """`complex64` array of shape (USRPs, signals, streams, samples). Signals shorter than
+    the longest one and missing signals or streams of a USRP are zero-padded."""
+
+    usrpNames: List[str]
+    """Name of the USRP of each entry along the first axis."""
+
+    numSamples: np.ndarray
+    """Number of valid samples of each signal, of shape (USRPs, signals). Zero for
+    signals that a USRP did not receive."""
+
+    numSignals: List[int]
+    """Number of signals received by each USRP."""
+
+    @staticmethod
+    def allocate(signalLengths: Dict[str, List[int]],
+                 numStreams: Dict[str, int]) -> "SampleTensor":
+        """Allocate a zeroed tensor for the given number of samples per signal and
+        number of streams of each USRP."""
+        numSamples, shape = _tensorLayout(signalLengths, numStreams)
+        return SampleTensor(samples=np.zeros(shape, dtype=np.complex64),
+                            usrpNames=list(signalLengths.keys()), numSamples=numSamples,
+                            numSignals=[len(lengths) for lengths in signalLengths.values()])
+
+    def fits(self, signalLengths: Dict[str, List[int]], numStreams: Dict[str, int]) -> bool:
+        """True, if the tensor has the layout `allocate` creates for the arguments."""
+        numSamples, shape = _tensorLayout(signalLengths, numStreams)
+        return self.usrpNames == list(signalLengths.keys()) and \
+            self.numSignals == [len(lengths) for lengths in signalLengths.values()] and \
+            self.samples.shape == shape and np.array_equal(self.numSamples, numSamples)
+
+    def device(self, usrpName: str) -> np.ndarray:
+        """Contiguous block of shape (signals, streams, samples) of `usrpName`. This is a
+        view, not a copy."""
+        return self.samples[self.usrpNames.index(usrpName)]
+
+    def views(self, numStreams: Dict[str, int]) -> Dict[str, List[MimoSignal]]:
+        """`MimoSignal`s per USRP whose arrays are views of the valid samples."""
+        result: Dict[str, List[MimoSignal]] = dict()
+        for i, usrpName in enumerate(self.usrpNames):
+            result[usrpName] = [
+                MimoSignal(signals=[self.samples[i, c, s, :n]
+                                    for s in range(numStreams[usrpName])])
+                for c, n in enumerate(self.numSamples[i, :self.numSignals[i]])]
+        return result
+
+
+class MeasurementPlan:
+    """Streaming configs armed on the USRPs of a system, cf. `System.prepare`.
+
+    The plan can be used as context manager, which releases it on exit.
+    """
+
+    defaultRunPeriodSec = 1.0
+    """Time between the end of the burst of a run and the start of the next run of
+    `run` with `numRuns > 1`. If the duration of the burst is unknown, it is the time
+    between the starts of two runs."""
+
+    def __init__(self, system: "System", burstDurationSec: Optional[float] = None) -> None:
+        """Private constructor. Use `System.prepare` instead."""
+        self.__system: Optional[System] = system
+        self.__burstDurationSec = burstDurationSec
+
+    @property
+    def burstDurationSec(self) -> Optional[float]:
+        """Duration of one run from its base time on, cf. `System.plannedBurstDurationSec`.
+        """
+        return self.__burstDurationSec
+
+    @property
+    def released(self) -> bool:
+        return self.__system is None
+
+    def run(self, numRuns: int = 1, *, runPeriodSec: Optional[float] = None,
+            out: Optional[Dict[str, List[MimoSignal]]] = None
+            ) -> Dict[str, List[MimoSignal]]:
+        """Execute the armed configs and collect the samples.
+
+        Args:
+            numRuns (int): Number of executions. The runs after the first one are
+                performed by the USRPs without further requests.
+            runPeriodSec (float, optional): Time between the starts of two runs. Needs to
+                cover the streaming and the download of the samples of one run. Defaults
+                to the duration of the burst plus `defaultRunPeriodSec`.
+            out (Dict[str, List[MimoSignal]], optional): Preallocated buffers, cf.
+                `System.collect`.
+
+        Returns:
+            Dict[str, List[MimoSignal]]: Samples per USRP. The signals of all configs of
+            the first run are followed by the signals of the second run and so on.
+
+        Raises:
+            ValueError: `runPeriodSec` is shorter than the burst of a run.
+        """
+        if self.__system is None:
+            raise RuntimeError("The measurement plan has been released.")
+        if numRuns < 1:
+            raise ValueError("At least one run is required.")
+        burstDurationSec = self.__burstDurationSec or 0.0
+        if runPeriodSec is None:
+            runPeriodSec = burstDurationSec + self.defaultRunPeriodSec
+        if numRuns > 1 and runPeriodSec < burstDurationSec:
+            raise ValueError(f"The run period of {runPeriodSec}s is shorter than the burst "
+                             f"of {burstDurationSec}s.")
+        self.__system._executePlan(self, numRuns, runPeriodSec)
+        return self.__system.collect(out=out)
+
+    def release(self) -> None:
+        """Reset the armed configs on the USRPs."""
+        if self.__system is not None:
+            system, self.__system = self.__system, None
+            system._releasePlan(self)
+
+    def __enter__(self) -> "MeasurementPlan":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+
 class System:
     """User interface for accessing multiple USRPs.
 
     This module is the main interface for using the USRP. A system is to be defined to which
     USRPs can be added. Using the system functions defined in the `System` class gives you
-    direct access to the USRP configuration etc."""
+    direct access to the USRP configuration etc.
+
+    The system can be used by multiple threads. Calls referring to a single USRP, e.g.
+    `configureTx`, only hold the lock of that USRP (cf. `UsrpClient.lock`), hence calls
+    referring to different USRPs proceed in parallel. Calls affecting all USRPs, e.g.
+    adding USRPs or synchronizing them, are serialized by a lock of the system."""
 
     syncThresholdSec = 0.2
     """In order to verify if the USRPs in the system are properly
@@ -79,12 +321,34 @@ class System:
     syncTimeOut = 20 * 60.0  # every 20 minutes
     """Timeout of synchronisation."""
 
+    maxPpsAgeSec = 1.5
+    """A USRP whose last PPS edge is older than this is considered to miss the PPS
+    signal, cf. `checkSynchronization`."""
+
+    ppsDriftThresholdSec = 1e-6
+    """The FPGA time of each PPS edge is an integer number of seconds for synchronized
+    USRPs. Larger deviations indicate that the clock of a USRP drifts."""
+
+    latencyCacheFile = DEFAULT_CACHE_FILE
+    """File the calibrated TX to RX latencies are stored in, cf. `calibrateLatency`."""
+
+    maxLatencySamples = 5000
+    """Maximum TX to RX latency in samples that can be measured by `calibrateLatency`."""
+
     def __init__(self, logLevel: int = logging.INFO, *, syncSource: str = 'auto') -> None:
         self.__usrpClients: Dict[str, LabeledUsrp] = {}
         self._usrpsSynced = TimedFlag(resetTimeSec=System.syncTimeOut)
         self._syncSourceSet = False
         self._syncSourceRequest = syncSource
         self.__logger = self.__createLogger(logLevel)
+        self.__latencyCalibration: Optional[LatencyCalibration] = None
+        self.__plan: Optional[MeasurementPlan] = None
+        self.__lock = RLock()
+        self.__groups: Dict[str, List[str]] = {}
+        self.__syncedUsrps: Set[str] = set()
+        self.__syncSupervisor: Optional[SyncSupervisor] = None
+        # executed, but not collected yet, hence their time must not be reset
+        self.__executingUsrps: Set[str] = set()
 
     def __createLogger(self, logLevel: int) -> logging.Logger:
         handler = logging.StreamHandler()
@@ -119,7 +383,8 @@ class System:
         ip: str,
         usrpName: str,
         *,
-        port: int = 5555
+        port: int = 5555,
+        readinessTimeout: float = 0.0
     ) -> UsrpClient:
         """Create a new USRP and add it to the system.
 
@@ -127,7 +392,11 @@ class System:
             ip (str): IP of the USRP.
             port (int): Port where the Usrp Server is listening
             usrpName (str): Identifier of the USRP to be added.
+            readinessTimeout (float): If positive, wait up to this many seconds until
+                the server finished its startup, cf. `UsrpClient.waitUntilReady`.
         """
+        if readinessTimeout > 0:
+            UsrpClient.waitUntilReady(ip, port, readinessTimeout)
         try:
             usrpClient = self._createUsrpClient(ip, port)
         except RemoteError as e:
@@ -142,22 +411,58 @@ class System:
             client (UsrpClient): Prepared UsrpClient
         """
         try:
-            self._usrpsSynced.reset()
-            ip, port = client.ip, client.port
-            self.__assertUniqueUsrp(ip, port, usrpName)
-
-            self.__logger.info("Adding new USRP (%s:%s) with local version "
-                               "%s and remote version %s.",
-                               ip, port,
-                               client.getLocalVersion(), client.getRemoteVersion())
-
-            client.resetStreamingConfigs()
-            self.__usrpClients[usrpName] = LabeledUsrp(usrpName, ip, port, client)
-            self._syncSourceSet = False
-            return client
+            with self.__lock:
+                self._usrpsSynced.reset()
+                ip, port = client.ip, client.port
+                self.__assertUniqueUsrp(ip, port, usrpName)
+
+                self.__logger.info("Adding new USRP (%s:%s) with local version "
+                                   "%s and remote version %s.",
+                                   ip, port,
+                                   client.getLocalVersion(), client.getRemoteVersion())
+
+                client.resetStreamingConfigs()
+                self.__usrpClients[usrpName] = LabeledUsrp(usrpName, ip, port, client)
+                self._syncSourceSet = False
+                return client
         except RemoteError as e:
             raise RemoteUsrpError(e.msg, usrpName)
 
+    def defineGroup(self, groupName: str, usrpNames: Iterable[str]) -> None:
+        """Define a group of USRPs that can be selected by `groupName`, e.g. in
+        `execute` and `collect`. An existing group of the same name is replaced.
+
+        Args:
+            groupName (str): Identifier of the group. Must differ from the USRP names.
+            usrpNames (Iterable[str]): Identifiers of the USRPs in the group.
+        """
+        usrpNames = list(usrpNames)
+        with self.__lock:
+            if groupName in self.__usrpClients:
+                raise ValueError(f"{groupName} is the name of a USRP.")
+            for usrpName in usrpNames:
+                if usrpName not in self.__usrpClients:
+                    raise ValueError(f"Unknown USRP {usrpName}.")
+            self.__groups[groupName] = usrpNames
+
+    def __usrps(self, usrpNames: UsrpSelection = None) -> List[LabeledUsrp]:
+        # copy, since USRPs may be added by other threads while iterating
+        with self.__lock:
+            if usrpNames is None:
+                return list(self.__usrpClients.values())
+            if isinstance(usrpNames, str):
+                usrpNames = [usrpNames]
+
+            selected: Dict[str, LabeledUsrp] = {}
+            for name in usrpNames:
+                if name in self.__groups:
+                    selected.update((n, self.__usrpClients[n]) for n in self.__groups[name])
+                elif name in self.__usrpClients:
+                    selected[name] = self.__usrpClients[name]
+                else:
+                    raise ValueError(f"Unknown USRP or group {name}.")
+            return list(selected.values())
+
     def __calculateSyncSource(self) -> str:
         if self._syncSourceRequest == 'auto':
             source = "internal" if len(self.__usrpClients) <= 1 else "external"
@@ -172,7 +477,7 @@ class System:
             return
 
         source = self.__calculateSyncSource()
-        for usrp in self.__usrpClients.values():
+        for usrp in self.__usrps():
             usrp.client.setSyncSource(source)
         self.resetFpgaTimes()
         self._syncSourceSet = True
@@ -215,10 +520,12 @@ class System:
         if txContainsClippedValue(txStreamingConfig.samples):
             raise ValueError("Tx signal contains values above 1.0.")
 
-        self.__usrpClients[usrpName].client.configureTx(txStreamingConfig)
+        with span("System.configureTx", usrp=usrpName):
+            self.__usrpClients[usrpName].client.configureTx(txStreamingConfig)
         self.__logger.debug(f"Configured TX Streaming for USRP: {usrpName}.")
 
-    def configureRx(self, usrpName: str, rxStreamingConfig: RxStreamingConfig) -> None:
+    def configureRx(self, usrpName: str, rxStreamingConfig: RxStreamingConfig,
+                    *, alignToTx: Optional[str] = None) -> None:
         """Configure receiver streaming.
 
         Use this function to configure the receiving of your desired USRP.
@@ -226,10 +533,134 @@ class System:
         Args:
             usrpName (str): Identifier of USRP.
             rxStreamingConfig (RxStreamingConfig): Desired configuration.
+            alignToTx (str, optional): Identifier of the transmitting USRP. If given, the
+                `receiveTimeOffset` is shifted by the calibrated latency of the link, such
+                that the first received sample is the first sample transmitted at the same
+                offset. Hence, `numSamples` only needs to cover the transmitted signal.
+
+        Raises:
+            LookupError: The latency of the link is not calibrated.
         """
+        if alignToTx is not None:
+            delay = self.__lookupLatency(alignToTx, usrpName)
+            if delay is None:
+                raise LookupError(f"The latency from {alignToTx} to {usrpName} is not "
+                                  "calibrated. Call calibrateLatency first.")
+            samplingRate = self.__usrpClients[usrpName].client.getConfiguredRfConfig() \
+                .rxSamplingRate
+            rxStreamingConfig = replace(
+                rxStreamingConfig,
+                receiveTimeOffset=rxStreamingConfig.receiveTimeOffset + delay / samplingRate)
         self.__usrpClients[usrpName].client.configureRx(rxStreamingConfig)
         self.__logger.debug(f"Configured RX streaming for USRP: {usrpName}.")
 
+    @property
+    def latencyCalibration(self) -> LatencyCalibration:
+        """Cache of the calibrated TX to RX latencies, stored in `latencyCacheFile`."""
+        with self.__lock:
+            if self.__latencyCalibration is None:
+                self.__latencyCalibration = LatencyCalibration(self.latencyCacheFile)
+            return self.__latencyCalibration
+
+    def __deviceId(self, usrpName: str) -> str:
+        usrp = self.__usrpClients[usrpName]
+        return f"{usrp.ip}:{usrp.port}"
+
+    def __lookupLatency(self, txUsrpName: str, rxUsrpName: str) -> Optional[int]:
+        txRfConfig = self.__usrpClients[txUsrpName].client.getConfiguredRfConfig()
+        rxRfConfig = self.__usrpClients[rxUsrpName].client.getConfiguredRfConfig()
+        with self.__lock:
+            return self.latencyCalibration.lookup(
+                self.__deviceId(txUsrpName), txRfConfig,
+                self.__deviceId(rxUsrpName), rxRfConfig)
+
+    def calibrateLatency(self, txUsrpName: str, rxUsrpName: str, *, force: bool = False,
+                         probeLength: int = 1000) -> int:
+        """Measure the latency of the link from `txUsrpName` to `rxUsrpName`.
+
+        The latency is stored in `latencyCalibration` and only measured again if the RF
+        settings of the link changed or `force` is set. The measurement executes a probe
+        transmission on both USRPs, hence no streaming configs may be pending at them. The
+        probe is sent from the first TX stream and received by the first RX stream.
+
+        Args:
+            txUsrpName (str): Identifier of the transmitting USRP.
+            rxUsrpName (str): Identifier of the receiving USRP. May equal `txUsrpName`.
+            force (bool): Measure even if the latency is calibrated already.
+            probeLength (int): Length of the probe signal in samples.
+
+        Returns:
+            int: Latency in samples at the RX sampling rate.
+        """
+        with self.__lock:
+            return self.__calibrateLatency(txUsrpName, rxUsrpName, force, probeLength)
+
+    def __calibrateLatency(self, txUsrpName: str, rxUsrpName: str, force: bool,
+                           probeLength: int) -> int:
+        if not force:
+            delay = self.__lookupLatency(txUsrpName, rxUsrpName)
+            if delay is not None:
+                return delay
+
+        txRfConfig = self.__usrpClients[txUsrpName].client.getConfiguredRfConfig()
+        rxRfConfig = self.__usrpClients[rxUsrpName].client.getConfiguredRfConfig()
+        probe = self.__latencyProbe(probeLength)
+        self.configureTx(txUsrpName, TxStreamingConfig(
+            sendTimeOffset=0.0,
+            samples=MimoSignal(signals=[probe] + [np.zeros_like(probe)] * (
+                txRfConfig.noTxStreams - 1))))
+        self.configureRx(rxUsrpName, RxStreamingConfig(
+            receiveTimeOffset=0.0, numSamples=probeLength + System.maxLatencySamples))
+        usrpNames = list(dict.fromkeys([txUsrpName, rxUsrpName]))
+        self.execute(usrpNames)
+        # the TX USRP is collected as well to clear its probe
+        rxSignal = self.collect(usrpNames=usrpNames)[rxUsrpName][-1].signals[0]
+
+        delay = findSignalDelay(rxSignal, probe)
+        self.latencyCalibration.store(self.__deviceId(txUsrpName), txRfConfig,
+                                      self.__deviceId(rxUsrpName), rxRfConfig, delay)
+        self.__logger.info(f"Calibrated latency from {txUsrpName} to {rxUsrpName}: "
+                           f"{delay} samples.")
+        return delay
+
+    @staticmethod
+    def __latencyProbe(numSamples: int) -> np.ndarray:
+        # QPSK symbols have a sharp autocorrelation peak and a low crest factor
+        rng = np.random.default_rng(seed=0)
+        symbols = rng.integers(0, 4, numSamples)
+        return (0.5 * np.exp(1j * (np.pi / 4 + np.pi / 2 * symbols))).astype(np.complex64)
+
+    def reopenUsrps(self, masterClockRate: float = 0.0, deviceArgs: str = "",
+                    usrpNames: UsrpSelection = None) -> Dict[str, Dict[str, Any]]:
+        """Recreate the devices of the USRPs without restarting their servers, e.g. to
+        change the master clock rate, cf. `UsrpClient.reopenDevice`.
+
+        The USRPs need to be configured and are synchronized again afterwards.
+
+        Args:
+            masterClockRate (float): Master clock rate to configure. 0 leaves it at the
+                default of the devices.
+            deviceArgs (str): Additional UHD device arguments.
+            usrpNames (UsrpSelection): USRPs or groups to reopen. Defaults to all.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Readiness of each server after reopening, which
+            contains the durations of the reinitialization.
+        """
+        result: Dict[str, Dict[str, Any]] = dict()
+
+        def reopenAtUsrp(usrpName: str) -> None:
+            result[usrpName] = self.__usrpClients[usrpName].client.reopenDevice(
+                masterClockRate, deviceArgs)
+
+        with self.__lock:
+            self._usrpsSynced.reset()
+            self._syncSourceSet = False
+            usrps = self.__usrps(usrpNames)
+            self.__markCollected(u.name for u in usrps)
+            self.__catchRemoteUsrpErrors(reopenAtUsrp, usrps)
+        return result
+
     def getRfConfigs(self) -> Dict[str, RfConfig]:
         """Returns actual Radio Frontend configurations of the USRPs in the system.
 
@@ -238,52 +669,163 @@ class System:
                 Dict-keys denote the identifier/name of the USRPs.
                 Values are the Radio Frontend configurations.
         """
-        return {
-            usrpName: self.__usrpClients[usrpName].client.getRfConfig()
-            for usrpName in self.__usrpClients.keys()
-        }
-
-    def synchronizeUsrps(self) -> None:
-        """Let all USRPs synchronize upon the PPS signal"""
-        self.__updateSyncSources()
-        self.__synchronizeUsrps()
-
-    def __synchronizeUsrps(self) -> None:
-        if self._usrpsSynced.isSet():
+        return {usrp.name: usrp.client.getRfConfig() for usrp in self.__usrps()}
+
+    def synchronizeUsrps(self, usrpNames: UsrpSelection = None) -> None:
+        """Let the USRPs synchronize upon the PPS signal.
+
+        USRPs which have been synchronized with each other already, e.g. by synchronizing
+        all USRPs, are not synchronized again. Synchronizing a subset of the USRPs resets
+        their time only, hence other USRPs are no longer synchronized with them.
+
+        Args:
+            usrpNames (UsrpSelection): USRPs or groups to synchronize. Defaults to all.
+        """
+        with self.__lock:
+            self.__updateSyncSources()
+            self.__synchronizeUsrps([usrp.name for usrp in self.__usrps(usrpNames)])
+
+    @traced("System.synchronizeUsrps")
+    def __synchronizeUsrps(self, usrpNames: List[str], force: bool = False) -> None:
+        if not self._usrpsSynced.isSet():
+            self.__syncedUsrps = set()
+        elif self.__syncedUsrps.issuperset(usrpNames):
             return
 
-        if self.synchronisationValid():
-            self._usrpsSynced.set()
+        if not force and self.synchronisationValid(usrpNames):
+            # the USRPs synchronized before may still agree with the new ones
+            union = sorted(self.__syncedUsrps.union(usrpNames))
+            if len(self.__syncedUsrps) > 0 and self.synchronisationValid(union):
+                usrpNames = union
+            self.__markSynchronized(usrpNames)
             return
 
         for _ in range(System.syncAttempts):
-            self.__setTimeToZeroNextPps()
-            if self.synchronisationValid():
-                self._usrpsSynced.set()
+            self.__setTimeToZeroNextPps(usrpNames)
+            if self.synchronisationValid(usrpNames):
+                self.__markSynchronized(usrpNames)
                 return
             self._sleep(System.timeBetweenSyncAttempts)
         raise RuntimeError(f"Tried at least {self.syncAttempts} syncing wihout succes.")
 
-    def synchronisationValid(self) -> bool:
-        """Returns true if synchronisation of the USRPs is valid."""
-        currentFpgaTimes = self.__getCurrentFpgaTimes()
+    def __markSynchronized(self, usrpNames: List[str]) -> None:
+        self.__syncedUsrps = set(usrpNames)
+        self._usrpsSynced.set()
+
+    def startSyncSupervisor(self, intervalSec: float = 10.0) -> SyncSupervisor:
+        """Verify the synchronization of the USRPs in a background thread.
+
+        The supervisor synchronizes the USRPs right away if required and again if they
+        drift apart, cf. `SyncSupervisor`. Hence, `execute` does not block on periodic
+        synchronizations.
+
+        Args:
+            intervalSec (float): Time between two checks in seconds.
+
+        Returns:
+            SyncSupervisor: The running supervisor.
+        """
+        with self.__lock:
+            if self.__syncSupervisor is None:
+                self.__syncSupervisor = SyncSupervisor(self, intervalSec, self.__logger)
+            self.__syncSupervisor.start()
+            return self.__syncSupervisor
+
+    def stopSyncSupervisor(self) -> None:
+        """Stop the supervisor started by `startSyncSupervisor`."""
+        with self.__lock:
+            supervisor, self.__syncSupervisor = self.__syncSupervisor, None
+        if supervisor is not None:
+            supervisor.stop()
+
+    @property
+    def syncStatus(self) -> Optional[SyncStatus]:
+        """Result of the last check of the supervisor, None if it is not running."""
+        supervisor = self.__syncSupervisor
+        return None if supervisor is None else supervisor.status
+
+    def checkSynchronization(self) -> SyncStatus:
+        """Check if the synchronized USRPs are still synchronized, without interrupting
+        them.
+
+        Each USRP counts the seconds since the PPS edge its time was reset at. Hence, the
+        times of the last PPS edges are equal integers for synchronized USRPs. A
+        successful check renews the synchronization, cf. `syncTimeOut`.
+
+        Returns:
+            SyncStatus: Result of the check.
+        """
+        with self.__lock:
+            usrpNames = sorted(self.__syncedUsrps) if self._usrpsSynced.isSet() else []
+        if len(usrpNames) == 0:
+            return SyncStatus(reason="The USRPs have not been synchronized yet.",
+                              checkedAt=time.time())
+        usrps = self.__usrps(usrpNames)
+
+        # a PPS edge between the queries of two USRPs causes a difference of one second
+        for _ in range(2):
+            ppsTimes = []
+            for usrp in usrps:
+                ppsTime = usrp.client.getTimeLastPps()
+                if usrp.client.getCurrentFpgaTime() - ppsTime > System.maxPpsAgeSec:
+                    self._usrpsSynced.reset()
+                    return SyncStatus(reason=f"{usrp.name} misses the PPS signal.",
+                                      ppsMissing=True, checkedAt=time.time())
+                if abs(ppsTime - round(ppsTime)) > System.ppsDriftThresholdSec:
+                    return SyncStatus(reason=f"The clock of {usrp.name} drifts.",
+                                      checkedAt=time.time())
+                ppsTimes.append(round(ppsTime))
+            if max(ppsTimes) == min(ppsTimes):
+                with self.__lock:
+                    if self.__syncedUsrps.issuperset(usrpNames):
+                        self._usrpsSynced.set()
+                return SyncStatus(synchronized=True, checkedAt=time.time())
+        return SyncStatus(reason="The USRPs count different seconds.",
+                          checkedAt=time.time())
+
+    def _resynchronize(self) -> bool:
+        """Synchronize the USRPs again, e.g. after a failed check. Developers only.
+
+        Returns:
+            bool: False, if it is deferred, since USRPs have been executed but not
+            collected yet. Resetting their time would break the running execution.
+        """
+        with self.__lock:
+            if len(self.__executingUsrps) > 0:
+                return False
+            usrpNames = sorted(self.__syncedUsrps) if self._usrpsSynced.isSet() else []
+            if len(usrpNames) == 0:
+                usrpNames = [usrp.name for usrp in self.__usrps()]
+            self._usrpsSynced.reset()
+            self.__updateSyncSources()
+            self.__synchronizeUsrps(usrpNames, force=True)
+            return True
+
+    def synchronisationValid(self, usrpNames: UsrpSelection = None) -> bool:
+        """Returns true if synchronisation of the USRPs is valid.
+
+        Args:
+            usrpNames (UsrpSelection): USRPs or groups to check. Defaults to all.
+        """
+        currentFpgaTimes = self.__getCurrentFpgaTimes(usrpNames)
         return (
             np.max(currentFpgaTimes) - np.min(currentFpgaTimes)
             < System.syncThresholdSec
         )
 
-    def __setTimeToZeroNextPps(self) -> None:
-        for usrp in self.__usrpClients.keys():
-            self.__usrpClients[usrp].client.setTimeToZeroNextPps()
+    def __setTimeToZeroNextPps(self, usrpNames: UsrpSelection = None) -> None:
+        for usrp in self.__usrps(usrpNames):
+            usrp.client.setTimeToZeroNextPps()
             self.__logger.debug("Set time to zero for PPS.")
         self._sleep(1.1)
 
     def _sleep(self, delay: float) -> None:
         """Let's the system sleep for `delay` seconds."""
-        time.sleep(delay)
+        with span("System.sleep", delaySec=delay):
+            time.sleep(delay)
 
-    def __calculateBaseTimeSec(self) -> float:
-        currentFpgaTimesSec = self.__getCurrentFpgaTimes()
+    def __calculateBaseTimeSec(self, usrpNames: UsrpSelection = None) -> float:
+        currentFpgaTimesSec = self.__getCurrentFpgaTimes(usrpNames)
         self.__logger.debug(
             f"For calculating the base time, I received the "
             f"following fpgaTimes: {currentFpgaTimesSec}"
@@ -291,56 +833,226 @@ class System:
         maxTime = np.max(currentFpgaTimesSec)
         return maxTime + System.baseTimeOffsetSec
 
-    def __getCurrentFpgaTimes(self) -> List[float]:
-        return [
-            item.client.getCurrentFpgaTime() for _, item in self.__usrpClients.items()
-        ]
+    def __getCurrentFpgaTimes(self, usrpNames: UsrpSelection = None) -> List[float]:
+        return [usrp.client.getCurrentFpgaTime() for usrp in self.__usrps(usrpNames)]
 
-    def __catchRemoteUsrpErrors(self, f: Callable[[str], None]) -> None:
+    def __catchRemoteUsrpErrors(self, f: Callable[[str], None],
+                                usrps: Optional[List[LabeledUsrp]] = None) -> None:
         errors = []
 
-        for usrpName in self.__usrpClients.keys():
+        for usrp in self.__usrps() if usrps is None else usrps:
             try:
-                f(usrpName)
+                with span(f.__name__, usrp=usrp.name):
+                    f(usrp.name)
             except RemoteError as e:
-                errors.append(RemoteUsrpError(e.msg, usrpName))
+                errors.append(RemoteUsrpError(e.msg, usrp.name))
         if errors:
             raise MultipleRemoteUsrpErrors(errors)
 
-    def execute(self) -> None:
+    def __activeUsrps(self, usrpNames: UsrpSelection = None) -> List[LabeledUsrp]:
+        return [u for u in self.__usrps(usrpNames) if u.client.hasPendingConfigs]
+
+    @traced("System.execute")
+    def execute(self, usrpNames: UsrpSelection = None) -> None:
         """Executes all streaming configurations.
 
         Samples are buffered, timeouts are calculated, Usrps are synchronized...
+        USRPs without pending streaming configurations are skipped. Different selections
+        of USRPs may be executed by different threads concurrently.
+
+        Args:
+            usrpNames (UsrpSelection): USRPs or groups to execute. Defaults to all.
         """
-        self.synchronizeUsrps()
-        baseTimeSec = self.__calculateBaseTimeSec()
+        usrps = self.__activeUsrps(usrpNames)
+        if len(usrps) == 0:
+            return
+        activeUsrps = [u.name for u in usrps]
 
         def callExecuteAtUsrp(usrpName: str) -> None:
             self.__usrpClients[usrpName].client.execute(baseTimeSec)
 
-        self.__catchRemoteUsrpErrors(callExecuteAtUsrp)
+        self.__markExecuting(activeUsrps)
+        try:
+            self.synchronizeUsrps(activeUsrps)
+            baseTimeSec = self.__calculateBaseTimeSec(activeUsrps)
+            self.__catchRemoteUsrpErrors(callExecuteAtUsrp, usrps)
+        except Exception:
+            self.__markCollected(activeUsrps)
+            raise
+
+    def __markExecuting(self, usrpNames: List[str]) -> None:
+        with self.__lock:
+            self.__executingUsrps.update(usrpNames)
+
+    def __markCollected(self, usrpNames: Iterable[str]) -> None:
+        with self.__lock:
+            self.__executingUsrps.difference_update(usrpNames)
+
+    @property
+    def plannedBurstDurationSec(self) -> Optional[float]:
+        """Time from the base time until all configured streaming configs finished
+        streaming, i.e. the longest planned burst of all USRPs. None, if it is unknown for
+        any of the USRPs, cf. `UsrpClient.plannedStreaming`."""
+        durations = []
+        for item in self.__usrpClients.values():
+            planned = item.client.plannedStreaming
+            if planned is None:
+                return None
+            durations.append(planned.burstDuration)
+        return max(durations, default=0.0)
+
+    def prepare(self) -> "MeasurementPlan":
+        """Arm the configured streaming configs of all USRPs for repeated execution.
+
+        The configs stay on the USRPs until the returned plan is released. Hence, each
+        run of the plan only executes and collects, without transferring and validating
+        the configs again. Preparing a new plan releases the previous one.
+
+        Returns:
+            MeasurementPlan: Handle of the armed configs.
+        """
+        def armAtUsrp(usrpName: str) -> None:
+            self.__usrpClients[usrpName].client.armStreamingConfigs()
+
+        with self.__lock:
+            if self.__plan is not None:
+                self.__plan.release()
+            self.__catchRemoteUsrpErrors(armAtUsrp)
+            self.__plan = MeasurementPlan(self, self.plannedBurstDurationSec)
+            return self.__plan
+
+    @traced("System.executePlan")
+    def _executePlan(self, plan: "MeasurementPlan", numRuns: int, runPeriodSec: float) -> None:
+        """Execute the armed configs of `plan` `numRuns` times. Developers only."""
+        if plan is not self.__plan:
+            raise RuntimeError("The measurement plan has been released.")
+        if numRuns == 1:
+            self.execute()
+            return
+
+        usrps = self.__activeUsrps()
+        if len(usrps) == 0:
+            return
+        activeUsrps = [u.name for u in usrps]
+
+        def callExecuteAtUsrp(usrpName: str) -> None:
+            self.__usrpClients[usrpName].client.executeRepeatedly(
+                baseTimeSec, numRuns, runPeriodSec)
+
+        self.__markExecuting(activeUsrps)
+        try:
+            self.synchronizeUsrps(activeUsrps)
+            baseTimeSec = self.__calculateBaseTimeSec(activeUsrps)
+            self.__catchRemoteUsrpErrors(callExecuteAtUsrp, usrps)
+        except Exception:
+            self.__markCollected(activeUsrps)
+            raise
+
+    def _releasePlan(self, plan: "MeasurementPlan") -> None:
+        """Reset the armed configs of `plan`. Developers only."""
+        with self.__lock:
+            if plan is not self.__plan:
+                return
+            self.__plan = None
 
-    def collect(self) -> Dict[str, List[MimoSignal]]:
+        def resetAtUsrp(usrpName: str) -> None:
+            self.__usrpClients[usrpName].client.resetStreamingConfigs()
+
+        try:
+            self.__catchRemoteUsrpErrors(resetAtUsrp)
+        finally:
+            self.__markCollected(self.__usrpClients.keys())
+
+    @traced("System.collect")
+    def collect(
+        self, out: Optional[Dict[str, List[MimoSignal]]] = None,
+        usrpNames: UsrpSelection = None
+    ) -> Dict[str, List[MimoSignal]]:
         """Collects the samples at each USRP.
 
         This is a blocking call. In the streaming configurations, the user defined when to send
         and receive the samples at which USRP. This method waits until all the samples are
-        received (hence blocking) and returns them.
+        received (hence blocking) and returns them. USRPs without pending streaming
+        configurations are not requested and return no samples.
+
+        Args:
+            out (Dict[str, List[MimoSignal]], optional): Preallocated buffers per USRP,
+                as returned by a previous call to `collect`. The samples of all USRPs
+                contained in `out` are written into these buffers in place. This avoids
+                allocating new arrays in every iteration of a measurement loop.
+            usrpNames (UsrpSelection): USRPs or groups to collect from. Defaults to all.
 
         Returns:
             Dict[str, List[MimoSignal]]:
                 Dictionary containing the samples received.
                 The key represents the usrp identifier.
         """
-        samples = dict()
+        samples: Dict[str, List[MimoSignal]] = dict()
 
         def callCollectAtUsrp(usrpName: str) -> None:
-            samples[usrpName] = self.__usrpClients[usrpName].client.collect()
-
-        self.__catchRemoteUsrpErrors(callCollectAtUsrp)
+            client = self.__usrpClients[usrpName].client
+            if not client.hasPendingConfigs:
+                samples[usrpName] = []
+            elif out is not None and usrpName in out:
+                samples[usrpName] = client.collect(out=out[usrpName])
+            else:
+                samples[usrpName] = client.collect()
+
+        usrps = self.__usrps(usrpNames)
+        try:
+            self.__catchRemoteUsrpErrors(callCollectAtUsrp, usrps)
+        finally:
+            self.__markCollected(u.name for u in usrps)
         self.__assertNoClippedValues(samples)
         return samples
 
+    def collectArray(self, out: Optional[SampleTensor] = None,
+                     usrpNames: UsrpSelection = None) -> SampleTensor:
+        """Collects the samples at each USRP into a single array, cf. `collect`.
+
+        If the layout of the received signals is known beforehand from the validated
+        streaming configs, the samples of each USRP are written directly into its part of
+        the array while they are downloaded. Otherwise, they are copied into it after
+        collecting them.
+
+        Args:
+            out (SampleTensor, optional): Tensor returned by a previous call. It is reused,
+                if the layout of the received signals did not change.
+            usrpNames (UsrpSelection): USRPs or groups to collect from. Defaults to all.
+
+        Returns:
+            SampleTensor: Samples of all selected USRPs, including those without pending
+            streaming configs, which receive no signals.
+        """
+        usrps = self.__usrps(usrpNames)
+        signalLengths: Dict[str, List[int]] = dict()
+        numStreams: Dict[str, int] = dict()
+        for u in usrps:
+            lengths = u.client.pendingSignalLengths
+            plan = u.client.plannedStreaming
+            if lengths is None or plan is None:
+                return self.__collectAndStack(usrps)
+            signalLengths[u.name] = lengths
+            numStreams[u.name] = plan.numRxStreams
+
+        if out is None or not out.fits(signalLengths, numStreams):
+            out = SampleTensor.allocate(signalLengths, numStreams)
+        self.collect(out=out.views(numStreams), usrpNames=[u.name for u in usrps])
+        return out
+
+    def __collectAndStack(self, usrps: List[LabeledUsrp]) -> SampleTensor:
+        samples = self.collect(usrpNames=[u.name for u in usrps])
+        numStreams = {n: max((len(s.signals) for s in signals), default=0)
+                      for n, signals in samples.items()}
+        tensor = SampleTensor.allocate(
+            {n: [len(s.signals[0]) for s in signals] for n, signals in samples.items()},
+            numStreams)
+        for usrpName, views in tensor.views(numStreams).items():
+            for view, signal in zip(views, samples[usrpName]):
+                for v, s in zip(view.signals, signal.signals):
+                    v[:] = s
+        return tensor
+
     def getSupportedSamplingRates(self, usrpName: str) -> np.ndarray:
         """Returns supported sampling rates.
 
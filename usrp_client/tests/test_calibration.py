@@ -0,0 +1,82 @@
+from dataclasses import replace
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from usrp_client.calibration import LatencyCalibration, findSignalDelay
+from uhd_wrapper.utils.config import RfConfig
+
+
+class TestFindSignalDelay(unittest.TestCase):
+    def test_findsDelayedSignal(self) -> None:
+        rng = np.random.default_rng(seed=1)
+        txSignal = rng.standard_normal(100) + 1j * rng.standard_normal(100)
+        rxSignal = 0.01 * rng.standard_normal(1000).astype(complex)
+        rxSignal[363:463] += 0.3 * txSignal
+        self.assertEqual(findSignalDelay(rxSignal, txSignal), 363)
+
+    def test_rxSignalShorterThanTxSignal_raises(self) -> None:
+        self.assertRaises(ValueError, lambda: findSignalDelay(np.ones(10), np.ones(20)))
+
+
+class TestLatencyCalibration(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.cacheFile = os.path.join(self.tmpDir.name, "cache", "latency.json")
+        self.calibration = LatencyCalibration(self.cacheFile)
+        self.rfConfig = RfConfig(txSamplingRate=245.76e6, rxSamplingRate=245.76e6,
+                                 txCarrierFrequency=3.7e9, rxCarrierFrequency=3.7e9,
+                                 txAntennaMapping=[0], rxAntennaMapping=[1])
+
+    def tearDown(self) -> None:
+        self.tmpDir.cleanup()
+
+    def test_uncalibratedLinkReturnsNone(self) -> None:
+        self.assertIsNone(self.calibration.lookup("a", self.rfConfig, "b", self.rfConfig))
+
+    def test_storedLatencyIsPersisted(self) -> None:
+        self.calibration.store("a", self.rfConfig, "b", self.rfConfig, 363)
+
+        calibration = LatencyCalibration(self.cacheFile)
+        self.assertEqual(calibration.lookup("a", self.rfConfig, "b", self.rfConfig), 363)
+        self.assertIsNone(calibration.lookup("b", self.rfConfig, "a", self.rfConfig))
+
+    def test_linksDifferInSamplingRateAndAntennas(self) -> None:
+        self.calibration.store("a", self.rfConfig, "b", self.rfConfig, 363)
+
+        otherRate = replace(self.rfConfig, rxSamplingRate=491.52e6)
+        otherAntenna = replace(self.rfConfig, rxAntennaMapping=[0])
+        self.assertIsNone(self.calibration.lookup("a", self.rfConfig, "b", otherRate))
+        self.assertIsNone(self.calibration.lookup("a", self.rfConfig, "b", otherAntenna))
+
+    def test_gainChangesKeepEntry(self) -> None:
+        self.calibration.store("a", self.rfConfig, "b", self.rfConfig, 363)
+        self.rfConfig.rxGain += 10
+        self.assertEqual(
+            self.calibration.lookup("a", self.rfConfig, "b", self.rfConfig), 363)
+
+    def test_carrierFrequencyChangeInvalidatesEntry(self) -> None:
+        self.calibration.store("a", self.rfConfig, "b", self.rfConfig, 363)
+        changed = replace(self.rfConfig, rxCarrierFrequency=2.4e9)
+
+        self.assertIsNone(self.calibration.lookup("a", self.rfConfig, "b", changed))
+        self.assertIsNone(self.calibration.lookup("a", self.rfConfig, "b", self.rfConfig))
+        self.assertIsNone(LatencyCalibration(self.cacheFile).lookup(
+            "a", self.rfConfig, "b", self.rfConfig))
+
+    def test_invalidateRemovesLinksOfDevice(self) -> None:
+        self.calibration.store("a", self.rfConfig, "b", self.rfConfig, 1)
+        self.calibration.store("c", self.rfConfig, "c", self.rfConfig, 2)
+        self.calibration.invalidate("b")
+
+        self.assertIsNone(self.calibration.lookup("a", self.rfConfig, "b", self.rfConfig))
+        self.assertEqual(self.calibration.lookup("c", self.rfConfig, "c", self.rfConfig), 2)
+
+    def test_corruptCacheFileIsIgnored(self) -> None:
+        os.makedirs(os.path.dirname(self.cacheFile))
+        with open(self.cacheFile, "w") as f:
+            f.write("{no json")
+        calibration = LatencyCalibration(self.cacheFile)
+        self.assertIsNone(calibration.lookup("a", self.rfConfig, "b", self.rfConfig))
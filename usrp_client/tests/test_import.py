@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import unittest
+from typing import Dict
+from unittest.mock import patch
+
+import usrp_client
+import uhd_wrapper.versioning
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+HEAVY_MODULES = ["zerorpc", "gevent", "msgpack", "matplotlib", "numpy", "dataclasses_json",
+                 "subprocess"]
+
+
+def measureImport(statement: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of each module imported by `statement`
+    in a fresh interpreter, as reported by `python -X importtime`."""
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, env=env, cwd=REPO_DIR,
+                            check=True)
+    times = dict()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_packageImportDoesNotLoadDependencies(self) -> None:
+        times = measureImport("import usrp_client")
+        self.assertIn("usrp_client", times)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_configsDoNotLoadTransport(self) -> None:
+        times = measureImport("from usrp_client import MimoSignal, RfConfig")
+        for module in ["zerorpc", "gevent", "matplotlib", "subprocess"]:
+            self.assertNotIn(module, times)
+
+    def test_sanityDoesNotLoadMatplotlib(self) -> None:
+        self.assertNotIn("matplotlib", measureImport("import usrp_client.sanity"))
+
+
+class TestLazyAttributes(unittest.TestCase):
+    def test_attributesAreResolvedOnAccess(self) -> None:
+        from usrp_client.system import System
+        self.assertIs(usrp_client.System, System)
+        self.assertIn("UsrpClient", dir(usrp_client))
+        self.assertRaises(AttributeError, lambda: usrp_client.Foo)  # type: ignore
+
+    def test_versionIsDeterminedOnce(self) -> None:
+        uhd_wrapper.versioning.versionFromFile.cache_clear()
+        with patch("subprocess.run") as run:
+            run.return_value.returncode = 0
+            first = uhd_wrapper.versioning.versionFromFile(
+                os.path.join(REPO_DIR, "setup.py"), "VERSION = ")
+            second = uhd_wrapper.versioning.versionFromFile(
+                os.path.join(REPO_DIR, "setup.py"), "VERSION = ")
+        self.assertEqual(first, second)
+        run.assert_called_once()
@@ -0,0 +1,46 @@
+import socket
+import unittest
+from unittest.mock import Mock
+
+import gevent
+import zerorpc
+
+from uhd_wrapper.rpc_server.job_queue import LeaseManager, LeaseMiddleware
+from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+from uhd_wrapper.usrp_pybinding import Usrp
+from usrp_client.rpc_client import UsrpClient
+
+
+class TestLeases(unittest.TestCase):
+    def setUp(self) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.usrpMock = Mock(spec=Usrp)
+        self.usrpMock.resetStreamingConfigs.return_value = None
+        leases = LeaseManager()
+        context = zerorpc.Context()
+        context.register_middleware(LeaseMiddleware(leases))
+        self.server = zerorpc.Server(UsrpServer(self.usrpMock, leases=leases),
+                                     context=context)
+        self.server.bind(f"tcp://127.0.0.1:{self.port}")
+        self.serverTask = gevent.spawn(self.server.run)
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self.serverTask.kill()
+
+    def test_onlyLeaseHolderChangesDevice(self) -> None:
+        alice = UsrpClient.create("127.0.0.1", self.port)
+        bob = UsrpClient.create("127.0.0.1", self.port)
+
+        self.assertEqual(alice.acquireLease("alice", 10.0)["owner"], "alice")
+        alice.resetStreamingConfigs()
+        with self.assertRaises(zerorpc.RemoteError) as context:
+            bob.resetStreamingConfigs()
+        self.assertEqual(context.exception.name, "LeaseError")
+        self.assertRaises(zerorpc.RemoteError, lambda: bob.acquireLease("bob"))
+
+        alice.releaseLease()
+        bob.resetStreamingConfigs()
+        self.assertRaises(RuntimeError, alice.releaseLease)
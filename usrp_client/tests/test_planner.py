@@ -0,0 +1,108 @@
+import unittest
+
+import numpy as np
+
+from usrp_client.planner import DeviceCapabilities, StreamingPlanner
+from uhd_wrapper.utils.config import (
+    MimoSignal,
+    RfConfig,
+    RxStreamingConfig,
+    TxStreamingConfig,
+)
+
+
+def txConfig(offset: float, numSamples: int, numStreams: int = 1,
+             numRepetitions: int = 1) -> TxStreamingConfig:
+    return TxStreamingConfig(
+        sendTimeOffset=offset, numRepetitions=numRepetitions,
+        samples=MimoSignal(signals=[np.ones(numSamples, dtype=np.complex64)] * numStreams))
+
+
+class TestStreamingPlanner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.caps = DeviceCapabilities(txBufferSize=4096, rxBufferSize=8192)
+        self.rfConfig = RfConfig(txSamplingRate=1000, rxSamplingRate=2000,
+                                 noTxStreams=1, noRxStreams=1)
+        self.planner = StreamingPlanner(self.caps, self.rfConfig)
+
+    def test_maxTxSamplesMatchesDevice(self) -> None:
+        caps = DeviceCapabilities(txBufferSize=2**31, rxBufferSize=2**31)
+        self.assertEqual(caps.maxTxSamples(1), 536870904)
+        self.assertEqual(caps.maxTxSamples(4), 134217720)
+
+    def test_invalidNumberOfStreamsIsRejected(self) -> None:
+        self.assertRaises(ValueError, lambda: self.planner.setRfConfig(
+            RfConfig(noTxStreams=5, noRxStreams=1)))
+        self.assertRaises(ValueError, lambda: StreamingPlanner(
+            self.caps, RfConfig(noTxStreams=1, noRxStreams=0)))
+
+    def test_txSignalMustMatchStreams(self) -> None:
+        self.assertRaises(ValueError, lambda: self.planner.addTx(txConfig(0.0, 8, 2)))
+        self.assertRaises(ValueError, lambda: self.planner.addTx(txConfig(0.0, 2000)))
+
+    def test_txSignalWithNanIsRejected(self) -> None:
+        config = txConfig(0.0, 8)
+        config.samples.signals[0] = np.full(8, np.nan, dtype=np.complex64)
+        self.assertRaises(ValueError, lambda: self.planner.addTx(config))
+
+    def test_overlappingTxConfigsAreRejected(self) -> None:
+        # 100 samples are extended to 104, i.e. 0.104s at 1kHz
+        self.planner.addTx(txConfig(0.0, 100))
+        self.assertRaises(ValueError, lambda: self.planner.validateTx(txConfig(0.15, 8)))
+        self.planner.addTx(txConfig(0.16, 8))
+
+    def test_txRepetitionsRequireWordAlignedSignal(self) -> None:
+        self.assertRaises(ValueError,
+                          lambda: self.planner.addTx(txConfig(0.0, 100, numRepetitions=2)))
+        self.assertRaises(ValueError,
+                          lambda: self.planner.addTx(txConfig(0.0, 104, numRepetitions=0)))
+        self.planner.addTx(txConfig(0.0, 104, numRepetitions=2))
+
+    def test_txMemoryIsExhausted(self) -> None:
+        self.planner.addTx(txConfig(0.0, 512))
+        self.assertEqual(self.planner.summary.txMemoryUsage, 2048)
+        self.assertRaises(ValueError, lambda: self.planner.addTx(txConfig(1.0, 512)))
+        self.planner.addTx(txConfig(1.0, 504))
+
+    def test_rxRepetitionsAreValidated(self) -> None:
+        self.assertRaises(ValueError, lambda: self.planner.addRx(
+            RxStreamingConfig(numSamples=100, numRepetitions=2)))
+        self.assertRaises(ValueError, lambda: self.planner.addRx(
+            RxStreamingConfig(numSamples=100, repetitionPeriod=50)))
+        self.assertRaises(ValueError, lambda: self.planner.addRx(
+            RxStreamingConfig(numSamples=100, repetitionPeriod=102)))
+        self.planner.addRx(
+            RxStreamingConfig(numSamples=100, repetitionPeriod=104, numRepetitions=2))
+
+    def test_rxRepetitionsWithMultipleStreamsAreRejected(self) -> None:
+        self.planner.setRfConfig(RfConfig(noTxStreams=1, noRxStreams=2))
+        self.assertRaises(ValueError, lambda: self.planner.addRx(
+            RxStreamingConfig(numSamples=104, numRepetitions=2)))
+
+    def test_rxMemoryIsExhausted(self) -> None:
+        self.planner.addRx(RxStreamingConfig(numSamples=1000, numRepetitions=1))
+        self.assertEqual(self.planner.summary.rxMemoryUsage, 4000)
+        self.assertRaises(ValueError, lambda: self.planner.addRx(
+            RxStreamingConfig(receiveTimeOffset=1.0, numSamples=1048)))
+
+    def test_summaryContainsBurstDuration(self) -> None:
+        self.planner.addTx(txConfig(0.5, 104, numRepetitions=5))
+        self.planner.addRx(RxStreamingConfig(receiveTimeOffset=0.2, numSamples=1000))
+        self.assertAlmostEqual(self.planner.summary.burstDuration, 1.02)
+
+    def test_armedPlanRejectsConfigsUntilReset(self) -> None:
+        self.planner.addRx(RxStreamingConfig(numSamples=100))
+        self.planner.arm()
+        self.assertRaises(ValueError, lambda: self.planner.addRx(
+            RxStreamingConfig(receiveTimeOffset=1.0, numSamples=100)))
+
+        self.planner.reset()
+        self.assertFalse(self.planner.armed)
+        self.planner.addRx(RxStreamingConfig(numSamples=100))
+
+    def test_summaryContainsLayoutOfReceivedSignals(self) -> None:
+        self.planner.addRx(RxStreamingConfig(numSamples=100))
+        self.planner.addRx(RxStreamingConfig(receiveTimeOffset=1.0, numSamples=40,
+                                             numRepetitions=2, repetitionPeriod=48))
+        self.assertEqual(self.planner.summary.rxSignalLengths, [100, 40, 40])
+        self.assertEqual(self.planner.summary.numRxStreams, 1)
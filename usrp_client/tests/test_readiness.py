@@ -0,0 +1,63 @@
+import socket
+import unittest
+from typing import Any, Dict
+from unittest.mock import Mock
+
+import gevent
+import zerorpc
+
+from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+from uhd_wrapper.rpc_server.startup import StartupMethods
+from uhd_wrapper.utils.readiness import READY, ServerReadiness
+from usrp_client.rpc_client import UsrpClient
+
+
+class TestWaitUntilReady(unittest.TestCase):
+    def setUp(self) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.readiness = ServerReadiness()
+        self.methods = StartupMethods(self.readiness)
+        self.server = zerorpc.Server(self.methods)
+        self.serverTask = gevent.spawn(self.server.run)
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self.serverTask.kill()
+
+    def waitUntilReady(self, timeout: float) -> Dict[str, Any]:
+        return UsrpClient.waitUntilReady("127.0.0.1", self.port, timeout,
+                                         pollInterval=0.05)
+
+    def test_unboundServerIsNotReady(self) -> None:
+        self.assertRaises(TimeoutError, lambda: self.waitUntilReady(0.2))
+
+    def test_initializingServerAnswersOnlyReadiness(self) -> None:
+        self.server.bind(f"tcp://127.0.0.1:{self.port}")
+        self.assertRaises(TimeoutError, lambda: self.waitUntilReady(0.2))
+
+        client = zerorpc.Client(timeout=5)
+        client.connect(f"tcp://127.0.0.1:{self.port}")
+        try:
+            with self.assertRaises(zerorpc.RemoteError) as context:
+                client.getMasterClockRate()
+            self.assertEqual(context.exception.name, "ServerNotReadyError")
+
+            usrpMock = Mock()
+            usrpMock.getMasterClockRate.return_value = 245.76e6
+            usrpMock.getPerformanceCounters.return_value = {}
+            self.methods.serve(UsrpServer(usrpMock, readiness=self.readiness))
+            self.readiness.ready()
+
+            self.assertEqual(self.waitUntilReady(1.0)["state"], READY)
+            self.assertEqual(client.getMasterClockRate(), 245.76e6)
+        finally:
+            client.close()
+
+    def test_failedStartupIsReported(self) -> None:
+        self.server.bind(f"tcp://127.0.0.1:{self.port}")
+        self.readiness.fail(RuntimeError("no device"))
+        with self.assertRaises(RuntimeError) as context:
+            self.waitUntilReady(1.0)
+        self.assertIn("no device", str(context.exception))
@@ -1,21 +1,48 @@
+import json
+import socket
+import threading
+from typing import Any, Callable, List
 import unittest
 from unittest.mock import Mock, patch
 
+import gevent
 import numpy as np
+import zerorpc
+from zerorpc.exceptions import RemoteError
 
+from usrp_client.planner import PlanSummary
 from usrp_client.rpc_client import UsrpClient, _RpcClient
 from uhd_wrapper.utils.config import (
+    AgcConfig,
+    AgcResult,
     MimoSignal,
     RfConfig,
+    RxStreamingConfig,
     TxStreamingConfig,
 )
 from uhd_wrapper.rpc_server.rpc_server import UsrpServer
+from uhd_wrapper.usrp_pybinding import Usrp
+from uhd_wrapper.utils.compression import compressStream
+from uhd_wrapper.utils.data_plane import DataPlaneServer
+from uhd_wrapper.utils.shared_memory import (
+    SharedMemoryDescriptor,
+    hostId,
+    readSharedMemory,
+    writeSharedMemory,
+)
 from uhd_wrapper.tests.python.utils import fillDummyRfConfig
 
 
+CAPABILITIES = {"txBufferSize": 2**31, "rxBufferSize": 2**31, "sampleSize": 4,
+                "wordSize": 8, "guardOffset": 0.05, "masterClockRate": 245.76e6,
+                "numAntennas": 4}
+
+
 class TestRpcClient(unittest.TestCase):
     def setUp(self) -> None:
         self.mockRpcClient = Mock(spec=UsrpServer)
+        self.mockRpcClient.getDataPlanePort.return_value = 0
+        self.mockRpcClient.getCapabilities.return_value = CAPABILITIES
         with patch(target="usrp_client.rpc_client._RpcClient._createClient",
                    new=Mock(return_value=self.mockRpcClient)):
             self.usrpClient = _RpcClient("the_ip", 1234)
@@ -32,6 +59,226 @@ class TestRpcClient(unittest.TestCase):
             txConfig.sendTimeOffset, signal.serialize(), 19
         )
 
+    def test_configureTxPassesRfChangesOnlyIfSet(self) -> None:
+        signal = MimoSignal(signals=[np.arange(20)])
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=3.0, samples=signal,
+                                                      carrierFrequency=2.4e9))
+        self.mockRpcClient.configureTx.assert_called_with(
+            3.0, signal.serialize(), 1, 2.4e9, None
+        )
+
+    def test_configureRxSendsPackedConfig(self) -> None:
+        config = RxStreamingConfig(receiveTimeOffset=1.0, numSamples=10, gain=3.0)
+        self.usrpClient.configureRx(config)
+        self.mockRpcClient.configureRxPacked.assert_called_once_with(config.pack())
+        self.mockRpcClient.configureRx.assert_not_called()
+
+    def test_configureRxOmitsUnsetRfChangesForOlderServers(self) -> None:
+        self.mockRpcClient.configureRxPacked.side_effect = RemoteError(
+            "NameError", "configureRxPacked", None)
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=10))
+        serialized = json.loads(self.mockRpcClient.configureRx.call_args.args[0])
+        self.assertNotIn("gain", serialized)
+        self.assertEqual(serialized["numSamples"], 10)
+
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=10, gain=3.0))
+        serialized = json.loads(self.mockRpcClient.configureRx.call_args.args[0])
+        self.assertEqual(serialized["gain"], 3.0)
+
+    def test_rfConfigIsSentAgainAfterRfChanges(self) -> None:
+        c = fillDummyRfConfig(RfConfig())
+        self.usrpClient.configureRfConfig(c)
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=10, carrierFrequency=1e9))
+        self.usrpClient.configureRfConfig(c)
+        self.assertEqual(self.mockRpcClient.configureRfConfigPacked.call_count, 2)
+
+    def test_configureTxSendsMostlyZeroSignalsSparse(self) -> None:
+        samples = np.zeros(1000, dtype=np.complex64)
+        samples[100:200] = 0.5
+        signal = MimoSignal(signals=[samples])
+        txConfig = TxStreamingConfig(sendTimeOffset=3.0, samples=signal, numRepetitions=2)
+
+        self.usrpClient.configureTx(txConfig=txConfig)
+
+        self.mockRpcClient.configureTx.assert_not_called()
+        self.mockRpcClient.configureTxSparse.assert_called_once_with(
+            3.0, signal.serializeSparse(), 2
+        )
+
+    def test_configureTxFallsBackToDenseIfServerDoesNotSupportSparse(self) -> None:
+        samples = np.zeros(1000, dtype=np.complex64)
+        samples[:10] = 0.5
+        signal = MimoSignal(signals=[samples])
+        txConfig = TxStreamingConfig(sendTimeOffset=3.0, samples=signal)
+        self.mockRpcClient.configureTxSparse.side_effect = RemoteError(
+            "NameError", "configureTxSparse", None
+        )
+
+        self.usrpClient.configureTx(txConfig=txConfig)
+        self.usrpClient.configureTx(txConfig=txConfig)
+
+        self.mockRpcClient.configureTxSparse.assert_called_once()
+        self.assertEqual(self.mockRpcClient.configureTx.call_count, 2)
+        self.mockRpcClient.configureTx.assert_called_with(3.0, signal.serialize(), 1)
+
+    def test_configureTxUploadsLongSignalsInChunks(self) -> None:
+        self.usrpClient.txChunkSize = 8
+        signal = MimoSignal(signals=[np.arange(20) + 1, np.arange(20) + 2j])
+        txConfig = TxStreamingConfig(sendTimeOffset=3.0, samples=signal, numRepetitions=4)
+
+        self.usrpClient.configureTx(txConfig=txConfig)
+
+        self.mockRpcClient.configureTx.assert_not_called()
+        self.mockRpcClient.beginTxChunks.assert_called_once_with(3.0, 2, 20, 4)
+        chunks = [c.args[0] for c in self.mockRpcClient.appendTxChunk.call_args_list]
+        self.assertEqual([len(c[0][0]) for c in chunks], [8, 8, 4])
+        self.assertEqual(chunks[2], MimoSignal(
+            signals=[s[16:] for s in signal.signals]).serialize())
+        self.mockRpcClient.endTxChunks.assert_called_once()
+
+    def test_configureTxFallsBackToSingleMessageIfServerDoesNotSupportChunks(self) -> None:
+        self.usrpClient.txChunkSize = 8
+        signal = MimoSignal(signals=[np.arange(20) + 1])
+        txConfig = TxStreamingConfig(sendTimeOffset=3.0, samples=signal)
+        self.mockRpcClient.beginTxChunks.side_effect = RemoteError(
+            "NameError", "beginTxChunks", None
+        )
+
+        self.usrpClient.configureTx(txConfig=txConfig)
+
+        self.mockRpcClient.appendTxChunk.assert_not_called()
+        self.mockRpcClient.configureTx.assert_called_once_with(3.0, signal.serialize(), 1)
+
+    def test_remoteServerDoesNotUseSharedMemory(self) -> None:
+        self.mockRpcClient.getHostId.return_value = "other host"
+        self.assertFalse(self.usrpClient.usesSharedMemory)
+
+    def test_olderServerDoesNotUseSharedMemory(self) -> None:
+        self.mockRpcClient.getHostId.side_effect = RemoteError(
+            "NameError", "getHostId", None
+        )
+        self.assertFalse(self.usrpClient.usesSharedMemory)
+        self.assertFalse(self.usrpClient.usesSharedMemory)
+        self.mockRpcClient.getHostId.assert_called_once()
+
+    def test_configureTxPassesSamplesViaSharedMemoryToLocalServer(self) -> None:
+        self.mockRpcClient.getHostId.return_value = hostId()
+        signal = MimoSignal(signals=[np.arange(20) + 1j])
+        received = []
+
+        def configureTxFromSharedMemory(sendTimeOffset: float,
+                                        samples: SharedMemoryDescriptor,
+                                        numRepetitions: int) -> None:
+            received.append(readSharedMemory(samples))
+        self.mockRpcClient.configureTxFromSharedMemory.side_effect = \
+            configureTxFromSharedMemory
+
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=1.0, samples=signal))
+
+        self.mockRpcClient.configureTx.assert_not_called()
+        self.assertEqual(received, [signal])
+
+    def test_collectReadsSamplesFromSharedMemoryOfLocalServer(self) -> None:
+        self.mockRpcClient.getHostId.return_value = hostId()
+        signals = [MimoSignal(signals=[np.arange(10)]), MimoSignal(signals=[np.ones(10)])]
+        self.mockRpcClient.collectToSharedMemory.return_value = [
+            writeSharedMemory(s) for s in signals
+        ]
+        out = [MimoSignal.empty(1, 10), MimoSignal.empty(1, 10)]
+
+        result = self.usrpClient.collect(out=out)
+
+        self.mockRpcClient.collect.assert_not_called()
+        self.assertIs(result[1], out[1])
+        self.assertEqual(result, signals)
+
+    @patch("usrp_client.rpc_client.DataPlaneClient")
+    def test_configureTxUploadsSamplesViaDataPlane(self, dataPlaneClass: Mock) -> None:
+        self.mockRpcClient.getDataPlanePort.return_value = 1235
+        dataPlaneClass.return_value.upload.return_value = "3c"
+        signal = MimoSignal(signals=[np.arange(20)])
+
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=1.0, samples=signal,
+                                                      numRepetitions=2))
+
+        dataPlaneClass.assert_called_once_with("the_ip", 1235)
+        dataPlaneClass.return_value.upload.assert_called_once_with(signal)
+        self.mockRpcClient.configureTxFromDataPlane.assert_called_once_with(1.0, "3c", 2)
+        self.mockRpcClient.configureTx.assert_not_called()
+
+    @patch("usrp_client.rpc_client.DataPlaneClient")
+    def test_sparseSignalsAreNotSentViaDataPlane(self, dataPlaneClass: Mock) -> None:
+        self.mockRpcClient.getDataPlanePort.return_value = 1235
+        samples = np.zeros(1000, dtype=np.complex64)
+        samples[100:200] = 0.5
+        signal = MimoSignal(signals=[samples])
+
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=1.0, samples=signal))
+
+        self.mockRpcClient.configureTxSparse.assert_called_once_with(
+            1.0, signal.serializeSparse(), 1)
+        dataPlaneClass.return_value.upload.assert_not_called()
+
+    @patch("usrp_client.rpc_client.DataPlaneClient")
+    def test_longSignalsAreSentViaDataPlaneWithoutChunks(self, dataPlaneClass: Mock) -> None:
+        self.mockRpcClient.getDataPlanePort.return_value = 1235
+        dataPlaneClass.return_value.upload.return_value = "3c"
+        self.usrpClient.txChunkSize = 8
+        signal = MimoSignal(signals=[np.arange(20) + 1])
+
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=1.0, samples=signal))
+
+        dataPlaneClass.return_value.upload.assert_called_once_with(signal)
+        self.mockRpcClient.beginTxChunks.assert_not_called()
+
+    @patch("usrp_client.rpc_client.DataPlaneClient")
+    def test_collectDownloadsSamplesViaDataPlane(self, dataPlaneClass: Mock) -> None:
+        self.mockRpcClient.getDataPlanePort.return_value = 1235
+        self.mockRpcClient.collectToDataPlane.return_value = ["4d", "5e"]
+        signals = [MimoSignal(signals=[np.arange(10)]), MimoSignal(signals=[np.ones(10)])]
+        dataPlaneClass.return_value.download.side_effect = signals
+
+        self.assertEqual(self.usrpClient.collect(), signals)
+        dataPlaneClass.return_value.download.assert_called_with("5e", out=None)
+        self.mockRpcClient.collect.assert_not_called()
+
+    def test_olderServerDoesNotUseDataPlane(self) -> None:
+        self.mockRpcClient.getDataPlanePort.side_effect = RemoteError(
+            "NameError", "getDataPlanePort", None
+        )
+        signal = MimoSignal(signals=[np.arange(20)])
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=1.0, samples=signal))
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=1.0, samples=signal))
+
+        self.mockRpcClient.getDataPlanePort.assert_called_once()
+        self.assertEqual(self.mockRpcClient.configureTx.call_count, 2)
+
+    def test_collectDecompressesSamplesIfCompressionIsEnabled(self) -> None:
+        self.usrpClient.compressSamples = True
+        self.mockRpcClient.getCompressionCodecs.return_value = ["zlib", "unknown"]
+        signal = MimoSignal(signals=[np.arange(10)])
+        self.mockRpcClient.collectCompressed.return_value = [
+            ("zlib", 10, [compressStream(signal.signals[0], "zlib")])
+        ]
+
+        self.assertEqual(self.usrpClient.collect(), [signal])
+        self.usrpClient.collect()
+
+        self.mockRpcClient.collect.assert_not_called()
+        self.mockRpcClient.getCompressionCodecs.assert_called_once()
+        codecs, linkRate = self.mockRpcClient.collectCompressed.call_args.args
+        self.assertEqual(codecs, ["zlib"])
+        self.assertGreater(linkRate, 0)
+
+    def test_collectIsUncompressedIfServerDoesNotSupportCompression(self) -> None:
+        self.usrpClient.compressSamples = True
+        self.mockRpcClient.getCompressionCodecs.side_effect = RemoteError(
+            "NameError", "getCompressionCodecs", None
+        )
+        self.mockRpcClient.collect.return_value = []
+        self.usrpClient.collect()
+        self.mockRpcClient.collectCompressed.assert_not_called()
+
     def test_collectReturnsDeserializedSamples(self) -> None:
         signal = MimoSignal(signals=[np.ones(10)])
         self.mockRpcClient.collect.return_value = [signal.serialize()]
@@ -48,10 +295,28 @@ class TestRpcClient(unittest.TestCase):
         recvdSamples = self.usrpClient.collect()
         self.assertListEqual(recvdSamples, [signalConfig1, signalConfig2])
 
+    def test_collectWritesIntoProvidedBuffers(self) -> None:
+        signal = MimoSignal(signals=[np.arange(10) * 0.1j])
+        self.mockRpcClient.collect.return_value = [signal.serialize()]
+        out = [MimoSignal.empty(numStreams=1, numSamples=10)]
+        buffer = out[0].signals[0]
+
+        recvdSamples = self.usrpClient.collect(out=out)
+
+        self.assertIs(recvdSamples, out)
+        self.assertIs(recvdSamples[0].signals[0], buffer)
+        np.testing.assert_array_almost_equal(buffer, signal.signals[0])
+
+    def test_collectThrowsIfNumberOfBuffersMismatches(self) -> None:
+        signal = MimoSignal(signals=[np.ones(10)])
+        self.mockRpcClient.collect.return_value = [signal.serialize(), signal.serialize()]
+        out = [MimoSignal.empty(numStreams=1, numSamples=10)]
+        self.assertRaises(ValueError, lambda: self.usrpClient.collect(out=out))
+
     def test_getRfConfigReturnsSerializedRfConfig(self) -> None:
         usrpRfConf = fillDummyRfConfig(RfConfig())
 
-        self.mockRpcClient.getRfConfig.return_value = usrpRfConf.serialize()
+        self.mockRpcClient.getRfConfigPacked.return_value = usrpRfConf.pack()
         recvRfConfig = self.usrpClient.getRfConfig()
 
         self.assertEqual(recvRfConfig, usrpRfConf)
@@ -60,7 +325,194 @@ class TestRpcClient(unittest.TestCase):
         c = fillDummyRfConfig(RfConfig())
 
         self.usrpClient.configureRfConfig(rfConfig=c)
-        self.mockRpcClient.configureRfConfig.assert_called_with(c.serialize())
+        self.mockRpcClient.configureRfConfigPacked.assert_called_with(c.pack())
+        self.mockRpcClient.configureRfConfig.assert_not_called()
+
+    def test_olderServerReceivesConfigsAsJson(self) -> None:
+        self.mockRpcClient.configureRfConfigPacked.side_effect = RemoteError(
+            "NameError", "configureRfConfigPacked", None)
+        c = fillDummyRfConfig(RfConfig())
+        self.usrpClient.configureRfConfig(c)
+        self.mockRpcClient.configureRfConfig.assert_called_once_with(c.serialize())
+
+        self.mockRpcClient.getRfConfig.return_value = c.serialize()
+        self.assertEqual(self.usrpClient.getRfConfig(), c)
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=10))
+        self.mockRpcClient.getRfConfigPacked.assert_not_called()
+        self.mockRpcClient.configureRxPacked.assert_not_called()
+        self.mockRpcClient.configureRx.assert_called_once()
+
+    def test_configureRfConfigIsSkippedIfConfigDidNotChange(self) -> None:
+        c = fillDummyRfConfig(RfConfig())
+        self.usrpClient.configureRfConfig(rfConfig=c)
+        self.usrpClient.configureRfConfig(rfConfig=fillDummyRfConfig(RfConfig()))
+        self.mockRpcClient.configureRfConfigPacked.assert_called_once()
+
+        c.txGain += 1
+        self.usrpClient.configureRfConfig(rfConfig=c)
+        self.assertEqual(self.mockRpcClient.configureRfConfigPacked.call_count, 2)
+
+        self.mockRpcClient.getPerformanceCounters = Mock(
+            return_value={"rfConfig.calls": 2.0})
+        self.assertEqual(self.usrpClient.getPerformanceCounters(),
+                         {"rfConfig.calls": 2.0, "client.rfConfigsSkipped": 1})
+
+    def test_executeRepeatedlyIsForwarded(self) -> None:
+        self.mockRpcClient.armStreamingConfigs = Mock()
+        self.usrpClient.armStreamingConfigs()
+        self.usrpClient.executeRepeatedly(2.0, 3, 0.5)
+        self.mockRpcClient.armStreamingConfigs.assert_called_once_with()
+        self.mockRpcClient.executeRepeatedly.assert_called_once_with(2.0, 3, 0.5)
+
+    def test_getConfiguredRfConfigQueriesServerOnlyIfUnknown(self) -> None:
+        c = fillDummyRfConfig(RfConfig())
+        self.mockRpcClient.getRfConfigPacked.return_value = c.pack()
+        self.assertEqual(self.usrpClient.getConfiguredRfConfig(), c)
+        self.mockRpcClient.getRfConfigPacked.assert_called_once()
+
+        self.usrpClient.configureRfConfig(c)
+        self.assertEqual(self.usrpClient.getConfiguredRfConfig(), c)
+        self.mockRpcClient.getRfConfigPacked.assert_called_once()
+
+    def test_runAgcReturnsChosenGains(self) -> None:
+        c = fillDummyRfConfig(RfConfig())
+        agcConfig = AgcConfig(targetPeak=0.3)
+        self.mockRpcClient.runAgc.return_value = AgcResult(
+            rxGain=c.rxGain + 5, txGain=c.txGain, converged=True).to_json()
+
+        result = self.usrpClient.runAgc(c, agcConfig)
+        self.mockRpcClient.runAgc.assert_called_once_with(
+            c.serialize(), agcConfig.to_json(), None)
+        self.assertEqual(result.rxGain, c.rxGain + 5)
+        self.assertTrue(result.converged)
+
+        # the server already applied the chosen gains
+        c.rxGain += 5
+        self.usrpClient.configureRfConfig(c)
+        self.mockRpcClient.configureRfConfigPacked.assert_not_called()
+
+    def test_reopenDeviceResetsRfConfigAndCapabilities(self) -> None:
+        c = fillDummyRfConfig(RfConfig())
+        self.usrpClient.configureRfConfig(c)
+        self.mockRpcClient.reopenDevice = Mock(return_value={"state": "ready"})
+
+        self.assertEqual(self.usrpClient.reopenDevice(250e6), {"state": "ready"})
+        self.mockRpcClient.reopenDevice.assert_called_once_with(250e6, "", timeout=120.0)
+
+        self.usrpClient.configureRfConfig(c)
+        self.assertEqual(self.mockRpcClient.configureRfConfigPacked.call_count, 2)
+        self.assertEqual(self.mockRpcClient.getCapabilities.call_count, 2)
+
+    def test_configureRfConfigIsSentAgainAfterFailure(self) -> None:
+        c = fillDummyRfConfig(RfConfig())
+        self.mockRpcClient.configureRfConfigPacked.side_effect = [RemoteError(
+            "UsrpException", "mismatch", None), None]
+        self.assertRaises(RemoteError, lambda: self.usrpClient.configureRfConfig(c))
+        self.usrpClient.configureRfConfig(c)
+        self.assertEqual(self.mockRpcClient.configureRfConfigPacked.call_count, 2)
+
+    def test_invalidConfigsAreRejectedBeforeSending(self) -> None:
+        self.usrpClient.configureRfConfig(fillDummyRfConfig(RfConfig()))
+        signal = MimoSignal(signals=[np.ones(16, dtype=np.complex64)])
+        self.usrpClient.configureTx(TxStreamingConfig(sendTimeOffset=0.0, samples=signal))
+
+        self.assertRaises(ValueError, lambda: self.usrpClient.configureTx(
+            TxStreamingConfig(sendTimeOffset=0.01, samples=signal)))
+        self.assertRaises(ValueError, lambda: self.usrpClient.configureRx(
+            RxStreamingConfig(receiveTimeOffset=0.0, numSamples=100, numRepetitions=2)))
+        self.mockRpcClient.configureTx.assert_called_once()
+        self.mockRpcClient.configureRxPacked.assert_not_called()
+        self.mockRpcClient.getCapabilities.assert_called_once_with()
+
+    def test_plannedStreamingIsResetByCollect(self) -> None:
+        self.usrpClient.configureRfConfig(fillDummyRfConfig(RfConfig()))
+        self.usrpClient.configureRx(
+            RxStreamingConfig(receiveTimeOffset=1.0, numSamples=30000))
+        planned = self.usrpClient.plannedStreaming
+        assert planned is not None
+        self.assertAlmostEqual(planned.burstDuration, 1.001)
+        self.assertEqual(planned.rxMemoryUsage, 30000 * 4)
+
+        self.mockRpcClient.execute = Mock()
+        self.mockRpcClient.collect.return_value = []
+        self.usrpClient.execute(2.0)
+        self.usrpClient.collect()
+        self.assertEqual(self.mockRpcClient.collect.call_args.kwargs["timeout"],
+                         self.usrpClient.rpcTimeoutSec + 1.001)
+        self.assertEqual(self.usrpClient.plannedStreaming, PlanSummary())
+
+    def test_olderServerDoesNotValidateConfigs(self) -> None:
+        self.mockRpcClient.getCapabilities.side_effect = RemoteError(
+            "NameError", "getCapabilities", None)
+        self.usrpClient.configureRfConfig(fillDummyRfConfig(RfConfig()))
+        self.usrpClient.configureRx(
+            RxStreamingConfig(receiveTimeOffset=0.0, numSamples=100, numRepetitions=2))
+        self.mockRpcClient.configureRxPacked.assert_called_once()
+        self.assertIsNone(self.usrpClient.plannedStreaming)
+
+    def test_configsArePendingUntilCollected(self) -> None:
+        self.mockRpcClient.armStreamingConfigs = Mock()
+        self.mockRpcClient.resetStreamingConfigs = Mock()
+        self.mockRpcClient.collect.return_value = []
+        self.assertFalse(self.usrpClient.hasPendingConfigs)
+
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=16))
+        self.assertTrue(self.usrpClient.hasPendingConfigs)
+        self.usrpClient.collect()
+        self.assertFalse(self.usrpClient.hasPendingConfigs)
+
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=16))
+        self.usrpClient.armStreamingConfigs()
+        self.usrpClient.collect()
+        self.assertTrue(self.usrpClient.hasPendingConfigs)
+        self.usrpClient.resetStreamingConfigs()
+        self.assertFalse(self.usrpClient.hasPendingConfigs)
+
+    def test_pendingSignalLengthsCoverAllRuns(self) -> None:
+        self.mockRpcClient.armStreamingConfigs = Mock()
+        self.mockRpcClient.executeRepeatedly = Mock()
+        self.usrpClient.configureRfConfig(fillDummyRfConfig(RfConfig()))
+        self.assertEqual(self.usrpClient.pendingSignalLengths, [])
+
+        self.usrpClient.configureRx(RxStreamingConfig(numSamples=16, numRepetitions=2))
+        self.assertEqual(self.usrpClient.pendingSignalLengths, [16, 16])
+        self.usrpClient.armStreamingConfigs()
+        self.usrpClient.executeRepeatedly(1.0, 3, 1.0)
+        self.assertEqual(self.usrpClient.pendingSignalLengths, [16] * 6)
+
+
+class TestRpcClientConcurrency(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connections = [Mock(), Mock()]
+        self.createClient = Mock(side_effect=self.connections)
+        with patch(target="usrp_client.rpc_client._RpcClient._createClient",
+                   new=self.createClient):
+            self.usrpClient = _RpcClient("the_ip", 1234)
+
+    def runInThread(self, f: Callable[[], Any]) -> threading.Thread:
+        thread = threading.Thread(target=f)
+        thread.start()
+        return thread
+
+    def test_eachThreadUsesItsOwnConnection(self) -> None:
+        self.usrpClient._createClient = self.createClient  # type: ignore
+        self.usrpClient.getCurrentFpgaTime()
+        self.runInThread(self.usrpClient.getCurrentFpgaTime).join()
+        self.usrpClient.getCurrentFpgaTime()
+
+        self.assertEqual(self.connections[0].getCurrentFpgaTime.call_count, 2)
+        self.connections[1].getCurrentFpgaTime.assert_called_once()
+        self.createClient.assert_called_with("the_ip", 1234)
+
+    def test_callsWaitForLockOfDevice(self) -> None:
+        self.usrpClient._createClient = self.createClient  # type: ignore
+        with self.usrpClient.lock:
+            thread = self.runInThread(self.usrpClient.resetStreamingConfigs)
+            thread.join(timeout=0.1)
+            self.assertTrue(thread.is_alive())
+            self.connections[1].resetStreamingConfigs.assert_not_called()
+        thread.join()
+        self.connections[1].resetStreamingConfigs.assert_called_once()
 
 
 class TestUsrpClient(unittest.TestCase):
@@ -68,6 +520,7 @@ class TestUsrpClient(unittest.TestCase):
         self.masterClockRate = 400e6
         self.mockRpcClient = Mock()
         self.mockRpcClient.getMasterClockRate.return_value = self.masterClockRate
+        self.mockRpcClient.getCapabilities.return_value = CAPABILITIES
 
         with patch(target="usrp_client.rpc_client._RpcClient._createClient",
                    new=Mock(return_value=self.mockRpcClient)):
@@ -79,3 +532,52 @@ class TestUsrpClient(unittest.TestCase):
 
         self.usrpClient.configureRfConfig(RfConfig())
         self.usrpClient.execute(5)
+
+
+class TestDataPlaneAcrossThreads(unittest.TestCase):
+    def setUp(self) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.signal = MimoSignal(signals=[np.arange(100) + 1j])
+        self.stopServer = threading.Event()
+        serverReady = threading.Event()
+        # the server runs in the hub of its own thread, such that the client threads
+        # block without serving it
+        self.serverThread = threading.Thread(target=self.__serve, args=(serverReady,))
+        self.serverThread.start()
+        serverReady.wait(5.0)
+        self.client = UsrpClient.create("127.0.0.1", self.port)
+        self.client.sharedMemoryTransport = False
+
+    def tearDown(self) -> None:
+        self.stopServer.set()
+        self.serverThread.join()
+
+    def __serve(self, ready: threading.Event) -> None:
+        usrpMock = Mock(spec=Usrp)
+        usrpMock.resetStreamingConfigs.return_value = None
+        usrpMock.collect.return_value = [self.signal.signals]
+        dataPlane = DataPlaneServer()
+        dataPlane.start()
+        server = zerorpc.Server(UsrpServer(usrpMock, dataPlane))
+        server.bind(f"tcp://127.0.0.1:{self.port}")
+        task = gevent.spawn(server.run)
+        ready.set()
+        while not self.stopServer.is_set():
+            gevent.sleep(0.01)
+        server.close()
+        task.kill()
+        dataPlane.stop()
+
+    def test_collectFromTwoThreads(self) -> None:
+        self.assertEqual(self.client.collect(), [self.signal])
+
+        results: List[Any] = []
+        thread = threading.Thread(target=lambda: results.append(self.client.collect()))
+        thread.start()
+        thread.join(timeout=5.0)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [[self.signal]])
+        self.assertEqual(self.client.collect(), [self.signal])
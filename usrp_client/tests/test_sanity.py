@@ -0,0 +1,92 @@
+import argparse
+import itertools
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+import numpy.testing as npt
+
+import usrp_client.sanity as sanity
+from usrp_client.sanity import (
+    _calculateSNRs,
+    _evaluateReceptions,
+    _findPeaks,
+    _pairRounds,
+    _probeSignals,
+    checkSingle,
+)
+
+
+class TestPeakDetection(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=1)
+        self.txSignal = rng.random(100) - 0.5
+        self.frames = 0.01 * (rng.standard_normal((3, 1000)) + 0j)
+        self.peaks = np.array([363, 365, 500])
+        for frame, peak in zip(self.frames, self.peaks):
+            frame[peak:peak + 100] += 0.3 * self.txSignal
+
+    def test_peaksOfAllFramesAreFound(self) -> None:
+        npt.assert_array_equal(_findPeaks(self.frames, self.txSignal), self.peaks)
+
+    def test_peaksMatchTimeDomainCorrelation(self) -> None:
+        expected = [np.argmax(np.abs(np.correlate(f, self.txSignal))) for f in self.frames]
+        npt.assert_array_equal(_findPeaks(self.frames, self.txSignal), expected)
+
+    def test_snrMatchesPerFrameCalculation(self) -> None:
+        def snr(rxSignal: np.ndarray, peak: int) -> float:
+            rxSignal = rxSignal - np.mean(rxSignal)
+            rxPow = np.mean(np.abs(rxSignal[peak:peak + 100]) ** 2)
+            rxNoise = np.mean(np.abs(rxSignal[peak + 100:peak + 1100]) ** 2)
+            return 10 * np.log10((rxPow - rxNoise) / rxNoise)
+
+        npt.assert_allclose(_calculateSNRs(self.frames, 100, self.peaks),
+                            [snr(f, p) for f, p in zip(self.frames, self.peaks)])
+
+    def test_evaluationReportsPeakSpread(self) -> None:
+        result = _evaluateReceptions(self.frames[:2], self.txSignal)
+        self.assertEqual(result["peakSpread"], 2)
+        self.assertEqual(result["latencySamples"], 364)
+        self.assertTrue(result["ok"])
+        self.assertFalse(_evaluateReceptions(self.frames, self.txSignal)["ok"])
+
+
+class TestPairRounds(unittest.TestCase):
+    def test_allPairsAreScheduledInDisjointRounds(self) -> None:
+        for numUsrps in [2, 5, 16]:
+            names = [f"usrp{i}" for i in range(numUsrps)]
+            rounds = _pairRounds(names)
+
+            self.assertEqual(len(rounds), numUsrps if numUsrps % 2 == 1 else numUsrps - 1)
+            for pairs in rounds:
+                usrps = [u for pair in pairs for u in pair]
+                self.assertEqual(len(usrps), len(set(usrps)))
+            scheduled = [frozenset(p) for pairs in rounds for p in pairs]
+            self.assertEqual(len(scheduled), len(set(scheduled)))
+            self.assertEqual(set(scheduled),
+                             {frozenset(p) for p in itertools.combinations(names, 2)})
+
+
+class TestProbeSignals(unittest.TestCase):
+    def test_devicesLockOntoTheirOwnProbe(self) -> None:
+        probes = _probeSignals(["usrp0", "usrp1"], seed=1)
+        self.assertFalse(np.array_equal(probes["usrp0"], probes["usrp1"]))
+
+        # the neighbour transmits at the same time and is received even stronger
+        frame = 0.01 * (np.random.default_rng(seed=2).standard_normal(3000) + 0j)
+        frame[300:300 + sanity.PROBE_LENGTH] += 0.3 * probes["usrp0"]
+        frame[100:100 + sanity.PROBE_LENGTH] += 0.6 * probes["usrp1"]
+        npt.assert_array_equal(_findPeaks(frame[np.newaxis], probes["usrp0"]), [300])
+
+
+class TestCheckSingle(unittest.TestCase):
+    def test_streamingConfigsAreResetIfExecutionFails(self) -> None:
+        client = Mock()
+        client.executeImmediately.side_effect = IOError("no samples")
+        args = argparse.Namespace(fs=245.76e6, tx_gain=30, rx_gain=30, fc=2e9, tx_port=0,
+                                  rx_port=0, rx_antenna="RX2", plot=False)
+        with patch.object(sanity, "cmdlineArgs", args, create=True), \
+                patch.object(sanity.UsrpClient, "create", return_value=client):
+            with self.assertRaises(IOError):
+                checkSingle("localhost")
+        client.resetStreamingConfigs.assert_called_once()
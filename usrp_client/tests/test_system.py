@@ -1,3 +1,7 @@
+from typing import Callable, List
+import logging
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock
 import time
@@ -6,8 +10,15 @@ import numpy as np
 import numpy.testing as npt
 from zerorpc.exceptions import RemoteError
 
+from usrp_client.planner import PlanSummary
 from usrp_client.rpc_client import UsrpClient
-from usrp_client.system import System, TimedFlag
+from usrp_client.system import (
+    MeasurementPlan,
+    SampleTensor,
+    SyncSupervisor,
+    System,
+    TimedFlag,
+)
 from usrp_client.errors import MultipleRemoteUsrpErrors, RemoteUsrpError
 from uhd_wrapper.utils.config import (
     MimoSignal,
@@ -143,6 +154,8 @@ class FakeSystem(System):
         usrpClientMock.getCurrentFpgaTime.return_value = 3.0
         usrpClientMock.getRfConfig.return_value = RfConfig()
         usrpClientMock.getMasterClockRate.return_value = 400e6
+        usrpClientMock.plannedStreaming = None
+        usrpClientMock.pendingSignalLengths = None
         return usrpClientMock
 
 
@@ -237,6 +250,19 @@ class TestMultiDeviceSync(unittest.TestCase):
         self.system.execute()
         self.assertEqual(self.system.synchronisationValid.call_count, 3)
 
+    def test_reopenedUsrpsAreSynchronizedAgain(self) -> None:
+        self.system.execute()
+        for mock in self.system.mockUsrps:
+            mock.reopenDevice.return_value = {"state": "ready"}
+        self.assertEqual(self.system.reopenUsrps(250e6),
+                         {"usrp1": {"state": "ready"}, "usrp2": {"state": "ready"}})
+        for mock in self.system.mockUsrps:
+            mock.reopenDevice.assert_called_once_with(250e6, "")
+
+        self.system.synchronisationValid = Mock(side_effect=[False, True])  # type: ignore
+        self.system.execute()
+        self.system.mockUsrps[0].setTimeToZeroNextPps.assert_called()
+
     def test_syncInvalidSetsPps(self) -> None:
         self.system.synchronisationValid = Mock(side_effect=[False, True])  # type: ignore
 
@@ -245,6 +271,105 @@ class TestMultiDeviceSync(unittest.TestCase):
         self.system.mockUsrps[1].setTimeToZeroNextPps.assert_called()
 
 
+class TestSyncSupervisor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.system = FakeSystem(2, resyncFlag=FakedTimeFlag(0.0))
+        for mock in self.system.mockUsrps:
+            mock.getTimeLastPps.return_value = 2.0
+            mock.getCurrentFpgaTime.return_value = 2.3
+        self.supervisor = SyncSupervisor(self.system, 1.0, logging.getLogger())
+
+    def synchronize(self) -> None:
+        self.system.synchronizeUsrps()
+        for mock in self.system.mockUsrps:
+            mock.setTimeToZeroNextPps.reset_mock()
+
+    def test_synchronizedUsrpsPassCheck(self) -> None:
+        self.synchronize()
+        status = self.supervisor.check()
+
+        self.assertTrue(status.synchronized)
+        self.assertEqual(status.numResyncs, 0)
+        self.assertIs(self.supervisor.status, status)
+        for mock in self.system.mockUsrps:
+            mock.setTimeToZeroNextPps.assert_not_called()
+
+    def test_unsynchronizedUsrpsAreSynchronized(self) -> None:
+        status = self.supervisor.check()
+        self.assertTrue(status.synchronized)
+        self.assertEqual(status.numResyncs, 1)
+
+    def test_driftingClockTriggersResync(self) -> None:
+        self.synchronize()
+        self.system.mockUsrps[1].getTimeLastPps.return_value = 2.001
+        status = self.supervisor.check()
+
+        self.assertFalse(status.synchronized)
+        self.assertIn("usrp2", status.reason)
+        self.assertEqual(status.numResyncs, 1)
+        for mock in self.system.mockUsrps:
+            mock.setTimeToZeroNextPps.assert_called_once()
+
+    def test_differentSecondsTriggerResync(self) -> None:
+        self.synchronize()
+        self.system.mockUsrps[1].getTimeLastPps.side_effect = [3.0, 3.0, 2.0, 2.0]
+        status = self.supervisor.check()
+
+        self.assertTrue(status.synchronized)
+        self.assertEqual(status.numResyncs, 1)
+
+    def test_edgeBetweenQueriesIsTolerated(self) -> None:
+        self.synchronize()
+        self.system.mockUsrps[1].getTimeLastPps.side_effect = [3.0, 2.0]
+        self.assertTrue(self.supervisor.check().synchronized)
+        self.assertEqual(self.supervisor.status.numResyncs, 0)
+
+    def test_resyncIsDeferredUntilExecutedUsrpsAreCollected(self) -> None:
+        self.synchronize()
+        self.system.execute()
+        self.system.mockUsrps[1].getTimeLastPps.return_value = 2.001
+        status = self.supervisor.check()
+
+        self.assertFalse(status.synchronized)
+        self.assertIn("deferred", status.reason)
+        self.assertEqual(status.numResyncs, 0)
+        for mock in self.system.mockUsrps:
+            mock.setTimeToZeroNextPps.assert_not_called()
+
+        for mock in self.system.mockUsrps:
+            mock.collect.return_value = []
+        self.system.collect()
+        self.assertEqual(self.supervisor.check().numResyncs, 1)
+        for mock in self.system.mockUsrps:
+            mock.setTimeToZeroNextPps.assert_called_once()
+
+    def test_failedExecutionDoesNotDeferResync(self) -> None:
+        self.synchronize()
+        self.system.mockUsrps[0].execute.side_effect = RemoteError("", "failed", None)
+        self.assertRaises(MultipleRemoteUsrpErrors, self.system.execute)
+        self.system.mockUsrps[1].getTimeLastPps.return_value = 2.001
+        self.assertEqual(self.supervisor.check().numResyncs, 1)
+
+    def test_missingPpsIsReportedWithoutResync(self) -> None:
+        self.synchronize()
+        self.system.mockUsrps[0].getCurrentFpgaTime.return_value = 5.0
+        status = self.supervisor.check()
+
+        self.assertTrue(status.ppsMissing)
+        self.assertEqual(status.numResyncs, 0)
+        self.assertFalse(self.system._usrpsSynced.isSet())
+
+    def test_supervisorRunsInBackground(self) -> None:
+        supervisor = self.system.startSyncSupervisor(intervalSec=0.01)
+        self.assertTrue(supervisor.running)
+        time.sleep(0.05)
+        self.system.stopSyncSupervisor()
+
+        self.assertFalse(supervisor.running)
+        self.assertIsNone(self.system.syncStatus)
+        self.assertTrue(supervisor.status.synchronized)
+
+
 class TestUsrpExceptionHandling(unittest.TestCase):
     def setUp(self) -> None:
         self.system = FakeSystem(2)
@@ -391,6 +516,19 @@ class TestTransceivingMultiDevice(unittest.TestCase):
         npt.assert_array_equal(samples["usrp1"][0].signals[0], samplesUsrp1.signals[0])
         npt.assert_array_equal(samples["usrp2"][0].signals[0], samplesUsrp2.signals[0])
 
+    def test_collectPassesOutputBuffersToUsrpClient(self) -> None:
+        out = {"usrp1": [MimoSignal.empty(numStreams=1, numSamples=10)]}
+        self.system.mockUsrps[0].collect.return_value = out["usrp1"]
+        self.system.mockUsrps[1].collect.return_value = [
+            MimoSignal(signals=[0.1 * np.ones(10)])
+        ]
+
+        samples = self.system.collect(out=out)
+
+        self.system.mockUsrps[0].collect.assert_called_once_with(out=out["usrp1"])
+        self.system.mockUsrps[1].collect.assert_called_once_with()
+        self.assertIs(samples["usrp1"], out["usrp1"])
+
     def test_calculationBaseTime_validSynchronisation(self) -> None:
         FPGA_TIME_S_USRP1 = 0.3
         FPGA_TIME_S_USRP2 = 0.4
@@ -429,3 +567,254 @@ class TestTransceivingMultiDevice(unittest.TestCase):
         ]
 
         self.assertRaises(ValueError, lambda: self.system.collect())
+
+
+def fillWith(value: float) -> Callable[..., List[MimoSignal]]:
+    def collect(out: List[MimoSignal]) -> List[MimoSignal]:
+        for mimoSignal in out:
+            for s in mimoSignal.signals:
+                s[:] = value
+        return out
+
+    return collect
+
+
+class TestCollectArray(unittest.TestCase):
+    def setUp(self) -> None:
+        self.system = FakeSystem(2)
+        self.usrp1, self.usrp2 = self.system.mockUsrps
+        self.usrp1.pendingSignalLengths = [10, 6]
+        self.usrp1.plannedStreaming = PlanSummary(numRxStreams=2)
+        self.usrp1.collect.side_effect = fillWith(0.1)
+        self.usrp2.pendingSignalLengths = [8]
+        self.usrp2.plannedStreaming = PlanSummary(numRxStreams=1)
+        self.usrp2.collect.side_effect = fillWith(0.2)
+
+    def test_samplesAreWrittenIntoTensor(self) -> None:
+        tensor = self.system.collectArray()
+
+        self.assertEqual(tensor.samples.shape, (2, 2, 2, 10))
+        self.assertEqual(tensor.samples.dtype, np.complex64)
+        self.assertEqual(tensor.usrpNames, ["usrp1", "usrp2"])
+        npt.assert_array_equal(tensor.numSamples, [[10, 6], [8, 0]])
+        npt.assert_array_equal(tensor.device("usrp1")[1, :, :6], 0.1)
+        npt.assert_array_equal(tensor.device("usrp1")[1, :, 6:], 0)
+        npt.assert_array_equal(tensor.device("usrp2")[0, 0, :8], 0.2)
+        npt.assert_array_equal(tensor.device("usrp2")[0, 1], 0)
+        npt.assert_array_equal(tensor.device("usrp2")[1], 0)
+
+        out = self.usrp1.collect.call_args.kwargs["out"]
+        self.assertTrue(np.shares_memory(out[0].signals[1], tensor.samples))
+
+    def test_tensorIsReusedForSameLayout(self) -> None:
+        tensor = self.system.collectArray()
+        self.assertIs(self.system.collectArray(out=tensor), tensor)
+
+        self.usrp2.pendingSignalLengths = [8, 8]
+        self.assertIsNot(self.system.collectArray(out=tensor), tensor)
+
+    def test_samplesAreStackedForUnknownLayout(self) -> None:
+        self.usrp2.pendingSignalLengths = None
+        self.usrp1.collect.side_effect = None
+        self.usrp1.collect.return_value = [MimoSignal(signals=[0.1 * np.ones(4)] * 2)]
+        self.usrp2.collect.side_effect = None
+        self.usrp2.collect.return_value = [MimoSignal(signals=[0.2 * np.ones(6)])]
+
+        tensor = self.system.collectArray()
+
+        self.usrp1.collect.assert_called_once_with()
+        self.assertEqual(tensor.samples.shape, (2, 1, 2, 6))
+        npt.assert_array_equal(tensor.numSamples, [[4], [6]])
+        npt.assert_array_equal(tensor.device("usrp1")[0, :, :4], 0.1)
+        npt.assert_array_equal(tensor.device("usrp2")[0, 0], 0.2)
+
+    def test_viewsCoverValidSamples(self) -> None:
+        tensor = SampleTensor.allocate({"a": [4, 0], "b": []}, {"a": 1, "b": 1})
+        views = tensor.views({"a": 1, "b": 1})
+        self.assertEqual([len(m.signals[0]) for m in views["a"]], [4, 0])
+        self.assertEqual(views["b"], [])
+
+
+class TestDeviceGroups(unittest.TestCase):
+    def setUp(self) -> None:
+        self.system = FakeSystem(3, mockSyncValid=False)
+        for mock in self.system.mockUsrps:
+            mock.collect.return_value = [MimoSignal(signals=[0.1 * np.ones(10)])]
+        self.system.defineGroup("link", ["usrp1", "usrp2"])
+
+    def test_executeOnlyTriggersSelectedUsrps(self) -> None:
+        for mock in self.system.mockUsrps[:2]:
+            mock.getCurrentFpgaTime.return_value = 5.0
+        self.system.execute("link")
+
+        for mock in self.system.mockUsrps[:2]:
+            mock.execute.assert_called_once_with(5.0 + System.baseTimeOffsetSec)
+        self.system.mockUsrps[2].execute.assert_not_called()
+        self.system.mockUsrps[2].getCurrentFpgaTime.assert_not_called()
+
+    def test_idleUsrpsAreSkipped(self) -> None:
+        self.system.mockUsrps[0].hasPendingConfigs = False
+        self.system.execute()
+        samples = self.system.collect()
+
+        self.system.mockUsrps[0].execute.assert_not_called()
+        self.system.mockUsrps[0].collect.assert_not_called()
+        self.assertEqual(samples["usrp1"], [])
+        self.assertEqual(len(samples["usrp2"]), 1)
+
+    def test_collectOnlySelectedUsrps(self) -> None:
+        samples = self.system.collect(usrpNames=["usrp3", "usrp1"])
+        self.assertListEqual(sorted(samples.keys()), ["usrp1", "usrp3"])
+        self.system.mockUsrps[1].collect.assert_not_called()
+
+    def test_synchronizingGroupResetsOnlyItsUsrps(self) -> None:
+        self.system._syncSourceSet = True
+        self.system.mockUsrps[1].getCurrentFpgaTime.side_effect = [10.0, 3.0]
+        self.system.mockUsrps[2].getCurrentFpgaTime.return_value = 100.0
+        self.system.synchronizeUsrps("link")
+
+        for mock in self.system.mockUsrps[:2]:
+            mock.setTimeToZeroNextPps.assert_called_once()
+        self.system.mockUsrps[2].setTimeToZeroNextPps.assert_not_called()
+
+    def test_synchronizedUsrpsAreNotSynchronizedAgain(self) -> None:
+        self.system.synchronizeUsrps()
+        for mock in self.system.mockUsrps:
+            mock.getCurrentFpgaTime.reset_mock()
+
+        self.system.synchronizeUsrps("link")
+        for mock in self.system.mockUsrps:
+            mock.getCurrentFpgaTime.assert_not_called()
+
+    def test_unknownNamesAreRejected(self) -> None:
+        self.assertRaises(ValueError, lambda: self.system.execute("unknown"))
+        self.assertRaises(ValueError,
+                          lambda: self.system.defineGroup("usrp1", ["usrp2"]))
+        self.assertRaises(ValueError,
+                          lambda: self.system.defineGroup("group", ["unknown"]))
+
+
+class TestLatencyCalibration(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.system = FakeSystem(0)
+        self.system.latencyCacheFile = os.path.join(self.tmpDir.name, "latency.json")
+        self.rfConfig = RfConfig(rxSamplingRate=100e6, txSamplingRate=100e6)
+        self.tx = self.__addUsrp("usrpTx", "ipTx")
+        self.rx = self.__addUsrp("usrpRx", "ipRx")
+
+    def tearDown(self) -> None:
+        self.tmpDir.cleanup()
+
+    def __addUsrp(self, name: str, ip: str) -> Mock:
+        mock = Mock(spec=UsrpClient)
+        mock.ip, mock.port = ip, 5555
+        mock.getCurrentFpgaTime.return_value = 3.0
+        mock.getConfiguredRfConfig.return_value = self.rfConfig
+        self.system.addUsrp(name, mock)
+        return mock
+
+    def __mockReception(self, delay: int) -> None:
+        def collect() -> List[MimoSignal]:
+            probe = self.tx.configureTx.call_args[0][0].samples.signals[0]
+            rxSignal = np.zeros(self.rx.configureRx.call_args[0][0].numSamples,
+                                dtype=np.complex64)
+            rxSignal[delay:delay + len(probe)] = 0.5 * probe
+            return [MimoSignal(signals=[rxSignal])]
+        self.tx.collect.return_value = []
+        self.rx.collect.side_effect = collect
+
+    def test_alignedRxWithoutCalibration_raises(self) -> None:
+        self.assertRaises(LookupError, lambda: self.system.configureRx(
+            "usrpRx", RxStreamingConfig(numSamples=100), alignToTx="usrpTx"))
+
+    def test_calibrateLatencyMeasuresDelay(self) -> None:
+        self.__mockReception(delay=363)
+        self.assertEqual(self.system.calibrateLatency("usrpTx", "usrpRx"), 363)
+        self.tx.execute.assert_called_once()
+        self.rx.execute.assert_called_once()
+        self.tx.collect.assert_called_once()
+        self.rx.collect.assert_called_once()
+
+    def test_calibratedLatencyIsReused(self) -> None:
+        self.__mockReception(delay=363)
+        self.system.calibrateLatency("usrpTx", "usrpRx")
+        self.assertEqual(self.system.calibrateLatency("usrpTx", "usrpRx"), 363)
+        self.rx.execute.assert_called_once()
+
+        self.__mockReception(delay=100)
+        self.assertEqual(self.system.calibrateLatency("usrpTx", "usrpRx", force=True), 100)
+
+    def test_alignedRxShiftsReceiveTimeOffset(self) -> None:
+        self.__mockReception(delay=300)
+        self.system.calibrateLatency("usrpTx", "usrpRx")
+        self.system.configureRx("usrpRx", RxStreamingConfig(receiveTimeOffset=1e-3,
+                                                            numSamples=100),
+                                alignToTx="usrpTx")
+
+        rxConfig = self.rx.configureRx.call_args[0][0]
+        self.assertAlmostEqual(rxConfig.receiveTimeOffset, 1e-3 + 300 / 100e6)
+        self.assertEqual(rxConfig.numSamples, 100)
+
+
+class TestMeasurementPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.system = FakeSystem(2)
+        for mock in self.system.mockUsrps:
+            mock.collect.return_value = [MimoSignal(signals=[0.1 * np.ones(10)])]
+
+    def test_prepareArmsConfigsAtEachUsrp(self) -> None:
+        self.system.prepare()
+        for mock in self.system.mockUsrps:
+            mock.armStreamingConfigs.assert_called_once()
+
+    def test_runExecutesAndCollects(self) -> None:
+        plan = self.system.prepare()
+        samples = plan.run()
+        plan.run()
+
+        self.assertListEqual(list(samples.keys()), ["usrp1", "usrp2"])
+        for mock in self.system.mockUsrps:
+            self.assertEqual(mock.execute.call_count, 2)
+            self.assertEqual(mock.collect.call_count, 2)
+            mock.configureTx.assert_not_called()
+
+    def test_multipleRunsAreExecutedAtServer(self) -> None:
+        plan = self.system.prepare()
+        plan.run(3, runPeriodSec=0.25)
+
+        baseTime = 3.0 + System.baseTimeOffsetSec
+        for mock in self.system.mockUsrps:
+            mock.executeRepeatedly.assert_called_once_with(baseTime, 3, 0.25)
+            mock.execute.assert_not_called()
+
+    def test_defaultRunPeriodCoversPlannedBurst(self) -> None:
+        self.system.mockUsrps[0].plannedStreaming = PlanSummary(burstDuration=0.5)
+        self.system.mockUsrps[1].plannedStreaming = PlanSummary(burstDuration=2.0)
+        plan = self.system.prepare()
+        self.assertEqual(plan.burstDurationSec, 2.0)
+
+        plan.run(3)
+        for mock in self.system.mockUsrps:
+            self.assertEqual(mock.executeRepeatedly.call_args.args[2],
+                             2.0 + MeasurementPlan.defaultRunPeriodSec)
+        self.assertRaises(ValueError, lambda: plan.run(3, runPeriodSec=1.5))
+
+    def test_burstDurationIsUnknownIfNotPlannedAtEachUsrp(self) -> None:
+        self.system.mockUsrps[0].plannedStreaming = PlanSummary(burstDuration=0.5)
+        self.assertIsNone(self.system.plannedBurstDurationSec)
+
+    def test_releaseResetsConfigs(self) -> None:
+        with self.system.prepare() as plan:
+            for mock in self.system.mockUsrps:
+                mock.resetStreamingConfigs.reset_mock()
+        self.assertTrue(plan.released)
+        for mock in self.system.mockUsrps:
+            mock.resetStreamingConfigs.assert_called_once()
+        self.assertRaises(RuntimeError, lambda: plan.run())
+
+    def test_prepareReleasesPreviousPlan(self) -> None:
+        plan = self.system.prepare()
+        self.system.prepare()
+        self.assertTrue(plan.released)
+        self.assertRaises(RuntimeError, lambda: plan.run())
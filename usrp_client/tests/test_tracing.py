@@ -0,0 +1,111 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import gevent
+import zerorpc
+
+from uhd_wrapper.utils.tracing import SERVER_SPAN_HEADER, TracingMiddleware
+from usrp_client.rpc_client import _ConnectionPerThread
+from usrp_client.tracing import Tracer, disableTracing, enableTracing, span
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tracer = Tracer()
+
+    def test_spansAreNested(self) -> None:
+        with self.tracer.span("outer", usrp="usrp1"):
+            with self.tracer.span("inner") as inner:
+                inner["numBytes"] = 10
+                self.assertIs(self.tracer.currentSpan(), inner)
+        self.assertIsNone(self.tracer.currentSpan())
+
+        inner, outer = self.tracer.events
+        self.assertEqual(outer["name"], "outer")
+        self.assertEqual(outer["args"], {"usrp": "usrp1"})
+        self.assertEqual(inner["args"], {"numBytes": 10})
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+
+    def test_chromeTraceContainsProcessNames(self) -> None:
+        with self.tracer.span("foo"):
+            pass
+        with tempfile.TemporaryDirectory() as tmpDir:
+            fileName = os.path.join(tmpDir, "trace.json")
+            self.tracer.writeChromeTrace(fileName)
+            with open(fileName) as f:
+                trace = json.load(f)
+
+        metadata, event = trace["traceEvents"]
+        self.assertEqual(metadata["args"], {"name": "client"})
+        self.assertEqual(event["name"], "foo")
+        self.assertEqual(event["ph"], "X")
+
+    def test_disabledTracingRecordsNothing(self) -> None:
+        tracer = enableTracing()
+        disableTracing()
+        with span("foo"):
+            pass
+        self.assertEqual(tracer.events, [])
+
+    def test_connectionRecordsSpanPerCall(self) -> None:
+        connection = _ConnectionPerThread(lambda: Mock(), device="localhost:5555")
+        tracer = enableTracing()
+        try:
+            connection.getCurrentFpgaTime()
+        finally:
+            disableTracing()
+        self.assertEqual(tracer.events[0]["name"], "rpc.getCurrentFpgaTime")
+        self.assertEqual(tracer.events[0]["args"], {"device": "localhost:5555"})
+
+
+class Calculator:
+    def add(self, a: int, b: int) -> int:
+        gevent.sleep(0.01)
+        return a + b
+
+
+class TestRequestTracing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        zerorpc.Context.get_instance().register_middleware(TracingMiddleware())
+
+    def setUp(self) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        self.server = zerorpc.Server(Calculator())
+        self.server.bind(f"tcp://127.0.0.1:{port}")
+        self.serverTask = gevent.spawn(self.server.run)
+        self.client = zerorpc.Client(timeout=5)
+        self.client.connect(f"tcp://127.0.0.1:{port}")
+
+    def tearDown(self) -> None:
+        disableTracing()
+        self.client.close()
+        self.server.close()
+        self.serverTask.kill()
+
+    def test_untracedRequestHasNoServerSpan(self) -> None:
+        middleware = TracingMiddleware()
+        request, reply = Mock(header={}), Mock(header={})
+        middleware.server_before_exec(request)
+        middleware.server_after_exec(request, reply)
+        self.assertNotIn(SERVER_SPAN_HEADER, reply.header)
+
+    def test_serverSpanIsCorrelatedWithClientSpan(self) -> None:
+        tracer = enableTracing()
+        with tracer.span("rpc.add", device="calculator"):
+            self.assertEqual(self.client.add(1, 2), 3)
+
+        serverSpan, clientSpan = tracer.events
+        self.assertEqual(serverSpan["name"], "add")
+        self.assertEqual(serverSpan["args"]["traceId"], clientSpan["args"]["traceId"])
+        self.assertNotEqual(serverSpan["pid"], clientSpan["pid"])
+        self.assertGreaterEqual(serverSpan["dur"], 1e4)
+        self.assertLessEqual(serverSpan["dur"], clientSpan["dur"])
+        self.assertGreater(clientSpan["args"]["requestBytes"], 0)
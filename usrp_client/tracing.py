@@ -0,0 +1,213 @@
+"""This module contains the opt-in tracing of the client, cf. `enableTracing`.
+
+While tracing is enabled, spans are recorded for each RPC request to a USRP, the
+(de)serialization of samples and the phases of `System`. They can be written as Chrome
+trace JSON, which can be opened with Perfetto or `chrome://tracing`. Servers of this
+version report the time they spent executing a traced request. These spans are shown in
+a separate process per USRP, centered within the corresponding request of the client,
+since the clocks of client and server are not synchronized.
+"""
+
+import contextlib
+import functools
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, TypeVar, cast
+
+from uhd_wrapper.utils.tracing import SERVER_SPAN_HEADER, TRACE_ID_HEADER
+
+
+CLIENT_PROCESS_ID = 0
+
+
+def payloadSize(payload: Any) -> int:
+    """Approximate number of bytes of `payload` in an RPC message."""
+    if isinstance(payload, (bytes, bytearray, str)):
+        return len(payload)
+    if isinstance(payload, (list, tuple)):
+        return sum(payloadSize(p) for p in payload)
+    if isinstance(payload, dict):
+        return sum(payloadSize(k) + payloadSize(v) for k, v in payload.items())
+    return 8
+
+
+class Tracer:
+    """Records spans of the client and the servers, cf. `enableTracing`."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__events: List[Dict[str, Any]] = []
+        self.__processIds: Dict[str, int] = dict()
+        self.__pendingRequests: Dict[str, float] = dict()
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded spans as Chrome trace events."""
+        with self.__lock:
+            return list(self.__events)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__events.clear()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Record a span covering the `with` block.
+
+        Args:
+            name (str): Name of the span.
+            **args: Attributes of the span, e.g. `device`. Further attributes can be added
+                to the yielded dictionary inside the block.
+        """
+        start = time.perf_counter()
+        stack = self.__spanStack()
+        stack.append(args)
+        try:
+            yield args
+        finally:
+            stack.pop()
+            self.__record(name, CLIENT_PROCESS_ID, start, time.perf_counter() - start,
+                          args)
+
+    def currentSpan(self) -> Optional[Dict[str, Any]]:
+        """Attributes of the innermost span of the calling thread."""
+        stack = self.__spanStack()
+        return stack[-1] if len(stack) > 0 else None
+
+    def writeChromeTrace(self, fileName: str) -> None:
+        """Write the recorded spans as Chrome trace JSON to `fileName`."""
+        with self.__lock:
+            processes = [("client", CLIENT_PROCESS_ID)] + \
+                [(f"server {d}", p) for d, p in self.__processIds.items()]
+            events = [{"name": "process_name", "ph": "M", "pid": p, "tid": 0,
+                       "args": {"name": n}} for n, p in processes] + self.__events
+        with open(fileName, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def beginRequest(self, requestEvent: Any) -> None:
+        """Add a trace ID to a request sent by zerorpc."""
+        spanId = uuid.uuid4().hex[:16]
+        requestEvent.header[TRACE_ID_HEADER] = spanId
+        with self.__lock:
+            self.__pendingRequests[spanId] = time.perf_counter()
+
+    def endRequest(self, requestEvent: Any, replyEvent: Optional[Any]) -> None:
+        """Attribute a finished request and its span on the server to the current span.
+        """
+        with self.__lock:
+            start = self.__pendingRequests.pop(requestEvent.header.get(TRACE_ID_HEADER),
+                                               None)
+        if start is None:
+            return
+        roundTrip = time.perf_counter() - start
+        span = self.currentSpan()
+        if span is None:
+            span = dict()
+        span["traceId"] = requestEvent.header[TRACE_ID_HEADER]
+        span["requestBytes"] = payloadSize(requestEvent.args)
+        if replyEvent is None:
+            return
+        span["replyBytes"] = payloadSize(replyEvent.args)
+        serverSpan = replyEvent.header.get(SERVER_SPAN_HEADER)
+        if not isinstance(serverSpan, dict):
+            return
+        duration = min(float(serverSpan["duration"]), roundTrip)
+        span["serverDurationMs"] = 1e3 * duration
+        self.__record(str(serverSpan["name"]),
+                      self.__processId(str(span.get("device", ""))),
+                      start + 0.5 * (roundTrip - duration), duration,
+                      {"traceId": serverSpan["id"], "serverStart": serverSpan["start"]})
+
+    def __spanStack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    def __processId(self, device: str) -> int:
+        with self.__lock:
+            if device not in self.__processIds:
+                self.__processIds[device] = len(self.__processIds) + 1
+            return self.__processIds[device]
+
+    def __record(self, name: str, processId: int, start: float, duration: float,
+                 args: Dict[str, Any]) -> None:
+        event = {"name": name, "ph": "X", "pid": processId, "tid": threading.get_ident(),
+                 "ts": 1e6 * start, "dur": 1e6 * duration, "args": args}
+        with self.__lock:
+            self.__events.append(event)
+
+
+_tracer: Optional[Tracer] = None
+_middlewareRegistered = False
+
+
+def enableTracing() -> Tracer:
+    """Start recording spans of all clients and systems of this process.
+
+    Returns:
+        Tracer: Recorded spans, cf. `Tracer.writeChromeTrace`. If tracing is already
+        enabled, the active tracer is returned.
+    """
+    global _tracer, _middlewareRegistered
+    if _tracer is None:
+        _tracer = Tracer()
+    if not _middlewareRegistered:
+        import zerorpc
+
+        zerorpc.Context.get_instance().register_middleware(_TracingMiddleware())
+        _middlewareRegistered = True
+    return _tracer
+
+
+def disableTracing() -> Optional[Tracer]:
+    """Stop recording spans and return the tracer containing the recorded spans."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def activeTracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **args: Any) -> ContextManager[Dict[str, Any]]:
+    """Record a span with the active tracer. Does nothing if tracing is disabled."""
+    tracer = _tracer
+    if tracer is None:
+        return contextlib.nullcontext(args)
+    return tracer.span(name, **args)
+
+
+_Function = TypeVar("_Function", bound=Callable[..., Any])
+
+
+def traced(name: str) -> Callable[[_Function], _Function]:
+    """Decorator recording a span named `name` for each call of the function."""
+    def decorator(function: _Function) -> _Function:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return function(*args, **kwargs)
+        return cast(_Function, wrapper)
+    return decorator
+
+
+class _TracingMiddleware:
+    """Forwards the hooks of zerorpc to the active tracer. Middlewares cannot be
+    removed from zerorpc, hence it is registered once and does nothing while tracing
+    is disabled."""
+
+    def client_before_request(self, requestEvent: Any) -> None:
+        tracer = _tracer
+        if tracer is not None:
+            tracer.beginRequest(requestEvent)
+
+    def client_after_request(self, requestEvent: Any, replyEvent: Optional[Any],
+                             exception: Optional[BaseException] = None) -> None:
+        tracer = _tracer
+        if tracer is not None:
+            tracer.endRequest(requestEvent, replyEvent)